@@ -0,0 +1,4 @@
+"""SHARPy benchmark suite
+
+See ``benchmarks/README.md`` for usage.
+"""
@@ -0,0 +1,92 @@
+"""Rotation algebra benchmarks
+
+Per-node loops over the scalar functions of :mod:`sharpy.utils.algebra` against their batched versions, evaluated
+for the number of nodes of a typical finely discretised beam.
+"""
+import numpy as np
+
+import sharpy.utils.algebra as algebra
+from benchmarks.harness import benchmark
+
+n_nodes = 1000
+
+
+def setup_nodes():
+    np.random.seed(2021)
+    psi = 2.0 * np.pi * (np.random.rand(n_nodes, 3) - 0.5)
+    quat = algebra.crv2quat_batch(psi)
+    vec = np.random.rand(n_nodes, 3)
+    return psi, quat, vec
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_crv2rotation_loop(args):
+    psi, _, _ = args
+    np.array([algebra.crv2rotation(psi[inode]) for inode in range(n_nodes)])
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_crv2rotation_batch(args):
+    psi, _, _ = args
+    algebra.crv2rotation_batch(psi)
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_crv2tan_loop(args):
+    psi, _, _ = args
+    np.array([algebra.crv2tan(psi[inode]) for inode in range(n_nodes)])
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_crv2tan_batch(args):
+    psi, _, _ = args
+    algebra.crv2tan_batch(psi)
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_quat2rotation_loop(args):
+    _, quat, _ = args
+    np.array([algebra.quat2rotation(quat[inode]) for inode in range(n_nodes)])
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_quat2rotation_batch(args):
+    _, quat, _ = args
+    algebra.quat2rotation_batch(quat)
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_rotation2crv_loop(args):
+    psi, _, _ = args
+    rot = algebra.crv2rotation_batch(psi)
+    np.array([algebra.rotation2crv(rot[inode]) for inode in range(n_nodes)])
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_rotation2crv_batch(args):
+    psi, _, _ = args
+    algebra.rotation2crv_batch(algebra.crv2rotation_batch(psi))
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_der_Ccrv_by_v_loop(args):
+    psi, _, vec = args
+    np.array([algebra.der_Ccrv_by_v(psi[inode], vec[inode]) for inode in range(n_nodes)])
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_der_Ccrv_by_v_batch(args):
+    psi, _, vec = args
+    algebra.der_Ccrv_by_v_batch(psi, vec)
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_crv_dot2omega_loop(args):
+    psi, _, vec = args
+    np.array([algebra.crv_dot2omega(psi[inode], vec[inode]) for inode in range(n_nodes)])
+
+
+@benchmark('kernel', setup=setup_nodes, number=10)
+def algebra_crv_dot2omega_batch(args):
+    psi, _, vec = args
+    algebra.crv_dot2omega_batch(psi, vec)
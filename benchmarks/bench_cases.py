@@ -0,0 +1,96 @@
+"""End to end case benchmarks
+
+Full simulations timed by running the existing regression tests. Case generation, done in the test class or test
+``setUp`` methods, is excluded from the timed region, while case generators called within the test method itself
+(such as in the Pazy test) are included.
+"""
+import importlib
+import runpy
+
+import configobj
+
+import sharpy.utils.sharpydir as sharpydir
+from benchmarks.harness import benchmark
+
+requires_libs = ('sharpy.aero.utils.uvlmlib', 'sharpy.structure.utils.xbeamlib')
+
+
+class TestCaseRunner(object):
+    """
+    Runs a single ``unittest.TestCase`` method, with the class and instance set up performed in :meth:`setup`.
+
+    Args:
+        module (str): Test module
+        test_class (str): Name of the ``TestCase`` class
+        method (str): Test method to run
+    """
+    def __init__(self, module, test_class, method):
+        self.module = module
+        self.test_class = test_class
+        self.method = method
+
+    def setup(self):
+        test_class = getattr(importlib.import_module(self.module), self.test_class)
+        test_class.setUpClass()
+        test_case = test_class(self.method)
+        test_case.setUp()
+        return test_case
+
+    def run(self, test_case):
+        getattr(test_case, self.method)()
+
+    def teardown(self, test_case):
+        test_case.tearDown()
+        type(test_case).tearDownClass()
+
+
+def register_case(name, module, test_class, method, repeat=3, requires=requires_libs):
+    runner = TestCaseRunner(module, test_class, method)
+    benchmark('case', name=name, setup=runner.setup, teardown=runner.teardown,
+              repeat=repeat, requires=requires)(runner.run)
+
+
+def generate_smith_g_4deg():
+    importlib.import_module('tests.coupled.static.smith_g_4deg.generate_smith_g_4deg')
+
+
+@benchmark('case', setup=generate_smith_g_4deg, repeat=3, requires=requires_libs)
+def static_smith_g_4deg():
+    import sharpy.sharpy_main
+    sharpy.sharpy_main.main(['', sharpydir.SharpyDir + '/tests/coupled/static/smith_g_4deg/smith_g_4deg.sharpy'])
+
+
+def generate_simple_hale(n_time_steps=20):
+    """
+    Generates the ``simple_HALE`` case and shortens its gust response to ``n_time_steps`` time steps, without the
+    plotting postprocessors.
+    """
+    route = sharpydir.SharpyDir + '/cases/coupled/simple_HALE/'
+    runpy.run_path(route + 'generate_hale.py')
+
+    config = configobj.ConfigObj(route + 'simple_HALE.sharpy')
+    config['SHARPy']['flow'] = [solver for solver in config['SHARPy']['flow']
+                                if solver not in ['AerogridPlot', 'BeamPlot']]
+    dynamic = config['DynamicCoupled']
+    dynamic['n_time_steps'] = n_time_steps
+    dynamic['aero_solver_settings']['n_time_steps'] = n_time_steps
+    dynamic['structural_solver_settings']['num_steps'] = n_time_steps
+    dynamic['postprocessors'] = ['BeamLoads']
+    config.write()
+    return route + 'simple_HALE.sharpy'
+
+
+@benchmark('case', setup=generate_simple_hale, repeat=1, requires=requires_libs)
+def dynamic_simple_hale(case_file):
+    import sharpy.sharpy_main
+    sharpy.sharpy_main.main(['', case_file])
+
+
+register_case('static_pazy', 'tests.coupled.static.test_pazy_static', 'TestPazyCoupledStatic', 'test_static_aoa')
+register_case('multibody_double_pendulum_hinge',
+              'tests.coupled.multibody.double_pendulum.test_double_pendulum_geradin',
+              'TestDoublePendulum', 'test_doublependulum_hinge')
+register_case('prescribed_rotor', 'tests.coupled.prescribed.WindTurbine.test_rotor', 'TestRotor', 'test_rotor',
+              repeat=1)
+register_case('linear_goland_flutter', 'tests.linear.goland_wing.test_goland_flutter', 'TestGolandFlutter',
+              'test_flutter', repeat=1)
@@ -0,0 +1,148 @@
+"""Nonlinear kernel benchmarks
+
+Force mapping, grid generation and velocity field generation on the ``smith_g_4deg`` static test case, and multibody
+system assembly on the hinged double pendulum test case. These require the compiled UVLM and xbeam libraries.
+"""
+import importlib
+import os
+
+import numpy as np
+
+import sharpy.utils.sharpydir as sharpydir
+from benchmarks.harness import benchmark
+
+requires_libs = ('sharpy.aero.utils.uvlmlib', 'sharpy.structure.utils.xbeamlib')
+
+
+def load_case(solver_file, flow):
+    """
+    Runs the ``flow`` solvers of a generated case and returns the resulting ``PreSharpy`` data.
+
+    Args:
+        solver_file (str): Path to the ``.sharpy`` file
+        flow (list(str)): Solvers to run, usually only the loaders
+
+    Returns:
+        sharpy.presharpy.presharpy.PreSharpy: Case data
+    """
+    import sharpy.solvers
+    import sharpy.postproc
+    import sharpy.generators
+    import sharpy.utils.input_arg as input_arg
+    import sharpy.utils.solver_interface as solver_interface
+    from sharpy.presharpy.presharpy import PreSharpy
+
+    settings = input_arg.parse_settings(solver_file)
+    settings['SHARPy']['flow'] = flow
+    settings['SHARPy']['write_screen'] = 'off'
+    data = PreSharpy(settings)
+    for solver_name in flow:
+        solver = solver_interface.initialise_solver(solver_name, print_info=False)
+        solver.initialise(data)
+        data = solver.run()
+    return data
+
+
+def setup_smith():
+    importlib.import_module('tests.coupled.static.smith_g_4deg.generate_smith_g_4deg')
+    solver_file = sharpydir.SharpyDir + '/tests/coupled/static/smith_g_4deg/smith_g_4deg.sharpy'
+    data = load_case(solver_file, ['BeamLoader', 'AerogridLoader'])
+    aero_tstep = data.aero.timestep_info[0]
+    for i_surf in range(aero_tstep.n_surf):
+        aero_tstep.forces[i_surf][:] = np.random.rand(*aero_tstep.forces[i_surf].shape)
+    return data
+
+
+@benchmark('kernel', setup=setup_smith, number=10, requires=requires_libs)
+def force_mapping(data):
+    import sharpy.aero.utils.mapping as mapping
+    struct_tstep = data.structure.timestep_info[0]
+    mapping.aero2struct_force_mapping(data.aero.timestep_info[0].forces,
+                                      data.aero.struct2aero_mapping,
+                                      data.aero.timestep_info[0].zeta,
+                                      struct_tstep.pos,
+                                      struct_tstep.psi,
+                                      data.structure.node_master_elem,
+                                      data.structure.connectivities,
+                                      struct_tstep.cag(),
+                                      data.aero.aero_dict)
+
+
+@benchmark('kernel', setup=setup_smith, number=10, requires=requires_libs)
+def grid_generation(data):
+    data.aero.generate_zeta(data.structure, data.aero.aero_settings, ts=0, beam_ts=0)
+
+
+def setup_velocity_generators():
+    import sharpy.generators.steadyvelocityfield as steadyvelocityfield
+    import sharpy.generators.gustvelocityfield as gustvelocityfield
+    data = setup_smith()
+    steady = steadyvelocityfield.SteadyVelocityField()
+    steady.initialise({'u_inf': 10.,
+                       'u_inf_direction': np.array([1., 0., 0.])})
+    gust = gustvelocityfield.GustVelocityField()
+    gust.initialise({'u_inf': 10.,
+                     'u_inf_direction': np.array([1., 0., 0.]),
+                     'gust_shape': '1-cos',
+                     'gust_parameters': {'gust_length': 5.,
+                                         'gust_intensity': 0.1},
+                     'offset': 0.,
+                     'relative_motion': True})
+    return data, steady, gust
+
+
+def generate_velocity(data, generator):
+    aero_tstep = data.aero.timestep_info[0]
+    for zeta, uext, is_wake in ((aero_tstep.zeta, aero_tstep.u_ext, False),
+                                (aero_tstep.zeta_star, aero_tstep.u_ext_star, True)):
+        generator.generate({'zeta': zeta,
+                            'override': True,
+                            't': 0.1,
+                            'ts': 1,
+                            'dt': 0.01,
+                            'for_pos': data.structure.timestep_info[0].for_pos,
+                            'is_wake': is_wake},
+                           uext)
+
+
+@benchmark('kernel', setup=setup_velocity_generators, number=10, requires=requires_libs)
+def velocity_generator_steady(args):
+    data, steady, gust = args
+    generate_velocity(data, steady)
+
+
+@benchmark('kernel', setup=setup_velocity_generators, number=10, requires=requires_libs)
+def velocity_generator_gust(args):
+    data, steady, gust = args
+    generate_velocity(data, gust)
+
+
+def setup_multibody():
+    import sharpy.utils.solver_interface as solver_interface
+    import sharpy.utils.multibody as mb
+    import tests.coupled.multibody.double_pendulum.test_double_pendulum_geradin as dp
+
+    test_case = dp.TestDoublePendulum()
+    test_case.setUp()
+    solver_file = os.path.dirname(dp.__file__) + '/' + dp.name_hinge + '.sharpy'
+    data = load_case(solver_file, ['BeamLoader', 'AerogridLoader'])
+
+    structural_solver = solver_interface.initialise_solver('NonLinearDynamicMultibody', print_info=False)
+    structural_solver.initialise(data, data.settings['DynamicCoupled']['structural_solver_settings'])
+
+    tstep = data.structure.timestep_info[-1].copy()
+    tstep.whole_structure_to_local_AFoR(data.structure)
+    MB_beam, MB_tstep = mb.split_multibody(data.structure, tstep, data.structure.ini_mb_dict, 1)
+    return test_case, structural_solver, MB_beam, MB_tstep, data
+
+
+def teardown_multibody(args):
+    args[0].tearDown()
+
+
+@benchmark('kernel', setup=setup_multibody, teardown=teardown_multibody, number=10, requires=requires_libs)
+def multibody_assembly(args):
+    test_case, structural_solver, MB_beam, MB_tstep, data = args
+    structural_solver.assembly_MB_eq_system(MB_beam, MB_tstep, 1, structural_solver.settings['dt'],
+                                            structural_solver.Lambda, structural_solver.Lambda_dot,
+                                            data.structure.ini_mb_dict)
@@ -0,0 +1,75 @@
+"""Linear kernel benchmarks
+
+Frequency response, Krylov and balancing reduction of the state-space system stored in ``tests/linear/rom/src`` (the
+same system used in the ROM unit tests) and of a larger random stable discrete-time system.
+"""
+import numpy as np
+import scipy.io as scio
+
+import sharpy.utils.sharpydir as sharpydir
+import sharpy.utils.cout_utils as cout
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+from benchmarks.harness import benchmark
+
+
+def load_rom_test_system():
+    cout.cout_wrap.initialise(False, False)
+    src = sharpydir.SharpyDir + '/tests/linear/rom/src/'
+    A = libsp.csc_matrix(scio.loadmat(src + 'A.mat')['A']).todense()
+    B = scio.loadmat(src + 'B.mat')['B']
+    C = scio.loadmat(src + 'C.mat')['C']
+    D = np.zeros((C.shape[0], B.shape[1]))
+    return libss.ss(np.asarray(A), B, C, D)
+
+
+def random_dlti(nx=400, nu=6, ny=6):
+    np.random.seed(2021)
+    return libss.random_ss(nx, nu, ny, dt=0.1, stable=True)
+
+
+def setup_freqresp():
+    return random_dlti(), np.linspace(0.01, 10, 100)
+
+
+@benchmark('kernel', setup=setup_freqresp, repeat=3)
+def freqresp(args):
+    ss, wv = args
+    libss.freqresp(ss, wv)
+
+
+@benchmark('kernel', setup=load_rom_test_system, repeat=3)
+def krylov_one_sided_arnoldi(ss):
+    import sharpy.rom.krylov as krylov
+    rom = krylov.Krylov()
+    rom.initialise({'algorithm': 'one_sided_arnoldi',
+                    'r': 48,
+                    'frequency': np.array([0])})
+    rom.run(ss)
+
+
+@benchmark('kernel', setup=load_rom_test_system, repeat=3)
+def krylov_mimo_rational_arnoldi(ss):
+    import sharpy.rom.krylov as krylov
+    rom = krylov.Krylov()
+    rom.initialise({'algorithm': 'mimo_rational_arnoldi',
+                    'r': 6,
+                    'frequency': np.array([0.])})
+    rom.run(ss)
+
+
+def setup_balancing():
+    return random_dlti(nx=200, nu=4, ny=4)
+
+
+@benchmark('kernel', setup=setup_balancing, repeat=3)
+def balancing_direct(ss):
+    import sharpy.rom.utils.librom as librom
+    librom.balreal_direct_py(ss.A, ss.B, ss.C, DLTI=True, full_outputs=False)
+
+
+@benchmark('kernel', setup=setup_balancing, repeat=3)
+def balancing_iterative(ss):
+    import sharpy.rom.utils.librom as librom
+    librom.balreal_iter(ss.A, ss.B, ss.C, lowrank=True, tolSmith=1e-10, tolSVD=1e-6, kmin=None, tolAbs=False,
+                        Print=False, outFacts=False)
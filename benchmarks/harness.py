@@ -0,0 +1,200 @@
+"""Benchmark Harness
+
+Minimal registry, timer and result comparison for the SHARPy benchmark suite.
+
+Benchmarks are plain functions registered with the :func:`benchmark` decorator. An optional ``setup`` function is
+run once, outside the timed region, and its return value is passed to the benchmark on each call. Each benchmark is
+called ``number`` times per repeat and the best (minimum) time per call out of ``repeat`` repeats is reported,
+together with the mean and standard deviation, as in ``timeit``.
+"""
+import collections
+import datetime
+import fnmatch
+import json
+import platform
+import subprocess
+import time
+import traceback
+
+import numpy as np
+import scipy
+
+import sharpy.utils.sharpydir as sharpydir
+
+Benchmark = collections.namedtuple('Benchmark', ['name', 'group', 'function', 'setup', 'teardown',
+                                                 'number', 'repeat', 'requires'])
+
+registry = collections.OrderedDict()
+
+
+def benchmark(group, name=None, setup=None, teardown=None, number=1, repeat=5, requires=()):
+    """
+    Decorator that registers a benchmark.
+
+    Args:
+        group (str): Benchmark group, ``kernel`` or ``case`` (end to end)
+        name (str): Benchmark name. Defaults to the function name
+        setup (callable): Function run once before timing. Its output is passed to the benchmark
+        teardown (callable): Function run once after timing with the output of ``setup``
+        number (int): Calls per repeat
+        repeat (int): Number of repeats
+        requires (tuple(str)): Names of modules that must be importable to run the benchmark, such as
+            ``'sharpy.aero.utils.uvlmlib'`` for benchmarks that need the compiled UVLM library
+    """
+    def register(function):
+        bench_name = group + '.' + (name if name is not None else function.__name__)
+        if bench_name in registry:
+            raise KeyError('Benchmark %s already registered' % bench_name)
+        registry[bench_name] = Benchmark(bench_name, group, function, setup, teardown, number, repeat, requires)
+        return function
+    return register
+
+
+def select(patterns=None):
+    """
+    Returns the registered benchmarks whose name matches any of the ``fnmatch`` patterns (all if ``None``).
+    """
+    if not patterns:
+        return list(registry.values())
+    return [bench for bench in registry.values() if any(fnmatch.fnmatch(bench.name, p) for p in patterns)]
+
+
+def missing_requirements(bench):
+    missing = []
+    for module in bench.requires:
+        try:
+            __import__(module)
+        except (ImportError, SystemExit):
+            missing.append(module)
+    return missing
+
+
+def time_benchmark(bench, repeat=None):
+    """
+    Times a benchmark.
+
+    Args:
+        bench (Benchmark): Benchmark to run
+        repeat (int): Overrides the benchmark number of repeats
+
+    Returns:
+        dict: Timing results in seconds per call, or the reason for which the benchmark was skipped or failed.
+    """
+    if repeat is None:
+        repeat = bench.repeat
+
+    missing = missing_requirements(bench)
+    if missing:
+        return {'status': 'skipped', 'reason': 'Missing ' + ', '.join(missing)}
+
+    try:
+        args = bench.setup() if bench.setup is not None else None
+        times = np.zeros((repeat,))
+        for i_repeat in range(repeat):
+            t0 = time.perf_counter()
+            for i_call in range(bench.number):
+                if args is None:
+                    bench.function()
+                else:
+                    bench.function(args)
+            times[i_repeat] = (time.perf_counter() - t0)/bench.number
+        if bench.teardown is not None:
+            bench.teardown(args)
+    except Exception:
+        return {'status': 'failed', 'reason': traceback.format_exc(limit=3)}
+
+    return {'status': 'ok',
+            'min': float(np.min(times)),
+            'mean': float(np.mean(times)),
+            'std': float(np.std(times)),
+            'number': bench.number,
+            'repeat': repeat}
+
+
+def machine_info():
+    info = {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor()}
+    try:
+        info['commit'] = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                                 cwd=sharpydir.SharpyDir).strip().decode('utf-8')
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        info['commit'] = None
+    return info
+
+
+def run(patterns=None, repeat=None, print_info=True):
+    """
+    Runs the selected benchmarks.
+
+    Returns:
+        dict: Results with ``machine`` information and a ``benchmarks`` entry per benchmark
+    """
+    results = {'machine': machine_info(),
+               'benchmarks': collections.OrderedDict()}
+    for bench in select(patterns):
+        result = time_benchmark(bench, repeat)
+        results['benchmarks'][bench.name] = result
+        if print_info:
+            if result['status'] == 'ok':
+                print('%-55s %12.4e s  (+/- %.2e)' % (bench.name, result['min'], result['std']))
+            else:
+                print('%-55s %12s  %s' % (bench.name, result['status'], result['reason'].splitlines()[-1]))
+    return results
+
+
+def save(results, filename):
+    with open(filename, 'w') as outfile:
+        json.dump(results, outfile, indent=2)
+
+
+def load(filename):
+    with open(filename, 'r') as infile:
+        return json.load(infile)
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compares benchmark results against a baseline.
+
+    A benchmark is flagged as a regression if its best time is more than ``threshold`` (relative) above the
+    baseline and the difference is larger than the combined standard deviation of both measurements. Conversely
+    for improvements.
+
+    Args:
+        results (dict): Current results, as returned by :func:`run` or :func:`load`
+        baseline (dict): Baseline results
+        threshold (float): Relative change that is flagged
+
+    Returns:
+        list(tuple): ``(name, baseline_time, current_time, ratio, flag)`` for every benchmark in both results, where
+        ``flag`` is ``'regression'``, ``'improvement'`` or ``''``.
+    """
+    comparison = []
+    for name, current in results['benchmarks'].items():
+        try:
+            reference = baseline['benchmarks'][name]
+        except KeyError:
+            continue
+        if current['status'] != 'ok' or reference['status'] != 'ok':
+            continue
+
+        ratio = current['min']/reference['min']
+        noise = current['std'] + reference['std']
+        flag = ''
+        if ratio > 1 + threshold and current['min'] - reference['min'] > noise:
+            flag = 'regression'
+        elif ratio < 1/(1 + threshold) and reference['min'] - current['min'] > noise:
+            flag = 'improvement'
+        comparison.append((name, reference['min'], current['min'], ratio, flag))
+
+    return comparison
+
+
+def print_comparison(comparison):
+    print('%-55s %12s %12s %8s' % ('benchmark', 'baseline', 'current', 'ratio'))
+    for name, reference, current, ratio, flag in comparison:
+        print('%-55s %12.4e %12.4e %8.3f %s' % (name, reference, current, ratio, flag.upper()))
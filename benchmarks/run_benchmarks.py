@@ -0,0 +1,70 @@
+"""SHARPy benchmark runner
+
+Usage::
+
+    python -m benchmarks.run_benchmarks run [-k PATTERN ...] [-o results.json] [--repeat N]
+    python -m benchmarks.run_benchmarks compare results.json baseline.json [--threshold 0.1]
+
+``compare`` exits with a non zero status if any benchmark regressed, such that it can be used as a CI check.
+"""
+import argparse
+import sys
+
+import benchmarks.harness as harness
+import benchmarks.bench_algebra
+import benchmarks.bench_linear
+import benchmarks.bench_kernels
+import benchmarks.bench_cases
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run_benchmarks',
+                                     description='Run and compare SHARPy benchmarks')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks')
+    run_parser.add_argument('-k', dest='patterns', nargs='+', default=None,
+                            help='Only run benchmarks matching these patterns, e.g. "kernel.*"')
+    run_parser.add_argument('-o', '--output', default=None, help='Save results to a JSON file')
+    run_parser.add_argument('--repeat', type=int, default=None, help='Override the number of repeats')
+    run_parser.add_argument('--baseline', default=None, help='Compare against this results file after running')
+    run_parser.add_argument('--threshold', type=float, default=0.1, help='Relative regression threshold')
+
+    list_parser = subparsers.add_parser('list', help='List benchmarks')
+    list_parser.add_argument('-k', dest='patterns', nargs='+', default=None)
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two results files')
+    compare_parser.add_argument('results', help='Current results')
+    compare_parser.add_argument('baseline', help='Baseline results')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='Relative regression threshold')
+
+    args = parser.parse_args(args)
+
+    if args.command == 'list':
+        for bench in harness.select(args.patterns):
+            print(bench.name)
+        return 0
+
+    if args.command == 'run':
+        results = harness.run(args.patterns, repeat=args.repeat)
+        if args.output is not None:
+            harness.save(results, args.output)
+        if args.baseline is None:
+            return 0
+        baseline = harness.load(args.baseline)
+    elif args.command == 'compare':
+        results = harness.load(args.results)
+        baseline = harness.load(args.baseline)
+    else:
+        parser.print_help()
+        return 1
+
+    comparison = harness.compare(results, baseline, threshold=args.threshold)
+    harness.print_comparison(comparison)
+    if any(flag == 'regression' for *_, flag in comparison):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
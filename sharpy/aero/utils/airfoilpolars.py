@@ -6,6 +6,15 @@ from sharpy.utils.constants import deg2rad
 class Polar:
     """
     Airfoil polar object
+
+    Attributes:
+        table (np.ndarray): 4-column array containing ``aoa`` (rad), ``cl``, ``cd`` and ``cm``
+        aoa_cl0_deg (float): Angle of attack of zero lift closest to zero
+        i_aoa_cl0 (int): Index of the point of the table closest to ``aoa_cl0_deg``
+        cl_branch_pos (np.ndarray): Running maximum of ``cl`` from ``i_aoa_cl0`` towards the last point. Monotone
+          inverse of the positive lift branch of the polar used by :meth:`get_cdcm_from_cl`
+        cl_branch_neg (np.ndarray): Running minimum of ``cl`` from ``i_aoa_cl0`` towards the first point. Monotone
+          inverse of the negative lift branch of the polar
     """
 
     def __init__(self):
@@ -13,6 +22,10 @@ class Polar:
         self.table = None
         self.aoa_cl0_deg = None
 
+        self.i_aoa_cl0 = None
+        self.cl_branch_pos = None
+        self.cl_branch_neg = None
+
     def initialise(self, table):
         """
         Initialise polar
@@ -51,6 +64,12 @@ class Polar:
                 iaoacl0 = imin
         self.aoa_cl0_deg = matches[iaoacl0]
 
+        # Monotone inverse tables: the first point along each branch (starting at the AoA of CL=0) at which a given
+        # CL is reached is found by a binary search in the running maximum (minimum) of CL
+        self.i_aoa_cl0 = np.argmin(np.abs(self.table[:, 0] - self.aoa_cl0_deg))
+        self.cl_branch_pos = np.maximum.accumulate(self.table[self.i_aoa_cl0:, 1])
+        self.cl_branch_neg = np.minimum.accumulate(self.table[self.i_aoa_cl0::-1, 1])
+
     def get_coefs(self, aoa_deg):
 
         cl = np.interp(aoa_deg, self.table[:, 0], self.table[:, 1])
@@ -80,39 +99,62 @@ class Polar:
         return new_polar
 
     def get_cdcm_from_cl(self, cl):
-        # Computes the cd and cm from cl
-        # It provides the first match after (or before) the AOA of CL=0
-
-        cl_max = np.max(self.table[:,1])  
-        cl_min = np.min(self.table[:,1])
-
-        if cl_max < cl or cl_min > cl:
-            print(("cl = %.2f out of range, forces at this point will not be corrected" % cl))  
-            cd = 0.
-            cm = 0. 
-        else: 
-            if cl == 0.:
-                cl_new, cd, cm = self.get_coefs(self.aoa_cl0_deg)
-            elif cl > 0.:
-                dist = np.abs(self.table[:,0] - self.aoa_cl0_deg)
-                min_dist = np.min(dist)
-                i = np.where(dist == min_dist)[0][0]
-                while self.table[i, 1] < cl:
-                    i += 1
-                cd = np.interp(cl, self.table[i-1:i+1, 1], self.table[i-1:i+1, 2])
-                cm = np.interp(cl, self.table[i-1:i+1, 1], self.table[i-1:i+1, 3])
-            else:
-                dist = np.abs(self.table[:,0] - self.aoa_cl0_deg)
-                min_dist = np.min(dist)
-                i = np.where(dist == min_dist)[0][0]
-                while self.table[i, 1] > cl:
-                        i -= 1
-                cd = np.interp(cl, self.table[i:i+2, 1], self.table[i:i+2, 2])
-                cm = np.interp(cl, self.table[i:i+2, 1], self.table[i:i+2, 3])
-        
-        return cd, cm
-
-    
+        """
+        Computes the cd and cm from cl
+
+        It provides the first match after (or before) the AOA of CL=0. The matching point of the polar is found in the
+        monotone inverse tables built in :meth:`initialise`.
+
+        Args:
+            cl (float or np.ndarray): Lift coefficient(s)
+
+        Returns:
+            tuple: ``cd`` and ``cm`` with the shape of ``cl``. They are zero if ``cl`` is out of the range of the
+            polar, in which case the forces at that point should not be corrected.
+        """
+        cl = np.asarray(cl, dtype=float)
+        coefs = np.zeros(cl.shape + (2,))
+
+        n_points = self.table.shape[0]
+        cl_flat = cl.reshape(-1)
+        coefs_flat = coefs.reshape(-1, 2)
+
+        # positive lift: interpolate between the first point with a larger cl and the previous one
+        i_pos = np.where(cl_flat > 0.)[0]
+        i_point = self.i_aoa_cl0 + np.searchsorted(self.cl_branch_pos, cl_flat[i_pos], side='left')
+        in_range = i_point < n_points
+        i_pos, i_point = i_pos[in_range], i_point[in_range]
+        coefs_flat[i_pos] = self._interp_segments(cl_flat[i_pos], np.maximum(i_point - 1, 0), i_point)
+
+        # negative lift: interpolate between the first point with a smaller cl and the next one
+        i_neg = np.where(cl_flat < 0.)[0]
+        i_point = self.i_aoa_cl0 - np.searchsorted(-self.cl_branch_neg, -cl_flat[i_neg], side='left')
+        in_range = i_point >= 0
+        i_neg, i_point = i_neg[in_range], i_point[in_range]
+        coefs_flat[i_neg] = self._interp_segments(cl_flat[i_neg], i_point, np.minimum(i_point + 1, n_points - 1))
+
+        _, cd0, cm0 = self.get_coefs(self.aoa_cl0_deg)
+        coefs_flat[cl_flat == 0.] = [cd0, cm0]
+
+        out_of_range = (cl_flat > np.max(self.table[:, 1])) | (cl_flat < np.min(self.table[:, 1]))
+        for cl_out in cl_flat[out_of_range]:
+            print(("cl = %.2f out of range, forces at this point will not be corrected" % cl_out))
+        coefs_flat[out_of_range] = 0.
+
+        return coefs[..., 0][()], coefs[..., 1][()]
+
+    def _interp_segments(self, cl, i_start, i_end):
+        """
+        Linear interpolation of ``cd`` and ``cm`` at ``cl`` in the segments of the polar between the points
+        ``i_start`` and ``i_end``, clamped to the values at the ends of each segment as in ``np.interp``.
+        """
+        cl_start = self.table[i_start, 1]
+        cl_end = self.table[i_end, 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(cl_end > cl_start, np.clip((cl - cl_start) / (cl_end - cl_start), 0., 1.), 1.)
+        return (1. - weight)[:, None] * self.table[i_start, 2:4] + weight[:, None] * self.table[i_end, 2:4]
+
+
 def interpolate(polar1, polar2, coef=0.5):
 
     all_aoa = np.sort(np.concatenate((polar1.table[:, 0], polar2.table[:, 0]),))
@@ -85,6 +85,23 @@ def local_stability_axes(dir_urel, dir_chord):
     return algebra.triad2rotation(xs, ys, zs)
 
 
+def local_stability_axes_batch(dir_urel, dir_chord):
+    """
+    Batched version of :func:`local_stability_axes` for arrays of directions ``[..., 3]``.
+
+    Returns:
+        np.array: Rotation matrices from B to S ``[..., 3, 3]``
+    """
+    xs = np.asarray(dir_urel, dtype=float)
+
+    zb = np.array([0, 0, 1.])
+    zs = algebra.cross3_batch(algebra.cross3_batch(dir_chord, zb), xs)
+
+    ys = -algebra.cross3_batch(xs, zs)
+
+    return np.stack((xs, ys, zs), axis=-1)
+
+
 def span_chord(i_node_surf, zeta):
     """
     Retrieve the local span and local chord
@@ -121,3 +138,34 @@ def span_chord(i_node_surf, zeta):
     dir_chord = algebra.unit_vector(dir_chord)
 
     return dir_span, span, dir_chord, chord
+
+
+def span_chord_batch(i_node_surf, zeta):
+    """
+    Batched version of :func:`span_chord` for an array of node indices in the same aerodynamic surface.
+
+    Args:
+        i_node_surf (np.array): Node indices in aerodynamic surface ``(n_nodes)``
+        zeta (np.array): Aerodynamic surface coordinates ``(3 x n_chord x m_span)``
+
+    Returns:
+        tuple: ``dir_span``, ``span``, ``dir_chord``, ``chord`` with a leading dimension ``n_nodes``
+    """
+    N = zeta.shape[2] - 1 # spanwise vertices in surface (-1 for index)
+
+    # Deal with the extremes
+    node_p = np.minimum(i_node_surf + 1, N)
+    node_m = np.maximum(i_node_surf - 1, 0)
+
+    # Define the span and the span direction
+    dir_span = 0.5 * (zeta[:, 0, node_p] - zeta[:, 0, node_m]).T
+
+    span = np.linalg.norm(dir_span, axis=1)
+    dir_span = algebra.unit_vector_batch(dir_span)
+
+    # Define the chord and the chord direction
+    dir_chord = (zeta[:, -1, i_node_surf] - zeta[:, 0, i_node_surf]).T
+    chord = np.linalg.norm(dir_chord, axis=1)
+    dir_chord = algebra.unit_vector_batch(dir_chord)
+
+    return dir_span, span, dir_chord, chord
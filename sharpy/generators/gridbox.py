@@ -61,7 +61,11 @@ class GridBox(generator_interface.BaseGenerator):
         self.dy = self.in_dict['spacing'][1]
         self.dz = self.in_dict['spacing'][2]
 
-    def generate(self, params):
+    def coordinates(self, params):
+        """
+        Returns:
+            tuple: Coordinates of the grid points along the ``x``, ``y`` and ``z`` axes
+        """
         if self.settings['moving']:
             for_pos = params['for_pos']
         else:
@@ -73,15 +77,19 @@ class GridBox(generator_interface.BaseGenerator):
         xarray = np.linspace(self.x0, self.x1, nx) + for_pos[0]
         yarray = np.linspace(self.y0, self.y1, ny) + for_pos[1]
         zarray = np.linspace(self.z0, self.z1, nz) + for_pos[2]
+
+        return xarray, yarray, zarray
+
+    def generate(self, params):
+        xarray, yarray, zarray = self.coordinates(params)
+        nx, ny, nz = len(xarray), len(yarray), len(zarray)
+
         grid = []
         for iz in range(nz):
             grid.append(np.zeros((3, nx, ny), dtype=ct.c_double))
-            for ix in range(nx):
-                for iy in range(ny):
-                    grid[iz][0, ix, iy] = xarray[ix]
-                    grid[iz][1, ix, iy] = yarray[iy]
-                    grid[iz][2, ix, iy] = zarray[iz]
-
+            grid[iz][0, :, :] = xarray[:, None]
+            grid[iz][1, :, :] = yarray[None, :]
+            grid[iz][2, :, :] = zarray[iz]
 
         vtk_info = tvtk.RectilinearGrid()
         vtk_info.dimensions = np.array([nx, ny, nz], dtype=int)
@@ -2,7 +2,7 @@ import numpy as np
 import sharpy.utils.generator_interface as generator_interface
 import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
-from sharpy.aero.utils.utils import magnitude_and_direction_of_relative_velocity, local_stability_axes, span_chord
+from sharpy.aero.utils.utils import local_stability_axes_batch, span_chord_batch
 from sharpy.utils.generate_cases import get_aoacl0_from_camber
 
 
@@ -46,6 +46,10 @@ class PolarCorrection(generator_interface.BaseGenerator):
     overriding any moment computed in SHARPy. That is, the moment will include the polar pitching moment, and moments
     due to lift and drag computed from the polar data.
 
+    The correction is evaluated for all the aerodynamic nodes at once. The nodes, their master elements, airfoils
+    and positions in the aerodynamic surfaces are tabulated on initialisation, as well as the zero lift angle of
+    attack of each airfoil.
+
     """
     generator_id = 'PolarCorrection'
 
@@ -83,6 +87,13 @@ class PolarCorrection(generator_interface.BaseGenerator):
         self.rho = None
         self.vortex_radius = None
 
+        self.aero_nodes = None
+        self.master_elem = None
+        self.node_airfoil = None
+        self.node_surf = None
+        self.node_i_n = None
+        self.aoa_cl0 = None
+
     def initialise(self, in_dict, **kwargs):
         self.settings = in_dict
         settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
@@ -92,6 +103,30 @@ class PolarCorrection(generator_interface.BaseGenerator):
         self.rho = kwargs.get('rho')
         self.vortex_radius = kwargs.get('vortex_radius', 1e-6)
 
+        if self.aero is not None and self.aero.polars is not None:
+            self.generate_node_tables()
+
+    def generate_node_tables(self):
+        """
+        Tabulates the aerodynamic nodes, with their master element, airfoil, aerodynamic surface and spanwise index
+        in the surface, and the zero lift angle of attack of each airfoil from its camber line.
+        """
+        aero_dict = self.aero.aero_dict
+
+        self.aero_nodes = np.where(aero_dict['aero_node'])[0]
+        self.master_elem = self.structure.node_master_elem[self.aero_nodes, :]
+        self.node_airfoil = aero_dict['airfoil_distribution'][self.master_elem[:, 0], self.master_elem[:, 1]]
+        self.node_surf = np.array([self.aero.struct2aero_mapping[inode][0]['i_surf'] for inode in self.aero_nodes],
+                                  dtype=int)
+        self.node_i_n = np.array([self.aero.struct2aero_mapping[inode][0]['i_n'] for inode in self.aero_nodes],
+                                 dtype=int)
+
+        if not self.settings['cd_from_cl']:
+            self.aoa_cl0 = np.zeros(len(self.aero.polars))
+            for iairfoil in np.unique(self.node_airfoil):
+                airfoil_coords = aero_dict['airfoils'][str(iairfoil)]
+                self.aoa_cl0[iairfoil] = get_aoacl0_from_camber(airfoil_coords[:, 0], airfoil_coords[:, 1])
+
     def generate(self, **params):
         """
         Keyword Args:
@@ -108,108 +143,112 @@ class PolarCorrection(generator_interface.BaseGenerator):
         struct_forces = params['struct_forces']
 
         aerogrid = self.aero
-        structure = self.structure
         rho = self.rho
         correct_lift = self.settings['correct_lift']
         cd_from_cl = self.settings['cd_from_cl']
         moment_from_polar = self.settings['moment_from_polar']
 
-        aero_dict = aerogrid.aero_dict
         if aerogrid.polars is None:
             return struct_forces
-        new_struct_forces = np.zeros_like(struct_forces)
+        if self.aero_nodes is None:
+            self.generate_node_tables()
+        new_struct_forces = struct_forces.copy()
 
-        nnode = struct_forces.shape[0]
+        nodes = self.aero_nodes
+        n_aero_node = len(nodes)
 
-        # Compute induced velocities at the structural points
         cga = algebra.quat2rotation(structural_kstep.quat)
-        pos_g = np.array([cga.dot(structural_kstep.pos[inode]) + np.array([0, 0, 0]) for inode in range(nnode)])
-
-        for inode in range(nnode):
-            new_struct_forces[inode, :] = struct_forces[inode, :].copy()
-            if aero_dict['aero_node'][inode]:
-                ielem, inode_in_elem = structure.node_master_elem[inode]
-                iairfoil = aero_dict['airfoil_distribution'][ielem, inode_in_elem]
-                isurf = aerogrid.struct2aero_mapping[inode][0]['i_surf']
-                i_n = aerogrid.struct2aero_mapping[inode][0]['i_n']
-                N = aerogrid.aero_dimensions[isurf, 1]
-                polar = aerogrid.polars[iairfoil]
-                cab = algebra.crv2rotation(structural_kstep.psi[ielem, inode_in_elem, :])
-                cgb = np.dot(cga, cab)
-
-                if not cd_from_cl:
-                    airfoil_coords = aerogrid.aero_dict['airfoils'][str(aero_dict['airfoil_distribution'][ielem, inode_in_elem])]
-
-                dir_span, span, dir_chord, chord = span_chord(i_n, aero_kstep.zeta[isurf])
-
-                # Define the relative velocity and its direction
-                urel, dir_urel = magnitude_and_direction_of_relative_velocity(structural_kstep.pos[inode, :],
-                                                                              structural_kstep.pos_dot[inode, :],
-                                                                              structural_kstep.for_vel[:],
-                                                                              cga,
-                                                                              aero_kstep.u_ext[isurf][:, :, i_n])
-
-                # Coefficient to change from aerodynamic coefficients to forces (and viceversa)
-                coef = 0.5 * rho * np.linalg.norm(urel) ** 2 * chord * span
-
-                # Stability axes - projects forces in B onto S
-                c_bs = local_stability_axes(cgb.T.dot(dir_urel), cgb.T.dot(dir_chord))
-                forces_s = c_bs.T.dot(struct_forces[inode, :3])
-                moment_s = c_bs.T.dot(struct_forces[inode, 3:])
-                drag_force = forces_s[0]
-                lift_force = forces_s[2]
-
-                # Compute the associated lift
-                cl = np.sign(lift_force) * np.linalg.norm(lift_force) / coef
-                cd_sharpy = np.linalg.norm(drag_force) / coef
-
-                if cd_from_cl:
-                    # Compute the drag from the UVLM computed lift
-                    cd, cm = polar.get_cdcm_from_cl(cl)
-
-                else:
-                    # Compute L, D, M from polar depending on:
-                    # ii) Compute the effective angle of attack from potential flow theory. The local lift curve
-                    # slope is 2pi and the zero-lift angle of attack is given by thin airfoil theory. From this,
-                    # the effective angle of attack is computed for the section and includes 3D effects.
-                    aoa_0cl = get_aoacl0_from_camber(airfoil_coords[:, 0], airfoil_coords[:, 1])
-                    aoa = cl / 2 / np.pi + aoa_0cl
-                    # Compute the coefficients associated to that angle of attack
-                    cl_polar, cd, cm = polar.get_coefs(aoa)
-
-                    if correct_lift:
-                        # Use polar generated CL rather than UVLM computed CL
-                        cl = cl_polar
-
-                # Recompute the forces based on the coefficients (side force is uncorrected)
-                forces_s[0] += cd * coef  # add viscous drag to induced drag from UVLM
-                forces_s[2] = cl * coef
-
-                new_struct_forces[inode, 0:3] = c_bs.dot(forces_s)
-
-                # Pitching moment
-                # The panels are shifted by 0.25 of a panel aft from the leading edge
-                panel_shift = 0.25 * (aero_kstep.zeta[isurf][:, 1, i_n] - aero_kstep.zeta[isurf][:, 0, i_n])
-                ref_point = aero_kstep.zeta[isurf][:, 0, i_n] + 0.25 * chord * dir_chord - panel_shift
-
-                # viscous contribution (pure moment)
-                moment_s[1] += cm * coef * chord
-
-                # moment due to drag
-                arm = cgb.T.dot(ref_point - pos_g[inode])  # in B frame
-                moment_polar_drag = algebra.cross3(c_bs.T.dot(arm), cd * dir_urel * coef)  # in S frame
-                moment_s += moment_polar_drag
-
-                # moment due to lift (if corrected)
-                if correct_lift and moment_from_polar:
-                    # add moment from scratch: cm_polar + cm_drag_polar + cl_lift_polar
-                    moment_s = np.zeros(3)
-                    moment_s[1] = cm * coef * chord
-                    moment_s += moment_polar_drag
-                    moment_polar_lift = algebra.cross3(c_bs.T.dot(arm), forces_s[2] * np.array([0, 0, 1]))
-                    moment_s += moment_polar_lift
-
-                new_struct_forces[inode, 3:6] = c_bs.dot(moment_s)
+        pos = structural_kstep.pos[nodes, :]
+        pos_g = np.dot(pos, cga.T)
+        cab = algebra.crv2rotation_batch(structural_kstep.psi[self.master_elem[:, 0], self.master_elem[:, 1], :])
+        cgb = np.matmul(cga, cab)
+
+        # Geometry of the aerodynamic sections and background flow velocity
+        span = np.zeros((n_aero_node,))
+        chord = np.zeros((n_aero_node,))
+        dir_chord = np.zeros((n_aero_node, 3))
+        leading_edge = np.zeros((n_aero_node, 3))
+        panel_shift = np.zeros((n_aero_node, 3))
+        uext = np.zeros((n_aero_node, 3))
+        for isurf in np.unique(self.node_surf):
+            in_surf = self.node_surf == isurf
+            i_n = self.node_i_n[in_surf]
+            zeta = aero_kstep.zeta[isurf]
+            _, span[in_surf], dir_chord[in_surf], chord[in_surf] = span_chord_batch(i_n, zeta)
+            leading_edge[in_surf] = zeta[:, 0, i_n].T
+            # The panels are shifted by 0.25 of a panel aft from the leading edge
+            panel_shift[in_surf] = 0.25 * (zeta[:, 1, i_n] - zeta[:, 0, i_n]).T
+            uext[in_surf] = np.average(aero_kstep.u_ext[isurf][:, :, i_n], axis=1).T
+
+        # Define the relative velocity and its direction
+        for_vel = structural_kstep.for_vel
+        urel = -np.dot(structural_kstep.pos_dot[nodes, :] + for_vel[0:3] + algebra.cross3_batch(for_vel[3:6], pos),
+                       cga.T) + uext
+        dir_urel = algebra.unit_vector_batch(urel)
+
+        # Coefficient to change from aerodynamic coefficients to forces (and viceversa)
+        coef = 0.5 * rho * np.linalg.norm(urel, axis=1) ** 2 * chord * span
+
+        # Stability axes - projects forces in B onto S
+        c_bs = local_stability_axes_batch(np.einsum('nji,nj->ni', cgb, dir_urel),
+                                          np.einsum('nji,nj->ni', cgb, dir_chord))
+        forces_s = np.einsum('nji,nj->ni', c_bs, struct_forces[nodes, :3])
+        moment_s = np.einsum('nji,nj->ni', c_bs, struct_forces[nodes, 3:])
+        lift_force = forces_s[:, 2]
+
+        # Compute the associated lift
+        cl = np.sign(lift_force) * np.abs(lift_force) / coef
+        cd = np.zeros((n_aero_node,))
+        cm = np.zeros((n_aero_node,))
+
+        for iairfoil in np.unique(self.node_airfoil):
+            with_airfoil = self.node_airfoil == iairfoil
+            polar = aerogrid.polars[iairfoil]
+            if cd_from_cl:
+                # Compute the drag from the UVLM computed lift
+                cd[with_airfoil], cm[with_airfoil] = polar.get_cdcm_from_cl(cl[with_airfoil])
+
+            else:
+                # Compute L, D, M from polar depending on:
+                # ii) Compute the effective angle of attack from potential flow theory. The local lift curve
+                # slope is 2pi and the zero-lift angle of attack is given by thin airfoil theory. From this,
+                # the effective angle of attack is computed for the section and includes 3D effects.
+                aoa = cl[with_airfoil] / 2 / np.pi + self.aoa_cl0[iairfoil]
+                # Compute the coefficients associated to that angle of attack
+                cl_polar, cd[with_airfoil], cm[with_airfoil] = polar.get_coefs(aoa)
+
+                if correct_lift:
+                    # Use polar generated CL rather than UVLM computed CL
+                    cl[with_airfoil] = cl_polar
+
+        # Recompute the forces based on the coefficients (side force is uncorrected)
+        forces_s[:, 0] += cd * coef  # add viscous drag to induced drag from UVLM
+        forces_s[:, 2] = cl * coef
+
+        new_struct_forces[nodes, 0:3] = np.einsum('nij,nj->ni', c_bs, forces_s)
+
+        # Pitching moment
+        ref_point = leading_edge + 0.25 * chord[:, None] * dir_chord - panel_shift
+
+        # viscous contribution (pure moment)
+        moment_s[:, 1] += cm * coef * chord
+
+        # moment due to drag
+        arm = np.einsum('nji,nj->ni', cgb, ref_point - pos_g)  # in B frame
+        arm_s = np.einsum('nji,nj->ni', c_bs, arm)
+        moment_polar_drag = algebra.cross3_batch(arm_s, (cd * coef)[:, None] * dir_urel)  # in S frame
+        moment_s += moment_polar_drag
+
+        # moment due to lift (if corrected)
+        if correct_lift and moment_from_polar:
+            # add moment from scratch: cm_polar + cm_drag_polar + cl_lift_polar
+            moment_s = np.zeros((n_aero_node, 3))
+            moment_s[:, 1] = cm * coef * chord
+            moment_s += moment_polar_drag
+            moment_polar_lift = algebra.cross3_batch(arm_s, forces_s[:, 2:3] * np.array([0, 0, 1]))
+            moment_s += moment_polar_lift
+
+        new_struct_forces[nodes, 3:6] = np.einsum('nij,nj->ni', c_bs, moment_s)
 
         return new_struct_forces
 
@@ -241,27 +280,19 @@ class EfficiencyCorrection(generator_interface.BaseGenerator):
         self.aero = None
         self.structure = None
 
+        self.node_efficiency = None
+
     def initialise(self, in_dict, **kwargs):
         self.aero = kwargs.get('aero')
         self.structure = kwargs.get('structure')
 
-    def generate(self, **params):
+    def generate_node_efficiency(self):
         """
-        Keyword Args:
-            aero_kstep (:class:`sharpy.utils.datastructures.AeroTimeStepInfo`): Current aerodynamic substep
-            structural_kstep (:class:`sharpy.utils.datastructures.StructTimeStepInfo`): Current structural substep
-            struct_forces (np.array): Array with the aerodynamic forces mapped on the structure in the B frame of
-              reference
-
-        Returns:
-            np.array: New corrected structural forces
+        Tabulates the force and moment efficiencies of each node from those of its master element
+        ``[n_node, 2, 6]``, where the second dimension contains the multiplicative and constant terms.
         """
-        struct_forces = params['struct_forces']
-
-        n_node = self.structure.num_node
         n_elem = self.structure.num_elem
         aero_dict = self.aero.aero_dict
-        new_struct_forces = np.zeros_like(struct_forces)
 
         # load airfoil efficiency (if it exists); else set to one (to avoid multiple ifs in the loops)
         airfoil_efficiency = aero_dict['airfoil_efficiency']
@@ -276,11 +307,26 @@ class EfficiencyCorrection(generator_interface.BaseGenerator):
         moment_efficiency[:, :, 0, :] = 1.
         moment_efficiency[:, :, :, 0] = airfoil_efficiency[:, :, :, 2]
 
-        for inode in range(n_node):
-            i_elem, i_local_node = self.structure.node_master_elem[inode]
-            new_struct_forces[inode, :] = struct_forces[inode, :].copy()
-            new_struct_forces[inode, 0:3] *= force_efficiency[i_elem, i_local_node, 0, :] # element wise multiplication
-            new_struct_forces[inode, 0:3] += force_efficiency[i_elem, i_local_node, 1, :]
-            new_struct_forces[inode, 3:6] *= moment_efficiency[i_elem, i_local_node, 0, :]
-            new_struct_forces[inode, 3:6] += moment_efficiency[i_elem, i_local_node, 1, :]
-        return new_struct_forces
+        i_elem = self.structure.node_master_elem[:, 0]
+        i_local_node = self.structure.node_master_elem[:, 1]
+        self.node_efficiency = np.concatenate((force_efficiency[i_elem, i_local_node],
+                                               moment_efficiency[i_elem, i_local_node]), axis=-1)
+
+    def generate(self, **params):
+        """
+        Keyword Args:
+            aero_kstep (:class:`sharpy.utils.datastructures.AeroTimeStepInfo`): Current aerodynamic substep
+            structural_kstep (:class:`sharpy.utils.datastructures.StructTimeStepInfo`): Current structural substep
+            struct_forces (np.array): Array with the aerodynamic forces mapped on the structure in the B frame of
+              reference
+
+        Returns:
+            np.array: New corrected structural forces
+        """
+        struct_forces = params['struct_forces']
+
+        if self.node_efficiency is None:
+            self.generate_node_efficiency()
+
+        # element wise multiplication
+        return struct_forces * self.node_efficiency[:, 0, :] + self.node_efficiency[:, 1, :]
@@ -2,6 +2,7 @@ import struct
 import yaml
 import logging
 import numpy as np
+import sharpy.io.message_interface as message_interface
 
 logger = logging.getLogger(__name__)
 
@@ -191,11 +192,24 @@ class SetOfVariables:
         self.in_variables = []
 
         self._byte_ordering = '<'
+        self._out_codec = None
 
         self.file_name = None  # for input variables
 
     def set_byte_ordering(self, value):
         self._byte_ordering = value
+        self._out_codec = None
+
+    @property
+    def out_codec(self):
+        """
+        :class:`~sharpy.io.message_interface.MessageCodec` for the output variables, created on first use.
+        """
+        if self._out_codec is None:
+            self._out_codec = message_interface.MessageCodec(
+                [self.variables[var_idx].variable_index for var_idx in self.out_variables],
+                byte_ordering=self._byte_ordering)
+        return self._out_codec
 
     def load_variables_from_yaml(self, path_to_yaml):
         with open(path_to_yaml, 'r') as yaml_file:
@@ -236,22 +250,20 @@ class SetOfVariables:
 
     def encode(self):
         """
-        Encode output variables in binary format with little-endian byte ordering.
+        Encode output variables in binary format with the selected byte ordering.
 
         The signal consists of a 5-byte header ``RREF0`` followed by 8 bytes per variable.
         Of those 8 bytes allocated to each variable, the first 4 are the integer value of the variable index
         and the last 4 are the single precision float value.
 
+        The message layout is precompiled and the message is written into a preallocated buffer, see
+        :class:`~sharpy.io.message_interface.MessageCodec`.
+
         Returns:
-            bytes: Encoded message of length ``5 + num_var * 8``.
+            memoryview: Encoded message of length ``5 + num_var * 8``. The underlying buffer is reused by the next
+            call.
         """
-        msg = struct.pack('{}5s'.format(self._byte_ordering), b'RREF0')
-        for var_idx in self.out_variables:
-            variable = self.variables[var_idx]
-            logger.debug('Encoding variable {}'.format(variable.dref_name))
-            msg += struct.pack('{}if'.format(self._byte_ordering), variable.variable_index, variable.value)
-
-        return msg
+        return self.out_codec.encode([self.variables[var_idx].value for var_idx in self.out_variables])
 
     def get_value(self, data, timestep_index=-1):
         """
@@ -276,7 +288,7 @@ class SetOfVariables:
 
         for idx, value in values:
             self.variables[idx].set_variable_value(value)
-            logger.info('Set the input variable {} to {:.4f}'.format(self.variables[idx].dref_name,
+            logger.debug('Set the input variable {} to {:.4f}'.format(self.variables[idx].dref_name,
                                                                      self.variables[idx].value))
         # save to file:
         self.save_to_file(values)
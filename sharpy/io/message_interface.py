@@ -1,27 +1,108 @@
-import struct
+import functools
 import logging
+import numpy as np
 
 # logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
 #                     level=20)
 logger = logging.getLogger(__name__)
 
+header = b'RREF0'
+header_length = len(header)
+value_length = 8  # 4-byte integer index + 4-byte single precision value
+
+
+@functools.lru_cache(maxsize=None)
+def value_dtype(byte_ordering='<'):
+    """
+    NumPy structured data type of each ``(index, value)`` pair in a message. It is built once per byte ordering.
+
+    Args:
+        byte_ordering (str): ``<`` for little endian or ``>`` for big endian
+
+    Returns:
+        np.dtype: Data type with fields ``index`` (``int32``) and ``value`` (``float32``)
+    """
+    return np.dtype([('index', byte_ordering + 'i4'), ('value', byte_ordering + 'f4')])
+
 
 def decoder(msg, byte_ordering='<'):
+    """
+    Decodes a message into a list of ``(variable_index, value)`` tuples.
+
+    Args:
+        msg (bytes or bytearray or memoryview): Message, made of the ``RREF0`` header followed by 8 bytes per variable
+        byte_ordering (str): ``<`` for little endian or ``>`` for big endian
+
+    Returns:
+        list(tuple): Variable indices and values
+    """
     n_bytes = len(msg)
 
-    header = msg[:5]
-    if header != b'RREF0':
+    if bytes(msg[:header_length]) != header:
         logger.error('Error, header is not RREF0')
 
-    len_values = int(n_bytes - 5)
-    if divmod(len_values, 8)[1] != 0:  # remainder equal 0
+    len_values = int(n_bytes - header_length)
+    if divmod(len_values, value_length)[1] != 0:  # remainder equal 0
         logger.error('Error in decoding message. Length of values field not a multiple of 8')
 
-    n_values = int(len_values // 8)
-    values = []
-    for i_val in range(n_values):
-        current_signal = msg[5 + i_val * 8: 5 + i_val * 8 + 8]
-        sig_index = struct.unpack('{}if'.format(byte_ordering), current_signal)
-        values.append(sig_index)
+    n_values = int(len_values // value_length)
+    values = np.frombuffer(msg, dtype=value_dtype(byte_ordering), count=n_values, offset=header_length)
+
+    return list(zip(values['index'].tolist(), values['value'].tolist()))
+
+
+class MessageCodec:
+    """
+    Encoder and decoder of fixed layout messages.
+
+    The ``RREF0`` message layout for a given set of variables is known in advance, thus the NumPy structured data
+    type of the whole message is precompiled and messages are encoded into a preallocated buffer, avoiding the
+    packing of each variable and the concatenation of bytes.
+
+    Args:
+        variable_indices (list(int)): Index of each variable in the message, in order
+        byte_ordering (str): ``<`` for little endian or ``>`` for big endian
+    """
+    def __init__(self, variable_indices, byte_ordering='<'):
+        self.variable_indices = list(variable_indices)
+        self.n_variables = len(self.variable_indices)
+        self.byte_ordering = byte_ordering
+
+        self.dtype = np.dtype([('header', 'S5'), ('values', value_dtype(byte_ordering), (self.n_variables,))])
+        self.message_length = self.dtype.itemsize
+
+        self.buffer = bytearray(self.message_length)
+        self._message = np.frombuffer(self.buffer, dtype=self.dtype, count=1)[0]
+        self._message['header'] = header
+        self._message['values']['index'] = self.variable_indices
+
+    def encode(self, values):
+        """
+        Encodes the values into the preallocated buffer.
+
+        Args:
+            values (list(float) or np.ndarray): Value of each variable, in the order of ``variable_indices``
+
+        Returns:
+            memoryview: View of the encoded message. It is overwritten by the next call
+        """
+        self._message['values']['value'] = values
+        return memoryview(self.buffer)
+
+    def decode(self, msg):
+        """
+        Decodes a message with the layout of this codec.
+
+        Args:
+            msg (bytes or bytearray or memoryview): Message of length ``message_length``
 
-    return values
+        Returns:
+            tuple: Arrays of the variable indices and values
+        """
+        if len(msg) != self.message_length:
+            logger.error('Error in decoding message. Expected {} bytes, received {}'.format(self.message_length,
+                                                                                           len(msg)))
+        message = np.frombuffer(msg, dtype=self.dtype, count=1)[0]
+        if message['header'] != header:
+            logger.error('Error, header is not RREF0')
+        return message['values']['index'], message['values']['value']
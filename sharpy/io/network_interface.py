@@ -1,6 +1,11 @@
 import socket
 import selectors
 import logging
+import asyncio
+import queue
+import threading
+import time
+import numpy as np
 import sharpy.io.message_interface as message_interface
 import sharpy.io.inout_variables as inout_variables
 import sharpy.utils.settings as settings
@@ -67,7 +72,13 @@ class NetworkLoader:
     variable in single precision float. The byte ordering is specified by the user.
 
     A specific network log is created to detail the ins and outs of the communication protocol. The level of messages
-    that are shown can be set in the settings.
+    that are shown can be set in the settings. Per packet messages are logged at the ``debug`` level.
+
+    The network events can be processed either with a ``selectors`` loop or with an ``asyncio`` event loop (setting
+    ``event_loop``). In both cases messages are received into and sent from preallocated buffers.
+
+    For clients running on the same host, the ``shared_memory`` ``transport`` replaces the UDP sockets by a block of
+    shared memory, see :class:`~sharpy.io.network_interface.SharedMemoryNetwork`.
 
 
     See Also:
@@ -118,6 +129,22 @@ class NetworkLoader:
     settings_default['received_data_filename'] = ''
     settings_description['received_data_filename'] = 'If not empty, writes received input data to the specified file.'
 
+    settings_types['transport'] = 'str'
+    settings_default['transport'] = 'udp'
+    settings_description['transport'] = 'Data transport. ``udp`` sockets or ``shared_memory`` for clients on the ' \
+                                        'same host'
+    settings_options['transport'] = ['udp', 'shared_memory']
+
+    settings_types['event_loop'] = 'str'
+    settings_default['event_loop'] = 'selectors'
+    settings_description['event_loop'] = 'Event loop processing the UDP network events'
+    settings_options['event_loop'] = ['selectors', 'asyncio']
+
+    settings_types['shared_memory_settings'] = 'dict'
+    settings_default['shared_memory_settings'] = dict()
+    settings_description['shared_memory_settings'] = 'Settings for the shared memory transport ' \
+                                                     ':class:`~sharpy.io.network_interface.SharedMemoryNetwork`.'
+
     settings_types['log_name'] = 'str'
     settings_default['log_name'] = './network_output.log'
     settings_description['log_name'] = 'Network log file name'
@@ -193,6 +220,45 @@ class NetworkLoader:
         elif len(to_return) == 1:
             return to_return[0]  # for single network cases (usually output only)
 
+    def network_loop(self, set_of_variables, in_queue, out_queue, finish_event):
+        """
+        Exchanges data with the clients until ``finish_event`` is set. Received inputs are put in ``in_queue`` as
+        lists of ``(variable_index, value)`` tuples and the outputs taken from ``out_queue`` as
+        :class:`~sharpy.io.inout_variables.SetOfVariables` are sent.
+
+        This method runs in a separate thread from the time loop.
+
+        Args:
+            set_of_variables (sharpy.io.inout_variables.SetOfVariables): Input and output variables
+            in_queue (queue.Queue): Queue for the received inputs
+            out_queue (queue.Queue): Queue of the outputs to send
+            finish_event (threading.Event): Event signalling the end of the simulation
+        """
+        if self.settings['transport'] == 'shared_memory':
+            shm_network = SharedMemoryNetwork()
+            shm_network.initialise(self.settings['shared_memory_settings'], set_of_variables)
+            try:
+                shared_memory_loop(shm_network, in_queue, out_queue, finish_event)
+            finally:
+                shm_network.close()
+            return
+
+        out_network, in_network = self.get_networks()
+        out_network.set_queue(out_queue)
+
+        in_network.set_message_length(set_of_variables.input_msg_len)
+        in_network.set_queue(in_queue)
+
+        try:
+            if self.settings['event_loop'] == 'asyncio':
+                asyncio_loop(in_network, out_network, finish_event)
+            else:
+                selector_loop(out_network, finish_event)
+        finally:
+            # close sockets
+            in_network.close()
+            out_network.close()
+
 
 class Network:
     """
@@ -231,6 +297,8 @@ class Network:
 
         self._byte_ordering = '<'
 
+        self._scratch_buffer = bytearray(1024)
+
     def set_byte_ordering(self, value):
         self._byte_ordering = value
 
@@ -276,17 +344,22 @@ class Network:
         self.queue = queue
 
     def _sendto(self, msg, address):
-        logger.debug('Network - Sending')
         self.sock.sendto(msg, address)
-        logger.info('Network - Sent data packet to {}'.format(address))
+        logger.debug('Network - Sent data packet to {}'.format(address))
 
     def receive(self, msg_length=1024):
-        r_msg, client_addr = self.sock.recvfrom(msg_length)  # adapt message length
-        logger.info('Received a {}-byte long data packet from {}'.format(len(r_msg), client_addr))
+        """
+        Receives a packet into a preallocated buffer.
+
+        Returns:
+            memoryview: View of the received bytes. The underlying buffer is reused by the next call.
+        """
+        if len(self._scratch_buffer) < msg_length:
+            self._scratch_buffer = bytearray(msg_length)
+        n_bytes, client_addr = self.sock.recvfrom_into(self._scratch_buffer, msg_length)
+        logger.debug('Received a {}-byte long data packet from {}'.format(n_bytes, client_addr))
         self.add_client(client_addr)
-        # r_msg = struct.unpack('f', r_msg)  # need to move decoding to dedicated message processing
-        return r_msg
-        # return recv_data
+        return memoryview(self._scratch_buffer)[:n_bytes]
 
     def process_events(self, mask):  # should only have the relevant queue
         logger.debug('Should not be here')
@@ -364,22 +437,29 @@ class OutNetwork(Network):
 
         if mask and selectors.EVENT_READ and not self.queue.empty():
             if self.settings['send_on_demand']:
-                logger.info('Out Network - waiting for request for data')
-                msg = self.receive()
-                # get variable that has been demanded, this would be easy if a SetOfVariables was sent in the queue
-                # logger.info('Received request for data {}'.format(msg))
-                logger.debug('Received request for data')
+                self.receive_request()
         if mask and selectors.EVENT_WRITE and not self.queue.empty():
             logger.debug('Out Network ready to receive from the queue')
-            # value = self.queue.get()  # check that it waits for the queue not to be empty
             set_of_vars = self.queue.get()  # always gets latest time step info
-            logger.debug('Out Network - got message from queue')
-            # for out_idx in set_of_vars.out_variables:
-            #     value = set_of_vars[out_idx].value
-            value = set_of_vars.encode()
-            logger.info('Message of length {} bytes ready to send'.format(len(value)))
-            self.send(value, self.clients)
-                # self.send(value, self.clients)
+            self.send_variables(set_of_vars)
+
+    def receive_request(self):
+        """
+        Receives a request for data, adding the requesting socket to the clients.
+        """
+        self.receive()
+        logger.debug('Received request for data')
+
+    def send_variables(self, set_of_vars):
+        """
+        Encodes the output variables and sends them to all clients.
+
+        Args:
+            set_of_vars (sharpy.io.inout_variables.SetOfVariables): Variables to send
+        """
+        value = set_of_vars.encode()
+        logger.debug('Message of length {} bytes ready to send'.format(len(value)))
+        self.send(value, self.clients)
 
 
 class InNetwork(Network):
@@ -404,26 +484,365 @@ class InNetwork(Network):
     def __init__(self):
         super().__init__()
         self._in_message_length = 1024
-        self._recv_buffer = b''
+        self._recv_buffer = bytearray(self._in_message_length)
+        self._n_received = 0
 
     def set_message_length(self, value):
         self._in_message_length = value
+        self._recv_buffer = bytearray(value)
+        self._n_received = 0
         logger.debug('Set input signal message size to {} bytes'.format(self._in_message_length))
 
     def process_events(self, mask):
-        self.sock.setblocking(False)
         if mask and selectors.EVENT_READ:
-            logger.info('In Network - waiting for input data of size {} bytes'.format(self._in_message_length))
-            msg = self.receive(self._in_message_length)
-            self._recv_buffer += msg
-            # any required processing
-            # send list of tuples
-            if len(self._recv_buffer) == self._in_message_length:
-                logger.info('In Network - {}/{} bytes read'.format(len(self._recv_buffer), self._in_message_length))
-                list_of_variables = message_interface.decoder(self._recv_buffer, byte_ordering=self._byte_ordering)
-                self.queue.put(list_of_variables)
-                logger.debug('In Network - put data in the queue')
-                self._recv_buffer = b''  # clean up
+            self.receive_message()
+
+    def receive_message(self):
+        """
+        Receives the input message directly into the preallocated buffer. Once the buffer is full, the message is
+        decoded and the list of ``(variable_index, value)`` tuples put in the queue.
+        """
+        view = memoryview(self._recv_buffer)[self._n_received:]
+        n_bytes, client_addr = self.sock.recvfrom_into(view)
+        self.add_client(client_addr)
+        self._n_received += n_bytes
+        logger.debug('In Network - {}/{} bytes read'.format(self._n_received, self._in_message_length))
+
+        if self._n_received == self._in_message_length:
+            list_of_variables = message_interface.decoder(self._recv_buffer, byte_ordering=self._byte_ordering)
+            self._n_received = 0
+            self.queue.put(list_of_variables)
+            logger.debug('In Network - put data in the queue')
+
+
+class SharedMemoryNetwork:
+    """
+    Shared memory transport for clients running on the same host.
+
+    The input and output variables are exchanged through a named block of shared memory, created by SHARPy, with the
+    following layout (native byte ordering)
+
+    ==================  =========================  ==============================================
+    Field               Type                       Description
+    ==================  =========================  ==============================================
+    ``input_sequence``  ``uint64``                 Incremented by the client when writing inputs
+    ``output_sequence`` ``uint64``                 Incremented by SHARPy when writing outputs
+    ``n_inputs``        ``uint32``                 Number of input variables
+    ``n_outputs``       ``uint32``                 Number of output variables
+    ``inputs``          ``float64[n_inputs]``      Input values, in the order of the YAML file
+    ``outputs``         ``float64[n_outputs]``     Output values, in the order of the YAML file
+    ==================  =========================  ==============================================
+
+    Writers increment the sequence number before (making it odd) and after (making it even) writing the values, such
+    that readers can detect and discard partially written data. A client is provided in
+    :class:`~sharpy.io.network_interface.SharedMemoryClient`.
+
+    Note:
+        Requires Python 3.8 or above.
+    """
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+
+    settings_types['name'] = 'str'
+    settings_default['name'] = 'sharpy_network'
+    settings_description['name'] = 'Name of the shared memory block'
+
+    settings_types['poll_interval'] = 'float'
+    settings_default['poll_interval'] = 1e-5
+    settings_description['poll_interval'] = 'Sleep time between polls of the shared memory when idle, in seconds. ' \
+                                            '``0`` polls continuously'
+
+    settings_table = settings.SettingsTable()
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+
+    def __init__(self):
+        self.settings = None
+        self.shm = None
+        self.block = None
+        self.in_variables = None
+        self.out_variables = None
+        self._last_input_sequence = 0
+
+    def initialise(self, in_settings, set_of_variables):
+        self.settings = in_settings
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, no_ctype=True)
+
+        self.in_variables = [set_of_variables[idx].variable_index for idx in set_of_variables.in_variables]
+        self.out_variables = list(set_of_variables.out_variables)
+
+        dtype = shared_memory_dtype(len(self.in_variables), len(self.out_variables))
+        self.shm = open_shared_memory(self.settings['name'], create=True, size=dtype.itemsize)
+        self.block = np.ndarray((), dtype=dtype, buffer=self.shm.buf)
+        self.block['input_sequence'] = 0
+        self.block['output_sequence'] = 0
+        self.block['n_inputs'] = len(self.in_variables)
+        self.block['n_outputs'] = len(self.out_variables)
+        logger.info('Created shared memory block {} of {} bytes'.format(self.shm.name, dtype.itemsize))
+
+    def poll_input(self):
+        """
+        Returns the new input values as a list of ``(variable_index, value)`` tuples or ``None`` if there are no new
+        inputs since the last call.
+        """
+        values = read_consistent(self.block, 'input_sequence', 'inputs', self._last_input_sequence)
+        if values is None:
+            return None
+        self._last_input_sequence, values = values
+        return list(zip(self.in_variables, values.tolist()))
+
+    def write_output(self, set_of_vars):
+        write_consistent(self.block, 'output_sequence', 'outputs',
+                         [set_of_vars[idx].value for idx in self.out_variables])
+
+    def close(self):
+        self.block = None
+        self.shm.close()
+        self.shm.unlink()
+        logger.info('Closed shared memory block')
+
+
+class SharedMemoryClient:
+    """
+    Client for the :class:`~sharpy.io.network_interface.SharedMemoryNetwork` transport, to be used by external
+    programs running on the same host as SHARPy.
+
+    Args:
+        name (str): Name of the shared memory block, as given in the SHARPy settings
+
+    Examples:
+
+        >>> client = SharedMemoryClient('sharpy_network')
+        >>> client.send_inputs([0.1])  # control inputs for the next time step
+        >>> outputs = client.receive_outputs(timeout=1.)
+    """
+    def __init__(self, name='sharpy_network'):
+        header = open_shared_memory(name, create=False)
+        n_inputs = int(np.ndarray((), dtype=shared_memory_dtype(0, 0), buffer=header.buf)['n_inputs'])
+        n_outputs = int(np.ndarray((), dtype=shared_memory_dtype(0, 0), buffer=header.buf)['n_outputs'])
+        header.close()
+
+        self.shm = open_shared_memory(name, create=False)
+        self.block = np.ndarray((), dtype=shared_memory_dtype(n_inputs, n_outputs), buffer=self.shm.buf)
+        self._last_output_sequence = int(self.block['output_sequence'])
+
+    def send_inputs(self, values):
+        """
+        Writes the values of the input variables, in the order of the YAML file.
+        """
+        write_consistent(self.block, 'input_sequence', 'inputs', values)
+
+    def receive_outputs(self, timeout=None, poll_interval=1e-5):
+        """
+        Waits for new output values.
+
+        Args:
+            timeout (float): Maximum waiting time in seconds. Waits indefinitely if ``None``
+            poll_interval (float): Sleep time between polls
+
+        Returns:
+            np.ndarray: Output values, in the order of the YAML file, or ``None`` if the time out is reached
+        """
+        t_end = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            values = read_consistent(self.block, 'output_sequence', 'outputs', self._last_output_sequence)
+            if values is not None:
+                self._last_output_sequence, values = values
+                return values
+            if t_end is not None and time.perf_counter() > t_end:
+                return None
+            if poll_interval > 0:
+                time.sleep(poll_interval)
+
+    def close(self):
+        self.block = None
+        self.shm.close()
+
+
+def open_shared_memory(name, create, size=0):
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise ImportError('The shared memory transport requires Python 3.8 or above')
+    return shared_memory.SharedMemory(name=name, create=create, size=size)
+
+
+def shared_memory_dtype(n_inputs, n_outputs):
+    """
+    Data type of the shared memory block, see :class:`~sharpy.io.network_interface.SharedMemoryNetwork`.
+    """
+    return np.dtype([('input_sequence', 'u8'),
+                     ('output_sequence', 'u8'),
+                     ('n_inputs', 'u4'),
+                     ('n_outputs', 'u4'),
+                     ('inputs', 'f8', (n_inputs,)),
+                     ('outputs', 'f8', (n_outputs,))])
+
+
+def write_consistent(block, sequence_field, values_field, values):
+    block[sequence_field] += 1  # odd: writing in progress
+    block[values_field][:] = values
+    block[sequence_field] += 1
+
+
+def read_consistent(block, sequence_field, values_field, last_sequence):
+    """
+    Reads ``values_field`` if it has been written since ``last_sequence`` and was not modified while reading.
+
+    Returns:
+        tuple: Sequence number and copy of the values, or ``None`` if there is no new consistent data.
+    """
+    sequence = int(block[sequence_field])
+    if sequence == last_sequence or sequence % 2:
+        return None
+    values = block[values_field].copy()
+    if int(block[sequence_field]) != sequence:
+        return None
+    return sequence, values
+
+
+def selector_loop(out_network, finish_event, timeout=0.1):
+    """
+    Processes the network events with the ``selectors`` module until ``finish_event`` is set.
+    """
+    previous_queue_empty = True
+    while not finish_event.is_set():
+
+        # selector version
+        events = sel.select(timeout=timeout)
+        if out_network.queue.empty() and not previous_queue_empty:
+            out_network.set_selector_events_mask('r')
+            previous_queue_empty = True
+        elif not out_network.queue.empty() and previous_queue_empty:
+            out_network.set_selector_events_mask('w')
+            previous_queue_empty = False
+
+        try:
+            for key, mask in events:
+                key.data.process_events(mask)
+        except KeyboardInterrupt:
+            break
+
+
+def asyncio_loop(in_network, out_network, finish_event):
+    """
+    Processes the network events with an ``asyncio`` event loop until ``finish_event`` is set.
+
+    Incoming packets are read as soon as the sockets are readable. If ``send_on_demand`` is ``True``, each request
+    received by the output socket is answered with the latest output put in the output queue since the previous
+    answer. Else, the outputs are sent as soon as they are put in the output queue.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_asyncio_main(in_network, out_network, finish_event))
+    finally:
+        loop.close()
+
+
+async def _asyncio_main(in_network, out_network, finish_event):
+    loop = asyncio.get_event_loop()
+
+    # the blocking waits on the output queue and on the finish event wake up the event loop from daemon threads,
+    # such that neither of them is polled. ``None`` signals the end of the simulation
+    outputs = asyncio.Queue()
+    threads = [threading.Thread(target=forward_queue, args=(out_network.queue, loop, outputs), daemon=True),
+               threading.Thread(target=forward_event, args=(finish_event, loop, outputs), daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    send_on_demand = out_network.settings['send_on_demand']
+    pending = {'request': False, 'output': None}
+
+    def receive_request():
+        out_network.receive_request()
+        if pending['output'] is None:
+            pending['request'] = True
+        else:
+            out_network.send_variables(pending['output'])
+            pending['output'] = None
+
+    loop.add_reader(in_network.sock, in_network.receive_message)
+    if send_on_demand:
+        loop.add_reader(out_network.sock, receive_request)
+    try:
+        while True:
+            set_of_vars = await outputs.get()
+            if set_of_vars is None:
+                break
+            if not send_on_demand or pending['request']:
+                out_network.send_variables(set_of_vars)
+                pending['request'] = False
+            else:
+                # wait for a request, only the latest output is sent
+                pending['output'] = set_of_vars
+    finally:
+        loop.remove_reader(in_network.sock)
+        if send_on_demand:
+            loop.remove_reader(out_network.sock)
+
+        # release the helper threads: the sentinel stops the output forwarder and, should the loop end on an
+        # exception, the finish event releases the event forwarder
+        out_network.queue.put(None)
+        finish_event.set()
+        for thread in threads:
+            thread.join()
+
+
+def shared_memory_loop(shm_network, in_queue, out_queue, finish_event):
+    """
+    Polls the shared memory inputs and writes the outputs until ``finish_event`` is set.
+    """
+    poll_interval = shm_network.settings['poll_interval']
+    while not finish_event.is_set():
+        idle = True
+        values = shm_network.poll_input()
+        if values is not None:
+            in_queue.put(values)
+            idle = False
+
+        try:
+            set_of_vars = out_queue.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            shm_network.write_output(set_of_vars)
+            idle = False
+
+        if idle and poll_interval > 0:
+            time.sleep(poll_interval)
+
+
+def forward_queue(in_queue, loop, async_queue):
+    """
+    Forwards the items of ``in_queue`` to the ``asyncio.Queue`` ``async_queue`` of the event loop ``loop``, until a
+    ``None`` sentinel is received or the event loop is closed.
+    """
+    while True:
+        item = in_queue.get()
+        if item is None or not call_soon_threadsafe(loop, async_queue.put_nowait, item):
+            return
+
+
+def forward_event(event, loop, async_queue):
+    """
+    Puts ``None`` in the ``asyncio.Queue`` ``async_queue`` of the event loop ``loop`` once ``event`` is set.
+    """
+    event.wait()
+    call_soon_threadsafe(loop, async_queue.put_nowait, None)
+
+
+def call_soon_threadsafe(loop, callback, *args):
+    """
+    Schedules ``callback(*args)`` in the event loop from another thread.
+
+    Returns:
+        bool: ``False`` if the event loop is already closed
+    """
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        return False
+    return True
 
 
 def get_events(mode):
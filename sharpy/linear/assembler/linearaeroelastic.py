@@ -65,6 +65,7 @@ class LinearAeroelastic(ss_interface.BaseElement):
         self.beam = None
 
         self.load_uvlm_from_file = False
+        self.cached_entry = None  # linear cache entry, see LinearAssembler
 
         self.settings = dict()
         self.state_variables = None
@@ -137,7 +138,8 @@ class LinearAeroelastic(ss_interface.BaseElement):
                               'vel_gen': vel_gen}
 
         if self.settings['uvlm_filename'] == '':
-            self.uvlm.assemble(track_body=self.settings['track_body'], wake_prop_settings=wake_prop_settings)
+            if self.cached_entry is None:
+                self.uvlm.assemble(track_body=self.settings['track_body'], wake_prop_settings=wake_prop_settings)
         else:
             self.load_uvlm_from_file = True
 
@@ -150,7 +152,11 @@ class LinearAeroelastic(ss_interface.BaseElement):
         for k, v in self.beam.linearisation_vectors.items():
             self.linearisation_vectors[k] = v
 
-        self.get_gebm2uvlm_gains(data)
+        if self.cached_entry is None:
+            self.get_gebm2uvlm_gains(data)
+        else:
+            for name, value in self.cached_entry['gains'].items():
+                setattr(self, name, value)
 
     def assemble(self):
         r"""
@@ -195,7 +201,14 @@ class LinearAeroelastic(ss_interface.BaseElement):
         else:
             beam.assemble()
 
-        if not self.load_uvlm_from_file:
+        if self.cached_entry is not None:
+            self.load_cache_entry()
+            Ksa = self.couplings['Ksa']
+            if self.settings['beam_settings']['modal_projection'] is True and \
+                    self.settings['beam_settings']['inout_coords'] == 'modes':
+                out_mode_matrix = beam.sys.U.T
+
+        elif not self.load_uvlm_from_file:
             # Projecting the UVLM inputs and outputs onto the structural degrees of freedom
             Ksa = self.Kforces[:beam.sys.num_dof, :]  # maps aerodynamic grid forces to nodal forces
 
@@ -293,14 +306,67 @@ class LinearAeroelastic(ss_interface.BaseElement):
         self.ss = ss
         return self.ss
 
-    def update(self, u_infty):
+    gain_names = ['Kdisp', 'Kvel_disp', 'Kdisp_vel', 'Kvel_vel', 'Kforces', 'Kss', 'Krs', 'Csr', 'Crs', 'Crr']
+
+    def cache_entry(self):
+        """
+        Data needed to recover the assembled system without assembling the UVLM, computing the aeroelastic gains or
+        running the reduced order models: the UVLM state-space projected onto the structural degrees of freedom (and
+        reduced, if applicable), the gains, and the reduced systems and projection bases of each ROM.
+
+        Returns:
+            dict: Linear cache entry. See :class:`sharpy.linear.utils.cache.LinearCache`
+        """
+        uvlm = self.uvlm
+        entry = {'uvlm_ss': uvlm.ss,
+                 'C_to_vertex_forces': uvlm.C_to_vertex_forces,
+                 'couplings': {'Ksa': self.couplings['Ksa'], 'Kas': self.couplings['Kas']},
+                 'gains': {name: getattr(self, name) for name in self.gain_names},
+                 'rom': dict()}
+
+        if uvlm.gust_assembler is not None:
+            entry['ss_gust'] = uvlm.gust_assembler.ss_gust
+        if uvlm.control_surface is not None:
+            entry['gain_cs'] = uvlm.gain_cs
+
+        if uvlm.rom:
+            for rom_name, rom in uvlm.rom.items():
+                entry['rom'][rom_name] = {attr: getattr(rom, attr) for attr in ['ssrom', 'V', 'W']
+                                          if getattr(rom, attr, None) is not None}
+        return entry
+
+    def load_cache_entry(self):
+        """
+        Recovers the projected UVLM system from the linear cache entry. The UVLM is not assembled, thus the
+        full order aerodynamic system ``uvlm.sys.SS`` is not available.
+        """
+        entry = self.cached_entry
+        uvlm = self.uvlm
+        uvlm.ss = entry['uvlm_ss']
+        uvlm.C_to_vertex_forces = entry['C_to_vertex_forces']
+        self.couplings.update(entry['couplings'])
+
+        if 'ss_gust' in entry:
+            uvlm.gust_assembler.ss_gust = entry['ss_gust']
+        if 'gain_cs' in entry:
+            uvlm.gain_cs = entry['gain_cs']
+
+        for rom_name, attributes in entry['rom'].items():
+            for attr, value in attributes.items():
+                setattr(uvlm.rom[rom_name], attr, value)
+
+    def update(self, u_infty, rho=None):
         """
         Updates the aeroelastic scaled system with the new reference velocity.
 
         Only the beam equations need updating since the only dependency in the forward flight velocity resides there.
 
+        If a new air density is given, the aerodynamic forces transferred to the structure are scaled by the ratio
+        of the new density to the density at which the UVLM was assembled.
+
         Args:
               u_infty (float): New reference velocity
+              rho (float (optional)): New air density
 
         Returns:
             sharpy.linear.src.libss.ss: Updated aeroelastic state-space system
@@ -312,8 +378,12 @@ class LinearAeroelastic(ss_interface.BaseElement):
         self.beam.sys.assemble()
         self.beam.ss = self.beam.sys.SSdisc
 
+        Tsa = self.couplings['Tsa']
+        if rho is not None and rho != self.uvlm.settings['density']:
+            Tsa = Tsa * (rho / self.uvlm.settings['density'])
+
         self.ss = libss.couple(ss01=self.uvlm.ss, ss02=self.beam.ss,
-                               K12=self.couplings['Tas'], K21=self.couplings['Tsa'])
+                               K12=self.couplings['Tas'], K21=Tsa)
 
         return self.ss
 
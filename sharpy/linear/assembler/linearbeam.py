@@ -422,11 +422,11 @@ class LinearBeam(BaseElement):
         K_grav = np.zeros_like(C_grav)
         try:
             Crr = self.sys.Crr_grav
-            Csr = self.sys.Csr_grav
+            Csr = self.sys.Csr_grav.toarray()  # nodal terms are stored as sparse matrices
             C_grav[:-rig_dof, -rig_dof:] = Csr # TODO: sort out changing q vector with euler
             C_grav[-rig_dof:, -rig_dof:] = Crr
-            K_grav[-rig_dof:, :-rig_dof] = self.sys.Krs_grav
-            K_grav[:-rig_dof, :-rig_dof] = self.sys.Kss_grav
+            K_grav[-rig_dof:, :-rig_dof] = self.sys.Krs_grav.toarray()
+            K_grav[:-rig_dof, :-rig_dof] = self.sys.Kss_grav.toarray()
             fgrav = -C_grav.dot(dqdt) - K_grav.dot(q)
             for i in range(gravity_forces.shape[0]-1):
                 #add bc at node - doing it manually here
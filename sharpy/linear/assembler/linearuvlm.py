@@ -132,6 +132,11 @@ class LinearUVLM(ss_interface.BaseElement):
     settings_default['cfl1'] = True
     settings_description['cfl1'] = 'If it is ``True``, it assumes that the discretisation complies with CFL=1'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes used to assemble the derivative blocks of ' \
+                                            'each pair of lifting surfaces. If ``0``, the number of CPUs is used'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
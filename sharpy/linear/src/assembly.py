@@ -19,12 +19,13 @@ import numpy as np
 import scipy.sparse as sparse
 import itertools
 
-from sharpy.aero.utils.uvlmlib import dvinddzeta_cpp, eval_panel_cpp
+from sharpy.aero.utils.uvlmlib import dvinddzeta_cpp
 import sharpy.linear.src.libsparse as libsp
 import sharpy.linear.src.lib_dbiot as dbiot
 import sharpy.linear.src.lib_ucdncdzeta as lib_ucdncdzeta
 import sharpy.utils.algebra as algebra
 import sharpy.utils.cout_utils as cout
+import sharpy.utils.parallel as parallel
 
 # local indiced panel/vertices as per self.maps
 dmver = [0, 1, 1, 0]  # delta to go from (m,n) panel to (m,n) vertices
@@ -34,6 +35,91 @@ avec = [0, 1, 2, 3]  # 1st vertex no.
 bvec = [1, 2, 3, 0]  # 2nd vertex no.
 
 
+def panel_vertex_indices(M, N):
+    """
+    Indices of the vertices of all the panels of a surface with ``M x N`` panels.
+
+    Returns:
+        np.ndarray: Index of the vertex ``vv`` (local no.) of the panel ``(m,n)`` in the array of vertices of the
+        surface flattened in C order, at row ``m * N + n`` and column ``vv``
+    """
+    mm, nn = np.unravel_index(np.arange(M * N), (M, N))
+    return (mm[:, None] + np.array(dmver)) * (N + 1) + nn[:, None] + np.array(dnver)
+
+
+def panel_vertices(zeta):
+    """
+    Coordinates of the vertices of all the panels of a surface.
+
+    Args:
+        zeta (np.ndarray): Vertices coordinates ``[3, M+1, N+1]``
+
+    Returns:
+        np.ndarray: Coordinates of the vertices of each panel ``[M, N, 4, 3]``, in the same format of
+        ``get_panel_vertices_coords``
+    """
+    M, N = zeta.shape[1] - 1, zeta.shape[2] - 1
+    return np.stack([zeta[:, dm:dm + M, dn:dn + N] for dm, dn in zip(dmver, dnver)], axis=-1).transpose(1, 2, 3, 0)
+
+
+def scatter_blocks(rows, cols, blocks, shape_vert):
+    """
+    Sums ``3 x 3`` blocks into a dense matrix whose rows and columns are vertex vectors (ordered by coordinate first,
+    as per ``maps.shape_vert_vect``). Blocks with the same position are added.
+
+    Args:
+        rows (np.ndarray): Vertex index of the rows of each block ``[P]``
+        cols (np.ndarray): Vertex index of the columns of each block ``[P]``
+        blocks (np.ndarray): Blocks ``[P, 3, 3]``
+        shape_vert (tuple): Number of vertices in the rows and columns ``(Kzeta_rows, Kzeta_cols)``
+
+    Returns:
+        np.ndarray: Matrix ``[3*Kzeta_rows, 3*Kzeta_cols]``
+    """
+    Kzeta_rows, Kzeta_cols = shape_vert
+    shape_blocks = (len(rows), 3, 3)
+    ii = np.broadcast_to(np.arange(3)[None, :, None] * Kzeta_rows + rows[:, None, None], shape_blocks)
+    jj = np.broadcast_to(np.arange(3)[None, None, :] * Kzeta_cols + cols[:, None, None], shape_blocks)
+    return sparse.coo_matrix((blocks.reshape(-1), (ii.reshape(-1), jj.reshape(-1))),
+                             shape=(3 * Kzeta_rows, 3 * Kzeta_cols)).toarray()
+
+
+def vector_rows(ind_vert, Kzeta):
+    """
+    Rows of the vertex vector (ordered by coordinate first) associated to the vertices ``ind_vert``.
+
+    Returns:
+        np.ndarray: ``[len(ind_vert), 3]``
+    """
+    return np.arange(3)[None, :] * Kzeta + np.asarray(ind_vert)[:, None]
+
+
+def map_surface_pairs(function, sizes, num_processes=1):
+    """
+    Evaluates the derivatives blocks ``function(ss_out, ss_in)`` of all the pairs of output and input surfaces.
+
+    Blocks are independent and, if ``num_processes`` is not ``1``, they are evaluated in worker processes (see
+    :func:`sharpy.utils.parallel.fork_map`), starting from the largest.
+
+    Args:
+        function (callable): Block of the pair ``(ss_out, ss_in)``
+        sizes (list(int)): Number of panels of each surface, used to estimate the cost of each block
+        num_processes (int): Number of worker processes. If ``None`` or ``< 1``, the number of CPUs is used
+
+    Returns:
+        list(list): Blocks, such that the element ``[ss_out][ss_in]`` is that of the pair ``(ss_out, ss_in)``
+    """
+    n_surf = len(sizes)
+    pairs = sorted(itertools.product(range(n_surf), range(n_surf)),
+                   key=lambda pair: sizes[pair[0]] * sizes[pair[1]], reverse=True)
+    results = parallel.fork_map(function, pairs, num_processes=num_processes)
+
+    blocks = [[None] * n_surf for _ in range(n_surf)]
+    for (ss_out, ss_in), block in zip(pairs, results):
+        blocks[ss_out][ss_in] = block
+    return blocks
+
+
 def AICs(Surfs, Surfs_star, target='collocation', Project=True):
     """
     Given a list of bound (Surfs) and wake (Surfs_star) instances of
@@ -115,11 +201,8 @@ def nc_dqcdzeta_Sin_to_Sout(Surf_in, Surf_out, Der_coll, Der_vert, Surf_in_bound
         N_in = Surf_in.maps.N
         M_bound_in = Kzeta_bound_in // (N_in + 1) - 1
 
-    # create mapping panels to vertices to loop
-    Surf_out.maps.map_panels_to_vertices_1D_scalar()
-    # Surf_in.maps.map_panels_to_vertices_1D_scalar()
-
     ##### loop collocation points
+    dvindnorm_coll = np.empty((K_out, 3))
     for cc_out in range(K_out):
 
         # get (m,n) indices of collocation point
@@ -146,19 +229,18 @@ def nc_dqcdzeta_Sin_to_Sout(Surf_in, Surf_out, Der_coll, Der_vert, Surf_in_bound
 
         ### Surf_out collocation point contribution
         # project
-        dvindnorm_coll = np.dot(nc_here, dvind_coll)
+        dvindnorm_coll[cc_out, :] = np.dot(nc_here, dvind_coll)
 
-        # loop panel vertices
-        for vv, dm, dn in zip(range(4), dmver, dnver):
-            mm_v, nn_v = mm_out + dm, nn_out + dn
-            ii_v = [np.ravel_multi_index(
-                (cc, mm_v, nn_v), shape_zeta_out) for cc in range(3)]
-            Der_coll[cc_out, ii_v] += wcv_out[vv] * dvindnorm_coll
+    # allocate to panel vertices of all collocation points at once
+    ind_vert = panel_vertex_indices(Surf_out.maps.M, Surf_out.maps.N)
+    rows = np.arange(K_out)[:, None]
+    for vv in range(4):
+        Der_coll[rows, vector_rows(ind_vert[:, vv], Kzeta_out)] += wcv_out[vv] * dvindnorm_coll
 
     return Der_coll, Der_vert
 
 
-def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
+def nc_dqcdzeta(Surfs, Surfs_star, Merge=False, num_processes=1):
     r"""
     Produces a list of derivative matrix
 
@@ -179,6 +261,9 @@ def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
     If ``Merge`` is ``True``, the derivatives due to collocation points movement are added
     to ``Dvert`` to minimise storage space.
 
+    The derivatives of each pair of output and input surfaces are independent and are
+    evaluated in ``num_processes`` worker processes (see :func:`map_surface_pairs`).
+
     To do:
 
         - Dcoll is highly sparse, exploit?
@@ -188,12 +273,7 @@ def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
     assert len(Surfs_star) == n_surf, \
         'Number of bound and wake surfaces much be equal'
 
-    DAICcoll = []
-    DAICvert = []
-
-    ### loop output (bound) surfaces
-    for ss_out in range(n_surf):
-
+    def pair_derivatives(ss_out, ss_in):
         # define output bound surface size
         Surf_out = Surfs[ss_out]
         K_out = Surf_out.maps.K
@@ -204,24 +284,23 @@ def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
         Dcoll = np.zeros((K_out, 3 * Kzeta_out))
         # derivatives w.r.t. panel coordinates will affect dof on bound Surf_in
         # (not wakes)
-        DAICvert_sub = []
+        Dvert = np.zeros((K_out, 3 * Surfs[ss_in].maps.Kzeta))
 
-        # loop input surfaces:
-        for ss_in in range(n_surf):
-            ##### bound
-            Surf_in = Surfs[ss_in]
-            Kzeta_in = Surf_in.maps.Kzeta
+        ##### bound
+        Dcoll, Dvert = nc_dqcdzeta_Sin_to_Sout(
+            Surfs[ss_in], Surf_out, Dcoll, Dvert, Surf_in_bound=True)
+        ##### wake:
+        Dcoll, Dvert = nc_dqcdzeta_Sin_to_Sout(
+            Surfs_star[ss_in], Surf_out, Dcoll, Dvert, Surf_in_bound=False)
+        return Dcoll, Dvert
 
-            # compute terms
-            Dvert = np.zeros((K_out, 3 * Kzeta_in))
-            Dcoll, Dvert = nc_dqcdzeta_Sin_to_Sout(
-                Surf_in, Surf_out, Dcoll, Dvert, Surf_in_bound=True)
+    Blocks = map_surface_pairs(pair_derivatives, [Surf.maps.K for Surf in Surfs], num_processes)
 
-            ##### wake:
-            Surf_in = Surfs_star[ss_in]
-            Dcoll, Dvert = nc_dqcdzeta_Sin_to_Sout(
-                Surf_in, Surf_out, Dcoll, Dvert, Surf_in_bound=False)
-            DAICvert_sub.append(Dvert)
+    DAICcoll = []
+    DAICvert = []
+    for ss_out in range(n_surf):
+        Dcoll = sum(Blocks[ss_out][ss_in][0] for ss_in in range(n_surf))
+        DAICvert_sub = [Blocks[ss_out][ss_in][1] for ss_in in range(n_surf)]
 
         if Merge:
             DAICvert_sub[ss_out] += Dcoll
@@ -495,35 +574,14 @@ def dfqsdzeta_vrel0(Surfs, Surfs_star):
         M, N = Surf.maps.M, Surf.maps.N
         K = Surf.maps.K
         Kzeta = Surf.maps.Kzeta
-        shape_fqs = Surf.maps.shape_vert_vect  # (3,M+1,N+1)
+        ind_vert = panel_vertex_indices(M, N)
 
         ##### unit gamma contribution of BOUND panels
-        Der = np.zeros((3 * Kzeta, 3 * Kzeta))
-
-        # loop panels (input, i.e. matrix columns)
-        for pp_in in range(K):
-            # get (m,n) indices of panel
-            mm_in = Surf.maps.ind_2d_pan_scal[0][pp_in]
-            nn_in = Surf.maps.ind_2d_pan_scal[1][pp_in]
-
-            for ll, aa, bb in zip(svec, avec, bvec):
-                vrel_seg = (Surf.u_input_seg[:, ll, mm_in, nn_in] +
-                            Surf.u_ind_seg[:, ll, mm_in, nn_in])
-                Df = algebra.skew((0.5 * Surf.rho * Surf.gamma[mm_in, nn_in]) * vrel_seg)
-
-                # get vertices m,n indices
-                mm_a, nn_a = mm_in + dmver[aa], nn_in + dnver[aa]
-                mm_b, nn_b = mm_in + dmver[bb], nn_in + dnver[bb]
-
-                # get vertices 1d index
-                ii_a = [np.ravel_multi_index(
-                    (cc, mm_a, nn_a), shape_fqs) for cc in range(3)]
-                ii_b = [np.ravel_multi_index(
-                    (cc, mm_b, nn_b), shape_fqs) for cc in range(3)]
-                Der[np.ix_(ii_a, ii_a)] += -Df
-                Der[np.ix_(ii_b, ii_a)] += -Df
-                Der[np.ix_(ii_a, ii_b)] += Df
-                Der[np.ix_(ii_b, ii_b)] += Df
+        # relative velocity at the segments of all panels [K, 4, 3]
+        vrel_seg = (Surf.u_input_seg + Surf.u_ind_seg).transpose(2, 3, 1, 0).reshape((K, 4, 3))
+        Df = dbiot.skew_batch((0.5 * Surf.rho * Surf.gamma.reshape((K, 1, 1))) * vrel_seg)
+        ii_a = ind_vert[:, avec]
+        ii_b = ind_vert[:, bvec]
 
         ##### contribution of WAKE TE segments.
         # This is added to Der, as only the bound vertices are included in the
@@ -532,25 +590,21 @@ def dfqsdzeta_vrel0(Surfs, Surfs_star):
         # loop TE bound segment but:
         # - using wake gamma
         # - using orientation of wake panel
-        for nn_in in range(N):
-            # get velocity at seg.3 of wake TE
-            vrel_seg = (Surf.u_input_seg[:, 1, M - 1, nn_in] + Surf.u_ind_seg[:, 1, M - 1, nn_in])
-            Df = Df = algebra.skew(
-                (0.5 * Surfs_star[ss].rho * Surfs_star[ss].gamma[0, nn_in]) * vrel_seg)
-
-            # get TE bound vertices m,n indices
-            nn_a = nn_in + dnver[2]
-            nn_b = nn_in + dnver[1]
-            # get vertices 1d index on bound
-            ii_a = [np.ravel_multi_index(
-                (cc, M, nn_a), shape_fqs) for cc in range(3)]
-            ii_b = [np.ravel_multi_index(
-                (cc, M, nn_b), shape_fqs) for cc in range(3)]
-
-            Der[np.ix_(ii_a, ii_a)] += -Df
-            Der[np.ix_(ii_b, ii_a)] += -Df
-            Der[np.ix_(ii_a, ii_b)] += Df
-            Der[np.ix_(ii_b, ii_b)] += Df
+        # get velocity at seg.3 of wake TE
+        vrel_seg = (Surf.u_input_seg[:, 1, M - 1, :] + Surf.u_ind_seg[:, 1, M - 1, :]).T
+        Df_te = dbiot.skew_batch((0.5 * Surfs_star[ss].rho * Surfs_star[ss].gamma[0, :, None]) * vrel_seg)
+        # get TE bound vertices 1d index
+        ii_a_te = M * (N + 1) + np.arange(N) + dnver[2]
+        ii_b_te = M * (N + 1) + np.arange(N) + dnver[1]
+
+        Df = np.concatenate((Df.reshape((-1, 3, 3)), Df_te))
+        ii_a = np.concatenate((ii_a.reshape(-1), ii_a_te))
+        ii_b = np.concatenate((ii_b.reshape(-1), ii_b_te))
+
+        Der = scatter_blocks(np.concatenate((ii_a, ii_b, ii_a, ii_b)),
+                             np.concatenate((ii_a, ii_a, ii_b, ii_b)),
+                             np.concatenate((-Df, -Df, Df, Df)),
+                             (Kzeta, Kzeta))
         Der_list.append(Der)
 
     return Der_list
@@ -724,10 +778,14 @@ def dfqsdzeta_omega(Surfs, Surfs_star):
     return Der_list
 
 
-def dfqsdvind_gamma(Surfs, Surfs_star):
+def dfqsdvind_gamma(Surfs, Surfs_star, num_processes=1):
     """
     Assemble derivative of quasi-steady force w.r.t. induced velocities changes
     due to gamma.
+
+    The derivatives of each pair of output and input surfaces are independent and are
+    evaluated in ``num_processes`` worker processes (see :func:`map_surface_pairs`).
+
     Note: the routine is memory consuming but avoids unnecessary computations.
     """
 
@@ -735,110 +793,53 @@ def dfqsdvind_gamma(Surfs, Surfs_star):
     assert len(Surfs_star) == n_surf, \
         'Number of bound and wake surfaces much be equal'
 
-    ### compute all influence coeff matrices (high RAM, low CPU)
-    # AIC_list,AIC_star_list=AICs(Surfs,Surfs_star,target='segments',Project=False)
-
-    Der_list = []
-    Der_star_list = []
-    for ss_out in range(n_surf):
-
+    def pair_derivatives(ss_out, ss_in):
         Surf_out = Surfs[ss_out]
         M_out, N_out = Surf_out.maps.M, Surf_out.maps.N
         K_out = Surf_out.maps.K
         Kzeta_out = Surf_out.maps.Kzeta
-        shape_fqs = Surf_out.maps.shape_vert_vect  # (3,M+1,N+1)
+        ind_vert = panel_vertex_indices(M_out, N_out)
 
-        # get AICs over Surf_out
-        AICs = []
-        AICs_star = []
-        for ss_in in range(n_surf):
-            AICs.append(Surfs[ss_in].get_aic_over_surface(
-                Surf_out, target='segments', Project=False))
-            AICs_star.append(Surfs_star[ss_in].get_aic_over_surface(
-                Surf_out, target='segments', Project=False))
-
-        # allocate all derivative matrices
-        Der_list_sub = []
-        Der_star_list_sub = []
-        for ss_in in range(n_surf):
-            # bound
-            K_in = Surfs[ss_in].maps.K
-            Der_list_sub.append(np.zeros((3 * Kzeta_out, K_in)))
-            # wake
-            K_in = Surfs_star[ss_in].maps.K
-            Der_star_list_sub.append(np.zeros((3 * Kzeta_out, K_in)))
-
-        ### loop bound panels
-        for pp_out in range(K_out):
-            # get (m,n) indices of panel
-            mm_out = Surf_out.maps.ind_2d_pan_scal[0][pp_out]
-            nn_out = Surf_out.maps.ind_2d_pan_scal[1][pp_out]
-            # get panel vertices
-            # zetav_here=Surf_out.get_panel_vertices_coords(mm_out,nn_out)
-            zetav_here = Surf_out.zeta[:, [mm_out + 0, mm_out + 1, mm_out + 1, mm_out + 0],
-                         [nn_out + 0, nn_out + 0, nn_out + 1, nn_out + 1]].T
+        # segments of all bound panels
+        zetav = panel_vertices(Surf_out.zeta).reshape((K_out, 4, 3))
+        lv = zetav[:, bvec, :] - zetav[:, avec, :]
+        Lskew = dbiot.skew_batch((-0.5 * Surf_out.rho * Surf_out.gamma.reshape((K_out, 1, 1))) * lv)
 
-            for ll, aa, bb in zip(svec, avec, bvec):
-
-                # get segment
-                lv = zetav_here[bb, :] - zetav_here[aa, :]
-                Lskew = algebra.skew((-0.5 * Surf_out.rho * Surf_out.gamma[mm_out, nn_out]) * lv)
-
-                # get vertices m,n indices
-                mm_a, nn_a = mm_out + dmver[aa], nn_out + dnver[aa]
-                mm_b, nn_b = mm_out + dmver[bb], nn_out + dnver[bb]
-
-                # get vertices 1d index
-                ii_a = [np.ravel_multi_index(
-                    (cc, mm_a, nn_a), shape_fqs) for cc in range(3)]
-                ii_b = [np.ravel_multi_index(
-                    (cc, mm_b, nn_b), shape_fqs) for cc in range(3)]
-
-                # update all derivatives
-                for ss_in in range(n_surf):
-                    # derivatives: size (3,K_in)
-                    Dfs = np.dot(Lskew, AICs[ss_in][:, :, ll, mm_out, nn_out])
-                    Dfs_star = np.dot(Lskew, AICs_star[ss_in][:, :, ll, mm_out, nn_out])
-                    # allocate
-                    Der_list_sub[ss_in][ii_a, :] += Dfs
-                    Der_list_sub[ss_in][ii_b, :] += Dfs
-                    Der_star_list_sub[ss_in][ii_a, :] += Dfs_star
-                    Der_star_list_sub[ss_in][ii_b, :] += Dfs_star
-
-        ### loop again trailing edge
+        # trailing edge
         # here we add the Gammaw_0*rho*skew(lv)*dvind/dgamma contribution hence:
         # - we use Gammaw_0 over the TE
         # - we run along the positive direction as defined in the first row of
         # wake panels
-        for nn_out in range(N_out):
+        nn_a = np.arange(N_out) + dnver[2]
+        nn_b = np.arange(N_out) + dnver[1]
+        lv_te = (Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]).T
+        Lskew_te = dbiot.skew_batch((-0.5 * Surf_out.rho * Surfs_star[ss_out].gamma[0, :, None]) * lv_te)
+
+        Der_pair = []
+        for Surf_in in [Surfs[ss_in], Surfs_star[ss_in]]:
+            # AICs over Surf_out segments [3, K_in, 4, M_out, N_out]
+            AIC = Surf_in.get_aic_over_surface(Surf_out, target='segments', Project=False)
+            K_in = AIC.shape[1]
+            Der = np.zeros((3 * Kzeta_out, K_in))
 
-            # get TE bound vertices m,n indices
-            nn_a = nn_out + dnver[2]
-            nn_b = nn_out + dnver[1]
+            for ll, aa, bb in zip(svec, avec, bvec):
+                # derivatives of all panels: size (K_out, 3, K_in)
+                Dfs = np.matmul(Lskew[:, ll], AIC[:, :, ll, :, :].reshape((3, K_in, K_out)).transpose(2, 0, 1))
+                # vertices are unique amongst panels for a given segment
+                Der[vector_rows(ind_vert[:, aa], Kzeta_out), :] += Dfs
+                Der[vector_rows(ind_vert[:, bb], Kzeta_out), :] += Dfs
 
-            # get segment
-            lv = Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]
-            Lskew = algebra.skew((-0.5 * Surf_out.rho * Surfs_star[ss_out].gamma[0, nn_out]) * lv)
+            Dfs = np.matmul(Lskew_te, AIC[:, :, 1, M_out - 1, :].transpose(2, 0, 1))
+            Der[vector_rows(M_out * (N_out + 1) + nn_a, Kzeta_out), :] += Dfs
+            Der[vector_rows(M_out * (N_out + 1) + nn_b, Kzeta_out), :] += Dfs
+            Der_pair.append(Der)
 
-            # get vertices 1d index on bound
-            ii_a = [np.ravel_multi_index(
-                (cc, M_out, nn_a), shape_fqs) for cc in range(3)]
-            ii_b = [np.ravel_multi_index(
-                (cc, M_out, nn_b), shape_fqs) for cc in range(3)]
-
-            # update all derivatives
-            for ss_in in range(n_surf):
-                # derivatives: size (3,K_in)
-                Dfs = np.dot(Lskew, AICs[ss_in][:, :, 1, M_out - 1, nn_out])
-                Dfs_star = np.dot(Lskew, AICs_star[ss_in][:, :, 1, M_out - 1, nn_out])
-                # allocate
-                Der_list_sub[ss_in][ii_a, :] += Dfs
-                Der_list_sub[ss_in][ii_b, :] += Dfs
-                Der_star_list_sub[ss_in][ii_a, :] += Dfs_star
-                Der_star_list_sub[ss_in][ii_b, :] += Dfs_star
-
-        Der_list.append(Der_list_sub)
-        Der_star_list.append(Der_star_list_sub)
+        return Der_pair
+
+    Blocks = map_surface_pairs(pair_derivatives, [Surf.maps.K for Surf in Surfs], num_processes)
+
+    Der_list = [[Blocks[ss_out][ss_in][0] for ss_in in range(n_surf)] for ss_out in range(n_surf)]
+    Der_star_list = [[Blocks[ss_out][ss_in][1] for ss_in in range(n_surf)] for ss_out in range(n_surf)]
 
     return Der_list, Der_star_list
 
@@ -857,6 +858,9 @@ def dvinddzeta(zetac, Surf_in, IsBound, M_in_bound=None):
     chordwise paneling Min_bound of the associated input is required so as to
     calculate Kzeta and correctly allocate the derivative matrix.
 
+    The derivatives of all the panels are evaluated at once with the batched
+    kernels of :mod:`lib_dbiot`.
+
     The output derivatives are:
     - Dercoll: 3 x 3 matrix
     - Dervert: 3 x 3*Kzeta (if Surf_in is a wake, Kzeta is that of the bound)
@@ -867,10 +871,8 @@ def dvinddzeta(zetac, Surf_in, IsBound, M_in_bound=None):
 
     M_in, N_in = Surf_in.maps.M, Surf_in.maps.N
     Kzeta_in = Surf_in.maps.Kzeta
-    shape_zeta_in = (3, M_in + 1, N_in + 1)
 
-    # allocate matrices
-    Dercoll = np.zeros((3, 3))
+    zeta_panels_in = panel_vertices(Surf_in.zeta)  # [M_in, N_in, 4, 3]
 
     if IsBound:
         """ Bound: scan everthing, and include every derivative. The TE is not
@@ -878,24 +880,17 @@ def dvinddzeta(zetac, Surf_in, IsBound, M_in_bound=None):
 
         Dervert = np.zeros((3, 3 * Kzeta_in))
 
-        for pp_in in itertools.product(range(0, M_in), range(0, N_in)):
-            mm_in, nn_in = pp_in
-            # zeta_panel_in=Surf_in.get_panel_vertices_coords(mm_in,nn_in)
-            zeta_panel_in = Surf_in.zeta[:, [mm_in + 0, mm_in + 1, mm_in + 1, mm_in + 0],
-                            [nn_in + 0, nn_in + 0, nn_in + 1, nn_in + 1]].T
-            # get local derivatives
-            der_zetac, der_zeta_panel = eval_panel_cpp(
-                zetac, zeta_panel_in, Surf_in.vortex_radius, gamma_pan=Surf_in.gamma[mm_in, nn_in])
-            ### Mid-segment point contribution
-            Dercoll += der_zetac
-            ### Panel vertices contribution
-            for vv_in in range(4):
-                # get vertices m,n indices
-                mm_v, nn_v = mm_in + dmver[vv_in], nn_in + dnver[vv_in]
-                # get vertices 1d index
-                jj_v = [np.ravel_multi_index(
-                    (cc, mm_v, nn_v), shape_zeta_in) for cc in range(3)]
-                Dervert[:, jj_v] += der_zeta_panel[vv_in, :, :]
+        # get local derivatives of all panels
+        der_zetac, der_zeta_panel = dbiot.eval_panel_fast_batch(
+            zetac, zeta_panels_in, Surf_in.vortex_radius, gamma_pan=Surf_in.gamma)
+        ### Mid-segment point contribution
+        Dercoll = np.sum(der_zetac, axis=(0, 1))
+        ### Panel vertices contribution
+        # vertices are unique amongst panels for a given vertex local no.
+        ind_vert = panel_vertex_indices(M_in, N_in)
+        der_zeta_panel = der_zeta_panel.reshape((M_in * N_in, 4, 3, 3))
+        for vv_in in range(4):
+            Dervert[:, vector_rows(ind_vert[:, vv_in], Kzeta_in)] += der_zeta_panel[:, vv_in].transpose(1, 0, 2)
 
     else:
         """
@@ -908,22 +903,9 @@ def dvinddzeta(zetac, Surf_in, IsBound, M_in_bound=None):
         Kzeta_in_bound = (M_in_bound + 1) * (N_in + 1)
         Dervert = np.zeros((3, 3 * Kzeta_in_bound))
 
-        ### loop all panels (coll. contrib)
-        for pp_in in itertools.product(range(0, M_in), range(0, N_in)):
-            mm_in, nn_in = pp_in
-            # zeta_panel_in=Surf_in.get_panel_vertices_coords(mm_in,nn_in)
-            zeta_panel_in = Surf_in.zeta[:, [mm_in + 0, mm_in + 1, mm_in + 1, mm_in + 0],
-                            [nn_in + 0, nn_in + 0, nn_in + 1, nn_in + 1]].T
-            # get local derivatives
-            der_zetac = dbiot.eval_panel_cpp_coll(
-                zetac, zeta_panel_in, Surf_in.vortex_radius, gamma_pan=Surf_in.gamma[mm_in, nn_in])
-            # der_zetac_fast=dbiot.eval_panel_fast_coll(
-            # 		zetac,zeta_panel_in,gamma_pan=Surf_in.gamma[mm_in,nn_in])
-            # if np.max(np.abs(der_zetac-der_zetac_fast))>1e-10:
-            # 	embed()
-
-            ### Mid-segment point contribution
-            Dercoll += der_zetac
+        ### all panels (coll. contrib)
+        Dercoll = np.sum(dbiot.eval_panel_fast_coll_batch(
+            zetac, zeta_panels_in, Surf_in.vortex_radius, gamma_pan=Surf_in.gamma), axis=(0, 1))
 
         ### Re-scan the TE to include vertex contrib.
         # vertex 0 of wake is vertex 1 of bound (local no.)
@@ -931,178 +913,90 @@ def dvinddzeta(zetac, Surf_in, IsBound, M_in_bound=None):
         vvec = [0, 3]  # vertices to include
         dn = [0, 1]  # delta to go from (m,n) panel to (m,n) vertices (on bound)
 
-        shape_zeta_in_bound = (3, M_in_bound + 1, N_in + 1)
-        for nn_in in range(N_in):
-            # zeta_panel_in=Surf_in.get_panel_vertices_coords(0,nn_in)
-            zeta_panel_in = Surf_in.zeta[:, [0, 1, 1, 0],
-                            [nn_in + 0, nn_in + 0, nn_in + 1, nn_in + 1]].T
-            # get local derivatives
-            _, der_zeta_panel = eval_panel_cpp(
-                zetac, zeta_panel_in, Surf_in.vortex_radius, gamma_pan=Surf_in.gamma[0, nn_in])
-
-            for vv in range(2):
-                nn_v = nn_in + dn[vv]
-                jj_v = []
-                for cc in range(3):
-                    jj_v.append(np.ravel_multi_index(
-                        (cc, M_in_bound, nn_v), shape_zeta_in_bound))
-                Dervert[:, jj_v] += der_zeta_panel[vvec[vv], :, :]
+        _, der_zeta_panel = dbiot.eval_panel_fast_batch(
+            zetac, zeta_panels_in[0], Surf_in.vortex_radius, gamma_pan=Surf_in.gamma[0, :])
+        for vv in range(2):
+            jj_v = M_in_bound * (N_in + 1) + np.arange(N_in) + dn[vv]
+            Dervert[:, vector_rows(jj_v, Kzeta_in_bound)] += der_zeta_panel[:, vvec[vv]].transpose(1, 0, 2)
 
     return Dercoll, Dervert
 
 
-def dfqsdvind_zeta(Surfs, Surfs_star):
+def dfqsdvind_zeta(Surfs, Surfs_star, num_processes=1):
     """
     Assemble derivative of quasi-steady force w.r.t. induced velocities changes
     due to zeta.
+
+    The derivatives of each pair of output and input surfaces are independent and are
+    evaluated in ``num_processes`` worker processes (see :func:`map_surface_pairs`).
     """
 
     n_surf = len(Surfs)
     assert len(Surfs_star) == n_surf, \
         'Number of bound and wake surfaces much be equal'
 
-    # allocate
-    Dercoll_list = []
-    Dervert_list = []
-    for ss_out in range(n_surf):
-        Kzeta_out = Surfs[ss_out].maps.Kzeta
-        Dercoll_list.append(np.zeros((3 * Kzeta_out, 3 * Kzeta_out)))
-        Dervert_list_sub = []
-        for ss_in in range(n_surf):
-            Kzeta_in = Surfs[ss_in].maps.Kzeta
-            Dervert_list_sub.append(np.zeros((3 * Kzeta_out, 3 * Kzeta_in)))
-        Dervert_list.append(Dervert_list_sub)
-
-    for ss_out in range(n_surf):
-
+    def pair_derivatives(ss_out, ss_in):
         Surf_out = Surfs[ss_out]
         M_out, N_out = Surf_out.maps.M, Surf_out.maps.N
         K_out = Surf_out.maps.K
         Kzeta_out = Surf_out.maps.Kzeta
-        shape_fqs = Surf_out.maps.shape_vert_vect  # (3,M+1,N+1)
-        Dercoll = Dercoll_list[ss_out]  # <--link
-
-        ### Loop out (bound) surface panels
-        for pp_out in itertools.product(range(0, M_out), range(0, N_out)):
-            mm_out, nn_out = pp_out
-            # zeta_panel_out=Surf_out.get_panel_vertices_coords(mm_out,nn_out)
-            zeta_panel_out = Surf_out.zeta[:, [mm_out + 0, mm_out + 1, mm_out + 1, mm_out + 0],
-                             [nn_out + 0, nn_out + 0, nn_out + 1, nn_out + 1]].T
+        ind_vert = panel_vertex_indices(M_out, N_out)
 
-            # Loop segments
-            for ll, aa, bb in zip(svec, avec, bvec):
-                zeta_mid = 0.5 * (zeta_panel_out[bb, :] + zeta_panel_out[aa, :])
-                lv = zeta_panel_out[bb, :] - zeta_panel_out[aa, :]
-                Lskew = algebra.skew((-Surf_out.rho * Surf_out.gamma[mm_out, nn_out]) * lv)
+        ### Out (bound) surface segments
+        zetav = panel_vertices(Surf_out.zeta).reshape((K_out, 4, 3))
+        zeta_mid = 0.5 * (zetav[:, bvec, :] + zetav[:, avec, :])
+        lv = zetav[:, bvec, :] - zetav[:, avec, :]
+        Lskew = dbiot.skew_batch((-Surf_out.rho * Surf_out.gamma.reshape((K_out, 1, 1))) * lv)
 
-                # get vertices m,n indices
-                mm_a, nn_a = mm_out + dmver[aa], nn_out + dnver[aa]
-                mm_b, nn_b = mm_out + dmver[bb], nn_out + dnver[bb]
-                # get vertices 1d index
-                ii_a = [np.ravel_multi_index(
-                    (cc, mm_a, nn_a), shape_fqs) for cc in range(3)]
-                ii_b = [np.ravel_multi_index(
-                    (cc, mm_b, nn_b), shape_fqs) for cc in range(3)]
-                del mm_a, mm_b, nn_a, nn_b
-
-                ### loop input surfaces coordinates
-                for ss_in in range(n_surf):
-                    ### Bound
-                    Surf_in = Surfs[ss_in]
-                    M_in_bound, N_in_bound = Surf_in.maps.M, Surf_in.maps.N
-                    shape_zeta_in_bound = (3, M_in_bound + 1, N_in_bound + 1)
-                    Dervert = Dervert_list[ss_out][ss_in]  # <- link
-                    # deriv wrt induced velocity
-                    dvind_mid, dvind_vert = dvinddzeta_cpp(
-                        zeta_mid, Surf_in, is_bound=True, vortex_radius=Surf_in.vortex_radius)
-                    # allocate coll
-                    Df = np.dot(0.25 * Lskew, dvind_mid)
-                    Dercoll[np.ix_(ii_a, ii_a)] += Df
-                    Dercoll[np.ix_(ii_b, ii_a)] += Df
-                    Dercoll[np.ix_(ii_a, ii_b)] += Df
-                    Dercoll[np.ix_(ii_b, ii_b)] += Df
-                    # allocate vert
-                    Df = np.dot(0.5 * Lskew, dvind_vert)
-                    Dervert[ii_a, :] += Df
-                    Dervert[ii_b, :] += Df
-
-                    ### wake
-                    # deriv wrt induced velocity
-                    dvind_mid, dvind_vert = dvinddzeta_cpp(
-                        zeta_mid, Surfs_star[ss_in],
-                        is_bound=False, vortex_radius=Surf_in.vortex_radius,
-                        M_in_bound=Surf_in.maps.M)
-                    # allocate coll
-                    Df = np.dot(0.25 * Lskew, dvind_mid)
-                    Dercoll[np.ix_(ii_a, ii_a)] += Df
-                    Dercoll[np.ix_(ii_b, ii_a)] += Df
-                    Dercoll[np.ix_(ii_a, ii_b)] += Df
-                    Dercoll[np.ix_(ii_b, ii_b)] += Df
-
-                    Df = np.dot(0.5 * Lskew, dvind_vert)
-                    Dervert[ii_a, :] += Df
-                    Dervert[ii_b, :] += Df
-
-        # Loop output surf. TE
+        ### Out surf. TE
         # - we use Gammaw_0 over the TE
         # - we run along the positive direction as defined in the first row of
         # wake panels
-        for nn_out in range(N_out):
-
-            # get TE bound vertices m,n indices
-            nn_a = nn_out + 1
-            nn_b = nn_out
-
-            # get segment and mid-point
-            zeta_mid = 0.5 * (Surf_out.zeta[:, M_out, nn_b] + Surf_out.zeta[:, M_out, nn_a])
-            lv = Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]
-            Lskew = algebra.skew((-Surf_out.rho * Surfs_star[ss_out].gamma[0, nn_out]) * lv)
-
-            # get vertices 1d index on bound
-            ii_a = [np.ravel_multi_index(
-                (cc, M_out, nn_a), shape_fqs) for cc in range(3)]
-            ii_b = [np.ravel_multi_index(
-                (cc, M_out, nn_b), shape_fqs) for cc in range(3)]
-
-            ### loop input surfaces coordinates
-            for ss_in in range(n_surf):
-                ### Bound
-                Surf_in = Surfs[ss_in]
-                M_in_bound, N_in_bound = Surf_in.maps.M, Surf_in.maps.N
-                shape_zeta_in_bound = (3, M_in_bound + 1, N_in_bound + 1)
-                Dervert = Dervert_list[ss_out][ss_in]  # <- link
-                # deriv wrt induced velocity
-                dvind_mid, dvind_vert = dvinddzeta_cpp(zeta_mid, Surf_in,
-                                                       is_bound=True,
-                                                       vortex_radius=Surf_in.vortex_radius)
-                # allocate coll
-                Df = np.dot(0.25 * Lskew, dvind_mid)
-                Dercoll[np.ix_(ii_a, ii_a)] += Df
-                Dercoll[np.ix_(ii_b, ii_a)] += Df
-                Dercoll[np.ix_(ii_a, ii_b)] += Df
-                Dercoll[np.ix_(ii_b, ii_b)] += Df
-                # allocate vert
-                Df = np.dot(0.5 * Lskew, dvind_vert)
-                Dervert[ii_a, :] += Df
-                Dervert[ii_b, :] += Df
-
-                ### wake
-                # deriv wrt induced velocity
-                dvind_mid, dvind_vert = dvinddzeta_cpp(
-                    zeta_mid, Surfs_star[ss_in],
-                    is_bound=False, vortex_radius=Surf_in.vortex_radius,
-                    M_in_bound=Surf_in.maps.M)
-                # allocate coll
-                Df = np.dot(0.25 * Lskew, dvind_mid)
-                Dercoll[np.ix_(ii_a, ii_a)] += Df
-                Dercoll[np.ix_(ii_b, ii_a)] += Df
-                Dercoll[np.ix_(ii_a, ii_b)] += Df
-                Dercoll[np.ix_(ii_b, ii_b)] += Df
-
-                # allocate vert
-                Df = np.dot(0.5 * Lskew, dvind_vert)
-                Dervert[ii_a, :] += Df
-                Dervert[ii_b, :] += Df
+        nn_a = np.arange(N_out) + 1
+        nn_b = np.arange(N_out)
+        zeta_mid_te = (0.5 * (Surf_out.zeta[:, M_out, nn_b] + Surf_out.zeta[:, M_out, nn_a])).T
+        lv_te = (Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]).T
+        Lskew_te = dbiot.skew_batch((-Surf_out.rho * Surfs_star[ss_out].gamma[0, :, None]) * lv_te)
+
+        zeta_mid = np.ascontiguousarray(np.concatenate((zeta_mid.reshape((-1, 3)), zeta_mid_te)))
+        Lskew = np.concatenate((Lskew.reshape((-1, 3, 3)), Lskew_te))
+        ii_a = np.concatenate((ind_vert[:, avec].reshape(-1), M_out * (N_out + 1) + nn_a))
+        ii_b = np.concatenate((ind_vert[:, bvec].reshape(-1), M_out * (N_out + 1) + nn_b))
+        rows_a = vector_rows(ii_a, Kzeta_out)
+        rows_b = vector_rows(ii_b, Kzeta_out)
+
+        ### input surface coordinates
+        Surf_in = Surfs[ss_in]
+        Dervert = np.zeros((3 * Kzeta_out, 3 * Surf_in.maps.Kzeta))
+        dvind_mid = np.empty((len(zeta_mid), 3, 3))
+        for ll in range(len(zeta_mid)):
+            ### Bound
+            dvind_mid_bound, dvind_vert = dvinddzeta_cpp(
+                zeta_mid[ll], Surf_in, is_bound=True, vortex_radius=Surf_in.vortex_radius)
+            ### wake
+            dvind_mid_wake, dvind_vert_wake = dvinddzeta_cpp(
+                zeta_mid[ll], Surfs_star[ss_in],
+                is_bound=False, vortex_radius=Surf_in.vortex_radius,
+                M_in_bound=Surf_in.maps.M)
+            dvind_mid[ll] = dvind_mid_bound + dvind_mid_wake
+            # allocate vert
+            Df = np.dot(0.5 * Lskew[ll], dvind_vert + dvind_vert_wake)
+            Dervert[rows_a[ll], :] += Df
+            Dervert[rows_b[ll], :] += Df
+
+        # allocate coll
+        Df = np.matmul(0.25 * Lskew, dvind_mid)
+        Dercoll = scatter_blocks(np.concatenate((ii_a, ii_b, ii_a, ii_b)),
+                                 np.concatenate((ii_a, ii_a, ii_b, ii_b)),
+                                 np.concatenate((Df, Df, Df, Df)),
+                                 (Kzeta_out, Kzeta_out))
+
+        return Dercoll, Dervert
+
+    Blocks = map_surface_pairs(pair_derivatives, [Surf.maps.K for Surf in Surfs], num_processes)
+
+    Dercoll_list = [sum(Blocks[ss_out][ss_in][0] for ss_in in range(n_surf)) for ss_out in range(n_surf)]
+    Dervert_list = [[Blocks[ss_out][ss_in][1] for ss_in in range(n_surf)] for ss_out in range(n_surf)]
 
     return Dercoll_list, Dervert_list
 
@@ -1160,6 +1054,10 @@ def wake_prop(MS, use_sparse=False, sparse_format='lil', settings=None):
     """
     Assembly of wake propagation matrices, in sparse or dense matrices format
 
+    The matrices are built directly from the indices of their non-zero entries: the propagation from the trailing
+    edge fills one entry per spanwise panel and the wake propagation one diagonal (``CFL=1``) or two diagonals
+    (otherwise) of the wake propagation matrix.
+
     Note:
         Wake propagation matrices are very sparse. Nonetheless, allocation
         in dense format (from numpy.zeros) or sparse does not have important
@@ -1169,7 +1067,7 @@ def wake_prop(MS, use_sparse=False, sparse_format='lil', settings=None):
     Args:
         MS (MultiSurface): MultiSurface instance
         use_sparse (bool (optional)): Use sparse matrices
-        sparse_format (str (optional)): Use either ``csc`` or ``lil`` format
+        sparse_format (str (optional)): Use either ``csc``, ``csr``, ``coo`` or ``lil`` format
         settings (dict (optional)): Dictionary with aerodynamic settings containing:
             cfl1 (bool): Defines if the wake shape complies with CFL=1
             dt (float): time step
@@ -1201,64 +1099,37 @@ def wake_prop(MS, use_sparse=False, sparse_format='lil', settings=None):
         dimensions[ss] = [M, N, K]
         dimensions_star[ss] = [M_star, N, K_star]
 
-        if not cfl1:
-            # allocate...
-            if use_sparse:
-                if sparse_format == 'csc':
-                    C = libsp.csc_matrix((K_star, K))
-                    C_star = libsp.csc_matrix((K_star, K_star))
-                elif sparse_format == 'lil':
-                    C = sparse.lil_matrix((K_star, K))
-                    C_star = sparse.lil_matrix((K_star, K_star))
-            else:
-                C = np.zeros((K_star, K))
-                C_star = np.zeros((K_star, K_star))
-
-            C_list = []
-            Cstar_list = []
-
-            # Compute flow velocity at wake
-            uext = [np.zeros((3,
-                             dimensions_star[ss][0],
-                             dimensions_star[ss][1]))]
-
-            try:
-                Surf_star.zetac
-            except AttributeError:
-                Surf_star.generate_collocations()
-            # Compute induced velocities in the wake
-            Surf_star.u_ind_coll = np.zeros((3, M_star, N))
-
-            for iin in range(N):
-                # propagation from trailing edge
-                conv_vec = Surf_star.zetac[:, 0, iin] - Surf.zetac[:, -1, iin]
-                dist = np.linalg.norm(conv_vec)
-                conv_dir_te = conv_vec/dist
-                vel = Surf.u_input_coll[:, -1, iin]
-                vel_value = np.dot(vel, conv_dir_te)
-                cfl = settings['dt']*vel_value/dist
-
-                C[iin, N * (M - 1) + iin] = cfl
-                C_star[iin, iin] = 1.0 - cfl
-
-                # wake propagation
-                for mm in range(1, M_star):
-                    conv_vec = Surf_star.zetac[:, mm, iin] - Surf_star.zetac[:, mm - 1, iin]
-                    dist = np.linalg.norm(conv_vec)
-                    conv_dir = conv_vec/dist
-                    cfl = settings['dt']*vel_value/dist
-
-                    C_star[mm * N + iin, (mm - 1) * N + iin] = cfl
-                    C_star[mm * N + iin, mm * N + iin] = 1.0 - cfl
-
-            C_list.append(C)
-            Cstar_list.append(C_star)
-
     if cfl1:
-        C_list, Cstar_list = wake_prop_from_dimensions(dimensions,
-                                                       dimensions_star,
-                                                       use_sparse=use_sparse,
-                                                       sparse_format=sparse_format)
+        return wake_prop_from_dimensions(dimensions,
+                                         dimensions_star,
+                                         use_sparse=use_sparse,
+                                         sparse_format=sparse_format)
+
+    C_list = []
+    Cstar_list = []
+    for ss in range(n_surf):
+        Surf = MS.Surfs[ss]
+        Surf_star = MS.Surfs_star[ss]
+        M, N, K = dimensions[ss]
+        M_star, N, K_star = dimensions_star[ss]
+
+        cfl = wake_cfl(Surf, Surf_star, settings['dt'])
+        # Compute induced velocities in the wake
+        Surf_star.u_ind_coll = np.zeros((3, M_star, N))
+
+        te_rows, te_cols, star_rows, star_cols = wake_prop_indices(M, N, M_star)
+        diag = np.arange(K_star)
+
+        # propagation from trailing edge
+        C = allocate_from_indices(te_rows, te_cols, cfl[0, :], (K_star, K), use_sparse, sparse_format)
+        # wake propagation
+        C_star = allocate_from_indices(np.concatenate((star_rows, diag)),
+                                       np.concatenate((star_cols, diag)),
+                                       np.concatenate((cfl[1:, :].reshape(-1), 1. - cfl.reshape(-1))),
+                                       (K_star, K_star), use_sparse, sparse_format)
+
+        C_list.append(C)
+        Cstar_list.append(C_star)
 
     return C_list, Cstar_list
 
@@ -1271,8 +1142,6 @@ def wake_prop_from_dimensions(dimensions, dimensions_star, use_sparse=False, spa
     C_list = []
     Cstar_list = []
 
-    # dimensions = [None]*n_surf
-
     n_surf = len(dimensions)
     assert len(dimensions_star) == n_surf, 'No. of wake and bound surfaces not matching!'
 
@@ -1283,25 +1152,13 @@ def wake_prop_from_dimensions(dimensions, dimensions_star, use_sparse=False, spa
         assert N_star == N, \
             'Bound and wake surface do not have the same spanwise discretisation'
 
-        # allocate...
-        if use_sparse:
-            if sparse_format == 'csc':
-                C = libsp.csc_matrix((K_star, K))
-                C_star = libsp.csc_matrix((K_star, K_star))
-            elif sparse_format == 'lil':
-                C = sparse.lil_matrix((K_star, K))
-                C_star = sparse.lil_matrix((K_star, K_star))
-        else:
-            C = np.zeros((K_star, K))
-            C_star = np.zeros((K_star, K_star))
+        te_rows, te_cols, star_rows, star_cols = wake_prop_indices(M, N, M_star)
 
-        # ... and fill
-        iivec = np.array(range(N), dtype=int)
         # propagation from trailing edge
-        C[iivec, N * (M - 1) + iivec] = 1.0
+        C = allocate_from_indices(te_rows, te_cols, np.ones(N), (K_star, K), use_sparse, sparse_format)
         # wake propagation
-        for mm in range(1, M_star):
-            C_star[mm * N + iivec, (mm - 1) * N + iivec] = 1.0
+        C_star = allocate_from_indices(star_rows, star_cols, np.ones((M_star - 1) * N), (K_star, K_star),
+                                       use_sparse, sparse_format)
 
         C_list.append(C)
         Cstar_list.append(C_star)
@@ -1309,6 +1166,96 @@ def wake_prop_from_dimensions(dimensions, dimensions_star, use_sparse=False, spa
     return C_list, Cstar_list
 
 
+def wake_prop_indices(M, N, M_star):
+    """
+    Indices of the non-zero entries of the wake propagation matrices of a surface.
+
+    Args:
+        M (int): Chordwise panels of the bound surface
+        N (int): Spanwise panels
+        M_star (int): Chordwise panels of the wake
+
+    Returns:
+        tuple: Row and column indices of the propagation from the trailing edge (one entry per spanwise panel) and
+        of the propagation from the wake panel upstream (one entry per wake panel beyond the first row)
+    """
+    iivec = np.arange(N)
+    te_rows = iivec
+    te_cols = N * (M - 1) + iivec
+
+    star_rows = np.arange(N, M_star * N)
+    star_cols = star_rows - N
+
+    return te_rows, te_cols, star_rows, star_cols
+
+
+def wake_cfl(Surf, Surf_star, dt):
+    """
+    Courant number of the wake panels of a surface.
+
+    The convection velocity is the projection of the velocity at the trailing edge collocation points onto the
+    direction from the trailing edge to the first row of wake collocation points, and it is kept constant along each
+    wake strip.
+
+    Args:
+        Surf (sharpy.linear.src.surface.AeroGridSurface): Bound surface
+        Surf_star (sharpy.linear.src.surface.AeroGridSurface): Wake surface
+        dt (float): Time step
+
+    Returns:
+        np.ndarray: Courant number of each wake panel ``[M_star, N]``. The first row corresponds to the propagation
+        from the trailing edge
+    """
+    try:
+        Surf_star.zetac
+    except AttributeError:
+        Surf_star.generate_collocations()
+
+    conv_te = Surf_star.zetac[:, 0, :] - Surf.zetac[:, -1, :]
+    dist_te = np.linalg.norm(conv_te, axis=0)
+    vel_value = np.sum(Surf.u_input_coll[:, -1, :] * conv_te, axis=0) / dist_te
+
+    dist = np.empty(Surf_star.zetac.shape[1:])
+    dist[0, :] = dist_te
+    dist[1:, :] = np.linalg.norm(np.diff(Surf_star.zetac, axis=1), axis=0)
+
+    return dt * vel_value / dist
+
+
+def allocate_from_indices(rows, cols, values, shape, use_sparse=False, sparse_format='lil'):
+    """
+    Allocates a matrix from the indices and values of its non-zero entries.
+
+    Args:
+        rows (np.ndarray): Row indices
+        cols (np.ndarray): Column indices
+        values (np.ndarray): Values
+        shape (tuple): Shape of the matrix
+        use_sparse (bool (optional)): Return a sparse matrix. Otherwise, a ``np.ndarray`` is returned
+        sparse_format (str (optional)): Sparse format, either ``csc`` (as ``libsparse.csc_matrix``), ``csr``,
+          ``coo`` or ``lil``
+
+    Returns:
+        np.ndarray or scipy.sparse matrix: Assembled matrix
+    """
+    if not use_sparse:
+        mat = np.zeros(shape, dtype=np.asarray(values).dtype)
+        mat[rows, cols] = values
+        return mat
+
+    mat = sparse.coo_matrix((values, (rows, cols)), shape=shape)
+    if sparse_format == 'csc':
+        return libsp.csc_matrix(mat)
+    elif sparse_format == 'csr':
+        return mat.tocsr()
+    elif sparse_format == 'coo':
+        return mat
+    elif sparse_format == 'lil':
+        return mat.tolil()
+    else:
+        raise NameError('Unrecognised sparse format %s' % sparse_format)
+
+
 def test_wake_prop_term(M, N, M_star, N_star, use_sparse, sparse_format='csc'):
     """
     Test allocation of single term of wake propagation matrix
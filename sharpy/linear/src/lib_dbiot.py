@@ -12,6 +12,10 @@ Methods:
 - eval_seg_comp and eval_seg_comp_loop: profide ders in format
     [Q_{x,y,z},ZetaPoint_{x,y,z}]
   and use compact analytical formula.
+
+- eval_panel_fast_batch and eval_panel_fast_coll_batch: vectorised versions of
+  eval_panel_fast and eval_panel_fast_coll over arrays of target points and
+  panels.
 """
 
 import numpy as np
@@ -486,6 +490,118 @@ def eval_panel_fast_coll(zetaP, ZetaPanel, vortex_radius, gamma_pan=1.0):
     return DerP
 
 
+# ------------------------------------------------------------------------------
+#	Batched Formula
+# ------------------------------------------------------------------------------
+
+
+def skew_batch(v):
+    """
+    Skew-symmetric matrices of the vectors ``v[..., :]``, such that
+    ``skew_batch(v)[..., :, :] @ w = v x w``.
+    """
+    Skew = np.zeros(v.shape + (3,))
+    Skew[..., 0, 1] = -v[..., 2]
+    Skew[..., 0, 2] = v[..., 1]
+    Skew[..., 1, 0] = v[..., 2]
+    Skew[..., 1, 2] = -v[..., 0]
+    Skew[..., 2, 0] = -v[..., 1]
+    Skew[..., 2, 1] = v[..., 0]
+    return Skew
+
+
+def der_runit_batch(r, rinv):
+    """
+    Batched version of ``der_runit``: derivatives of the unit vectors ``r[..., :] * rinv[...]``.
+    """
+    Der = (-rinv[..., None, None] ** 3) * (r[..., :, None] * r[..., None, :])
+    Der[..., [0, 1, 2], [0, 1, 2]] += rinv[..., None]
+    return Der
+
+
+def _eval_panel_segments_batch(zetaP, ZetaPanel, vortex_radius, gamma_pan):
+    """
+    Common terms of ``eval_panel_fast_batch`` and ``eval_panel_fast_coll_batch`` for all the segments of the
+    panels. Terms of segments closer than the vortex radius to the target point are zero.
+    """
+    R = zetaP[..., None, :] - ZetaPanel  # distance vertex ii-th from P
+    shape = np.broadcast_shapes(R.shape[:-2], np.shape(gamma_pan))
+    R = np.broadcast_to(R, shape + (4, 3))
+    ZetaPanel = np.broadcast_to(ZetaPanel, shape + (4, 3))
+    Cfact = cfact_biot * np.broadcast_to(gamma_pan, shape)[..., None]
+
+    # vertices coinciding with the target point only belong to inactive segments
+    r1 = np.linalg.norm(R, axis=-1)
+    r1inv = np.where(r1 > 0., 1. / np.where(r1 > 0., r1, 1.), 0.)
+    Runit = R * r1inv[..., None]
+    Der_runit = der_runit_batch(R, r1inv)
+
+    aa, bb = [0, 1, 2, 3], [1, 2, 3, 0]
+    RA, RB = R[..., aa, :], R[..., bb, :]
+    RAB = ZetaPanel[..., bb, :] - ZetaPanel[..., aa, :]  # segment vector
+    Vcr = np.cross(RA, RB)
+    vcr2 = np.sum(Vcr * Vcr, axis=-1)
+
+    active = vcr2 >= (vortex_radius * vortex_radius * np.sum(RAB * RAB, axis=-1))
+    vcr2inv = np.where(active, 1. / np.where(active, vcr2, 1.), 0.)
+
+    Tv = Runit[..., aa, :] - Runit[..., bb, :]
+    dotprod = np.sum(RAB * Tv, axis=-1)
+
+    ### cross-product derivatives
+    diag_fact = Cfact * vcr2inv * dotprod
+    off_fact = -2. * Cfact * vcr2inv * vcr2inv * dotprod
+    Dvcross = off_fact[..., None, None] * (Vcr[..., :, None] * Vcr[..., None, :])
+    Dvcross[..., [0, 1, 2], [0, 1, 2]] += diag_fact[..., None]
+
+    ### difference term derivative
+    Vsc = Vcr * (vcr2inv * Cfact)[..., None]
+    Ddiff = Vsc[..., :, None] * RAB[..., None, :]
+
+    return RA, RB, RAB, Tv, Der_runit, Dvcross, Vsc, Ddiff
+
+
+def eval_panel_fast_batch(zetaP, ZetaPanel, vortex_radius, gamma_pan=1.0):
+    """
+    Batched version of ``eval_panel_fast``. Computes the derivatives of the induced velocity w.r.t. coordinates of
+    target points and panel coordinates for several point/panel pairs at once.
+
+    The leading dimensions of ``zetaP[..., 3]``, ``ZetaPanel[..., 4, 3]`` and ``gamma_pan[...]`` are broadcast
+    against each other. For instance, the derivatives of the velocity induced by all the panels of a surface at a
+    point ``zetaP[3]`` are obtained with ``ZetaPanel[M, N, 4, 3]`` and ``gamma_pan[M, N]``.
+
+    Returns:
+        tuple: ``DerP[..., 3, 3]`` and ``DerVertices[..., 4, 3, 3]``, in the same format of ``eval_panel_fast``
+    """
+    RA, RB, RAB, Tv, Der_runit, Dvcross, Vsc, Ddiff = \
+        _eval_panel_segments_batch(np.asarray(zetaP), np.asarray(ZetaPanel), vortex_radius, gamma_pan)
+
+    dQ_dRAB = Vsc[..., :, None] * Tv[..., None, :]
+    dQ_dRA = Dvcross @ skew_batch(-RB) + Ddiff @ Der_runit
+    dQ_dRB = Dvcross @ skew_batch(RA) - Ddiff @ np.roll(Der_runit, -1, axis=-3)
+
+    DerP = np.sum(dQ_dRA + dQ_dRB, axis=-3)  # w.r.t. P
+    # segment ll runs from vertex ll (A) to vertex ll + 1 (B)
+    DerVertices = -(dQ_dRAB + dQ_dRA) + np.roll(dQ_dRAB - dQ_dRB, 1, axis=-3)
+
+    return DerP, DerVertices
+
+
+def eval_panel_fast_coll_batch(zetaP, ZetaPanel, vortex_radius, gamma_pan=1.0):
+    """
+    Batched version of ``eval_panel_fast_coll``. See ``eval_panel_fast_batch`` for the format of the inputs.
+
+    Returns:
+        np.ndarray: ``DerP[..., 3, 3]``
+    """
+    RA, RB, RAB, Tv, Der_runit, Dvcross, Vsc, Ddiff = \
+        _eval_panel_segments_batch(np.asarray(zetaP), np.asarray(ZetaPanel), vortex_radius, gamma_pan)
+
+    DerP = Dvcross @ skew_batch(RAB) + Ddiff @ (Der_runit - np.roll(Der_runit, -1, axis=-3))
+
+    return np.sum(DerP, axis=-3)
+
+
 if __name__ == '__main__':
 
     import cProfile
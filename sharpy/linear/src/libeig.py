@@ -0,0 +1,323 @@
+"""
+Shift-invert eigenvalue solvers
+
+Computation of the few eigenpairs of large (sparse) matrices and pencils that lie closest to a given shift
+:math:`\\sigma`, as an alternative to the dense eigenvalue decomposition when only a handful of modes are retained.
+
+The eigenvalue problem :math:`\\mathbf{A\\,x} = \\lambda\\mathbf{B\\,x}` is transformed into
+
+.. math:: (\\mathbf{A} - \\sigma\\mathbf{B})^{-1}\\mathbf{B\\,x} = \\mu\\mathbf{x}, \\quad \\lambda = \\sigma + 1/\\mu
+
+such that the eigenvalues closest to :math:`\\sigma` become the largest in magnitude and converge first in ARPACK.
+The shifted matrix is factorised once with a sparse LU decomposition. Symmetric pencils use the Lanczos method
+(``scipy.sparse.linalg.eigsh``) and general ones the Arnoldi method (``scipy.sparse.linalg.eigs``).
+
+Eigenpairs of a parametric system can be followed as the parameter changes (continuation) with
+:func:`track_eigenpairs`, which seeds a shift-invert iteration per cluster of close tracked modes with the previous
+eigenpairs and matches the candidates by the Modal Assurance Criterion (MAC).
+
+Methods:
+- is_symmetric: check whether a dense or sparse matrix is symmetric
+- eigs_shift_invert: eigenpairs of a general matrix or pencil closest to a shift
+- eigsh_shift_invert: eigenpairs of a symmetric pencil closest to a shift
+- mac: Modal Assurance Criterion between two sets of vectors
+- track_eigenpairs: continuation of eigenpairs to a perturbed matrix
+- cluster_shifts: grouping of close shifts sharing a factorisation
+"""
+import numpy as np
+import scipy.linalg as sclalg
+import scipy.sparse as sparse
+import scipy.sparse.linalg as spalg
+
+
+def is_symmetric(A, rtol=1e-10):
+    """
+    Returns ``True`` if ``A`` is symmetric to a tolerance ``rtol`` relative to its largest entry.
+
+    Args:
+        A (np.ndarray or scipy.sparse.spmatrix): Square matrix
+        rtol (float): Relative tolerance
+    """
+    if sparse.issparse(A):
+        diff = abs(A - A.T).max()
+        scale = abs(A).max()
+    else:
+        diff = np.max(np.abs(A - A.T))
+        scale = np.max(np.abs(A))
+    return diff <= rtol * scale
+
+
+def _identity_like(A):
+    return sparse.identity(A.shape[0], format='csc')
+
+
+def shift_invert_operator(A, sigma, B=None, transpose=False):
+    """
+    Returns the operator :math:`(\\mathbf{A} - \\sigma\\mathbf{B})^{-1}\\mathbf{B}` (or the transposed problem
+    :math:`(\\mathbf{A} - \\sigma\\mathbf{B})^{-\\top}\\mathbf{B}^\\top` if ``transpose``) as a
+    ``scipy.sparse.linalg.LinearOperator``.
+
+    Args:
+        A (np.ndarray or scipy.sparse.spmatrix): System matrix
+        sigma (float or complex): Shift
+        B (np.ndarray or scipy.sparse.spmatrix): Mass matrix. Identity if ``None``
+        transpose (bool): Return the operator for the left eigenvectors
+
+    Returns:
+        scipy.sparse.linalg.LinearOperator: Shift-invert operator
+    """
+    if not sparse.issparse(A) and (B is None or not sparse.issparse(B)):
+        return _dense_shift_invert_operator(np.asarray(A), sigma, B, transpose)
+
+    A = sparse.csc_matrix(A)
+    B = _identity_like(A) if B is None else sparse.csc_matrix(B)
+    dtype = np.result_type(A.dtype, B.dtype, np.asarray(sigma).dtype)
+
+    lu = spalg.splu(sparse.csc_matrix(A - sigma * B, dtype=dtype))
+    if transpose:
+        Bt = B.T.tocsc()
+
+        def matvec(x):
+            return lu.solve(np.asarray(Bt.dot(x), dtype=dtype), trans='T')
+    else:
+        def matvec(x):
+            return lu.solve(np.asarray(B.dot(x), dtype=dtype))
+
+    return spalg.LinearOperator(A.shape, matvec=matvec, dtype=dtype)
+
+
+def _dense_shift_invert_operator(A, sigma, B=None, transpose=False):
+    # dense matrices are factorised with LAPACK rather than a sparse LU, which would fill in completely
+    dtype = np.result_type(A.dtype, np.asarray(sigma).dtype)
+    if B is None:
+        shifted = A - sigma * np.eye(A.shape[0])
+        B = np.eye(A.shape[0])
+    else:
+        B = np.asarray(B)
+        dtype = np.result_type(dtype, B.dtype)
+        shifted = A - sigma * B
+    lu_piv = sclalg.lu_factor(shifted.astype(dtype))
+    if transpose:
+        def matvec(x):
+            return sclalg.lu_solve(lu_piv, B.T.dot(x).astype(dtype), trans=1)
+    else:
+        def matvec(x):
+            return sclalg.lu_solve(lu_piv, B.dot(x).astype(dtype))
+
+    return spalg.LinearOperator(A.shape, matvec=matvec, dtype=dtype)
+
+
+def _sort_by_distance(eigenvalues, eigenvectors, sigma, k):
+    order = np.argsort(np.abs(eigenvalues - sigma), kind='stable')[:k]
+    return eigenvalues[order], eigenvectors[:, order]
+
+
+def _dense_eig(A, sigma, k, B=None, left=False):
+    A = A.toarray() if sparse.issparse(A) else np.asarray(A)
+    if B is not None:
+        B = B.toarray() if sparse.issparse(B) else np.asarray(B)
+    if left:
+        eigenvalues, vl, vr = sclalg.eig(A, B, left=True, right=True)
+        order = np.argsort(np.abs(eigenvalues - sigma), kind='stable')[:k]
+        # vl^H A = lambda vl^H B, i.e. y = conj(vl) satisfies y^T A = lambda y^T B
+        return eigenvalues[order], vr[:, order], vl[:, order].conj()
+    eigenvalues, vr = sclalg.eig(A, B)
+    return _sort_by_distance(eigenvalues, vr, sigma, k)
+
+
+def eigs_shift_invert(A, k, sigma, B=None, v0=None, left=False, tol=0, maxiter=None):
+    """
+    Computes the ``k`` eigenpairs of :math:`\\mathbf{A\\,x} = \\lambda\\mathbf{B\\,x}` closest to ``sigma`` using
+    the shift-invert Arnoldi method.
+
+    If ``k`` is too large for ARPACK (``k >= n - 1``) the dense eigenvalue decomposition is used instead.
+
+    Args:
+        A (np.ndarray or scipy.sparse.spmatrix): System matrix
+        k (int): Number of eigenpairs
+        sigma (float or complex): Shift. Complex shifts require a complex factorisation
+        B (np.ndarray or scipy.sparse.spmatrix): Mass matrix. Identity if ``None``
+        v0 (np.ndarray): Starting vector for the iteration, for instance an eigenvector of a nearby problem
+        left (bool): Compute the left eigenvectors :math:`\\mathbf{y}` too, such that
+            :math:`\\mathbf{y}^\\top\\mathbf{A} = \\lambda\\mathbf{y}^\\top\\mathbf{B}`
+        tol (float): Relative accuracy of the eigenvalues. ``0`` is machine precision
+        maxiter (int): Maximum number of Arnoldi iterations
+
+    Returns:
+        tuple: Eigenvalues sorted by distance to ``sigma``, right eigenvectors (in columns) and, if ``left``, the
+        corresponding left eigenvectors.
+    """
+    n = A.shape[0]
+    k = min(k, n)
+    if k >= n - 1:
+        return _dense_eig(A, sigma, k, B=B, left=left)
+
+    op = shift_invert_operator(A, sigma, B=B)
+    mu, eigenvectors = spalg.eigs(op, k=k, which='LM', v0=v0, tol=tol, maxiter=maxiter)
+    eigenvalues = sigma + 1. / mu
+    eigenvalues, eigenvectors = _sort_by_distance(eigenvalues, eigenvectors, sigma, k)
+
+    if not left:
+        return eigenvalues, eigenvectors
+
+    op_t = shift_invert_operator(A, sigma, B=B, transpose=True)
+    mu_t, left_eigenvectors = spalg.eigs(op_t, k=k, which='LM', tol=tol, maxiter=maxiter)
+    left_eigenvalues = sigma + 1. / mu_t
+
+    # pair each right eigenvalue with the closest unused left eigenvalue
+    order = np.zeros(k, dtype=int)
+    available = np.ones(k, dtype=bool)
+    for i_eig in range(k):
+        distance = np.abs(left_eigenvalues - eigenvalues[i_eig])
+        distance[~available] = np.inf
+        order[i_eig] = np.argmin(distance)
+        available[order[i_eig]] = False
+
+    return eigenvalues, eigenvectors, left_eigenvectors[:, order]
+
+
+def eigsh_shift_invert(A, k, sigma, B=None, v0=None, tol=0, maxiter=None):
+    """
+    Computes the ``k`` eigenpairs of the symmetric pencil :math:`\\mathbf{A\\,x} = \\lambda\\mathbf{B\\,x}` closest
+    to ``sigma`` using the shift-invert Lanczos method. ``B`` must be positive (semi-) definite.
+
+    If ``k`` is too large for ARPACK (``k >= n``) the dense symmetric eigenvalue decomposition is used instead.
+
+    Args:
+        A (np.ndarray or scipy.sparse.spmatrix): Symmetric system matrix, e.g. the stiffness matrix
+        k (int): Number of eigenpairs
+        sigma (float): Real shift
+        B (np.ndarray or scipy.sparse.spmatrix): Symmetric mass matrix. Identity if ``None``
+        v0 (np.ndarray): Starting vector for the iteration
+        tol (float): Relative accuracy of the eigenvalues. ``0`` is machine precision
+        maxiter (int): Maximum number of Lanczos iterations
+
+    Returns:
+        tuple: Real eigenvalues sorted by distance to ``sigma`` and ``B``-orthonormal eigenvectors (in columns)
+    """
+    n = A.shape[0]
+    k = min(k, n)
+    if k >= n:
+        A = A.toarray() if sparse.issparse(A) else np.asarray(A)
+        if B is not None:
+            B = B.toarray() if sparse.issparse(B) else np.asarray(B)
+        eigenvalues, eigenvectors = sclalg.eigh(A, B)
+        return _sort_by_distance(eigenvalues, eigenvectors, sigma, k)
+
+    A = sparse.csc_matrix(A)
+    if B is not None:
+        B = sparse.csc_matrix(B)
+    eigenvalues, eigenvectors = spalg.eigsh(A, k=k, M=B, sigma=sigma, which='LM', v0=v0, tol=tol, maxiter=maxiter)
+    return _sort_by_distance(eigenvalues, eigenvectors, sigma, k)
+
+
+def mac(phi1, phi2):
+    r"""
+    Modal Assurance Criterion between the columns of ``phi1`` and ``phi2``
+
+    .. math:: \text{MAC}_{ij} = \frac{|\boldsymbol{\phi}_{1,i}^H\boldsymbol{\phi}_{2,j}|^2}
+        {(\boldsymbol{\phi}_{1,i}^H\boldsymbol{\phi}_{1,i})(\boldsymbol{\phi}_{2,j}^H\boldsymbol{\phi}_{2,j})}
+
+    Args:
+        phi1 (np.ndarray): Vectors in columns ``(n, m1)``
+        phi2 (np.ndarray): Vectors in columns ``(n, m2)``
+
+    Returns:
+        np.ndarray: ``(m1, m2)`` MAC matrix, with values between 0 (orthogonal) and 1 (collinear)
+    """
+    phi1 = np.asarray(phi1).reshape((phi1.shape[0], -1))
+    phi2 = np.asarray(phi2).reshape((phi2.shape[0], -1))
+    cross = np.abs(phi1.conj().T.dot(phi2)) ** 2
+    norm1 = np.sum(np.abs(phi1) ** 2, axis=0)
+    norm2 = np.sum(np.abs(phi2) ** 2, axis=0)
+    return cross / np.outer(norm1, norm2)
+
+
+def track_eigenpairs(A, eigenvalues, eigenvectors, k=3, B=None, shifts=None, tol=0, cluster_radius=0.05,
+                     mac_threshold=0.5):
+    """
+    Follows known eigenpairs of a nearby problem to the eigenvalue problem of ``A`` (and ``B``).
+
+    The tracked modes are grouped in clusters of close shifts (by default their previous eigenvalues), see
+    :func:`cluster_shifts`. For each cluster, the shifted matrix is factorised once at the mean shift and the
+    ``m + k - 1`` eigenpairs closest to it (with ``m`` the number of modes in the cluster) are computed with the
+    shift-invert Arnoldi method, starting from the sum of the previous eigenvectors. Each mode retains the candidate
+    with the highest MAC with respect to its previous eigenvector, a candidate being assigned to a single mode. Modes
+    of a cluster whose MAC falls below ``mac_threshold``, for instance because other eigenvalues lie closer to the
+    mean shift, are tracked again on their own.
+
+    The cost is thus driven by the number of clusters rather than the number of tracked modes. A ``cluster_radius``
+    of ``0`` factorises the shifted matrix once per mode.
+
+    Args:
+        A (np.ndarray or scipy.sparse.spmatrix): System matrix of the new problem
+        eigenvalues (np.ndarray): Eigenvalues of the tracked modes in the previous problem
+        eigenvectors (np.ndarray): Corresponding eigenvectors (in columns)
+        k (int): Number of candidates computed per tracked mode
+        B (np.ndarray or scipy.sparse.spmatrix): Mass matrix of the new problem. Identity if ``None``
+        shifts (np.ndarray): Shift for each mode, for instance an extrapolation of the eigenvalue. Defaults to
+            ``eigenvalues``
+        tol (float): Relative accuracy of the eigenvalues
+        cluster_radius (float): Distance between shifts sharing a factorisation, relative to the shift magnitude
+        mac_threshold (float): MAC below which a mode of a cluster is tracked again on its own
+
+    Returns:
+        tuple: Eigenvalues, eigenvectors and MAC with respect to the previous eigenvector of each tracked mode
+    """
+    if shifts is None:
+        shifts = eigenvalues
+    shifts = np.asarray(shifts)
+    n_modes = len(eigenvalues)
+    new_eigenvalues = np.zeros(n_modes, dtype=complex)
+    new_eigenvectors = np.zeros((A.shape[0], n_modes), dtype=complex)
+    mac_values = np.zeros(n_modes)
+
+    clusters = cluster_shifts(shifts, cluster_radius)
+    while clusters:
+        modes = clusters.pop(0)
+        # avoid an exactly singular shifted matrix
+        sigma = np.mean(shifts[modes]) * (1 + 1e-10) + 1e-12
+        candidates, candidate_vectors = eigs_shift_invert(A, len(modes) + k - 1, sigma, B=B,
+                                                          v0=np.sum(eigenvectors[:, modes], axis=1).astype(complex),
+                                                          tol=tol)
+        mac_candidates = mac(eigenvectors[:, modes], candidate_vectors)
+
+        # assign the candidates to the modes by decreasing MAC
+        for _ in range(min(len(modes), len(candidates))):
+            i_mode, best = np.unravel_index(np.argmax(mac_candidates), mac_candidates.shape)
+            new_eigenvalues[modes[i_mode]] = candidates[best]
+            new_eigenvectors[:, modes[i_mode]] = candidate_vectors[:, best]
+            mac_values[modes[i_mode]] = mac_candidates[i_mode, best]
+            mac_candidates[i_mode, :] = -1.
+            mac_candidates[:, best] = -1.
+
+        if len(modes) > 1:
+            clusters += [[i_mode] for i_mode in modes if mac_values[i_mode] < mac_threshold]
+
+    return new_eigenvalues, new_eigenvectors, mac_values
+
+
+def cluster_shifts(shifts, radius):
+    """
+    Groups the shifts into clusters. Each cluster is seeded by the first unassigned shift :math:`\sigma` and
+    gathers the unassigned shifts within ``radius`` :math:`|\sigma|` of it, such that the shifts of a cluster lie
+    within a disc of radius ``radius`` :math:`|\sigma|` around the seed.
+
+    Args:
+        shifts (np.ndarray): Shifts
+        radius (float): Cluster radius relative to the magnitude of the seed shift
+
+    Returns:
+        list(list(int)): Indices of the shifts in each cluster, the seed first
+    """
+    unassigned = np.ones(len(shifts), dtype=bool)
+    clusters = []
+    for i_seed in range(len(shifts)):
+        if not unassigned[i_seed]:
+            continue
+        close = unassigned & (np.abs(shifts - shifts[i_seed]) <= radius * np.abs(shifts[i_seed]))
+        close[i_seed] = True
+        members = [i_seed] + [int(i) for i in np.where(close)[0] if i != i_seed]
+        unassigned[members] = False
+        clusters.append(members)
+    return clusters
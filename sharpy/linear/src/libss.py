@@ -16,7 +16,7 @@ Classes:
 	the system matrices are overwritten
 
 Methods for state-space manipulation:
-- couple: feedback coupling. Does not support sparsity
+- couple: feedback coupling. Supports sparsity
 - freqresp: calculate frequency response. Supports sparsity.
 - series: series connection between systems
 - parallel: parallel connection between systems
@@ -40,21 +40,28 @@ Filtering:
 
 Utilities:
 - get_freq_from_eigs: clculate frequency corresponding to eigenvalues
+- assemble_blocks: build block matrices in place from dense/sparse blocks and
+products
+- nbytes: memory used by dense/sparse matrices
 
 Comments:
 - the module supports sparse matrices hence relies on libsparse.
 
+The interconnection routines (couple, series, parallel, addGain and join2)
+assemble the output matrices by blocks into arrays allocated once, without
+converting sparse blocks to dense. The memory used by the input and output
+systems is reported through the module logger.
+
 to do:
 	- remove unnecessary coupling routines
-	- couple function can handle sparse matrices but only outputs dense matrices
-		- verify if typical coupled systems are sparse
-		- update routine
-		- add method to automatically determine whether to use sparse or dense?
+	- add method to automatically determine whether to use sparse or dense?
 """
 
 import copy
+import logging
 import warnings
 import numpy as np
+import scipy.sparse as sparse
 import scipy.signal as scsig
 import scipy.linalg as scalg
 import scipy.interpolate as scint
@@ -62,6 +69,8 @@ import scipy.interpolate as scint
 # dependency
 import sharpy.linear.src.libsparse as libsp
 
+logger = logging.getLogger(__name__)
+
 
 # ------------------------------------------------------------- Dedicated class
 
@@ -290,8 +299,14 @@ class ss():
     def remove_inout_channels(self, retain_channels, where):
         remove_inout_channels(self, retain_channels, where)
 
+    @property
+    def nbytes(self):
+        """Memory used by the system matrices, in bytes."""
+        return sum(nbytes(M) for M in self.get_mats())
+
     def summary(self):
-        msg = 'State-space system\nStates: %g\nInputs: %g\nOutputs: %g\n' % (self.states, self.inputs, self.outputs)
+        msg = 'State-space system\nStates: %g\nInputs: %g\nOutputs: %g\nMemory: %.2f MB\n' \
+              % (self.states, self.inputs, self.outputs, self.nbytes / 1024 ** 2)
         return msg
 
     def transfer_function_evaluation(self, s):
@@ -499,6 +514,167 @@ class ss_block():
         return xn1, yn
 
 
+# ------------------------------------------------------- Block assembly utils
+
+# number of elements of the dense temporaries of the products evaluated by blocks of rows
+chunk_elements = 2 ** 22
+
+
+def nbytes(M):
+    """
+    Memory used by a dense or sparse matrix, in bytes.
+    """
+    if M is None:
+        return 0
+    if sparse.issparse(M):
+        return M.data.nbytes + M.indices.nbytes + M.indptr.nbytes
+    return np.asarray(M).nbytes
+
+
+def is_zero(M):
+    """ ``True`` if all entries of the dense or sparse matrix M are zero. """
+    if sparse.issparse(M):
+        return not np.any(M.data)
+    return not np.any(M)
+
+
+def _row_chunks(n_rows, n_cols):
+    chunk = max(1, chunk_elements // max(n_cols, 1))
+    for start in range(0, n_rows, chunk):
+        yield start, min(start + chunk, n_rows)
+
+
+def _dot(A, B):
+    """ Matrix product of dense and/or sparse matrices of any ``scipy.sparse`` format. """
+    if not sparse.issparse(A) and sparse.issparse(B):
+        return B.T.dot(A.T).T
+    return A.dot(B)
+
+
+def _chain_dot(factors):
+    """
+    Product of two or three dense or sparse matrices. Three factors ``L, G, R`` are associated as ``(L G) R`` or
+    ``L (G R)``, whichever requires fewer operations.
+    """
+    if len(factors) == 2:
+        return _dot(*factors)
+    left, gain, right = factors
+    n, a = left.shape
+    b, c = right.shape
+    if n * a * b + n * b * c <= a * b * c + n * a * c:
+        return _dot(_dot(left, gain), right)
+    return _dot(left, _dot(gain, right))
+
+
+def _add_chain_dot(out, factors):
+    """
+    Adds the product of ``factors`` (two or three dense or sparse matrices) to the dense array ``out`` in place.
+
+    The leading factor is split in blocks of rows such that the dense temporaries do not exceed ``chunk_elements``
+    entries. With three factors ``L, G, R``, ``L (G R)`` is evaluated if cheaper than ``(L G) R``, computing
+    ``G R`` only once.
+
+    Returns:
+        int: Size in bytes of the largest temporary
+    """
+    n_rows, n_cols = out.shape
+    temporary = 0
+    if len(factors) == 3:
+        left, gain, right = factors
+        a, b = gain.shape
+        if a * b * n_cols + n_rows * a * n_cols < n_rows * a * b + n_rows * b * n_cols:
+            factors = (left, _dot(gain, right))
+            temporary = nbytes(factors[1])
+
+    left = factors[0].tocsr() if sparse.issparse(factors[0]) else factors[0]
+    for start, end in _row_chunks(n_rows, n_cols):
+        product = left[start:end]
+        for factor in factors[1:]:
+            product = _dot(product, factor)
+        _add_into(out[start:end], product)
+        temporary = max(temporary, (end - start) * n_cols * out.itemsize)
+    return temporary
+
+
+def _add_into(out, M):
+    """ Adds the dense or sparse matrix M to the dense array ``out`` in place. """
+    if sparse.issparse(M):
+        coo = M.tocoo()
+        np.add.at(out, (coo.row, coo.col), coo.data)
+    else:
+        out += M
+
+
+def assemble_blocks(blocks, row_sizes, col_sizes, out_sparse=False):
+    """
+    Assembles a block matrix without intermediate full size copies.
+
+    Each entry of the nested list ``blocks`` is either ``None`` (zero block) or a tuple ``(base, factors)``, where
+    the block is ``base`` plus the product of the matrices in ``factors``. Either can be ``None``. Blocks can be
+    dense or ``libsparse.csc_matrix`` matrices.
+
+    If ``out_sparse`` is ``False``, the output array is allocated once and each block is added to it in place, thus
+    sparse blocks are never converted to dense and products are evaluated by blocks of rows (see
+    :func:`_add_chain_dot`). Else, the output is a ``libsparse.csc_matrix`` assembled from the sparse blocks.
+
+    Args:
+        blocks (list(list)): Block definitions
+        row_sizes (list(int)): Number of rows of each block row
+        col_sizes (list(int)): Number of columns of each block column
+        out_sparse (bool): Return a sparse matrix
+
+    Returns:
+        tuple: Assembled matrix and size in bytes of the largest temporary
+    """
+    row_offsets = np.concatenate(([0], np.cumsum(row_sizes))).astype(int)
+    col_offsets = np.concatenate(([0], np.cumsum(col_sizes))).astype(int)
+    temporary = 0
+
+    if out_sparse:
+        sparse_blocks = []
+        for i_row, row in enumerate(blocks):
+            sparse_row = []
+            for i_col, block in enumerate(row):
+                shape = (row_sizes[i_row], col_sizes[i_col])
+                if block is None or (block[0] is None and block[1] is None):
+                    sparse_row.append(sparse.csc_matrix(shape))
+                    continue
+                base, factors = block
+                value = None
+                if factors is not None:
+                    value = _chain_dot([f if sparse.issparse(f) else sparse.csc_matrix(f) for f in factors])
+                    temporary = max(temporary, nbytes(value))
+                if base is not None:
+                    value = base if value is None else base + value
+                sparse_row.append(sparse.csc_matrix(value))
+            sparse_blocks.append(sparse_row)
+        return libsp.csc_matrix(sparse.bmat(sparse_blocks, format='csc')), temporary
+
+    matrices = [matrix for row in blocks for block in row if block is not None
+                for matrix in [block[0]] + list(block[1] or []) if matrix is not None]
+    # all blocks are zero, e.g. the feedthrough of systems in series without feedthrough
+    dtype = np.result_type(*[matrix.dtype for matrix in matrices]) if matrices else float
+    out = np.zeros((row_offsets[-1], col_offsets[-1]), dtype=dtype)
+    for i_row, row in enumerate(blocks):
+        for i_col, block in enumerate(row):
+            if block is None:
+                continue
+            base, factors = block
+            view = out[row_offsets[i_row]:row_offsets[i_row + 1], col_offsets[i_col]:col_offsets[i_col + 1]]
+            if base is not None:
+                _add_into(view, base)
+            if factors is not None:
+                temporary = max(temporary, _add_chain_dot(view, factors))
+    return out, temporary
+
+
+def _log_memory(operation, inputs, output, temporary):
+    """ Reports the memory used by the input and output systems of an interconnection. """
+    logger.info('%s: inputs %.2f MB, output %.2f MB, largest temporary %.2f MB' %
+                (operation, sum(system.nbytes for system in inputs) / 1024 ** 2, output.nbytes / 1024 ** 2,
+                 temporary / 1024 ** 2))
+
+
 # ---------------------------------------- Methods for state-space manipulation
 def project(ss_here,WT,V):
     '''
@@ -526,8 +702,15 @@ def couple(ss01, ss02, K12, K21, out_sparse=False):
     Couples 2 dlti systems ss01 and ss02 through the gains K12 and K21, where
     K12 transforms the output of ss02 into an input of ss01.
 
+    The coupled matrices are assembled by blocks (see assemble_blocks): they
+    are allocated once, sparse blocks are not converted to dense and the
+    products of the state-space matrices with the coupling gains are evaluated
+    by blocks of rows. The self-influence terms are skipped if the feedthrough
+    matrices D1 or D2 are zero.
+
     Other inputs:
-    - out_sparse: if True, the output system is stored as sparse (not recommended)
+    - out_sparse: if True, the output system is stored as sparse, retaining the
+    sparsity of the input systems
     """
 
     assert np.abs(ss01.dt - ss02.dt) < 1e-10 * ss01.dt, 'Time-steps not matching!'
@@ -545,56 +728,55 @@ def couple(ss01, ss02, K12, K21, out_sparse=False):
     Nx2, Nu2 = B2.shape
     Ny2 = C2.shape[0]
 
-    #  terms to invert
-    maxD1 = np.max(np.abs(D1))
-    maxD2 = np.max(np.abs(D2))
-    if maxD1 < 1e-32:
-        pass
-    if maxD2 < 1e-32:
-        pass
-
-    # compute self-influence gains
-    K11 = libsp.dot(K12, libsp.dot(D2, K21))
-    K22 = libsp.dot(K21, libsp.dot(D1, K12))
-
-    # left hand side terms
-    L1 = libsp.dot(-K11, D1)
-    L2 = libsp.dot(-K22, D2)
-    L1 += libsp.eye_as(L1)
-    L2 += libsp.eye_as(L2)
+    # terms to invert
+    D1_zero = is_zero(D1)
+    D2_zero = is_zero(D2)
 
     # coupling terms
-    cpl_12 = libsp.solve(L1, K12)
-    cpl_21 = libsp.solve(L2, K21)
-
-    cpl_11 = libsp.dot(cpl_12, libsp.dot(D2, K21))
-    cpl_22 = libsp.dot(cpl_21, libsp.dot(D1, K12))
-
-    # Build coupled system
-    if out_sparse:
-        raise NameError('out_sparse=True not supported yet (verify if worth it first).')
+    if D1_zero or D2_zero:
+        cpl_12 = K12
+        cpl_21 = K21
     else:
-        A = np.block([
-            [libsp.dense(A1 + libsp.dot(libsp.dot(B1, cpl_11), C1)), libsp.dense(libsp.dot(libsp.dot(B1, cpl_12), C2))],
-            [libsp.dense(libsp.dot(libsp.dot(B2, cpl_21), C1)),
-             libsp.dense(A2 + libsp.dot(libsp.dot(B2, cpl_22), C2))]])
-
-        C = np.block([
-            [libsp.dense(C1 + libsp.dot(libsp.dot(D1, cpl_11), C1)), libsp.dense(libsp.dot(libsp.dot(D1, cpl_12), C2))],
-            [libsp.dense(libsp.dot(libsp.dot(D2, cpl_21), C1)),
-             libsp.dense(C2 + libsp.dot(libsp.dot(D2, cpl_22), C2))]])
-
-        B = np.block([
-            [libsp.dense(B1 + libsp.dot(libsp.dot(B1, cpl_11), D1)), libsp.dense(libsp.dot(libsp.dot(B1, cpl_12), D2))],
-            [libsp.dense(libsp.dot(libsp.dot(B2, cpl_21), D1)),
-             libsp.dense(B2 + libsp.dot(libsp.dot(B2, cpl_22), D2))]])
-
-        D = np.block([
-            [libsp.dense(D1 + libsp.dot(libsp.dot(D1, cpl_11), D1)), libsp.dense(libsp.dot(libsp.dot(D1, cpl_12), D2))],
-            [libsp.dense(libsp.dot(libsp.dot(D2, cpl_21), D1)),
-             libsp.dense(D2 + libsp.dot(libsp.dot(D2, cpl_22), D2))]])
-
-    return ss(A, B, C, D, dt=ss01.dt)
+        # compute self-influence gains
+        K11 = libsp.dot(K12, libsp.dot(D2, K21))
+        K22 = libsp.dot(K21, libsp.dot(D1, K12))
+
+        # left hand side terms
+        L1 = libsp.dot(-K11, D1)
+        L2 = libsp.dot(-K22, D2)
+        L1 += libsp.eye_as(L1)
+        L2 += libsp.eye_as(L2)
+
+        cpl_12 = libsp.solve(L1, K12)
+        cpl_21 = libsp.solve(L2, K21)
+
+    cpl_11 = None if D2_zero else libsp.dot(cpl_12, libsp.dot(D2, K21))
+    cpl_22 = None if D1_zero else libsp.dot(cpl_21, libsp.dot(D1, K12))
+
+    def block(base, left, gain, right):
+        # base + left * gain * right
+        if gain is None or left is D1 and D1_zero or left is D2 and D2_zero \
+                or right is D1 and D1_zero or right is D2 and D2_zero:
+            return None if base is None else (base, None)
+        return (base, (left, gain, right))
+
+    A, tmp_A = assemble_blocks([[block(A1, B1, cpl_11, C1), block(None, B1, cpl_12, C2)],
+                                [block(None, B2, cpl_21, C1), block(A2, B2, cpl_22, C2)]],
+                               [Nx1, Nx2], [Nx1, Nx2], out_sparse)
+    B, tmp_B = assemble_blocks([[block(B1, B1, cpl_11, D1), block(None, B1, cpl_12, D2)],
+                                [block(None, B2, cpl_21, D1), block(B2, B2, cpl_22, D2)]],
+                               [Nx1, Nx2], [Nu1, Nu2], out_sparse)
+    C, tmp_C = assemble_blocks([[block(C1, D1, cpl_11, C1), block(None, D1, cpl_12, C2)],
+                                [block(None, D2, cpl_21, C1), block(C2, D2, cpl_22, C2)]],
+                               [Ny1, Ny2], [Nx1, Nx2], out_sparse)
+    D, tmp_D = assemble_blocks([[block(D1, D1, cpl_11, D1), block(None, D1, cpl_12, D2)],
+                                [block(None, D2, cpl_21, D1), block(D2, D2, cpl_22, D2)]],
+                               [Ny1, Ny2], [Nu1, Nu2], out_sparse)
+
+    sc = ss(A, B, C, D, dt=ss01.dt)
+    _log_memory('couple', [ss01, ss02], sc, max(tmp_A, tmp_B, tmp_C, tmp_D))
+
+    return sc
 
 def disc2cont(sys):
     r"""
@@ -855,11 +1037,12 @@ def freqresp(SS, wv, dlti=True):
     return Yfreq
 
 
-def series(SS01, SS02):
+def series(SS01, SS02, out_sparse=False):
     r"""
     Connects two state-space blocks in series. If these are instances of DLTI
-    state-space systems, they need to have the same type and time-step. If the input systems are sparse, they are
-    converted to dense.
+    state-space systems, they need to have the same type and time-step. The matrices are assembled by blocks (see
+    :func:`assemble_blocks`), thus sparse input systems are not converted to dense, but the output system is dense
+    unless ``out_sparse`` is ``True``.
 
     The connection is such that:
 
@@ -870,9 +1053,10 @@ def series(SS01, SS02):
     Args:
         SS01 (libss.ss): State Space 1 instance. Can be DLTI/CLTI, dense or sparse.
         SS02 (libss.ss): State Space 2 instance. Can be DLTI/CLTI, dense or sparse.
+        out_sparse (bool): Return a system with sparse matrices.
 
     Returns
-        libss.ss: Combined state space system in series in dense format.
+        libss.ss: Combined state space system in series.
     """
 
     if type(SS01) is not type(SS02):
@@ -882,34 +1066,39 @@ def series(SS01, SS02):
 
     # determine size of total system
     Nst01, Nst02 = SS01.states, SS02.states
-    Nst = Nst01 + Nst02
     Nin = SS01.inputs
     Nout = SS02.outputs
 
-    # Build A matrix
-    A = np.zeros((Nst, Nst))
-
-    A[:Nst01, :Nst01] = libsp.dense(SS01.A)
-    A[Nst01:, Nst01:] = libsp.dense(SS02.A)
-    A[Nst01:, :Nst01] = libsp.dense(libsp.dot(SS02.B, SS01.C))
+    D1_zero = is_zero(SS01.D)
+    D2_zero = is_zero(SS02.D)
 
-    # Build the rest
-    B = np.concatenate((libsp.dense(SS01.B), libsp.dense(libsp.dot(SS02.B, SS01.D))), axis=0)
-    C = np.concatenate((libsp.dense(libsp.dot(SS02.D, SS01.C)), libsp.dense(SS02.C)), axis=1)
-    D = libsp.dense(libsp.dot(SS02.D, SS01.D))
+    A, tmp_A = assemble_blocks([[(SS01.A, None), None],
+                                [(None, (SS02.B, SS01.C)), (SS02.A, None)]],
+                               [Nst01, Nst02], [Nst01, Nst02], out_sparse)
+    B, tmp_B = assemble_blocks([[(SS01.B, None)],
+                                [None if D1_zero else (None, (SS02.B, SS01.D))]],
+                               [Nst01, Nst02], [Nin], out_sparse)
+    C, tmp_C = assemble_blocks([[None if D2_zero else (None, (SS02.D, SS01.C)), (SS02.C, None)]],
+                               [Nout], [Nst01, Nst02], out_sparse)
+    D, tmp_D = assemble_blocks([[None if D1_zero or D2_zero else (None, (SS02.D, SS01.D))]],
+                               [Nout], [Nin], out_sparse)
 
     SStot = ss(A, B, C, D, dt=SS01.dt)
+    _log_memory('series', [SS01, SS02], SStot, max(tmp_A, tmp_B, tmp_C, tmp_D))
 
     return SStot
 
 
-def parallel(SS01, SS02):
+def parallel(SS01, SS02, out_sparse=False):
     """
     Returns the sum (or parallel connection of two systems). Given two state-space
     models with the same output, but different input:
         u1 --> SS01 --> y
         u2 --> SS02 --> y
 
+    If the inputs are libss.ss instances, the output is a libss.ss instance
+    assembled by blocks (see assemble_blocks), which is stored as sparse if
+    out_sparse is True. Otherwise, a scipy.signal.dlti instance is returned.
     """
 
     if type(SS01) is not type(SS02):
@@ -930,6 +1119,18 @@ def parallel(SS01, SS02):
     Nin01, Nin02 = SS01.inputs, SS02.inputs
     Nin = Nin01 + Nin02
 
+    if isinstance(SS01, ss):
+        A, tmp_A = assemble_blocks([[(SS01.A, None), None], [None, (SS02.A, None)]],
+                                   [Nst01, Nst02], [Nst01, Nst02], out_sparse)
+        B, tmp_B = assemble_blocks([[(SS01.B, None), None], [None, (SS02.B, None)]],
+                                   [Nst01, Nst02], [Nin01, Nin02], out_sparse)
+        C, tmp_C = assemble_blocks([[(SS01.C, None), (SS02.C, None)]], [Nout], [Nst01, Nst02], out_sparse)
+        D, tmp_D = assemble_blocks([[(SS01.D, None), (SS02.D, None)]], [Nout], [Nin01, Nin02], out_sparse)
+
+        SStot = ss(A, B, C, D, dt=SS01.dt)
+        _log_memory('parallel', [SS01, SS02], SStot, max(tmp_A, tmp_B, tmp_C, tmp_D))
+        return SStot
+
     # Build A,B matrix
     A = np.zeros((Nst, Nst))
     A[:Nst01, :Nst01] = SS01.A
@@ -1040,45 +1241,52 @@ def addGain(SShere, Kmat, where):
        { u_2 -> y_2= Kmat*u_2    =>    u_new=(u_1,u_2) -> SSnew -> y=y_1+y_2
         {y = y_1+y_2
          -
-    Warning: function not tested for Kmat stored in sparse format
+    Dense and sparse (libsparse.csc_matrix) systems and gains are supported.
+    Matrices not affected by the gain are shared with the input system, and
+    sparse matrices are kept sparse.
     """
 
     assert where in ['in', 'out', 'parallel-down', 'parallel-up'], \
         'Specify whether gains are added to input or output'
 
+    temporary = 0
     if where == 'in':
         A = SShere.A
-        B = SShere.B.dot(Kmat)
+        B = libsp.dot(SShere.B, Kmat)
         C = SShere.C
-        D = SShere.D.dot(Kmat)
+        D = libsp.dot(SShere.D, Kmat)
 
     if where == 'out':
         A = SShere.A
         B = SShere.B
-        C = Kmat.dot(SShere.C)
-        D = Kmat.dot(SShere.D)
-
-    if where == 'parallel-down':
-        A = SShere.A
-        C = SShere.C
-        B = np.block([SShere.B, np.zeros((SShere.B.shape[0], Kmat.shape[1]))])
-        D = np.block([SShere.D, Kmat])
+        C = libsp.dot(Kmat, SShere.C)
+        D = libsp.dot(Kmat, SShere.D)
 
-    if where == 'parallel-up':
+    if where in ['parallel-down', 'parallel-up']:
         A = SShere.A
         C = SShere.C
-        B = np.block([np.zeros((SShere.B.shape[0], Kmat.shape[1])), SShere.B])
-        D = np.block([Kmat, SShere.D])
+        Nx, Nu = SShere.B.shape
+        Ny, Nk = Kmat.shape
+        if where == 'parallel-down':
+            B, tmp_B = assemble_blocks([[(SShere.B, None), None]], [Nx], [Nu, Nk], sparse.issparse(SShere.B))
+            D, tmp_D = assemble_blocks([[(SShere.D, None), (Kmat, None)]], [Ny], [Nu, Nk],
+                                       sparse.issparse(SShere.D))
+        else:
+            B, tmp_B = assemble_blocks([[None, (SShere.B, None)]], [Nx], [Nk, Nu], sparse.issparse(SShere.B))
+            D, tmp_D = assemble_blocks([[(Kmat, None), (SShere.D, None)]], [Ny], [Nk, Nu],
+                                       sparse.issparse(SShere.D))
+        temporary = max(tmp_B, tmp_D)
 
     if SShere.dt == None:
         SSnew = ss(A, B, C, D)
     else:
         SSnew = ss(A, B, C, D, dt=SShere.dt)
+    _log_memory('addGain', [SShere], SSnew, temporary)
 
     return SSnew
 
 
-def join2(SS1, SS2):
+def join2(SS1, SS2, out_sparse=False):
     r"""
     Join two state-spaces or gain matrices such that, given:
 
@@ -1096,14 +1304,51 @@ def join2(SS1, SS2):
     The output :math:`\mathbf{SS}_{TOT}` is either a gain matrix or a state-space system according
     to the input :math:`\mathbf{SS}_1` and :math:`\mathbf{SS}_2`
 
+    If either input is a :class:`ss` instance, the output is a :class:`ss` instance assembled by blocks (see
+    :func:`assemble_blocks`), stored as sparse if ``out_sparse`` is ``True``.
+
     Args:
-        SS1 (scsig.StateSpace or np.ndarray): State space 1 or gain 1
-        SS2 (scsig.StateSpace or np.ndarray): State space 2 or gain 2
+        SS1 (libss.ss or scsig.StateSpace or np.ndarray): State space 1 or gain 1
+        SS2 (libss.ss or scsig.StateSpace or np.ndarray): State space 2 or gain 2
+        out_sparse (bool): Store the output :class:`ss` system as sparse
 
     Returns:
-        scsig.StateSpace or np.ndarray: combined state space or gain matrix
+        libss.ss or scsig.StateSpace or np.ndarray: combined state space or gain matrix
 
     """
+    if isinstance(SS1, ss) or isinstance(SS2, ss):
+
+        systems = [SS1, SS2]
+        for system in systems:
+            assert isinstance(system, ss) or type(system) in libsp.SupportedTypes, \
+                'Input types not recognised in any implemented option!'
+        state_spaces = [system for system in systems if isinstance(system, ss)]
+        if len(state_spaces) == 2:
+            assert SS1.dt == SS2.dt, 'State-space models must have the same time-step'
+
+        # gains are systems without states
+        Nx = [system.states if isinstance(system, ss) else 0 for system in systems]
+        Nu = [system.inputs if isinstance(system, ss) else system.shape[1] for system in systems]
+        Ny = [system.outputs if isinstance(system, ss) else system.shape[0] for system in systems]
+
+        def diagonal(matrix_name):
+            blocks = [[None, None], [None, None]]
+            for i_sys, system in enumerate(systems):
+                if isinstance(system, ss):
+                    blocks[i_sys][i_sys] = (getattr(system, matrix_name), None)
+                elif matrix_name == 'D':
+                    blocks[i_sys][i_sys] = (system, None)
+            return blocks
+
+        A, tmp_A = assemble_blocks(diagonal('A'), Nx, Nx, out_sparse)
+        B, tmp_B = assemble_blocks(diagonal('B'), Nx, Nu, out_sparse)
+        C, tmp_C = assemble_blocks(diagonal('C'), Ny, Nx, out_sparse)
+        D, tmp_D = assemble_blocks(diagonal('D'), Ny, Nu, out_sparse)
+
+        SStot = ss(A, B, C, D, dt=state_spaces[0].dt)
+        _log_memory('join2', state_spaces, SStot, max(tmp_A, tmp_B, tmp_C, tmp_D))
+        return SStot
+
     type_dlti = scsig.ltisys.StateSpaceDiscrete
 
     if isinstance(SS1, np.ndarray) and isinstance(SS2, np.ndarray):
@@ -8,6 +8,7 @@ N. Goizueta
 import numpy as np
 import scipy as sc
 import scipy.signal as scsig
+import scipy.sparse as scsp
 import sharpy.linear.src.libss as libss
 import sharpy.utils.algebra as algebra
 import sharpy.utils.settings as settings
@@ -501,7 +502,6 @@ class FlexDynamic():
             except ValueError:
                 pass
 
-        num_node = tsstr.num_node
         flex_dof = 6 * sum(self.structure.vdof >= 0)
         if self.use_euler:
             rig_dof = 9
@@ -512,6 +512,9 @@ class FlexDynamic():
             # Projection matrices - this projects the vector in G t to A
             Pag = Cga
             Pga = Cag
+
+            orient = tsstr.euler
+            der_orient_by_v = algebra.der_Peuler_by_v
         else:
             rig_dof = 10
             # get projection matrix A->G
@@ -522,156 +525,107 @@ class FlexDynamic():
             Pag = Cag.T
             Pga = Pag.T
 
+            orient = tsstr.quat
+            der_orient_by_v = algebra.der_CquatT_by_v
+        orient_cols = np.arange(rig_dof - len(orient), rig_dof)
+
         # Mass matrix partitions for CG calculations
         Mss = self.Mstr[:flex_dof, :flex_dof]
         Mrr = self.Mstr[-rig_dof:, -rig_dof:]
 
-        # Initialise damping and stiffness gravity terms
+        # Initialise damping gravity terms of the rigid body equations
         Crr_grav = np.zeros((rig_dof, rig_dof))
-        Csr_grav = np.zeros((flex_dof, rig_dof))
-        Crr_debug = np.zeros((rig_dof, rig_dof))
-        Krs_grav = np.zeros((rig_dof, flex_dof))
-        Kss_grav = np.zeros((flex_dof, flex_dof))
 
         # Overall CG in A frame
         Xcg_A = -np.array([Mrr[2, 4], Mrr[0, 5], Mrr[1, 3]]) / Mrr[0, 0]
-        Xcg_Askew = algebra.skew(Xcg_A)
 
         if self.settings['print_info']:
             cout.cout_wrap('\tM = %.2f kg' % Mrr[0, 0], 1)
             cout.cout_wrap('\tX_CG A -> %.2f %.2f %.2f' %(Xcg_A[0], Xcg_A[1], Xcg_A[2]), 1)
 
-        FgravA = np.zeros(3)
-        FgravG = np.zeros(3)
-
-        for i_node in range(num_node):
-            # Gravity forces at the linearisation condition (from NL SHARPy in A frame)
-            fgravA = tsstr.gravity_forces[i_node, :3]
-            fgravG = Pga.dot(fgravA)
-            # fgravG = tsstr.gravity_forces[i_node, :3]
-            mgravA = tsstr.gravity_forces[i_node, 3:]
-            fgravA = Pag.dot(fgravG)
-            mgravG = Pag.dot(mgravA)
-
-            # Get nodal position - A frame
-            Ra = tsstr.pos[i_node, :]
-
-            # retrieve element and local index
-            ee, node_loc = self.structure.node_master_elem[i_node, :]
-            psi = tsstr.psi[ee, node_loc, :]
-            Cab = algebra.crv2rotation(psi)
-            Cba = Cab.T
-            Cbg = Cba.dot(Pag)
-
-            # Tangential operator for moments calculation
-            Tan = algebra.crv2tan(psi)
-
-            jj = 0  # nodal dof index
-            bc_at_node = self.structure.boundary_conditions[i_node]  # Boundary conditions at the node
-
-            if bc_at_node == 1:  # clamp (only rigid-body)
-                dofs_at_node = 0
-                jj_tra, jj_rot = [], []
-
-            elif bc_at_node == -1 or bc_at_node == 0:  # (rigid+flex body)
-                dofs_at_node = 6
-                jj_tra = 6 * self.structure.vdof[i_node] + np.array([0, 1, 2], dtype=int)  # Translations
-                jj_rot = 6 * self.structure.vdof[i_node] + np.array([3, 4, 5], dtype=int)  # Rotations
-            else:
-                raise NameError('Invalid boundary condition (%d) at node %d!' \
-                                % (bc_at_node, i_node))
-
-            jj += dofs_at_node
-
-            if bc_at_node != 1:
-                # Nodal centre of gravity (in the case of additional lumped masses, else should be zero)
-                Mss_indices = np.concatenate((jj_tra, jj_rot))
-                Mss_node = Mss[Mss_indices,:]
-                Mss_node = Mss_node[:, Mss_indices]
-                Xcg_B = Cba.dot(-np.array([Mss_node[2, 4], Mss_node[0, 5], Mss_node[1, 3]]) / Mss_node[0, 0])
-                Xcg_Bskew = algebra.skew(Xcg_B)
-
-                # Nodal CG in A frame
-                Xcg_A_n = Ra + Cab.dot(Xcg_B)
-                Xcg_A_n_skew = algebra.skew(Xcg_A_n)
-
-                # Nodal CG in G frame - debug
-                Xcg_G_n = Pga.dot(Xcg_A_n)
-
-                if self.settings['print_info']:
-                    cout.cout_wrap("Node %2d \t-> B %.3f %.3f %.3f" %(i_node, Xcg_B[0], Xcg_B[1], Xcg_B[2]), 2)
-                    cout.cout_wrap("\t\t\t-> A %.3f %.3f %.3f" %(Xcg_A_n[0], Xcg_A_n[1], Xcg_A_n[2]), 2)
-                    cout.cout_wrap("\t\t\t-> G %.3f %.3f %.3f" %(Xcg_G_n[0], Xcg_G_n[1], Xcg_G_n[2]), 2)
-                    cout.cout_wrap("\tNode mass:", 2)
-                    cout.cout_wrap("\t\tMatrix: %.4f" % Mss_node[0, 0], 2)
-                    # cout.cout_wrap("\t\tGrav: %.4f" % (np.linalg.norm(fgravG)/9.81), 2)
-
-            if self.use_euler:
-                if bc_at_node != 1:
-                    # Nodal moments due to gravity -> linearisation terms wrt to delta_psi
-                    Kss_grav[np.ix_(jj_rot, jj_rot)] -= Tan.dot(Xcg_Bskew.dot(algebra.der_Ccrv_by_v(psi, fgravA)))
-                    Kss_grav[np.ix_(jj_rot, jj_rot)] -= algebra.der_TanT_by_xv(psi, Xcg_Bskew.dot(Cbg.dot(fgravG)))
-
-                    # Nodal forces due to gravity -> linearisation terms wrt to delta_euler
-                    Csr_grav[jj_tra, -3:] -= algebra.der_Peuler_by_v(tsstr.euler, fgravG)
-
-                    # Nodal moments due to gravity -> linearisation terms wrt to delta_euler
-                    Csr_grav[jj_rot, -3:] -= Tan.dot(Xcg_Bskew.dot(Cba.dot(algebra.der_Peuler_by_v(tsstr.euler, fgravG))))
-
-                    # Total moments -> linearisation terms wrt to delta_Ra
-                    # These terms are not affected by the Euler matrix. Sign is correct (+)
-                    Krs_grav[3:6, jj_tra] += algebra.skew(fgravA)
-
-                    # Total moments -> linearisation terms wrt to delta_Psi
-                    Krs_grav[3:6, jj_rot] += np.dot(algebra.skew(fgravA), algebra.der_Ccrv_by_v(psi, Xcg_B))
-
-            else:
-                if bc_at_node != 1:
-                    # Nodal moments due to gravity -> linearisation terms wrt to delta_psi
-                    Kss_grav[np.ix_(jj_rot, jj_rot)] -= Tan.dot(Xcg_Bskew.dot(algebra.der_Ccrv_by_v(psi, fgravA)))
-                    Kss_grav[np.ix_(jj_rot, jj_rot)] -= algebra.der_TanT_by_xv(psi, Xcg_Bskew.dot(Cbg.dot(fgravG)))
-
-                    # Total moments -> linearisation terms wrt to delta_Ra
-                    # Check sign (in theory it should be +=)
-                    Krs_grav[3:6, jj_tra] += algebra.skew(fgravA)
-
-                    # Total moments -> linearisation terms wrt to delta_Psi
-                    Krs_grav[3:6, jj_rot] += np.dot(algebra.skew(fgravA), algebra.der_Ccrv_by_v(psi, Xcg_B))
-
-                    # Nodal forces due to gravity -> linearisation terms wrt to delta_euler
-                    Csr_grav[jj_tra, -4:] -= algebra.der_CquatT_by_v(tsstr.quat, fgravG) # ok
-                    # Crr_grav[:3, -4:] -= algebra.der_CquatT_by_v(tsstr.quat, fgravG)  # not ok - see below
+        # Gravity forces at the linearisation condition (from NL SHARPy in A frame)
+        fgravG = tsstr.gravity_forces[:, :3].dot(Pga.T)
+        fgravA = fgravG.dot(Pag.T)
+        FgravA = np.sum(fgravA, axis=0)
+        FgravG = np.sum(fgravG, axis=0)
+
+        # Nodal terms of the flexible nodes (clamped nodes only contribute to the total forces)
+        i_flex, jj_tra, jj_rot = self.flexible_node_dofs()
+        fgravA = fgravA[i_flex]
+        fgravG = fgravG[i_flex]
+        Ra = tsstr.pos[i_flex, :]  # nodal position - A frame
+
+        ee, node_loc = self.structure.node_master_elem[i_flex, 0], self.structure.node_master_elem[i_flex, 1]
+        psi = tsstr.psi[ee, node_loc, :]
+        Cab = algebra.crv2rotation_batch(psi)
+        Cba = np.swapaxes(Cab, -1, -2)
+        Cbg = Cba.dot(Pag)
+
+        # Tangential operator for moments calculation
+        Tan = algebra.crv2tan_batch(psi)
+
+        # Nodal centre of gravity (in the case of additional lumped masses, else should be zero)
+        Mss_indices = np.concatenate((jj_tra, jj_rot), axis=1)
+        Mss_node = Mss[Mss_indices[:, :, None], Mss_indices[:, None, :]]
+        Xcg_B = np.einsum('nij,nj->ni', Cba,
+                          -np.column_stack((Mss_node[:, 2, 4], Mss_node[:, 0, 5], Mss_node[:, 1, 3]))
+                          / Mss_node[:, 0, 0, None])
+        Xcg_Bskew = algebra.skew_batch(Xcg_B)
 
-                    # Nodal moments due to gravity -> linearisation terms wrt to delta_euler
-                    Csr_grav[jj_rot, -4:] -= Tan.dot(Xcg_Bskew.dot(Cba.dot(algebra.der_CquatT_by_v(tsstr.quat, fgravG))))
-
-
-            # Debugging:
-            FgravA += fgravA
-            FgravG += fgravG
-
-        if self.use_euler:
-            # Total gravity forces acting at the A frame
-            Crr_grav[:3, -3:] -= algebra.der_Peuler_by_v(tsstr.euler, FgravG)
-
-            # Total moments due to gravity in A frame
-            Crr_grav[3:6, -3:] -= algebra.skew(Xcg_A).dot(algebra.der_Peuler_by_v(tsstr.euler, FgravG))
-        else:
-            # Total gravity forces acting at the A frame
-            Crr_grav[:3, -4:] -= algebra.der_CquatT_by_v(tsstr.quat, FgravG)
-
-            # Total moments due to gravity in A frame
-            Crr_grav[3:6, -4:] -= algebra.skew(Xcg_A).dot(algebra.der_CquatT_by_v(tsstr.quat, FgravG))
+        if self.settings['print_info']:
+            # Nodal CG in A and G frames - debug
+            Xcg_A_n = Ra + np.einsum('nij,nj->ni', Cab, Xcg_B)
+            Xcg_G_n = Xcg_A_n.dot(Pga.T)
+            for i_node, Xcg_B_node, Xcg_A_node, Xcg_G_node, Mss_node_node in \
+                    zip(i_flex, Xcg_B, Xcg_A_n, Xcg_G_n, Mss_node):
+                cout.cout_wrap("Node %2d \t-> B %.3f %.3f %.3f" %(i_node, Xcg_B_node[0], Xcg_B_node[1], Xcg_B_node[2]), 2)
+                cout.cout_wrap("\t\t\t-> A %.3f %.3f %.3f" %(Xcg_A_node[0], Xcg_A_node[1], Xcg_A_node[2]), 2)
+                cout.cout_wrap("\t\t\t-> G %.3f %.3f %.3f" %(Xcg_G_node[0], Xcg_G_node[1], Xcg_G_node[2]), 2)
+                cout.cout_wrap("\tNode mass:", 2)
+                cout.cout_wrap("\t\tMatrix: %.4f" % Mss_node_node[0, 0], 2)
+
+        # Derivatives of the projected gravity forces w.r.t. the orientation. These are linear in the forces, thus
+        # they are obtained for all nodes from the derivatives of the projected unit vectors
+        der_orient_basis = np.array([der_orient_by_v(orient, unit_vector) for unit_vector in np.eye(3)])
+        Der_orient = np.einsum('nk,kij->nij', fgravG, der_orient_basis)
+
+        # Nodal moments due to gravity -> linearisation terms wrt to delta_psi
+        Kss_grav = sparse_from_blocks(
+            [(jj_rot, jj_rot, -Tan @ Xcg_Bskew @ algebra.der_Ccrv_by_v_batch(psi, fgravA)
+              - algebra.der_TanT_by_xv_batch(psi, np.einsum('nij,njk,nk->ni', Xcg_Bskew, Cbg, fgravG)))],
+            (flex_dof, flex_dof))
+
+        Csr_grav = sparse_from_blocks(
+            # Nodal forces due to gravity -> linearisation terms wrt to delta_euler (or delta_quat)
+            [(jj_tra, orient_cols, -Der_orient),
+             # Nodal moments due to gravity -> linearisation terms wrt to delta_euler (or delta_quat)
+             (jj_rot, orient_cols, -Tan @ Xcg_Bskew @ Cba @ Der_orient)],
+            (flex_dof, rig_dof))
+
+        fgravA_skew = algebra.skew_batch(fgravA)
+        Krs_grav = sparse_from_blocks(
+            # Total moments -> linearisation terms wrt to delta_Ra
+            # These terms are not affected by the Euler matrix. Sign is correct (+)
+            [(np.arange(3, 6), jj_tra, fgravA_skew),
+             # Total moments -> linearisation terms wrt to delta_Psi
+             (np.arange(3, 6), jj_rot, fgravA_skew @ algebra.der_Ccrv_by_v_batch(psi, Xcg_B))],
+            (rig_dof, flex_dof))
+
+        # Total gravity forces acting at the A frame
+        Crr_grav[:3, orient_cols] -= der_orient_by_v(orient, FgravG)
+
+        # Total moments due to gravity in A frame
+        Crr_grav[3:6, orient_cols] -= algebra.skew(Xcg_A).dot(der_orient_by_v(orient, FgravG))
 
         # Update matrices
-        self.Kstr[:flex_dof, :flex_dof] += Kss_grav
+        add_sparse(self.Kstr, Kss_grav)
 
         if self.Kstr[:flex_dof, :flex_dof].shape != self.Kstr.shape:  # If the beam is free, update rigid terms as well
             self.Cstr[-rig_dof:, -rig_dof:] += Crr_grav
-            self.Cstr[:-rig_dof, -rig_dof:] += Csr_grav
-            self.Kstr[flex_dof:, :flex_dof] += Krs_grav
+            add_sparse(self.Cstr, Csr_grav, col_offset=self.Cstr.shape[1] - rig_dof)
+            add_sparse(self.Kstr, Krs_grav, row_offset=flex_dof)
 
-            # Save gravity matrices for post-processing
+            # Save gravity matrices for post-processing (nodal terms in sparse format)
             self.Crr_grav = Crr_grav
             self.Csr_grav = Csr_grav
             self.Krs_grav = Krs_grav
@@ -683,6 +637,24 @@ class FlexDynamic():
         if self.settings['print_info']:
             cout.cout_wrap('\tUpdated the beam C, modal C and K matrices with the terms from the gravity linearisation\n')
 
+    def flexible_node_dofs(self):
+        """
+        Indices of the flexible (i.e. not clamped) nodes and of their degrees of freedom.
+
+        Returns:
+            tuple: Node indices ``[n_flex]`` and translational and rotational degrees of freedom ``[n_flex, 3]``
+        """
+        bc = self.structure.boundary_conditions
+        invalid = np.flatnonzero((bc != 1) & (bc != 0) & (bc != -1))
+        if len(invalid) > 0:
+            raise NameError('Invalid boundary condition (%d) at node %d!' % (bc[invalid[0]], invalid[0]))
+
+        i_flex = np.flatnonzero(bc != 1)
+        jj_tra = 6 * self.structure.vdof[i_flex, None] + np.array([0, 1, 2], dtype=int)  # Translations
+        jj_rot = 6 * self.structure.vdof[i_flex, None] + np.array([3, 4, 5], dtype=int)  # Rotations
+
+        return i_flex, jj_tra, jj_rot
+
     def linearise_applied_forces(self, tsstr=None):
         r"""
         Linearise externally applied follower forces given in the local ``B`` reference frame.
@@ -772,24 +744,39 @@ class FlexDynamic():
 
         # TODO: Future feature: gains for externally applied forces (i.e. thrust inputs)
 
-        num_node = tsstr.num_node
         flex_dof = 6 * sum(self.structure.vdof >= 0)
         if self.use_euler:
             rig_dof = 9
-            # This is a rotation matrix that rotates a vector from G to A
-            Cag = algebra.euler2rot(tsstr.euler)
-            Cga = Cag.T
-
-            # Projection matrices - this projects the vector in G t to A
-            Pag = Cga
-            Pga = Cag
         else:
             rig_dof = 10
 
-        stiff_flex = np.zeros((flex_dof, flex_dof), dtype=float)  # flex-flex partition of K
-        stiff_rig = np.zeros((rig_dof, flex_dof), dtype=float)  # rig-flex partition of K
-
-        for i_node in range(num_node):
+        # Flexible nodes
+        i_flex, jj_tra, jj_rot = self.flexible_node_dofs()
+        fext_b = self.structure.steady_app_forces[i_flex, :3]
+        mext_b = self.structure.steady_app_forces[i_flex, 3:]
+        Ra = tsstr.pos[i_flex, :]  # nodal position - in A frame
+
+        ee, node_loc = self.structure.node_master_elem[i_flex, 0], self.structure.node_master_elem[i_flex, 1]
+        psi = tsstr.psi[ee, node_loc, :]
+        Cab = algebra.crv2rotation_batch(psi)
+        der_Cab_fext = algebra.der_Ccrv_by_v_batch(psi, fext_b)
+
+        # flex-flex partition of K
+        stiff_flex_blocks = [(jj_tra, jj_rot, -der_Cab_fext),  # Externally applied follower forces
+                             (jj_rot, jj_rot, -algebra.der_TanT_by_xv_batch(psi, mext_b))]  # moments in B frame
+
+        # rig-flex partition of K
+        stiff_rig_blocks = [(np.arange(3), jj_rot, -der_Cab_fext),  # Rigid body contribution
+                            # Total moments
+                            # force contribution
+                            (np.arange(3, 6), jj_tra,
+                             algebra.skew_batch(np.einsum('nij,nj->ni', Cab, fext_b))),  # delta Ra term
+                            (np.arange(3, 6), jj_rot, -algebra.skew_batch(Ra) @ der_Cab_fext  # delta psi term
+                             # moment contribution
+                             - algebra.der_Ccrv_by_v_batch(psi, mext_b))]
+
+        # Clamped nodes
+        for i_node in np.flatnonzero(self.structure.boundary_conditions == 1):
             fext_b = self.structure.steady_app_forces[i_node, :3]
             mext_b = self.structure.steady_app_forces[i_node, 3:]
 
@@ -797,74 +784,38 @@ class FlexDynamic():
             ee, node_loc = self.structure.node_master_elem[i_node, :]
             psi = tsstr.psi[ee, node_loc, :]
             Cab = algebra.crv2rotation(psi)
-            Cba = Cab.T
-
-            # Tangential operator for moments calculation
-            Tan = algebra.crv2tan(psi)
 
             # Get nodal position - in A frame
             Ra = tsstr.pos[i_node, :]
 
-            jj = 0  # nodal dof index
-            bc_at_node = self.structure.boundary_conditions[i_node]  # Boundary conditions at the node
-
-            if bc_at_node == 1:  # clamp (only rigid-body)
-                dofs_at_node = 0
-                jj_tra, jj_rot = [], []
-
-            elif bc_at_node == -1 or bc_at_node == 0:  # (rigid+flex body)
-                dofs_at_node = 6
-                jj_tra = 6 * self.structure.vdof[i_node] + np.array([0, 1, 2], dtype=int)  # Translations
-                jj_rot = 6 * self.structure.vdof[i_node] + np.array([3, 4, 5], dtype=int)  # Rotations
-            else:
-                raise NameError('Invalid boundary condition ({}) at node {}'.format(bc_at_node, i_node))
-
-            jj += dofs_at_node
-
-            if bc_at_node != 1:
-                # Externally applied follower forces
-                stiff_flex[np.ix_(jj_tra, jj_rot)] -= algebra.der_Ccrv_by_v(psi, fext_b)
-                stiff_rig[:3, jj_rot] -= algebra.der_Ccrv_by_v(psi, fext_b)  # Rigid body contribution
-
-                # Externally applied moments in B frame
-                stiff_flex[np.ix_(jj_rot, jj_rot)] -= algebra.der_TanT_by_xv(psi, mext_b)
-
-                # Total moments
-                # force contribution
-                stiff_rig[3:6, jj_tra] += algebra.skew(Cab.dot(fext_b))  # delta Ra term
-                stiff_rig[3:6, jj_rot] -= algebra.skew(Ra).dot(algebra.der_Ccrv_by_v(psi, fext_b))  # delta psi term
-
-                # moment contribution
-                stiff_rig[3:6, jj_rot] -= algebra.der_Ccrv_by_v(psi, mext_b)
-
-            if bc_at_node == 1:
-                # forces applied at the A-frame (clamped node) need special attention since the
-                # node has an associated CRV to it's master element which may not be zero.
-                # forces applied at this node only appear in the rigid-body equations
+            # forces applied at the A-frame (clamped node) need special attention since the
+            # node has an associated CRV to it's master element which may not be zero.
+            # forces applied at this node only appear in the rigid-body equations
+            try:
+                closest_node = self.structure.connectivities[ee, node_loc + 2]
+            except IndexError:  # node is not in the first position
                 try:
-                    closest_node = self.structure.connectivities[ee, node_loc + 2]
-                except IndexError:  # node is not in the first position
-                    try:
-                        closest_node = self.structure.connectivities[ee, node_loc + 1]
-                    except IndexError:  # node is the midpoint
-                        closest_node = self.structure.connectivities[ee, node_loc - 1]
+                    closest_node = self.structure.connectivities[ee, node_loc + 1]
+                except IndexError:  # node is the midpoint
+                    closest_node = self.structure.connectivities[ee, node_loc - 1]
 
-                # indices of the node whos CRV applies to the clamped node
-                jj_rot = 6 * self.structure.vdof[closest_node] + np.array([3, 4, 5], dtype=int)
+            # indices of the node whos CRV applies to the clamped node
+            jj_rot_node = 6 * self.structure.vdof[closest_node] + np.array([3, 4, 5], dtype=int)
 
-                stiff_rig[:3, jj_rot] -= algebra.der_Ccrv_by_v(psi, fext_b)  # Rigid body contribution
+            stiff_rig_blocks += [
+                (np.arange(3), jj_rot_node, -algebra.der_Ccrv_by_v(psi, fext_b)),  # Rigid body contribution
                 # Total moments
                 # force contribution
-                stiff_rig[3:6, jj_rot] += algebra.skew(Cab.dot(fext_b))  # delta Ra term
-                stiff_rig[3:6, jj_rot] -= algebra.skew(Ra).dot(algebra.der_Ccrv_by_v(psi, fext_b))  # delta psi term
-
-                # moment contribution
-                stiff_rig[3:6, jj_rot] -= algebra.der_Ccrv_by_v(psi, mext_b)
+                (np.arange(3, 6), jj_rot_node, algebra.skew(Cab.dot(fext_b))  # delta Ra term
+                 - algebra.skew(Ra).dot(algebra.der_Ccrv_by_v(psi, fext_b))  # delta psi term
+                 # moment contribution
+                 - algebra.der_Ccrv_by_v(psi, mext_b))]
 
-        self.Kstr[:flex_dof, :flex_dof] += stiff_flex
+        add_sparse(self.Kstr, sparse_from_blocks(stiff_flex_blocks, (flex_dof, flex_dof)))
 
         if self.Kstr[:flex_dof, :flex_dof].shape != self.Kstr.shape:  # free flying structure
-            self.Kstr[-rig_dof:, :flex_dof] += stiff_rig
+            add_sparse(self.Kstr, sparse_from_blocks(stiff_rig_blocks, (rig_dof, flex_dof)),
+                       row_offset=self.Kstr.shape[0] - rig_dof)
 
     def assemble(self, Nmodes=None):
         r"""
@@ -1283,6 +1234,36 @@ class FlexDynamic():
         self.dlti = True
 
 
+def sparse_from_blocks(blocks, shape):
+    """
+    Sparse matrix from sets of stacked blocks, summing overlapping entries.
+
+    Args:
+        blocks (list(tuple)): Row indices ``[..., n_rows]``, column indices ``[..., n_cols]`` and values
+          ``[..., n_rows, n_cols]`` of each set of blocks. The indices are broadcast to the shape of the values.
+        shape (tuple): Shape of the matrix
+
+    Returns:
+        scipy.sparse.csr_matrix: Sum of the blocks
+    """
+    rows, cols, data = [], [], []
+    for row_indices, col_indices, values in blocks:
+        values = np.asarray(values)
+        rows.append(np.broadcast_to(np.asarray(row_indices)[..., :, None], values.shape).ravel())
+        cols.append(np.broadcast_to(np.asarray(col_indices)[..., None, :], values.shape).ravel())
+        data.append(values.ravel())
+
+    return scsp.csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))), shape=shape)
+
+
+def add_sparse(matrix, sparse_matrix, row_offset=0, col_offset=0):
+    """
+    Adds in place a sparse matrix to the block of the dense ``matrix`` starting at ``(row_offset, col_offset)``.
+    """
+    sparse_matrix = sparse_matrix.tocoo()
+    matrix[row_offset + sparse_matrix.row, col_offset + sparse_matrix.col] += sparse_matrix.data
+
+
 def newmark_ss(Minv, C, K, dt, num_damp=1e-4):
     r"""
     Produces a discrete-time state-space model of the structural equations
@@ -45,6 +45,9 @@ settings_default_static['vortex_radius'] = vortex_radius_def
 settings_types_static['cfl1'] = 'bool'
 settings_default_static['cfl1'] = True
 
+settings_types_static['num_processes'] = 'int'
+settings_default_static['num_processes'] = 1
+
 settings_types_dynamic = dict()
 settings_default_dynamic = dict()
 
@@ -74,6 +77,9 @@ settings_default_dynamic['vortex_radius'] = vortex_radius_def
 settings_types_dynamic['cfl1'] = 'bool'
 settings_default_dynamic['cfl1'] = True
 
+settings_types_dynamic['num_processes'] = 'int'
+settings_default_dynamic['num_processes'] = 1
+
 
 class Static():
     """	Static linear solver """
@@ -94,6 +100,7 @@ class Static():
 
         self.vortex_radius = settings_here['vortex_radius']
         self.cfl1 = settings_here['cfl1']
+        self.num_processes = settings_here['num_processes']
         MS = multisurfaces.MultiAeroGridSurfaces(tsdata,
                                                  self.vortex_radius,
                                                  for_vel=for_vel)
@@ -144,7 +151,7 @@ class Static():
         # ----------------------------------------------------------- state eq.
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_dqcdzeta_coll, List_nc_dqcdzeta_vert = \
-            ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star)
+            ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         List_AICs, List_AICs_star = ass.AICs(MS.Surfs, MS.Surfs_star,
                                              target='collocation', Project=True)
         List_Wnv = []
@@ -192,7 +199,8 @@ class Static():
         self.Dfqsdzeta = scalg.block_diag(
             *ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star))
         # ... induced velocity contrib.
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star,
+                                                  num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         self.Dfqsdzeta += np.block(List_vert)
@@ -211,7 +219,7 @@ class Static():
         del List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0
         # ... induced velocity contrib.
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         self.Dfqsdgamma += np.block(List_dfqsdvind_gamma)
         self.Dfqsdgamma_star += np.block(List_dfqsdvind_gamma_star)
         del List_dfqsdvind_gamma, List_dfqsdvind_gamma_star
@@ -583,7 +591,8 @@ class Dynamic(Static):
             self.settings['ScalingDict'] = ScalingDict
 
         static_dict = {'vortex_radius': self.settings['vortex_radius'],
-                       'cfl1': self.settings['cfl1']}
+                       'cfl1': self.settings['cfl1'],
+                       'num_processes': self.settings['num_processes']}
         super().__init__(tsdata, custom_settings=static_dict, for_vel=for_vel)
 
         self.dt = self.settings['dt']
@@ -844,7 +853,8 @@ class Dynamic(Static):
             Ass = libsp.csc_matrix(Ass)
 
         # zeta derivs
-        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True)
+        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True,
+                                           num_processes=self.num_processes)
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_domegazetadzeta_vert = ass.nc_domegazetadzeta(MS.Surfs, MS.Surfs_star)
         for ss in range(MS.n_surf):
@@ -888,7 +898,7 @@ class Dynamic(Static):
 
         # gamma (induced velocity contrib.)
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
 
         # gamma (at constant relative velocity)
         List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
@@ -918,7 +928,8 @@ class Dynamic(Static):
         Dss[:, :3 * Kzeta] = scalg.block_diag(
             *ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star))
         # zeta (induced velocity contrib)
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star,
+                                                  num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         Dss[:, :3 * Kzeta] += np.block(List_vert)
@@ -1003,10 +1014,12 @@ class Dynamic(Static):
         zv = np.cos(kvdt) + 1.j * np.sin(kvdt)
         Yfreq = np.empty((self.SS.outputs, self.SS.inputs, Nk,), dtype=np.complex_)
 
+        ###  build Cw complex at all frequencies
+        Cw_cpx_list = self.get_Cw_cpx(zv, settings=wake_prop_settings)
+
         for kk in range(Nk):
 
-            ###  build Cw complex
-            Cw_cpx = self.get_Cw_cpx(zv[kk], settings=wake_prop_settings)
+            Cw_cpx = Cw_cpx_list[kk]
 
             if self.remove_predictor:
                 Ygamma = zv[kk] * \
@@ -1055,6 +1068,7 @@ class Dynamic(Static):
 
             .. math:: \bar{\boldsymbol{\Gamma}}_w = \bar{\mathbf{C}}(z)  \bar{\mathbf{\Gamma}}
 
+        If ``zval`` is an array, a list with the matrix at each value is returned. See :func:`get_Cw_cpx`.
         """
 
         return get_Cw_cpx(self.MS, self.K, self.K_star, zval, settings=settings)
@@ -1266,13 +1280,15 @@ class Dynamic(Static):
             self.Yfreq = np.empty((self.SS.outputs, self.SS.inputs, Nk_low,), dtype=np.complex_)
             self.kv = kv_low
 
+        Cw_cpx_list = self.get_Cw_cpx(zv, settings=wake_prop_settings)
+
         for kk in range(len(kvdt)):
 
             zval = zv[kk]
             Intfact = wv[kk]  # integration factor
 
             #  build terms that will be recycled
-            Cw_cpx = self.get_Cw_cpx(zval, settings=wake_prop_settings)
+            Cw_cpx = Cw_cpx_list[kk]
             PwCw_T = Cw_cpx.T.dot(Pw.T)
             Kernel = np.linalg.inv(zval * Eye - P - PwCw_T.T)
 
@@ -1948,7 +1964,8 @@ class DynamicBlock(Dynamic):
         AinvAWCgammaW = None
 
         # zeta derivs
-        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True)
+        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True,
+                                           num_processes=self.num_processes)
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_domegazetadzeta_vert = ass.nc_domegazetadzeta(MS.Surfs, MS.Surfs_star)
         for ss in range(MS.n_surf):
@@ -1996,7 +2013,7 @@ class DynamicBlock(Dynamic):
 
         # gamma (induced velocity contrib.)
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
 
         # gamma (at constant relative velocity)
         List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
@@ -2024,7 +2041,8 @@ class DynamicBlock(Dynamic):
             [scalg.block_diag(*ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star))])
 
         # zeta (induced velocity contrib)
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star,
+                                                  num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         Dss[0][0] += np.block(List_vert)
@@ -2073,10 +2091,12 @@ class DynamicBlock(Dynamic):
         zv = np.cos(kvdt) + 1.j * np.sin(kvdt)
         Yfreq = np.empty((self.SS.outputs, self.SS.inputs, Nk,), dtype=np.complex_)
 
+        ###  build Cw complex at all frequencies
+        Cw_cpx_list = self.get_Cw_cpx(zv, settings=wake_prop_settings)
+
         for kk in range(Nk):
 
-            ###  build Cw complex
-            Cw_cpx = self.get_Cw_cpx(zv[kk], settings=wake_prop_settings)
+            Cw_cpx = Cw_cpx_list[kk]
 
             Ygamma = libsp.solve(zv[kk] * Eye - P -
                                  libsp.dot(Pw, Cw_cpx, type_out=libsp.csc_matrix),
@@ -2295,13 +2315,15 @@ class DynamicBlock(Dynamic):
             self.Yfreq = np.empty((self.SS.outputs, self.SS.inputs, Nk_low,), dtype=np.complex_)
             self.kv = kv_low
 
+        Cw_cpx_list = self.get_Cw_cpx(zv, settings=wake_prop_settings)
+
         for kk in range(len(kvdt)):
 
             zval = zv[kk]
             Intfact = wv[kk]  # integration factor
 
             #  build terms that will be recycled
-            Cw_cpx = self.get_Cw_cpx(zval, settings=wake_prop_settings)
+            Cw_cpx = Cw_cpx_list[kk]
             P_PwCw = P + Cw_cpx.T.dot(Pw.T).T
             Kernel = np.linalg.inv(zval * Eye - P_PwCw)
 
@@ -2719,7 +2741,8 @@ class Frequency(Static):
         List_AICs, List_AICs_star = None, None
 
         # zeta derivs
-        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True)
+        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True,
+                                           num_processes=self.num_processes)
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_domegazetadzeta_vert = ass.nc_domegazetadzeta(MS.Surfs, MS.Surfs_star)
         for ss in range(MS.n_surf):
@@ -2749,7 +2772,7 @@ class Frequency(Static):
 
         # gamma (induced velocity contrib.)
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
 
         # gamma (at constant relative velocity)
         List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
@@ -2779,7 +2802,8 @@ class Frequency(Static):
         Dss[:, :3 * Kzeta] = scalg.block_diag(
             *ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star))
         # zeta (induced velocity contrib)
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star,
+                                                  num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         Dss[:, :3 * Kzeta] += np.block(List_vert)
@@ -2841,11 +2865,13 @@ class Frequency(Static):
         zv = np.cos(kvdt) + 1.j * np.sin(kvdt)
         Yfreq = np.empty((self.outputs, self.inputs, Nk,), dtype=np.complex_)
 
+        ### build Cw complex at all frequencies
+        Cw_cpx_list = self.get_Cw_cpx(zv, settings=wake_prop_settings)
+
         ### loop frequencies
         for kk in range(Nk):
 
-            ### build Cw complex
-            Cw_cpx = self.get_Cw_cpx(zv[kk], settings=wake_prop_settings)
+            Cw_cpx = Cw_cpx_list[kk]
 
             # get bound state freq response
             if self.remove_predictor:
@@ -2890,6 +2916,7 @@ class Frequency(Static):
 
             .. math:: \bar{\goldsymbol{\Gamma}}_w = \bar{\mathbf{C}}(z)  \bar{\boldsymbol{\Gamma}}
 
+        If ``zval`` is an array, a list with the matrix at each value is returned. See :func:`get_Cw_cpx`.
         """
         return get_Cw_cpx(self.MS, self.K, self.K_star, zval, settings=settings)
 
@@ -2921,6 +2948,20 @@ def get_Cw_cpx(MS, K, K_star, zval, settings=None):
 
         .. math:: \bar{\boldsymbol{\Gamma}}_w = \bar{\mathbf{C}}(z)  \bar{\mathbf{\Gamma}}
 
+    Each wake panel depends only on the trailing edge panel of its strip, thus the sparsity pattern of
+    :math:`\bar{\mathbf{C}}(z)` does not depend on :math:`z`. If ``zval`` is an array, the pattern is computed once and
+    the values at all frequencies are evaluated at once.
+
+    Args:
+        MS (MultiSurface): MultiSurface instance
+        K (int): Number of bound panels
+        K_star (int): Number of wake panels
+        zval (complex or np.ndarray): Value(s) of :math:`z`
+        settings (dict (optional)): Dictionary with aerodynamic settings containing ``cfl1`` and ``dt``
+
+    Returns:
+        libsparse.csc_matrix or list(libsparse.csc_matrix): Matrix at ``zval``, or list of matrices at each value of
+        ``zval`` if an array is given
     """
 
     try:
@@ -2929,105 +2970,88 @@ def get_Cw_cpx(MS, K, K_star, zval, settings=None):
         # In case the key does not exist or settings=None
         cfl1 = True
     cout.cout_wrap("Computing wake propagation solution matrix if frequency domain with CFL1=%s" % cfl1, 1)
-    # print("Computing wake propagation solution matrix if frequency domain with CFL1=%s" % cfl1)
 
-    if cfl1:
-        jjvec = []
-        iivec = []
-        valvec = []
+    zv = np.atleast_1d(zval)
+    Nz = len(zv)
 
-        K0tot, K0totstar = 0, 0
-        for ss in range(MS.n_surf):
+    jjvec = []
+    iivec = []
+    valvec = []
 
-            M, N = MS.dimensions[ss]
-            Mstar, N = MS.dimensions_star[ss]
-
-            for mm in range(Mstar):
-                jjvec += range(K0tot + N * (M - 1), K0tot + N * M)
-                iivec += range(K0totstar + mm * N, K0totstar + (mm + 1) * N)
-                valvec += N * [zval ** (-mm - 1)]
-            K0tot += MS.KK[ss]
-            K0totstar += MS.KK_star[ss]
-    else:
-        # sum_m_n = 0
-        sum_mstar_n = 0
-        for ss in range(MS.n_surf):
-            # M, N = MS.dimensions[ss]
-            Mstar, N = MS.dimensions_star[ss]
-            # sum_m_n += M*N
-            sum_mstar_n += Mstar*N
-
-            try:
-                MS.Surfs_star[ss].zetac
-            except AttributeError:
-                MS.Surfs_star[ss].zetac.generate_collocations()
-        jjvec = [None]*sum_mstar_n
-        iivec = [None]*sum_mstar_n
-        valvec = [None]*sum_mstar_n
-
-        K0tot, K0totstar = 0, 0
-        ipoint = 0
-        for ss in range(MS.n_surf):
-            M, N = MS.dimensions[ss]
-            Mstar, N = MS.dimensions_star[ss]
-            Surf = MS.Surfs[ss]
-            Surf_star = MS.Surfs_star[ss]
-            for iin in range(N):
-                for mm in range(Mstar):
-                    # Value location in the sparse array
-                    ipoint = K0totstar + mm * N + iin
-                    # Compute CFL
-                    if mm == 0:
-                        conv_vec = Surf_star.zetac[:, 0, iin] - Surf.zetac[:, -1, iin]
-                        dist = np.linalg.norm(conv_vec)
-                        conv_dir_te = conv_vec/dist
-                        vel = Surf.u_input_coll[:, -1, iin]
-                        vel_value = np.dot(vel, conv_dir_te)
-                        cfl = settings['dt']*vel_value/dist
-                    else:
-                        conv_vec = Surf_star.zetac[:, mm, iin] - Surf_star.zetac[:, mm - 1, iin]
-                        dist = np.linalg.norm(conv_vec)
-                        conv_dir = conv_vec/dist
-                        vel = Surf.u_input_coll[:, -1, iin]
-                        vel_value = np.dot(vel, conv_dir_te)
-                        cfl = settings['dt']*vel_value/dist
-                    # Compute coefficient
-                    coef = get_Cw_cpx_coef_cfl_n1(cfl, zval)
-                    # Assign values
-                    jjvec[ipoint] = K0tot + N * (M - 1) + iin
-                    iivec[ipoint] = K0totstar + mm * N + iin
-                    if mm == 0:
-                        # First row
-                        valvec[ipoint] = coef
-                    else:
-                        ipoint_prev = K0totstar + (mm - 1) * N + iin
-                        valvec[ipoint] = coef*valvec[ipoint_prev]
-            K0tot += MS.KK[ss]
-            K0totstar += MS.KK_star[ss]
-
-    return libsp.csc_matrix((valvec, (iivec, jjvec)), shape=(K_star, K), dtype=np.complex_)
+    K0tot, K0totstar = 0, 0
+    for ss in range(MS.n_surf):
+        M, N = MS.dimensions[ss]
+        Mstar, N = MS.dimensions_star[ss]
+
+        mmvec = np.repeat(np.arange(Mstar), N)
+        iinvec = np.tile(np.arange(N), Mstar)
+        iivec.append(K0totstar + mmvec * N + iinvec)
+        jjvec.append(K0tot + N * (M - 1) + iinvec)
+
+        if cfl1:
+            valvec.append(zv[:, None] ** (-mmvec - 1))
+        else:
+            cfl = ass.wake_cfl(MS.Surfs[ss], MS.Surfs_star[ss], settings['dt'])
+            coef = get_Cw_cpx_coef_cfl_n1(cfl[None, :, :], zv[:, None, None])
+            # each row of wake panels is propagated from the row upstream
+            valvec.append(np.cumprod(coef, axis=1).reshape((Nz, Mstar * N)))
+
+        K0tot += MS.KK[ss]
+        K0totstar += MS.KK_star[ss]
+
+    iivec = np.concatenate(iivec)
+    jjvec = np.concatenate(jjvec)
+    valvec = np.concatenate(valvec, axis=1)
+
+    # compressed column storage shared by all frequencies
+    order = np.lexsort((iivec, jjvec))
+    indices = iivec[order]
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(jjvec, minlength=K))))
+
+    Cw_cpx = [libsp.csc_matrix((valvec[kk, order].astype(complex), indices, indptr), shape=(K_star, K))
+              for kk in range(Nz)]
+
+    if np.ndim(zval) == 0:
+        return Cw_cpx[0]
+    return Cw_cpx
 
 
 def get_Cw_cpx_coef_cfl_n1(cfl, zval):
+    """
+    Frequency domain coefficient of the propagation of circulation to a wake panel with Courant number ``cfl``.
+
+    ``cfl`` and ``zval`` may be arrays, in which case the coefficients are evaluated element wise, following the
+    ``numpy`` broadcasting rules.
+    """
     # Convergence loop end criteria
     tol = 1e-12
     rmax = 100
 
+    cfl = np.asarray(cfl)
+    zval = np.asarray(zval)
+    shape = np.broadcast(cfl, zval).shape
+
     # Initial values
-    coef = 0.
-    r = 0
+    coef = np.zeros(shape, dtype=complex)
+    error = np.full(shape, 2 * tol)
+    active = np.ones(shape, dtype=bool)
 
-    # Loop
-    error = 2*tol
-    while ((error > tol) and (r < rmax)):
+    # Loop, until convergence of each coefficient
+    r = 0
+    while np.any(active) and (r < rmax):
         delta_coef = ((1 - cfl)**r)*cfl*(zval**(-r-1))
-        coef += delta_coef
-        error = np.abs(delta_coef/coef)
+        coef = np.where(active, coef + delta_coef, coef)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            error = np.where(active, np.abs(delta_coef/coef), error)
+        active &= error > tol
         r += 1
     coef /= (1 - (1-cfl)**rmax*(zval**(-1)))
-    if (error > tol):
-        cout.cout_wrap(("WARNING computation of Cw_cpx did not reach desired accuracy. r: %d. error: %d" % (r, error)), 2)
+    if np.any(error > tol):
+        cout.cout_wrap(("WARNING computation of Cw_cpx did not reach desired accuracy. r: %d. error: %.2e" %
+                        (r, np.max(error))), 2)
 
+    if coef.ndim == 0:
+        return coef[()]
     return coef
 
 ################################################################################
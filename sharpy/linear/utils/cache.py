@@ -0,0 +1,212 @@
+"""Linear System Cache
+
+Persistent on-disk cache of assembled linear systems.
+
+Entries are content addressed: the key of an entry is a hash of the linearisation time step (structural and
+aerodynamic states and modal information), of the beam properties and connectivities and of the linear system
+settings, so a linearisation of the same model about the same reference state with the same settings (including
+those of the reduced order models) finds the entry written by a previous run, regardless of the case name or
+route.
+
+Each entry is a file ``<key>.pkl`` in the cache folder. When the total size of the entries exceeds the maximum cache
+size, the least recently used entries are deleted.
+"""
+import ctypes as ct
+import hashlib
+import numbers
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import scipy.sparse as scsp
+
+import sharpy.utils.cout_utils as cout
+
+# bump when the contents of the entries or the hashed quantities change
+cache_version = 2
+
+# attributes of the beam that define the structural model
+beam_properties = ('num_node', 'num_elem', 'num_node_elem', 'connectivities', 'boundary_conditions', 'beam_number',
+                   'body_number', 'elem_stiffness', 'stiffness_db', 'elem_mass', 'mass_db', 'frame_of_reference_delta',
+                   'structural_twist', 'lumped_mass', 'lumped_mass_nodes', 'lumped_mass_inertia',
+                   'lumped_mass_position', 'lumped_mass_mat', 'lumped_mass_mat_nodes')
+
+
+def update_hash(hasher, obj):
+    """
+    Updates a ``hashlib`` object with the contents of ``obj``.
+
+    Dictionaries (sorted by key), lists, tuples, arrays (dense and sparse), strings and numbers (including ``ctypes``
+    scalars) are hashed recursively. Objects of other types, such as ``ctypes`` pointers, are not part of the hash.
+
+    Args:
+        hasher: ``hashlib`` object
+        obj: Object to hash
+    """
+    if isinstance(obj, dict):
+        hasher.update(b'd%d' % len(obj))
+        for key in sorted(obj.keys(), key=str):
+            hasher.update(str(key).encode())
+            update_hash(hasher, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b'l%d' % len(obj))
+        for item in obj:
+            update_hash(hasher, item)
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            update_hash(hasher, obj.tolist())
+        else:
+            hasher.update(b'a' + obj.dtype.str.encode() + str(obj.shape).encode())
+            hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif scsp.issparse(obj):
+        obj = scsp.csr_matrix(obj)
+        obj.sort_indices()
+        hasher.update(b's' + str(obj.shape).encode())
+        for array in (obj.data, obj.indices, obj.indptr):
+            update_hash(hasher, array)
+    elif isinstance(obj, (str, bytes, bool, numbers.Number)) or obj is None:
+        hasher.update(repr(obj).encode())
+    elif isinstance(obj, ct._SimpleCData):
+        update_hash(hasher, obj.value)
+
+
+def linearisation_key(beam, tsstruct0, tsaero0, linear_settings):
+    """
+    Key of the linear system assembled about a reference state.
+
+    Args:
+        beam (sharpy.structure.models.beam.Beam): Structural model, of which the attributes in ``beam_properties``
+          are hashed
+        tsstruct0 (sharpy.utils.datastructures.StructTimeStepInfo): Structural linearisation time step, including the
+          modal information
+        tsaero0 (sharpy.utils.datastructures.AeroTimeStepInfo): Aerodynamic linearisation time step
+        linear_settings (dict): Linear system settings
+
+    Returns:
+        str: Hexadecimal SHA-256 digest
+    """
+    hasher = hashlib.sha256()
+    hasher.update(b'sharpy-linear-cache-v%d' % cache_version)
+    beam_dict = {name: getattr(beam, name, None) for name in beam_properties}
+    for obj in (beam_dict, vars(tsstruct0), vars(tsaero0), linear_settings):
+        update_hash(hasher, obj)
+    return hasher.hexdigest()
+
+
+class LinearCache(object):
+    """
+    On-disk cache of linear systems with least recently used eviction.
+
+    Args:
+        folder (str): Cache folder
+        max_size (float): Maximum total size of the entries in MB
+    """
+    extension = '.pkl'
+
+    def __init__(self, folder, max_size=1024.):
+        self.folder = folder
+        self.max_size = max_size * 1024 ** 2
+
+    def path(self, key):
+        return os.path.join(self.folder, key + self.extension)
+
+    def load(self, key):
+        """
+        Loads the entry ``key`` and marks it as the most recently used.
+
+        Returns:
+            dict: Cached entry or ``None`` if not found or unreadable. Entries referring to classes that no longer
+            exist are deleted
+        """
+        path = self.path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError) as error:
+            cout.cout_wrap('Unable to read linear cache entry %s: %s' % (key, error), 3)
+            return None
+        except (AttributeError, ImportError) as error:
+            # entry written by a version of SHARPy whose classes have since been moved or renamed
+            cout.cout_wrap('Discarding stale linear cache entry %s: %s' % (key, error), 3)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        os.utime(path)
+        return entry
+
+    def save(self, key, entry):
+        """
+        Writes the entry ``key`` and evicts the least recently used entries if the cache exceeds its maximum size.
+
+        Returns:
+            bool: ``True`` if the entry was written
+        """
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+        # write to a temporary file first such that concurrent runs never read incomplete entries
+        fd, temp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(temp_path)
+            if size > self.max_size:
+                os.remove(temp_path)
+                cout.cout_wrap('Linear cache entry of %.1f MB exceeds the maximum cache size, not cached' %
+                               (size / 1024 ** 2), 3)
+                return False
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.evict(keep=key)
+        return True
+
+    def entries(self):
+        """
+        Returns:
+            list(tuple): Key, last access time and size of each entry, from least to most recently used
+        """
+        if not os.path.isdir(self.folder):
+            return []
+        entries = []
+        for file_name in os.listdir(self.folder):
+            if file_name.endswith(self.extension):
+                try:
+                    stat = os.stat(os.path.join(self.folder, file_name))
+                except FileNotFoundError:
+                    continue
+                entries.append((file_name[:-len(self.extension)], stat.st_mtime, stat.st_size))
+        return sorted(entries, key=lambda entry: entry[1])
+
+    def size(self):
+        """
+        Returns:
+            int: Total size of the entries in bytes
+        """
+        return sum(entry[2] for entry in self.entries())
+
+    def evict(self, keep=None):
+        """
+        Deletes the least recently used entries, except ``keep``, until the cache fits in its maximum size.
+        """
+        entries = self.entries()
+        total_size = sum(entry[2] for entry in entries)
+        for key, _, size in entries:
+            if total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            cout.cout_wrap('Evicted linear cache entry %s' % key, 2)
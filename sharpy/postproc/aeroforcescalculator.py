@@ -5,6 +5,7 @@ import sharpy.utils.cout_utils as cout
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
+import sharpy.utils.parallel as parallel
 import sharpy.aero.utils.mapping as mapping
 
 
@@ -54,9 +55,20 @@ class AeroForcesCalculator(BaseSolver):
     settings_default['c_ref'] = 1
     settings_description['c_ref'] = 'Reference chord'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes among which time steps are split when run ' \
+                                            'after the simulation. If ``0``, the number of CPUs is used'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
+    # aerodynamic time step attributes set by calculate_forces
+    force_attributes = ['inertial_steady_forces', 'inertial_unsteady_forces',
+                        'body_steady_forces', 'body_unsteady_forces',
+                        'total_steady_body_forces', 'total_unsteady_body_forces',
+                        'total_steady_inertial_forces', 'total_unsteady_inertial_forces']
+
     def __init__(self):
 
         self.settings = None
@@ -96,8 +108,13 @@ class AeroForcesCalculator(BaseSolver):
             if self.settings['screen_output']:
                 self.screen_output(-1)
         else:
-            for ts in range(self.ts_max):
-                self.calculate_forces(ts)
+            steps = list(range(self.ts_max))
+            # the forces are computed by the workers and kept in the time steps of the main process
+            results = parallel.timestep_map(self.calculate_step_forces, steps,
+                                            num_processes=self.settings['num_processes'])
+            for ts, forces in zip(steps, results):
+                for name, value in zip(self.force_attributes, forces):
+                    setattr(self.data.aero.timestep_info[ts], name, value)
                 if self.settings['screen_output']:
                     self.screen_output(ts)
             cout.cout_wrap('...Finished', 1)
@@ -165,6 +182,14 @@ class AeroForcesCalculator(BaseSolver):
                       [np.zeros((3, 3)), rot]]).dot(
                 self.data.aero.timestep_info[ts].total_unsteady_body_forces)
 
+    def calculate_step_forces(self, ts):
+        """
+        Returns:
+            list(np.ndarray): Values of the ``force_attributes`` of the aerodynamic time step ``ts``
+        """
+        self.calculate_forces(ts)
+        return [getattr(self.data.aero.timestep_info[ts], name) for name in self.force_attributes]
+
     def map_forces_beam_dof(self, ts, force):
         aero_tstep = self.data.aero.timestep_info[ts]
         struct_tstep = self.data.structure.timestep_info[ts]
@@ -9,6 +9,8 @@ from sharpy.utils.settings import str2bool
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.aero.utils.uvlmlib as uvlmlib
+import sharpy.utils.instrumentation as instrumentation
+import sharpy.utils.parallel as parallel
 from sharpy.utils.constants import vortex_radius_def
 
 
@@ -73,6 +75,11 @@ class AerogridPlot(BaseSolver):
     settings_default['vortex_radius'] = vortex_radius_def
     settings_description['vortex_radius'] = 'Distance below which inductions are not computed'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes among which time steps are split when run ' \
+                                            'after the simulation. If ``0``, the number of CPUs is used'
+
     table = settings.SettingsTable()
     __doc__ += table.generate(settings_types, settings_default, settings_description)
 
@@ -111,10 +118,8 @@ class AerogridPlot(BaseSolver):
     def run(self, online=False):
         # TODO: Create a dictionary to plot any variable as in beamplot
         if not online:
-            for self.ts in range(self.ts_max):
-                if self.data.structure.timestep_info[self.ts] is not None:
-                    self.plot_body()
-                    self.plot_wake()
+            steps = [ts for ts in range(self.ts_max) if self.data.structure.timestep_info[ts] is not None]
+            parallel.timestep_map(self.plot_step, steps, num_processes=self.settings['num_processes'])
             cout.cout_wrap('...Finished', 1)
         else:
             aero_tsteps = len(self.data.aero.timestep_info) - 1
@@ -124,6 +129,11 @@ class AerogridPlot(BaseSolver):
             self.plot_wake()
         return self.data
 
+    def plot_step(self, ts):
+        self.ts = ts
+        self.plot_body()
+        self.plot_wake()
+
     def plot_body(self):
 
         aero_tstep = self.data.aero.timestep_info[self.ts]
@@ -256,6 +266,7 @@ class AerogridPlot(BaseSolver):
                 ug.point_data.add_array(vel)
                 ug.point_data.get_array(6).name = 'velocity'
             write_data(ug, filename)
+            instrumentation.timeline.written(self.solver_id, filename + '.vtu')
 
     def plot_wake(self):
         for i_surf in range(self.data.aero.timestep_info[self.ts].n_surf):
@@ -318,3 +329,4 @@ class AerogridPlot(BaseSolver):
             ug.point_data.scalars = np.arange(0, coords.shape[0])
             ug.point_data.scalars.name = 'n_id'
             write_data(ug, filename)
+            instrumentation.timeline.written(self.solver_id, filename + '.vtu')
@@ -8,6 +8,7 @@ import sharpy.utils.cout_utils as cout
 import sharpy.utils.algebra as algebra
 import sharpy.solvers.lindynamicsim as lindynamicsim
 import sharpy.structure.utils.modalutils as modalutils
+import sharpy.linear.src.libeig as libeig
 import scipy.sparse as scsp
 
 
@@ -21,6 +22,14 @@ class AsymptoticStability(BaseSolver):
     will be beneficial when deailing with very large systems. However, the direct method is
     preferred and more efficient when the system is of a relatively small size (typically around 5000 states).
 
+    In velocity sweeps, either through ``velocity_analysis`` or successive runs at different
+    ``reference_velocity``, the ``continuation`` setting tracks the ``num_evals`` least damped modes from one speed
+    to the next instead of computing the full spectrum. The tracked modes are grouped in clusters of close
+    eigenvalues, extrapolated from the previous speeds, and each cluster is refined with a single factorisation and
+    shift-invert Arnoldi iteration started from the previous eigenvectors. Each mode retains the candidate with the
+    highest Modal Assurance Criterion (MAC). The first speed is solved with the
+    direct method. See :func:`sharpy.linear.src.libeig.track_eigenpairs`.
+
     Warnings:
         The setting ``modes_to_plot`` to plot the eigenvectors in Paraview is currently under development.
 
@@ -65,6 +74,30 @@ class AsymptoticStability(BaseSolver):
     settings_default['num_evals'] = 200
     settings_description['num_evals'] = 'Number of eigenvalues to retain.'
 
+    settings_types['continuation'] = 'bool'
+    settings_default['continuation'] = False
+    settings_description['continuation'] = 'Track the ``num_evals`` least damped modes across velocities with ' \
+                                           'shift-invert Arnoldi iterations rather than computing all eigenvalues'
+
+    settings_types['continuation_candidates'] = 'int'
+    settings_default['continuation_candidates'] = 3
+    settings_description['continuation_candidates'] = 'Eigenpairs computed around each tracked mode from which the ' \
+                                                      'best match is chosen'
+
+    settings_types['continuation_cluster_radius'] = 'float'
+    settings_default['continuation_cluster_radius'] = 0.05
+    settings_description['continuation_cluster_radius'] = 'Tracked modes whose shifts lie within this distance, ' \
+                                                          'relative to the shift magnitude, share the factorisation ' \
+                                                          'of the shifted matrix. If ``0``, each mode is factorised ' \
+                                                          'on its own'
+
+    settings_types['continuation_mac_threshold'] = 'float'
+    settings_default['continuation_mac_threshold'] = 0.5
+    settings_description['continuation_mac_threshold'] = 'Tracked modes whose MAC with respect to the previous ' \
+                                                         'velocity is below this value are tracked again on ' \
+                                                         'their own if they shared a factorisation, and ' \
+                                                         'reported as lost otherwise'
+
     settings_types['modes_to_plot'] = 'list(int)'
     settings_default['modes_to_plot'] = []
     settings_description['modes_to_plot'] = 'List of mode numbers to simulate and plot'
@@ -95,6 +128,8 @@ class AsymptoticStability(BaseSolver):
         self.with_postprocessors = False
         self.caller = None
 
+        self.tracked_modes = None
+
     def initialise(self, data, custom_settings=None, caller=None):
         self.data = data
 
@@ -143,13 +178,9 @@ class AsymptoticStability(BaseSolver):
         else:
             ss = self.data.linear.ss
 
-        if self.settings['print_info']:
-            cout.cout_wrap('Calculating eigenvalues using direct method')
-        eigenvalues, eigenvectors = sclalg.eig(ss.A)
-
-        # Convert DT eigenvalues into CT
+        # Obtain dimensional time step
+        dt = None
         if ss.dt:
-            # Obtain dimensional time step
             try:
                 ScalingFacts = self.data.linear.linear_system.uvlm.sys.ScalingFacts
                 if ScalingFacts['length'] != 1.0 and ScalingFacts['time'] != 1.0:
@@ -158,7 +189,22 @@ class AsymptoticStability(BaseSolver):
                     dt = ss.dt
             except AttributeError:
                 dt = ss.dt
-            eigenvalues = np.log(eigenvalues) / dt
+
+        if self.settings['continuation'] and self.tracked_modes is not None:
+            if self.settings['print_info']:
+                cout.cout_wrap('Tracking eigenvalues from the previous velocity')
+            eigenvalues, eigenvectors, _ = self.continuation_step(ss.A, dt, self.settings['reference_velocity'])
+        else:
+            if self.settings['print_info']:
+                cout.cout_wrap('Calculating eigenvalues using direct method')
+            eigenvalues, eigenvectors = sclalg.eig(ss.A)
+
+            # Convert DT eigenvalues into CT
+            if dt is not None:
+                eigenvalues = np.log(eigenvalues) / dt
+
+            if self.settings['continuation']:
+                self.start_continuation(eigenvalues, eigenvectors, self.settings['reference_velocity'])
 
         self.num_evals = min(self.num_evals, len(eigenvalues))
 
@@ -241,21 +287,41 @@ class AsymptoticStability(BaseSolver):
         real_part_plot = []
         imag_part_plot = []
         uinf_part_plot = []
+        mode_part_plot = []
+        mac_part_plot = []
+
+        if self.settings['continuation']:
+            # the sweep is tracked from its first velocity
+            self.tracked_modes = None
 
         for i in range(len(u_inf_vec)):
             ss_aeroelastic = self.data.linear.linear_system.update(u_inf_vec[i])
 
-            eigs, eigenvectors = sclalg.eig(ss_aeroelastic.A)
-
-            eigs, eigenvectors = self.sort_eigenvalues(eigs, eigenvectors)
-
             # Obtain dimensional time
             dt_dimensional = self.data.linear.linear_system.uvlm.sys.ScalingFacts['length'] / u_inf_vec[i] \
                              * ss_aeroelastic.dt
 
-            eigs_cont = np.log(eigs) / dt_dimensional
+            if self.settings['continuation'] and self.tracked_modes is not None:
+                eigs_cont, eigenvectors, mac_values = self.continuation_step(ss_aeroelastic.A, dt_dimensional,
+                                                                             u_inf_vec[i])
+                mode_part_plot.append(np.arange(len(eigs_cont)))
+                mac_part_plot.append(mac_values)
+            else:
+                eigs, eigenvectors = sclalg.eig(ss_aeroelastic.A)
+
+                eigs, eigenvectors = self.sort_eigenvalues(eigs, eigenvectors)
+
+                eigs_cont = np.log(eigs) / dt_dimensional
+
+                if self.settings['continuation']:
+                    eigs_cont, eigenvectors = self.start_continuation(eigs_cont, eigenvectors, u_inf_vec[i])
+                    mode_part_plot.append(np.arange(len(eigs_cont)))
+                    mac_part_plot.append(np.ones(len(eigs_cont)))
+
+            # least damped modes first
+            order = np.argsort(eigs_cont.real)[::-1]
             Nunst = np.sum(eigs_cont.real > 0)
-            fn = np.abs(eigs_cont)
+            fn = np.abs(eigs_cont[order])
 
             cout.cout_wrap('LTI\tu: %.2f m/2\tmax. CT eig. real: %.6f\t' \
                            % (u_inf_vec[i], np.max(eigs_cont.real)))
@@ -271,6 +337,15 @@ class AsymptoticStability(BaseSolver):
         imag_part_plot = np.hstack(imag_part_plot)
         uinf_part_plot = np.hstack(uinf_part_plot)
 
+        if self.settings['continuation']:
+            mode_part_plot = np.hstack(mode_part_plot)
+            mac_part_plot = np.hstack(mac_part_plot)
+            np.savetxt(self.folder + '/velocity_analysis_tracking_min%04d_max%04d_nvel%04d.dat'
+                       % (ulb*10, uub*10, num_u),
+                       np.column_stack((uinf_part_plot, mode_part_plot, real_part_plot, imag_part_plot,
+                                        mac_part_plot)),
+                       header='u_inf mode real imag mac')
+
         cout.cout_wrap('Saving velocity analysis results...')
         np.savetxt(self.folder + '/velocity_analysis_min%04d_max%04d_nvel%04d.dat' %(ulb*10, uub*10, num_u),
                    np.concatenate((uinf_part_plot, real_part_plot, imag_part_plot)).reshape((-1, 3), order='F'))
@@ -281,6 +356,76 @@ class AsymptoticStability(BaseSolver):
         self.data.linear.stability['velocity_results']['u_inf'] = uinf_part_plot
         self.data.linear.stability['velocity_results']['evals_real'] = real_part_plot
         self.data.linear.stability['velocity_results']['evals_imag'] = imag_part_plot
+        if self.settings['continuation']:
+            self.data.linear.stability['velocity_results']['mode'] = mode_part_plot
+            self.data.linear.stability['velocity_results']['mac'] = mac_part_plot
+
+    def start_continuation(self, eigenvalues, eigenvectors, u_inf):
+        """
+        Selects the ``num_evals`` least damped modes with non-negative frequency to be tracked in the following
+        velocities.
+
+        Args:
+            eigenvalues (np.ndarray): Continuous time eigenvalues
+            eigenvectors (np.ndarray): Corresponding right eigenvectors of the state-space matrix
+            u_inf (float): Velocity
+
+        Returns:
+            tuple: Eigenvalues and eigenvectors of the tracked modes
+        """
+        positive = np.where(eigenvalues.imag >= 0)[0]
+        order = positive[np.argsort(eigenvalues[positive].real)[::-1]][:self.settings['num_evals']]
+        self.tracked_modes = {'u_inf': [u_inf],
+                              'eigenvalues': [eigenvalues[order]],
+                              'eigenvectors': eigenvectors[:, order]}
+        return eigenvalues[order], eigenvectors[:, order]
+
+    def continuation_step(self, A, dt, u_inf):
+        """
+        Tracks the modes to the state-space matrix ``A`` at the velocity ``u_inf``.
+
+        The shift of each mode is its continuous time eigenvalue linearly extrapolated from the two previous
+        velocities, mapped to discrete time for discrete systems.
+
+        Args:
+            A (np.ndarray or scipy.sparse.spmatrix): State-space matrix
+            dt (float): Dimensional time step, ``None`` for continuous time systems
+            u_inf (float): Velocity
+
+        Returns:
+            tuple: Continuous time eigenvalues, eigenvectors and MAC with respect to the previous velocity of the
+            tracked modes
+        """
+        tracked = self.tracked_modes
+        previous = tracked['eigenvalues'][-1]
+        if len(tracked['u_inf']) > 1 and tracked['u_inf'][-1] != tracked['u_inf'][-2]:
+            slope = (previous - tracked['eigenvalues'][-2]) / (tracked['u_inf'][-1] - tracked['u_inf'][-2])
+            predicted = previous + slope * (u_inf - tracked['u_inf'][-1])
+        else:
+            predicted = previous
+
+        if dt is not None:
+            eigenvalues, eigenvectors, mac_values = libeig.track_eigenpairs(
+                A, np.exp(previous * dt), tracked['eigenvectors'], k=self.settings['continuation_candidates'],
+                shifts=np.exp(predicted * dt), cluster_radius=self.settings['continuation_cluster_radius'],
+                mac_threshold=self.settings['continuation_mac_threshold'])
+            eigenvalues = np.log(eigenvalues) / dt
+        else:
+            eigenvalues, eigenvectors, mac_values = libeig.track_eigenpairs(
+                A, previous, tracked['eigenvectors'], k=self.settings['continuation_candidates'], shifts=predicted,
+                cluster_radius=self.settings['continuation_cluster_radius'],
+                mac_threshold=self.settings['continuation_mac_threshold'])
+
+        lost = np.where(mac_values < self.settings['continuation_mac_threshold'])[0]
+        for i_mode in lost:
+            cout.cout_wrap('\tTracking of mode %g uncertain at u = %.2f m/s: MAC = %.3f'
+                           % (i_mode, u_inf, mac_values[i_mode]), 3)
+
+        tracked['u_inf'] = [tracked['u_inf'][-1], u_inf]
+        tracked['eigenvalues'] = [previous, eigenvalues]
+        tracked['eigenvectors'] = eigenvectors
+
+        return eigenvalues, eigenvectors, mac_values
 
     def display_root_locus(self):
         """
@@ -1,7 +1,10 @@
 import os
 import numpy as np
+import h5py as h5
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
+import sharpy.utils.h5utils as h5utils
+import sharpy.utils.parallel as parallel
 import sharpy.structure.utils.xbeamlib as xbeamlib
 
 
@@ -10,6 +13,15 @@ class BeamLoads(BaseSolver):
     """
     Writes to file the total loads acting on the beam elements
 
+    The strain and loads of all the processed time steps are stacked in the attributes ``strain`` and ``loads``, of
+    shape ``[n_tsteps, num_elem, 6]``, and the ``A`` frame coordinates of the last node of each element in
+    ``coords_a``, of shape ``[n_tsteps, num_elem, 3]``. The ``strain``, ``loads`` and ``coords_a`` entries of the
+    ``postproc_cell`` of each time step are views of these arrays. When run online, each call appends the current
+    time step to the arrays, of which only the entries of the current time step are views.
+
+    With ``h5_output``, the arrays are written to ``<output_file_name>.h5`` in the ``beam`` folder together with the
+    time step numbers ``ts`` and the ``beam_number`` of each element. When run online, each time step is appended to
+    the file.
     """
     solver_id = 'BeamLoads'
     solver_classification = 'post-processor'
@@ -26,6 +38,15 @@ class BeamLoads(BaseSolver):
     settings_default['output_file_name'] = 'beam_loads'
     settings_description['output_file_name'] = 'Output file name'
 
+    settings_types['h5_output'] = 'bool'
+    settings_default['h5_output'] = False
+    settings_description['h5_output'] = 'Write ``h5`` file with the results of all time steps'
+
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes among which time steps are split when run ' \
+                                            'after the simulation. If ``0``, the number of CPUs is used'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -37,6 +58,12 @@ class BeamLoads(BaseSolver):
         self.folder = None
         self.caller = None
 
+        self.ts = None
+        self.strain = None
+        self.loads = None
+        self.coords_a = None
+        self.h5_created = False
+
     def initialise(self, data, custom_settings=None, caller=None):
         self.data = data
         if custom_settings is None:
@@ -54,66 +81,97 @@ class BeamLoads(BaseSolver):
         self.calculate_loads(online)
         if self.settings['csv_output']:
             self.print_loads(online)
+        if self.settings['h5_output']:
+            self.write_h5(online)
         return self.data
 
     def print_loads(self, online):
         if online:
-            it = len(self.data.structure.timestep_info) - 1
-            n_elem = self.data.structure.timestep_info[it].psi.shape[0]
-            data = np.zeros((n_elem, 10))
-            # coords
-            data[:, 0:3] = self.data.structure.timestep_info[it].postproc_cell['coords_a']
-            header = 'x_a, y_a, z_a, '
-            # beam number
-            data[:, 3] = self.data.structure.beam_number
-            header += 'beam_number, '
-            # loads_0
-            data[:, 4:10] = self.data.structure.timestep_info[it].postproc_cell['loads'][:, :]
-            header += 'Fx, Fy, Fz, Mx, My, Mz'
-
-            filename = self.folder
-            filename += self.settings['output_file_name'] + '_' + '{0}'.format(it)
-            filename += '.csv'
-            np.savetxt(filename, data, delimiter=',', header=header)
+            self.write_loads(len(self.data.structure.timestep_info) - 1)
         else:
-            for it in range(len(self.data.structure.timestep_info)):
-                it = len(self.data.structure.timestep_info) - 1
-                n_elem = self.data.structure.timestep_info[it].num_elem
-                data = np.zeros((n_elem, 10))
-                # coords
-                data[:, 0:3] = self.data.structure.timestep_info[it].postproc_cell['coords_a']
-                header = 'x_a, y_a, z_a, '
-                # beam number
-                data[:, 3] = self.data.structure.beam_number
-                header += 'beam_number, '
-                # loads_0
-                data[:, 4:10] = self.data.structure.timestep_info[it].postproc_cell['loads'][:, :]
-                header += 'Fx, Fy, Fz, Mx, My, Mz'
+            parallel.timestep_map(self.write_loads, range(len(self.data.structure.timestep_info)),
+                                  num_processes=self.settings['num_processes'])
+
+    def write_loads(self, it):
+        n_elem = self.data.structure.timestep_info[it].num_elem
+        data = np.zeros((n_elem, 10))
+        # coords
+        data[:, 0:3] = self.data.structure.timestep_info[it].postproc_cell['coords_a']
+        header = 'x_a, y_a, z_a, '
+        # beam number
+        data[:, 3] = self.data.structure.beam_number
+        header += 'beam_number, '
+        # loads_0
+        data[:, 4:10] = self.data.structure.timestep_info[it].postproc_cell['loads'][:, :]
+        header += 'Fx, Fy, Fz, Mx, My, Mz'
 
-                filename = self.folder
-                filename += self.settings['output_file_name'] + '_' + '{0}'.format(it)
-                filename += '.csv'
-                np.savetxt(filename, data, delimiter=',', header=header)
+        filename = self.folder
+        filename += self.settings['output_file_name'] + '_' + '{0}'.format(it)
+        filename += '.csv'
+        np.savetxt(filename, data, delimiter=',', header=header)
+
+    def write_h5(self, online):
+        filename = self.folder + self.settings['output_file_name'] + '.h5'
+        # overwrite the results of previous runs, then append each time step when run online
+        mode = 'a' if online and self.h5_created else 'w'
+        with h5.File(filename, mode) as f:
+            if 'beam_number' not in f:
+                f.create_dataset('beam_number', data=self.data.structure.beam_number)
+            # only the current time step is new to the file when run online
+            i_start = -1 if mode == 'a' else 0
+            h5utils.append_arrays(f, {'ts': self.ts[i_start:],
+                                      'coords_a': self.coords_a[i_start:],
+                                      'strain': self.strain[i_start:],
+                                      'loads': self.loads[i_start:]})
+        self.h5_created = True
 
     def calculate_loads(self, online):
         if online:
-            it = -1
-            (self.data.structure.timestep_info[it].postproc_cell['strain'],
-             self.data.structure.timestep_info[it].postproc_cell['loads']) = xbeamlib.cbeam3_loads(self.data.structure,
-                                                                                                   it)
-            self.calculate_coords_a(self.data.structure.timestep_info[it])
+            steps = [len(self.data.structure.timestep_info) - 1]
+            results = [self.calculate_step_loads(steps[0])]
         else:
-            for it in range(len(self.data.structure.timestep_info)):
-                (self.data.structure.timestep_info[it].postproc_cell['strain'],
-                 self.data.structure.timestep_info[it].postproc_cell['loads']) = xbeamlib.cbeam3_loads(self.data.structure,
-                                                                                                       it)
-                self.calculate_coords_a(self.data.structure.timestep_info[it])
+            steps = list(range(len(self.data.structure.timestep_info)))
+            # the loads are computed by the workers and kept in the time steps of the main process
+            results = parallel.timestep_map(self.calculate_step_loads, steps,
+                                            num_processes=self.settings['num_processes'])
+
+        ts = np.array(steps, dtype=int)
+        strain = np.array([step_strain for step_strain, _ in results])
+        loads = np.array([step_loads for _, step_loads in results])
+        coords_a = self.calculate_coords_a([self.data.structure.timestep_info[it] for it in steps])
+
+        if online and self.ts is not None and self.ts[-1] < ts[0]:
+            # append to the steps processed in previous calls
+            ts = np.concatenate((self.ts, ts))
+            strain = np.concatenate((self.strain, strain))
+            loads = np.concatenate((self.loads, loads))
+            coords_a = np.concatenate((self.coords_a, coords_a))
+        self.ts = ts
+        self.strain = strain
+        self.loads = loads
+        self.coords_a = coords_a
+
+        for i_step, it in enumerate(steps, start=len(self.ts) - len(steps)):
+            postproc_cell = self.data.structure.timestep_info[it].postproc_cell
+            postproc_cell['strain'] = self.strain[i_step]
+            postproc_cell['loads'] = self.loads[i_step]
+            postproc_cell['coords_a'] = self.coords_a[i_step]
+
+    def calculate_step_loads(self, it):
+        """
+        Returns:
+            tuple(np.ndarray): Strain and loads of each element at the time step ``it``
+        """
+        return xbeamlib.cbeam3_loads(self.data.structure, it)
 
-    def calculate_coords_a(self, timestep_info):
-        timestep_info.postproc_cell['coords_a'] = np.zeros((timestep_info.num_elem, 3))
-        for ielem in range(timestep_info.num_elem):
-            iglobal_node = self.data.structure.connectivities[ielem, 2]
-            timestep_info.postproc_cell['coords_a'][ielem, :] = timestep_info.pos[iglobal_node, :]
+    def calculate_coords_a(self, timesteps):
+        """
+        Returns:
+            np.ndarray: ``A`` frame coordinates of the last node of each element at each of the ``timesteps``
+            ``[n_tsteps, num_elem, 3]``
+        """
+        pos = np.array([timestep_info.pos for timestep_info in timesteps])
+        return pos[:, self.data.structure.connectivities[:, 2], :]
 
     # def calculate_loads(self):
     #     # initial (ini) loads
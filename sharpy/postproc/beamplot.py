@@ -7,6 +7,8 @@ import sharpy.utils.cout_utils as cout
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
+import sharpy.utils.instrumentation as instrumentation
+import sharpy.utils.parallel as parallel
 
 
 @solver
@@ -45,6 +47,11 @@ class BeamPlot(BaseSolver):
     settings_default['output_rbm'] = True
     settings_description['output_rbm'] = 'Write ``csv`` file with rigid body motion data'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes among which time steps are split when run ' \
+                                            'after the simulation. If ``0``, the number of CPUs is used'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -99,16 +106,16 @@ class BeamPlot(BaseSolver):
 
     def plot(self, online):
         if not online:
-            for it in range(len(self.data.structure.timestep_info)):
-                if self.data.structure.timestep_info[it] is not None:
-                    self.write_beam(it)
-                    if self.settings['include_FoR']:
-                        self.write_for(it)
+            steps = [it for it in range(len(self.data.structure.timestep_info))
+                     if self.data.structure.timestep_info[it] is not None]
+            parallel.timestep_map(self.write_step, steps, num_processes=self.settings['num_processes'])
         else:
-            it = len(self.data.structure.timestep_info) - 1
-            self.write_beam(it)
-            if self.settings['include_FoR']:
-                self.write_for(it)
+            self.write_step(len(self.data.structure.timestep_info) - 1)
+
+    def write_step(self, it):
+        self.write_beam(it)
+        if self.settings['include_FoR']:
+            self.write_for(it)
 
     def write_beam(self, it):
         it_filename = (self.filename +
@@ -319,6 +326,7 @@ class BeamPlot(BaseSolver):
                 ug.point_data.get_array(point_vector_counter).name = k
 
         write_data(ug, it_filename)
+        instrumentation.timeline.written(self.solver_id, it_filename + '.vtu')
 
     def write_for(self, it):
         it_filename = (self.filename_for +
@@ -358,3 +366,4 @@ class BeamPlot(BaseSolver):
         FoRmesh.point_data.get_array(for_vector_counter).name = 'moments_constraints_FoR'
 
         write_data(FoRmesh, it_filename)
+        instrumentation.timeline.written(self.solver_id, it_filename + '.vtp')
@@ -1,9 +1,11 @@
 import os
 import numpy as np
+import h5py as h5
 from tvtk.api import tvtk, write_data
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.generator_interface as gen_interface
 import sharpy.utils.settings as settings
+import sharpy.utils.parallel as parallel
 import sharpy.aero.utils.uvlmlib as uvlmlib
 import ctypes as ct
 from sharpy.utils.constants import vortex_radius_def
@@ -13,6 +15,19 @@ from sharpy.utils.constants import vortex_radius_def
 class PlotFlowField(BaseSolver):
     """
     Plots the flow field in Paraview and computes the velocity at a set of points in a grid.
+
+    The points of the grid are evaluated in chunks of ``chunk_size`` points, which can be distributed among
+    ``num_processes`` worker processes forked from the current one (see :mod:`sharpy.utils.parallel`). The induced
+    velocity of each chunk is computed by the UVLM library with ``num_cores`` threads.
+
+    The velocity field is written to the ``GenerateFlowField`` folder of the case output folder as:
+
+        * ``vti``: VTK XML image data file ``VelocityField_<ts>.vti``, with binary appended data.
+
+        * ``xdmf``: XDMF file ``VelocityField_<ts>.xdmf`` describing the uniform grid and the velocity arrays,
+          stored in the HDF5 file ``VelocityField_<ts>.h5``.
+
+        * ``vtk``: legacy VTK rectilinear grid file ``VelocityField_<ts>.vtk``.
     """
     solver_id = 'PlotFlowField'
     solver_classification = 'post-processor'
@@ -63,6 +78,20 @@ class PlotFlowField(BaseSolver):
     settings_default['vortex_radius'] = vortex_radius_def
     settings_description['vortex_radius'] = 'Distance below which inductions are not computed.'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes among which the chunks of points are ' \
+                                            'distributed. If ``0``, the number of CPUs is used'
+
+    settings_types['chunk_size'] = 'int'
+    settings_default['chunk_size'] = 100000
+    settings_description['chunk_size'] = 'Maximum number of points evaluated at once'
+
+    settings_types['output_format'] = 'str'
+    settings_default['output_format'] = 'vti'
+    settings_description['output_format'] = 'Format of the velocity field files'
+    settings_options['output_format'] = ['vti', 'xdmf', 'vtk']
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
@@ -99,86 +128,80 @@ class PlotFlowField(BaseSolver):
         self.caller = caller
 
     def output_velocity_field(self, ts):
-        # Notice that SHARPy utilities deal with several two-dimensional surfaces
-        # To be able to build 3D volumes, I will make use of the surface index as
-        # the third index in space
-        # It does not apply to the 'u' array because this way it is easier to
-        # write it in paraview
-
         # Generate the grid
-        vtk_info, grid = self.postproc_grid_generator.generate({
+        coordinates = self.postproc_grid_generator.coordinates({
                 'for_pos': self.data.structure.timestep_info[ts].for_pos[0:3]})
+        dimensions = [len(coords) for coords in coordinates]
 
-        # Compute the induced velocities
-        nx = grid[0].shape[1]
-        ny = grid[0].shape[2]
-        nz = len(grid)
+        # Grid points with the x coordinate varying fastest, as in VTK
+        z_points, y_points, x_points = np.meshgrid(*coordinates[::-1], indexing='ij')
+        points = np.column_stack((x_points.reshape(-1), y_points.reshape(-1), z_points.reshape(-1)))
 
-        array_counter = 0
-        u_ind = np.zeros((nx, ny, nz, 3), dtype=float)
-        if self.settings['include_induced']:
-            target_triads = np.zeros((nx*ny*nz, 3))
-            ipoint = -1
-            for iz in range(nz):
-                for ix in range(nx):
-                    for iy in range(ny):
-                        ipoint += 1
-                        target_triads[ipoint, :] = grid[iz][:, ix, iy].astype(dtype=ct.c_double, order='F', copy=True)
-
-            u_ind_points = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(self.data.aero.timestep_info[ts],
-                                                                                                      target_triads,
-                                                                                                      self.settings['vortex_radius'],
-                                                                                                      self.data.structure.timestep_info[ts].for_pos[0:3],
-                                                                                                      self.settings['num_cores'])
-            ipoint = -1
-            for iz in range(nz):
-                for ix in range(nx):
-                    for iy in range(ny):
-                        ipoint += 1
-                        u_ind[ix, iy, iz, :] = u_ind_points[ipoint, :]
-
-            # Write the data
-            vtk_info.point_data.add_array(u_ind.reshape((-1, u_ind.shape[-1]), order='F')) # Reshape the array except from the last dimension
-            vtk_info.point_data.get_array(array_counter).name = 'induced_velocity'
-            vtk_info.point_data.update()
-            array_counter += 1
-
-        # Add the external velocities
-        u_ext_out = np.zeros((nx, ny, nz, 3), dtype=float)
+        n_points = points.shape[0]
+        chunks = [(i_start, min(i_start + self.settings['chunk_size'], n_points))
+                  for i_start in range(0, n_points, max(self.settings['chunk_size'], 1))]
+        results = parallel.fork_map(lambda i_start, i_end: self.velocity_at_points(ts, points[i_start:i_end, :]),
+                                    chunks, num_processes=self.settings['num_processes'])
 
+        point_data = dict()
+        if self.settings['include_induced']:
+            point_data['induced_velocity'] = np.concatenate([result[0] for result in results])
         if self.settings['include_external']:
-            u_ext = []
-            for iz in range(nz):
-                u_ext.append(np.zeros((3, nx, ny), dtype=ct.c_double))
-            self.velocity_generator.generate({'zeta': grid,
+            point_data['external_velocity'] = np.concatenate([result[1] for result in results])
+        point_data['velocity'] = np.concatenate([result[0] + result[1] for result in results])
+
+        filename = self.folder + "VelocityField_" + '%06u' % ts
+        if self.settings['output_format'] == 'vti':
+            write_vti(filename + '.vti', coordinates, point_data)
+        elif self.settings['output_format'] == 'xdmf':
+            write_xdmf(filename + '.xdmf', coordinates, point_data)
+        else:
+            vtk_info = tvtk.RectilinearGrid()
+            vtk_info.dimensions = np.array(dimensions, dtype=int)
+            vtk_info.x_coordinates, vtk_info.y_coordinates, vtk_info.z_coordinates = coordinates
+            for array_counter, (name, data) in enumerate(point_data.items()):
+                vtk_info.point_data.add_array(data)
+                vtk_info.point_data.get_array(array_counter).name = name
+                vtk_info.point_data.update()
+            write_data(vtk_info, filename + '.vtk')
+
+    def velocity_at_points(self, ts, points):
+        """
+        Induced and external velocities at a set of points.
+
+        Args:
+            ts (int): Time step
+            points (np.ndarray): Point coordinates ``[n_points, 3]``
+
+        Returns:
+            tuple: Induced and external velocities ``[n_points, 3]``, zero if not included
+        """
+        n_points = points.shape[0]
+
+        u_ind = np.zeros((n_points, 3), dtype=ct.c_double)
+        if self.settings['include_induced']:
+            u_ind = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(self.data.aero.timestep_info[ts],
+                                                                            np.ascontiguousarray(points,
+                                                                                                 dtype=ct.c_double),
+                                                                            self.settings['vortex_radius'],
+                                                                            self.data.structure.timestep_info[ts].for_pos[0:3],
+                                                                            self.settings['num_cores'])
+
+        u_ext = np.zeros((n_points, 3), dtype=ct.c_double)
+        if self.settings['include_external']:
+            # the points are passed to the velocity field generator as a single surface of n_points x 1 vertices
+            zeta = [np.asfortranarray(points.T[:, :, None], dtype=ct.c_double)]
+            u_ext_surf = [np.zeros((3, n_points, 1), dtype=ct.c_double)]
+            self.velocity_generator.generate({'zeta': zeta,
                                               'override': True,
                                               't': ts*self.settings['dt'],
                                               'ts': ts,
                                               'dt': self.settings['dt'],
                                               'for_pos': 0*self.data.structure.timestep_info[ts].for_pos},
-                                             u_ext)
-            for iz in range(nz):
-                for ix in range(nx):
-                    for iy in range(ny):
-                        u_ext_out[ix, iy, iz, :] += u_ext[iz][:, ix, iy]
-
-            # Write the data
-            vtk_info.point_data.add_array(u_ext_out.reshape((-1, u_ext_out.shape[-1]), order='F')) # Reshape the array except from the last dimension
-            vtk_info.point_data.get_array(array_counter).name = 'external_velocity'
-            vtk_info.point_data.update()
-            array_counter += 1
-
-        # add the data
-        u = u_ind + u_ext_out
-
-        # Write the data
-        vtk_info.point_data.add_array(u.reshape((-1, u.shape[-1]), order='F')) # Reshape the array except from the last dimension
-        vtk_info.point_data.get_array(array_counter).name = 'velocity'
-        vtk_info.point_data.update()
-        array_counter += 1
-
-        filename = self.folder + "VelocityField_" + '%06u' % ts + ".vtk"
-        write_data(vtk_info, filename)
+                                             u_ext_surf)
+            u_ext = u_ext_surf[0][:, :, 0].T
+
+        return u_ind, u_ext
 
     def run(self, online=False):
         if online:
@@ -189,3 +212,105 @@ class PlotFlowField(BaseSolver):
                 if not self.data.structure.timestep_info[ts] is None:
                     self.output_velocity_field(ts)
         return self.data
+
+
+def grid_origin_spacing(coordinates):
+    """
+    Origin and spacing of a uniform grid.
+
+    Args:
+        coordinates (tuple): Coordinates of the grid points along the ``x``, ``y`` and ``z`` axes
+
+    Returns:
+        tuple: Origin and spacing of the grid. The spacing along axes with a single point is one.
+    """
+    origin = np.array([coords[0] for coords in coordinates], dtype=float)
+    spacing = np.array([(coords[-1] - coords[0]) / (len(coords) - 1) if len(coords) > 1 else 1.
+                        for coords in coordinates], dtype=float)
+    return origin, spacing
+
+
+def write_vti(filename, coordinates, point_data):
+    """
+    Writes point data on a uniform grid to a VTK XML image data file with raw binary appended data.
+
+    Args:
+        filename (str): Output file name, with the ``.vti`` extension
+        coordinates (tuple): Coordinates of the grid points along the ``x``, ``y`` and ``z`` axes
+        point_data (dict): Arrays of point data ``[n_points, n_components]``, with the ``x`` index varying fastest
+    """
+    origin, spacing = grid_origin_spacing(coordinates)
+    extent = ' '.join('0 %u' % (len(coords) - 1) for coords in coordinates)
+
+    header = ['<?xml version="1.0"?>',
+              '<VTKFile type="ImageData" version="1.0" byte_order="LittleEndian" header_type="UInt64">',
+              '  <ImageData WholeExtent="%s" Origin="%s" Spacing="%s">' % (extent,
+                                                                          ' '.join('%.17g' % x for x in origin),
+                                                                          ' '.join('%.17g' % x for x in spacing)),
+              '    <Piece Extent="%s">' % extent,
+              '      <PointData>']
+    offset = 0
+    arrays = []
+    for name, data in point_data.items():
+        data = np.ascontiguousarray(data, dtype='<f8')
+        n_components = data.shape[1] if data.ndim > 1 else 1
+        header.append('        <DataArray type="Float64" Name="%s" NumberOfComponents="%u" format="appended" '
+                      'offset="%u"/>' % (name, n_components, offset))
+        arrays.append(data)
+        offset += 8 + data.nbytes
+    header += ['      </PointData>',
+               '    </Piece>',
+               '  </ImageData>',
+               '  <AppendedData encoding="raw">']
+
+    with open(filename, 'wb') as f:
+        f.write(('\n'.join(header) + '\n   _').encode())
+        for data in arrays:
+            f.write(np.array([data.nbytes], dtype='<u8').tobytes())
+            f.write(data.tobytes())
+        f.write('\n  </AppendedData>\n</VTKFile>\n'.encode())
+
+
+def write_xdmf(filename, coordinates, point_data):
+    """
+    Writes point data on a uniform grid to an XDMF file, with the arrays stored in an HDF5 file with the same name.
+
+    Args:
+        filename (str): Output file name, with the ``.xdmf`` extension
+        coordinates (tuple): Coordinates of the grid points along the ``x``, ``y`` and ``z`` axes
+        point_data (dict): Arrays of point data ``[n_points, n_components]``, with the ``x`` index varying fastest
+    """
+    origin, spacing = grid_origin_spacing(coordinates)
+    # XDMF lists the dimensions from the slowest to the fastest varying index
+    dimensions = ' '.join('%u' % len(coords) for coords in coordinates[::-1])
+
+    h5_filename = os.path.splitext(filename)[0] + '.h5'
+    attributes = []
+    with h5.File(h5_filename, 'w') as f:
+        for name, data in point_data.items():
+            n_components = data.shape[1] if data.ndim > 1 else 1
+            f.create_dataset(name, data=data.reshape(tuple(len(coords) for coords in coordinates[::-1]) +
+                                                     ((n_components,) if n_components > 1 else ())))
+            attributes += ['      <Attribute Name="%s" AttributeType="%s" Center="Node">' %
+                           (name, 'Vector' if n_components == 3 else 'Scalar'),
+                           '        <DataItem Dimensions="%s%s" NumberType="Float" Precision="8" Format="HDF">'
+                           '%s:/%s</DataItem>' % (dimensions, ' %u' % n_components if n_components > 1 else '',
+                                                  os.path.basename(h5_filename), name),
+                           '      </Attribute>']
+
+    lines = ['<?xml version="1.0" ?>',
+             '<Xdmf Version="3.0">',
+             '  <Domain>',
+             '    <Grid Name="flow_field" GridType="Uniform">',
+             '      <Topology TopologyType="3DCoRectMesh" Dimensions="%s"/>' % dimensions,
+             '      <Geometry GeometryType="ORIGIN_DXDYDZ">',
+             '        <DataItem Dimensions="3" NumberType="Float" Precision="8" Format="XML">%s</DataItem>' %
+             ' '.join('%.17g' % x for x in origin[::-1]),
+             '        <DataItem Dimensions="3" NumberType="Float" Precision="8" Format="XML">%s</DataItem>' %
+             ' '.join('%.17g' % x for x in spacing[::-1]),
+             '      </Geometry>'] + attributes + \
+            ['    </Grid>',
+             '  </Domain>',
+             '</Xdmf>']
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
@@ -6,6 +6,7 @@ import sharpy.utils.cout_utils as cout
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.utils.h5utils as h5utils
+import sharpy.utils.instrumentation as instrumentation
 from sharpy.presharpy.presharpy import PreSharpy
 
 
@@ -197,6 +198,7 @@ class SaveData(BaseSolver):
 
         if self.settings['format'] == 'h5':
             file_exists = os.path.isfile(self.filename)
+            initial_size = os.path.getsize(self.filename) if file_exists else 0
             hdfile = h5py.File(self.filename, 'a')
 
             if (online and file_exists):
@@ -224,6 +226,7 @@ class SaveData(BaseSolver):
                         self.save_timestep(self.data, self.settings, it, hdfile)
 
             hdfile.close()
+            instrumentation.timeline.add_bytes(self.solver_id, os.path.getsize(self.filename) - initial_size)
 
             if self.settings['save_linear_uvlm']:
                 linhdffile = h5py.File(self.filename.replace('.data.h5', '.uvlmss.h5'), 'a')
@@ -0,0 +1,227 @@
+import os
+import time
+import numpy as np
+import scipy.linalg as sclalg
+import h5py as h5
+
+import sharpy.utils.settings as settings_utils
+from sharpy.utils.solver_interface import solver, BaseSolver
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.parallel as parallel
+
+
+@solver
+class StabilityMap(BaseSolver):
+    """
+    Velocity and density sweep of the linearised aeroelastic system.
+
+    The assembled (and, if applicable, reduced) UVLM system is reused at every point of the sweep and only the
+    structural equations are rescaled to the new velocity through
+    :meth:`~sharpy.linear.assembler.linearaeroelastic.LinearAeroelastic.update`. A change in air density scales the
+    aerodynamic forces transferred to the structure. Thus, the UVLM system needs to be scaled (see the
+    ``ScalingDict`` setting of :class:`~sharpy.linear.assembler.linearuvlm.LinearUVLM`).
+
+    The sweep comprises every combination of ``velocities`` and ``densities``. If ``num_processes`` is not ``1``,
+    points are evaluated in worker processes forked from the current one (see :mod:`sharpy.utils.parallel`), thus
+    the UVLM matrices are shared copy-on-write by all the workers and only the results are transferred back. The
+    linear system of the main process is not modified unless the points are evaluated serially.
+
+    At each point either the ``num_evals`` least damped continuous time eigenvalues with non-negative frequency
+    (``analysis = eigenvalues``), mapped from discrete time for discrete time systems, or the frequency response at
+    the reduced frequencies ``reduced_frequencies`` (``analysis = frequency_response``) are computed. Reduced
+    frequencies are based on the UVLM reference length.
+
+    The results of all the points are saved to a single stability map in the ``stability`` folder of the case
+    output folder:
+
+        * ``stability_map.dat``: eigenvalues, with columns ``u_inf rho mode real imag frequency damping``, where the
+          frequency is given in rad/s and modes are numbered from the least damped at each point.
+
+        * ``stability_map.h5``: frequency response, with datasets ``u_inf``, ``rho``, ``reduced_frequencies`` and
+          ``response`` of shape ``[n_points, p, m, n_freq]``.
+
+    The results are also stored in ``data.linear.stability['stability_map']``.
+    """
+    solver_id = 'StabilityMap'
+    solver_classification = 'post-processor'
+
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+    settings_options = dict()
+
+    settings_types['print_info'] = 'bool'
+    settings_default['print_info'] = False
+    settings_description['print_info'] = 'Print the results of each point to screen'
+
+    settings_types['velocities'] = 'list(float)'
+    settings_default['velocities'] = list()
+    settings_description['velocities'] = 'Free stream velocities of the sweep'
+
+    settings_types['densities'] = 'list(float)'
+    settings_default['densities'] = list()
+    settings_description['densities'] = 'Air densities of the sweep. If empty, the density at which the UVLM was ' \
+                                        'assembled is used'
+
+    settings_types['analysis'] = 'str'
+    settings_default['analysis'] = 'eigenvalues'
+    settings_description['analysis'] = 'Analysis performed at each point of the sweep'
+    settings_options['analysis'] = ['eigenvalues', 'frequency_response']
+
+    settings_types['num_evals'] = 'int'
+    settings_default['num_evals'] = 20
+    settings_description['num_evals'] = 'Number of least damped eigenvalues saved at each point'
+
+    settings_types['reduced_frequencies'] = 'list(float)'
+    settings_default['reduced_frequencies'] = [1e-3, 1.]
+    settings_description['reduced_frequencies'] = 'Reduced frequencies at which to compute the frequency response'
+
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes. If ``0``, the number of CPUs is used'
+
+    settings_table = settings_utils.SettingsTable()
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
+
+    def __init__(self):
+        self.settings = None
+        self.data = None
+        self.folder = None
+        self.caller = None
+
+        self.points = None
+
+    def initialise(self, data, custom_settings=None, caller=None):
+        self.data = data
+
+        if custom_settings is None:
+            self.settings = data.settings[self.solver_id]
+        else:
+            self.settings = custom_settings
+        settings_utils.to_custom_types(self.settings, self.settings_types, self.settings_default,
+                                       options=self.settings_options, no_ctype=True)
+
+        self.caller = caller
+        self.folder = data.output_folder + '/stability/'
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+
+        densities = self.settings['densities']
+        if len(densities) == 0:
+            densities = [self.data.linear.linear_system.uvlm.settings['density']]
+        self.points = [(u_inf, rho) for rho in densities for u_inf in self.settings['velocities']]
+
+    def run(self, online=False):
+        assert self.data.linear.linear_system.uvlm.scaled, 'The UVLM system is unscaled, unable to rescale the ' \
+                                                           'structural equations only. Rerun with a normalised ' \
+                                                           'UVLM system.'
+
+        if self.settings['analysis'] == 'eigenvalues':
+            function = self.eigenvalues
+        else:
+            function = self.frequency_response
+
+        cout.cout_wrap('Stability map: %g points, %u worker processes' %
+                       (len(self.points), min(parallel.get_num_processes(self.settings['num_processes']),
+                                              len(self.points))), 1)
+        t0 = time.time()
+        results = parallel.fork_map(function, self.points, num_processes=self.settings['num_processes'])
+        cout.cout_wrap('\tComputed the stability map in %f s' % (time.time() - t0), 2)
+
+        if self.settings['analysis'] == 'eigenvalues':
+            stability_map = self.save_eigenvalues(results)
+        else:
+            stability_map = self.save_frequency_response(results)
+
+        try:
+            self.data.linear.stability['stability_map'] = stability_map
+        except AttributeError:
+            self.data.linear.stability = {'stability_map': stability_map}
+
+        return self.data
+
+    def eigenvalues(self, u_inf, rho):
+        """
+        Continuous time eigenvalues of the aeroelastic system at a point of the sweep.
+
+        Args:
+            u_inf (float): Free stream velocity
+            rho (float): Air density
+
+        Returns:
+            np.ndarray: ``num_evals`` least damped eigenvalues with non-negative frequency, in rad/s
+        """
+        ss = self.data.linear.linear_system.update(u_inf, rho=rho)
+        time_scale = self.data.linear.linear_system.uvlm.sys.ScalingFacts['length'] / u_inf
+
+        eigenvalues = sclalg.eigvals(ss.A)
+        if ss.dt:
+            eigenvalues = np.log(eigenvalues) / (time_scale * ss.dt)
+        else:
+            # continuous time system
+            eigenvalues = eigenvalues / time_scale
+        eigenvalues = eigenvalues[eigenvalues.imag >= 0]
+        eigenvalues = eigenvalues[np.argsort(eigenvalues.real)[::-1]][:self.settings['num_evals']]
+
+        if self.settings['print_info']:
+            cout.cout_wrap('u: %.2f m/s\trho: %.4f kg/m3\tmax. CT eig. real: %.6f\tN unstab.: %.3d' %
+                           (u_inf, rho, np.max(eigenvalues.real), np.sum(eigenvalues.real > 0)), 1)
+        return eigenvalues
+
+    def frequency_response(self, u_inf, rho):
+        """
+        Frequency response of the aeroelastic system at a point of the sweep.
+
+        Since the time scale of the scaled system is the ratio of the UVLM reference length to the free stream
+        velocity, the response is evaluated directly at the reduced frequencies.
+
+        Args:
+            u_inf (float): Free stream velocity
+            rho (float): Air density
+
+        Returns:
+            np.ndarray: Frequency response ``[p, m, n_freq]``
+        """
+        ss = self.data.linear.linear_system.update(u_inf, rho=rho)
+        if self.settings['print_info']:
+            cout.cout_wrap('u: %.2f m/s\trho: %.4f kg/m3' % (u_inf, rho), 1)
+        return ss.freqresp(np.array(self.settings['reduced_frequencies']))
+
+    def save_eigenvalues(self, results):
+        u_inf = np.concatenate([np.ones(len(eigs)) * point[0] for point, eigs in zip(self.points, results)])
+        rho = np.concatenate([np.ones(len(eigs)) * point[1] for point, eigs in zip(self.points, results)])
+        mode = np.concatenate([np.arange(len(eigs)) for eigs in results])
+        eigenvalues = np.concatenate(results)
+
+        frequency = np.abs(eigenvalues)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            damping = np.where(frequency > 0, -eigenvalues.real / frequency, 1.)
+
+        np.savetxt(self.folder + '/stability_map.dat',
+                   np.column_stack((u_inf, rho, mode, eigenvalues.real, eigenvalues.imag, frequency, damping)),
+                   header='u_inf rho mode real imag frequency damping')
+        cout.cout_wrap('Saved stability map to %s' % self.folder + '/stability_map.dat', 1)
+
+        return {'u_inf': u_inf,
+                'rho': rho,
+                'mode': mode,
+                'evals_real': eigenvalues.real,
+                'evals_imag': eigenvalues.imag}
+
+    def save_frequency_response(self, results):
+        u_inf = np.array([point[0] for point in self.points])
+        rho = np.array([point[1] for point in self.points])
+        response = np.stack(results)
+        reduced_frequencies = np.array(self.settings['reduced_frequencies'])
+
+        with h5.File(self.folder + '/stability_map.h5', 'w') as f:
+            f.create_dataset('u_inf', data=u_inf)
+            f.create_dataset('rho', data=rho)
+            f.create_dataset('reduced_frequencies', data=reduced_frequencies)
+            f.create_dataset('response', data=response, dtype=complex)
+        cout.cout_wrap('Saved stability map to %s' % self.folder + '/stability_map.h5', 1)
+
+        return {'u_inf': u_inf,
+                'rho': rho,
+                'reduced_frequencies': reduced_frequencies,
+                'response': response}
@@ -1,7 +1,11 @@
+import os
 import numpy as np
+import h5py as h5
 import sharpy.utils.cout_utils as cout
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
+import sharpy.utils.parallel as parallel
+import sharpy.utils.h5utils as h5utils
 from sharpy.utils.datastructures import init_matrix_structure, standalone_ctypes_pointer
 import sharpy.aero.utils.uvlmlib as uvlmlib
 
@@ -21,7 +25,18 @@ class StallCheck(BaseSolver):
 
     The limits are set through the setting ``airfoil_stall_angles``, which takes a dictionary where the key is
     the ID to the airfoil (in string format) and the value is a 2-tuple containing the negative and positive limits
-    in radians.
+    in radians. The incidence angle of the leading edge panel of each spanwise strip is compared against the limits of
+    the airfoils of the structural nodes mapped to the strip.
+
+    The incidence angles of all the processed time steps are stacked in the attribute ``incidence_angle``, a list with
+    an array ``[n_tsteps, M, N]`` per surface, whose views are the ``incidence_angle`` entries of the ``postproc_cell``
+    of each time step. The strips out of the limits are flagged in ``stall_mask``, a list with a boolean array
+    ``[n_tsteps, N]`` per surface.
+
+    With ``h5_output``, these arrays are written to ``stall/stall_check.h5`` in the case output folder, together with
+    the time step numbers ``ts`` and the number of stalled panels ``stalled_panels`` ``[n_tsteps, n_surf]``, with
+    datasets ``incidence_angle_<i_surf>`` and ``stall_mask_<i_surf>`` for each surface. When run online, each time
+    step is appended to the file.
     """
     solver_id = 'StallCheck'
     solver_classification = 'post-processor'
@@ -43,6 +58,15 @@ class StallCheck(BaseSolver):
     settings_default['output_degrees'] = False
     settings_description['output_degrees'] = 'Output incidence angles in degrees vs radians'
 
+    settings_types['h5_output'] = 'bool'
+    settings_default['h5_output'] = False
+    settings_description['h5_output'] = 'Write ``h5`` file with the results of all time steps'
+
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes among which time steps are split when run ' \
+                                            'after the simulation. If ``0``, the number of CPUs is used'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -54,6 +78,13 @@ class StallCheck(BaseSolver):
         self.ts_max = None
         self.ts = None
         self.caller = None
+        self.folder = None
+
+        self.stall_table = None
+        self.incidence_angle = None
+        self.stall_mask = None
+        self.stalled_panels = None
+        self.h5_created = False
 
     def initialise(self, data, custom_settings=None, caller=None):
         self.data = data
@@ -65,70 +96,122 @@ class StallCheck(BaseSolver):
         self.ts_max = len(self.data.structure.timestep_info)
         self.caller = caller
 
+        if self.settings['h5_output']:
+            self.folder = data.output_folder + '/stall/'
+            if not os.path.isdir(self.folder):
+                os.makedirs(self.folder)
+
     def run(self, online=False):
         if not online:
-            for self.ts in range(self.ts_max):
-                self.check_stall()
-            cout.cout_wrap('...Finished', 1)
+            steps = list(range(self.ts_max))
+            # the incidence angles are computed by the workers and kept in the time steps of the main process
+            incidence_angles = parallel.timestep_map(self.calculate_incidence_angle, steps,
+                                                     num_processes=self.settings['num_processes'])
         else:
-            self.ts = len(self.data.structure.timestep_info) - 1
-            self.check_stall()
+            steps = [len(self.data.structure.timestep_info) - 1]
+            incidence_angles = [self.calculate_incidence_angle(steps[0])]
+        self.ts = steps[-1]
+
+        self.check_stall(steps, incidence_angles)
+        if self.settings['h5_output']:
+            self.write_h5(steps, online)
+        if not online:
+            cout.cout_wrap('...Finished', 1)
         return self.data
 
-    def check_stall(self):
-        # add entry to dictionary for postproc
-        tstep = self.data.aero.timestep_info[self.ts]
-        tstep.postproc_cell['incidence_angle'] = init_matrix_structure(dimensions=tstep.dimensions,
-                                                                       with_dim_dimension=False)
+    def calculate_incidence_angle(self, ts):
+        """
+        Returns:
+            list(np.ndarray): Incidence angle of the panels of each surface at the time step ``ts``
+        """
+        tstep = self.data.aero.timestep_info[ts]
+        incidence_angle = init_matrix_structure(dimensions=tstep.dimensions, with_dim_dimension=False)
 
         # create ctypes pointers
-        tstep.postproc_cell['incidence_angle_ct_list'] = None
-        tstep.postproc_cell['incidence_angle_ct_pointer'] = None
         tstep.postproc_cell['incidence_angle_ct_list'], tstep.postproc_cell['incidence_angle_ct_pointer'] = \
-            standalone_ctypes_pointer(tstep.postproc_cell['incidence_angle'])
+            standalone_ctypes_pointer(incidence_angle)
 
         # call calculate
-        uvlmlib.uvlm_calculate_incidence_angle(self.data.aero.timestep_info[self.ts],
-                                               self.data.structure.timestep_info[self.ts])
-
-        # calculate ratio of stalled panels and print
-        stalled_panels = False
-        stalled_surfs = np.zeros((tstep.n_surf, ), dtype=int)
-        added_panels = []
-        for i_surf in range(tstep.n_surf):
-            added_panels.append([])
-
-        for i_elem in range(self.data.structure.num_elem):
-            for i_local_node in range(self.data.structure.num_node_elem):
-                airfoil_id = self.data.aero.aero_dict['airfoil_distribution'][i_elem, i_local_node]
-                if self.settings['airfoil_stall_angles']:
+        uvlmlib.uvlm_calculate_incidence_angle(tstep, self.data.structure.timestep_info[ts])
+        return incidence_angle
+
+    def generate_stall_table(self):
+        """
+        Spanwise strips checked for stall.
+
+        Each structural node contributes an entry for each strip it is mapped to, with the limits of its airfoil.
+
+        Returns:
+            tuple(np.ndarray): Surface, spanwise panel index and negative and positive stall limits of each entry
+        """
+        i_surf, i_n, limits = [], [], []
+        if self.settings['airfoil_stall_angles']:
+            dimensions = self.data.aero.timestep_info[self.ts].dimensions
+            for i_elem in range(self.data.structure.num_elem):
+                for i_local_node in range(self.data.structure.num_node_elem):
+                    airfoil_id = self.data.aero.aero_dict['airfoil_distribution'][i_elem, i_local_node]
                     i_global_node = self.data.structure.connectivities[i_elem, i_local_node]
                     for i_dict in self.data.aero.struct2aero_mapping[i_global_node]:
-                        i_surf = i_dict['i_surf']
-                        i_n = i_dict['i_n']
-
-                        if i_n in added_panels[i_surf]:
-                            continue
-
-                        if i_n == tstep.dimensions[i_surf][1]:
+                        if i_dict['i_n'] == dimensions[i_dict['i_surf']][1]:
                             continue
+                        i_surf.append(i_dict['i_surf'])
+                        i_n.append(i_dict['i_n'])
+                        limits.append([float(limit) for limit in
+                                       self.settings['airfoil_stall_angles'][str(airfoil_id)]])
+
+        limits = np.array(limits, dtype=float).reshape(-1, 2)
+        return np.array(i_surf, dtype=int), np.array(i_n, dtype=int), limits[:, 0], limits[:, 1]
+
+    def check_stall(self, steps, incidence_angles):
+        """
+        Stacks the incidence angles of the time steps ``steps`` and flags the strips out of the stall limits.
+        """
+        if self.stall_table is None:
+            self.stall_table = self.generate_stall_table()
+        table_surf, table_n, lower_limit, upper_limit = self.stall_table
+
+        n_surf = len(incidence_angles[0])
+        self.incidence_angle = [np.array([angles[i_surf] for angles in incidence_angles]) for i_surf in range(n_surf)]
+        self.stall_mask = []
+        self.stalled_panels = np.zeros((len(steps), n_surf), dtype=int)
+        for i_surf in range(n_surf):
+            entries = table_surf == i_surf
+            # leading edge panel of the strip of each entry at every time step
+            angle = self.incidence_angle[i_surf][:, 0, table_n[entries]]
+            stalled = (angle < lower_limit[entries]) | (angle > upper_limit[entries])
+
+            n_stalled = np.zeros((len(steps), self.incidence_angle[i_surf].shape[2]), dtype=int)
+            np.add.at(n_stalled, (slice(None), table_n[entries]), stalled)
+            self.stall_mask.append(n_stalled > 0)
+            self.stalled_panels[:, i_surf] = np.sum(stalled, axis=1) * self.incidence_angle[i_surf].shape[2]
 
-                        limits = self.settings['airfoil_stall_angles'][str(airfoil_id)]
-                        if tstep.postproc_cell['incidence_angle'][i_surf][0, i_n] < float(limits[0]):
-                            stalled_panels = True
-                            stalled_surfs[i_surf] += tstep.postproc_cell['incidence_angle'][i_surf].shape[1]
-                        elif tstep.postproc_cell['incidence_angle'][i_surf][0, i_n] > float(limits[1]):
-                            stalled_panels = True
-                            stalled_surfs[i_surf] += tstep.postproc_cell['incidence_angle'][i_surf].shape[1]
-
-        if stalled_panels:
-            if self.settings['print_info']:
+        if self.settings['output_degrees']:
+            for i_surf in range(n_surf):
+                self.incidence_angle[i_surf] *= 180/np.pi
+
+        # add entries to dictionary for postproc
+        for i_step, ts in enumerate(steps):
+            tstep = self.data.aero.timestep_info[ts]
+            tstep.postproc_cell['incidence_angle'] = [angle[i_step] for angle in self.incidence_angle]
+            tstep.postproc_cell['incidence_angle_ct_list'], tstep.postproc_cell['incidence_angle_ct_pointer'] = \
+                standalone_ctypes_pointer(tstep.postproc_cell['incidence_angle'])
+
+        if self.settings['print_info']:
+            for i_step in np.where(np.any(self.stalled_panels > 0, axis=1))[0]:
                 cout.cout_wrap('Some panel has an incidence angle out of the linear region', 1)
                 cout.cout_wrap('The number of stalled panels per surface id are:', 1)
-                for i_surf in range(tstep.n_surf):
-                    cout.cout_wrap('\ti_surf = ' + str(i_surf) + ': ' + str(stalled_surfs[i_surf]) + ' panels.', 1)
-                # cout.cout_wrap('In total, the ratio of stalled panels is: ', str(stalled_surfs.sum()/))
-
-        if self.settings['output_degrees']:
-            for i_surf in range(tstep.n_surf):
-                tstep.postproc_cell['incidence_angle'][i_surf] *= 180/np.pi
+                for i_surf in range(n_surf):
+                    cout.cout_wrap('\ti_surf = ' + str(i_surf) + ': ' + str(self.stalled_panels[i_step, i_surf]) +
+                                   ' panels.', 1)
+
+    def write_h5(self, steps, online):
+        # overwrite the results of previous runs, then append each time step when run online
+        mode = 'a' if online and self.h5_created else 'w'
+        with h5.File(self.folder + 'stall_check.h5', mode) as f:
+            arrays = {'ts': np.array(steps, dtype=int),
+                      'stalled_panels': self.stalled_panels}
+            for i_surf in range(len(self.incidence_angle)):
+                arrays['incidence_angle_%02u' % i_surf] = self.incidence_angle[i_surf]
+                arrays['stall_mask_%02u' % i_surf] = self.stall_mask[i_surf]
+            h5utils.append_arrays(f, arrays)
+        self.h5_created = True
@@ -33,6 +33,12 @@ class UDPout(BaseSolver):
     del settings_default['send_output_to_all_clients']
     del settings_description['send_output_to_all_clients']
 
+    # data is sent from the time loop of the post-processor through the UDP output network
+    for key in ['transport', 'event_loop', 'shared_memory_settings']:
+        del settings_types[key]
+        del settings_default[key]
+        del settings_description[key]
+
     table = settings.SettingsTable()
     __doc__ += table.generate(settings_types, settings_default, settings_description,
                               header_line='This post-processor takes in the following settings, for a more '
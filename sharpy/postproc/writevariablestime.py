@@ -1,7 +1,9 @@
+import io
 import os
 import numpy as np
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
+import sharpy.utils.parallel as parallel
 
 
 @solver
@@ -92,6 +94,11 @@ class WriteVariablesTime(BaseSolver):
     settings_default['vel_field_points'] = np.array([0., 0., 0.])
     settings_description['vel_field_points'] = 'List of coordinates of the control points as x1, y1, z1, x2, y2, z2 ...'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of worker processes among which time steps are split when run ' \
+                                            'after the simulation. If ``0``, the number of CPUs is used'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -196,15 +203,27 @@ class WriteVariablesTime(BaseSolver):
     def run(self, online=False):
 
         if online:
-            self.data = self.write(-1)
+            self.append_to_files(self.write(-1, self.data.ts))
         else:
-            for it in range(len(self.data.structure.timestep_info)):
-                if self.data.structure.timestep_info[it] is not None:
-                    self.data = self.write(it)
+            steps = [it for it in range(len(self.data.structure.timestep_info))
+                     if self.data.structure.timestep_info[it] is not None]
+            # the workers return the lines of each time step, which are appended to the files in order
+            for buffers in parallel.timestep_map(self.write_step, steps, num_processes=self.settings['num_processes']):
+                self.append_to_files(buffers)
 
         return self.data
 
-    def write(self, it):
+    def write_step(self, it):
+        return self.write(it, it)
+
+    def write(self, it, ts):
+        """
+        Writes the variables at the time step ``it``, labelled as ``ts``, to in-memory buffers.
+
+        Returns:
+            dict: Text to append to each output file
+        """
+        buffers = dict()
 
         # FoR variables
         if 'FoR_number' in self.settings:
@@ -220,17 +239,17 @@ class WriteVariablesTime(BaseSolver):
             for ifor in range(len(self.settings['FoR_number'])):
                 filename = self.folder + "FoR_" + '%02d' % self.settings['FoR_number'][ifor] + "_" + self.settings['FoR_variables'][ivariable] + ".dat"
 
-                with open(filename, 'a') as fid:
-                    var = np.atleast_2d(getattr(tstep, self.settings['FoR_variables'][ivariable]))
-                    rows, cols = var.shape
-                    if ((cols == 1) and (rows == 1)):
-                        self.write_value_to_file(fid, self.data.ts, var, self.settings['delimiter'])
-                    elif ((cols > 1) and (rows == 1)):
-                        self.write_nparray_to_file(fid, self.data.ts, var, self.settings['delimiter'])
-                    elif ((cols == 1) and (rows >= 1)):
-                        self.write_value_to_file(fid, self.data.ts, var[ifor], self.settings['delimiter'])
-                    else:
-                        self.write_nparray_to_file(fid, self.data.ts, var[ifor,:], self.settings['delimiter'])
+                fid = self.file_buffer(buffers, filename)
+                var = np.atleast_2d(getattr(tstep, self.settings['FoR_variables'][ivariable]))
+                rows, cols = var.shape
+                if ((cols == 1) and (rows == 1)):
+                    self.write_value_to_file(fid, ts, var, self.settings['delimiter'])
+                elif ((cols > 1) and (rows == 1)):
+                    self.write_nparray_to_file(fid, ts, var, self.settings['delimiter'])
+                elif ((cols == 1) and (rows >= 1)):
+                    self.write_value_to_file(fid, ts, var[ifor], self.settings['delimiter'])
+                else:
+                    self.write_nparray_to_file(fid, ts, var[ifor,:], self.settings['delimiter'])
 
         # Structure variables at nodes
         for ivariable in range(len(self.settings['structure_variables'])):
@@ -241,19 +260,19 @@ class WriteVariablesTime(BaseSolver):
             if num_indices == 1:
                 # Beam global variables (i.e. not node dependant)
                 filename = self.folder + "struct_" + self.settings['structure_variables'][ivariable] + ".dat"
-                with open(filename, 'a') as fid:
-                    self.write_nparray_to_file(fid, self.data.ts, var, self.settings['delimiter'])
+                fid = self.file_buffer(buffers, filename)
+                self.write_nparray_to_file(fid, ts, var, self.settings['delimiter'])
 
             else:  # These variables have nodal values (i.e the number of indices is either 2 or 3)
                 for inode in range(len(self.settings['structure_nodes'])):
                     node = self.settings['structure_nodes'][inode]
                     filename = self.folder + "struct_" + self.settings['structure_variables'][ivariable] + "_node" + str(node) + ".dat"
-                    with open(filename, 'a') as fid:
-                        if num_indices == 2:
-                            self.write_nparray_to_file(fid, self.data.ts, var[node,:], self.settings['delimiter'])
-                        elif num_indices == 3:
-                            ielem, inode_in_elem = self.data.structure.node_master_elem[node]
-                            self.write_nparray_to_file(fid, self.data.ts, var[ielem,inode_in_elem,:], self.settings['delimiter'])
+                    fid = self.file_buffer(buffers, filename)
+                    if num_indices == 2:
+                        self.write_nparray_to_file(fid, ts, var[node,:], self.settings['delimiter'])
+                    elif num_indices == 3:
+                        ielem, inode_in_elem = self.data.structure.node_master_elem[node]
+                        self.write_nparray_to_file(fid, ts, var[ielem,inode_in_elem,:], self.settings['delimiter'])
 
 
         # Aerodynamic variables at panels
@@ -267,9 +286,9 @@ class WriteVariablesTime(BaseSolver):
 
                 filename = self.folder + "aero_" + self.settings['aero_panels_variables'][ivariable] + "_panel" + "_isurf" + str(i_surf) + "_im"+ str(i_m) + "_in"+ str(i_n) + ".dat"
 
-                with open(filename, 'a') as fid:
-                    var = getattr(self.data.aero.timestep_info[it], self.settings['aero_panels_variables'][ivariable])
-                    self.write_value_to_file(fid, self.data.ts, var.gamma[i_surf][i_m,i_n], self.settings['delimiter'])
+                fid = self.file_buffer(buffers, filename)
+                var = getattr(self.data.aero.timestep_info[it], self.settings['aero_panels_variables'][ivariable])
+                self.write_value_to_file(fid, ts, var.gamma[i_surf][i_m,i_n], self.settings['delimiter'])
 
 
         # Aerodynamic variables at nodes
@@ -283,9 +302,9 @@ class WriteVariablesTime(BaseSolver):
 
                 filename = self.folder + "aero_" + self.settings['aero_nodes_variables'][ivariable] + "_node" + "_isurf" + str(i_surf) + "_im"+ str(i_m) + "_in"+ str(i_n) + ".dat"
 
-                with open(filename, 'a') as fid:
-                    var = getattr(self.data.aero.timestep_info[it], self.settings['aero_nodes_variables'][ivariable])
-                    self.write_nparray_to_file(fid, self.data.ts, var[i_surf][:,i_m,i_n], self.settings['delimiter'])
+                fid = self.file_buffer(buffers, filename)
+                var = getattr(self.data.aero.timestep_info[it], self.settings['aero_nodes_variables'][ivariable])
+                self.write_nparray_to_file(fid, ts, var[i_surf][:,i_m,i_n], self.settings['delimiter'])
 
         # Velocity field variables at points
         for ivariable in range(len(self.settings['vel_field_variables'])):
@@ -293,16 +312,28 @@ class WriteVariablesTime(BaseSolver):
                 uext = [np.zeros((3, self.n_vel_field_points, 1))]
                 self.velocity_generator.generate({'zeta': self.vel_field_points,
                                     'for_pos': tstep.for_pos[0:3],
-                                    't': self.data.ts*self.caller.settings['dt'],
+                                    't': ts*self.caller.settings['dt'],
                                     'is_wake': False,
                                     'override': True},
                                     uext)
                 for ipoint in range(self.n_vel_field_points):
                     filename = self.folder + "vel_field_" + self.settings['vel_field_variables'][ivariable] + "_point" + str(ipoint) + ".dat"
-                    with open(filename, 'a') as fid:
-                        self.write_nparray_to_file(fid, self.data.ts, uext[0][:,ipoint,0], self.settings['delimiter'])
-
-        return self.data
+                    fid = self.file_buffer(buffers, filename)
+                    self.write_nparray_to_file(fid, ts, uext[0][:,ipoint,0], self.settings['delimiter'])
+
+        return {filename: fid.getvalue() for filename, fid in buffers.items()}
+
+    @staticmethod
+    def file_buffer(buffers, filename):
+        if filename not in buffers:
+            buffers[filename] = io.StringIO()
+        return buffers[filename]
+
+    @staticmethod
+    def append_to_files(buffers):
+        for filename, text in buffers.items():
+            with open(filename, 'a') as fid:
+                fid.write(text)
 
     def write_nparray_to_file(self, fid, ts, nparray, delimiter):
 
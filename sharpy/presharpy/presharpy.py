@@ -5,6 +5,7 @@ import sharpy.utils.cout_utils as cout
 from sharpy.utils.solver_interface import solver, dict_of_solvers
 import sharpy.utils.settings as settings
 import sharpy.utils.exceptions as exceptions
+import sharpy.utils.instrumentation as instrumentation
 
 
 @solver
@@ -71,6 +72,16 @@ class PreSharpy(object):
     settings_description['save_settings'] = 'Save a copy of the settings to a ``.sharpy`` file in the output ' \
                                             'directory specified in ``log_folder``'
 
+    settings_types['instrumentation'] = 'bool'
+    settings_default['instrumentation'] = False
+    settings_description['instrumentation'] = 'Record wall time, call counts, FSI iterations and bytes written ' \
+                                              'during the run. See :class:`~sharpy.utils.instrumentation.Timeline`'
+
+    settings_types['instrumentation_settings'] = 'dict'
+    settings_default['instrumentation_settings'] = dict()
+    settings_description['instrumentation_settings'] = 'Settings for the run instrumentation. See ' \
+                                                       ':class:`~sharpy.utils.instrumentation.Timeline`'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description,
                                        header_line='The following are the settings that the PreSharpy class takes:')
@@ -108,6 +119,10 @@ class PreSharpy(object):
             cout.cout_wrap('SHARPy output folder set')
             cout.cout_wrap('\t' + self.output_folder, 1)
 
+            if self.settings['SHARPy']['instrumentation']:
+                instrumentation.timeline.initialise(self.settings['SHARPy']['instrumentation_settings'],
+                                                    self.output_folder)
+
             if self.settings['SHARPy']['save_settings']:
                 self.save_settings()
 
@@ -131,6 +146,10 @@ class PreSharpy(object):
         self.case_route = self.settings['SHARPy']['route'] + '/'
         self.case_name = self.settings['SHARPy']['case']
 
+        if self.settings['SHARPy']['instrumentation']:
+            instrumentation.timeline.initialise(self.settings['SHARPy']['instrumentation_settings'],
+                                                self.output_folder)
+
     def save_settings(self):
         """
         Saves the settings to a ``.sharpy`` config obj file in the output directory.
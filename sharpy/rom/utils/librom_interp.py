@@ -15,6 +15,16 @@ The module includes the methods:
     - :func:`~sharpy.rom.utils.librom_interp.BT_transfer_function`: evolution of transfer function methods. The growth of
       the interpolated system size is avoided through balancing.
 
+    - :class:`~sharpy.rom.utils.librom_interp.InterpROM`: interpolation of the matrices of state-space models projected
+      onto common generalised coordinates.
+
+The interpolatory weights over 1D and scattered multi-dimensional parameter spaces are obtained with:
+
+    - :func:`~sharpy.rom.utils.librom_interp.linear_weights`: piecewise linear weights over a 1D grid.
+
+    - :class:`~sharpy.rom.utils.librom_interp.ScatteredWeights`: barycentric weights over a Delaunay triangulation of
+      scattered points in any number of dimensions.
+
 
 References:
 
@@ -33,6 +43,7 @@ Date: Mar-Apr 2019
 import warnings
 import numpy as np
 import scipy.linalg as scalg
+import scipy.spatial as scspa
 
 # dependency
 import sharpy.linear.src.libss as libss
@@ -222,8 +233,10 @@ class InterpROM:
     projecting the state-space models onto a common set of generalised 
     coordinates before interpoling.
 
-    For development purposes, the method currently creates a hard copy of the
-    projected matrices into the self.AA, self.BB, self.CC lists
+    The (projected) matrices of all state-space models are stacked into the
+    arrays self.AA, self.BB, self.CC and self.DD, of shape [N_interp, ...], such
+    that the interpolated model is obtained with a single tensor contraction
+    over the state-space models with non-zero weight.
 
 
     Inputs:
@@ -303,12 +316,12 @@ class InterpROM:
         self.Projected = False
         if VV is None or WWT is None:
             self.Projected = True
-            self.AA = [ss_here.A for ss_here in SS]
-            self.BB = [ss_here.B for ss_here in SS]
-            self.CC = [ss_here.C for ss_here in SS]
+            self.AA = np.array([ss_here.A for ss_here in SS])
+            self.BB = np.array([ss_here.B for ss_here in SS])
+            self.CC = np.array([ss_here.C for ss_here in SS])
 
         # projection required for D
-        self.DD = [ss_here.D for ss_here in SS]
+        self.DD = np.array([ss_here.D for ss_here in SS])
 
         ### check state-space models
         Nx, Nu, Ny = SS[0].states, SS[0].inputs, SS[0].outputs
@@ -331,16 +344,14 @@ class InterpROM:
         assert self.Projected, ('You must project the state-space models over' +
                                 ' a common basis before interpolating')
 
-        Aint = np.zeros_like(self.AA[0])
-        Bint = np.zeros_like(self.BB[0])
-        Cint = np.zeros_like(self.CC[0])
-        Dint = np.zeros_like(self.DD[0])
+        wv = np.asarray(wv)
+        iivec = np.flatnonzero(wv)
+        wv = wv[iivec]
 
-        for ii in range(len(self.AA)):
-            Aint += wv[ii] * self.AA[ii]
-            Bint += wv[ii] * self.BB[ii]
-            Cint += wv[ii] * self.CC[ii]
-            Dint += wv[ii] * self.DD[ii]
+        Aint = np.tensordot(wv, self.AA[iivec], axes=1)
+        Bint = np.tensordot(wv, self.BB[iivec], axes=1)
+        Cint = np.tensordot(wv, self.CC[iivec], axes=1)
+        Dint = np.tensordot(wv, self.DD[iivec], axes=1)
 
         return libss.ss(Aint, Bint, Cint, Dint, self.SS[0].dt)
 
@@ -485,9 +496,115 @@ class InterpROM:
             self.BB.append(np.dot(self.QQinv[ii], self.SS[ii].B))
             self.CC.append(np.dot(self.SS[ii].C, self.QQ[ii]))
 
+        self.AA = np.array(self.AA)
+        self.BB = np.array(self.BB)
+        self.CC = np.array(self.CC)
+
         self.Projected = True
 
 
+def linear_weights(zv, zint, extrapolate=False):
+    """
+    Piecewise linear interpolatory weights over the 1D grid ``zv``.
+
+    Args:
+        zv (np.ndarray): Grid points. Need not be sorted.
+        zint (float): Interpolation point
+        extrapolate (bool): If ``True``, the weights of the first/last interval are extrapolated for points outside
+          the grid. Else, the weights of the closest grid point are returned.
+
+    Returns:
+        np.ndarray: Weights of each grid point, with at most two non-zero entries
+
+    Raises:
+        ValueError: If the grid has repeated points
+    """
+    zv = np.asarray(zv, dtype=float)
+    wv = np.zeros(len(zv))
+    if len(zv) == 1:
+        wv[0] = 1.
+        return wv
+
+    order = np.argsort(zv)
+    zsort = zv[order]
+    if np.any(np.diff(zsort) == 0.):
+        raise ValueError('Repeated grid points in %s. Remove the duplicate points' % zsort)
+    if not extrapolate:
+        zint = min(max(zint, zsort[0]), zsort[-1])
+
+    ii = min(max(np.searchsorted(zsort, zint) - 1, 0), len(zv) - 2)
+    ratio = (zint - zsort[ii]) / (zsort[ii + 1] - zsort[ii])
+    wv[order[ii]] = 1. - ratio
+    wv[order[ii + 1]] += ratio
+
+    return wv
+
+
+class ScatteredWeights:
+    """
+    Interpolatory weights over scattered points in a multi-dimensional parameter space.
+
+    The points are scaled to the unit hypercube (such that parameters of different magnitude, e.g. velocity and
+    altitude, have the same influence on the triangulation) and triangulated once at construction. The weights at
+    an interpolation point are the barycentric coordinates of the point in its simplex, thus at most ``n_dim + 1``
+    weights are non-zero. Outside of the convex hull of the points, the weight of the closest point is one.
+
+    Parameters that are constant over all points are ignored. If a single parameter varies, the weights are
+    obtained with :func:`linear_weights`.
+
+    Args:
+        points (np.ndarray): Points ``[N_interp, n_dim]``
+
+    Raises:
+        ValueError: If two points coincide
+    """
+
+    def __init__(self, points):
+
+        points = np.asarray(points, dtype=float)
+        if points.ndim == 1:
+            points = points[:, None]
+        self.n_points = points.shape[0]
+        if np.unique(points, axis=0).shape[0] < self.n_points:
+            raise ValueError('Repeated points in the parameter space. Remove the duplicate points')
+
+        pmin, pmax = np.min(points, axis=0), np.max(points, axis=0)
+        self.active = np.flatnonzero(pmax > pmin)
+        self.offset = pmin[self.active]
+        self.scale = pmax[self.active] - pmin[self.active]
+        self.points = (points[:, self.active] - self.offset) / self.scale
+
+        self.tri = None
+        self.tree = None
+        if len(self.active) > 1:
+            self.tri = scspa.Delaunay(self.points)
+            self.tree = scspa.cKDTree(self.points)
+
+    def __call__(self, zint):
+        """
+        Returns the weights ``[N_interp]`` of each point at the interpolation point ``zint[n_dim]``.
+        """
+        wv = np.zeros(self.n_points)
+        if len(self.active) == 0:
+            wv[0] = 1.
+            return wv
+
+        zint = (np.atleast_1d(np.asarray(zint, dtype=float))[self.active] - self.offset) / self.scale
+        if self.tri is None:
+            return linear_weights(self.points[:, 0], zint[0])
+
+        simplex = self.tri.find_simplex(zint)
+        if simplex < 0:
+            wv[self.tree.query(zint)[1]] = 1.
+            return wv
+
+        transform = self.tri.transform[simplex]
+        bary = np.dot(transform[:-1], zint - transform[-1])
+        wv[self.tri.simplices[simplex]] = np.append(bary, 1. - np.sum(bary))
+
+        return wv
+
+
 # ------------------------------------------------------------------------------
 
 
@@ -0,0 +1,239 @@
+r"""Parametric Reduced Order Model Database
+
+Offline/online framework for parametric reduced order models (ROMs) defined over a grid of flight conditions (e.g.
+free stream velocity, altitude and mass case).
+
+Offline, :meth:`ROMDatabase.build` generates the ROMs at each point of the grid, in parallel worker processes (see
+:mod:`sharpy.utils.parallel`), and :meth:`ROMDatabase.save` stores them, together with the projection bases used to
+obtain them, in a single HDF5 file.
+
+Online, :meth:`ROMDatabase.interpolator` projects the ROMs onto common generalised coordinates once and returns a
+:class:`ParametricROM`, which evaluates the interpolated ROM at any point of the parameter space through a weighted
+sum of the stacked ROM matrices. The interpolatory weights are piecewise linear if a single parameter varies over
+the grid or barycentric over a Delaunay triangulation of the (scattered) points otherwise (see
+:mod:`sharpy.rom.utils.librom_interp`).
+
+HDF5 database layout:
+
+    * ``parameters``: names of the parameters
+    * ``points``: parameter values at each point ``[n_points, n_parameters]``
+    * ``rom_<ii>``: group of the ROM at the ``ii``-th point with datasets ``A``, ``B``, ``C``, ``D`` and, if
+      available, the right and left projection bases ``V`` and ``WT`` such that :math:`\mathbf{A}_{rom} =
+      \mathbf{W}^\top \mathbf{AV}`. The time step of discrete time ROMs is stored in the attribute ``dt``.
+"""
+import itertools
+import os
+import time
+
+import h5py as h5
+import numpy as np
+import scipy.sparse as scsp
+
+import sharpy.linear.src.libss as libss
+import sharpy.rom.utils.librom_interp as librom_interp
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.parallel as parallel
+
+
+def grid_points(*axes):
+    """
+    Full factorial grid of parameter values.
+
+    Args:
+        *axes (list): Values of each parameter
+
+    Returns:
+        np.ndarray: Points ``[n_points, n_parameters]``, with the last parameter varying fastest
+
+    Examples:
+        >>> grid_points([10., 20.], [0., 1000.])
+        array([[  10.,    0.],
+               [  10., 1000.],
+               [  20.,    0.],
+               [  20., 1000.]])
+    """
+    return np.array(list(itertools.product(*axes)), dtype=float).reshape(-1, len(axes))
+
+
+def _dense(matrix):
+    if scsp.issparse(matrix) or hasattr(matrix, 'todense'):
+        return np.array(matrix.todense())
+    return np.asarray(matrix)
+
+
+class ROMDatabase(object):
+    """
+    Database of ROMs tabulated over a grid of points of the parameter space.
+
+    Args:
+        parameters (list(str)): Names of the parameters
+        points (np.ndarray): Parameter values at each point ``[n_points, n_parameters]``
+        roms (list(sharpy.linear.src.libss.ss)): ROM at each point
+        right_bases (list(np.ndarray)): Right projection basis ``V`` of each ROM, or ``None``
+        left_bases (list(np.ndarray)): Transposed left projection basis ``W^T`` of each ROM, or ``None``
+    """
+
+    def __init__(self, parameters, points, roms, right_bases=None, left_bases=None):
+
+        self.parameters = list(parameters)
+        self.points = np.asarray(points, dtype=float).reshape(len(roms), len(self.parameters))
+        self.roms = roms
+        self.right_bases = right_bases
+        self.left_bases = left_bases
+
+    @property
+    def n_points(self):
+        return len(self.roms)
+
+    @classmethod
+    def build(cls, generate_rom, parameters, points, num_processes=None):
+        """
+        Offline stage: generates the ROMs at each point of the parameter space.
+
+        Each point is evaluated in a worker process forked from the current one, such that ``generate_rom`` (e.g. a
+        function that runs a SHARPy case at the given flight condition and returns its ROM) need not be picklable.
+
+        Args:
+            generate_rom (callable): Function of the parameter values of a point that returns its ROM
+              (:class:`sharpy.linear.src.libss.ss`) or a tuple ``(rom, V, WT)`` with the ROM and its projection bases
+            parameters (list(str)): Names of the parameters
+            points (np.ndarray): Parameter values at each point ``[n_points, n_parameters]``
+            num_processes (int): Number of worker processes. If ``None`` or ``< 1`` the number of CPUs is used
+
+        Returns:
+            ROMDatabase: ROM database
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, len(parameters))
+
+        cout.cout_wrap('Building ROM database: %g points, %u worker processes' %
+                       (len(points), min(parallel.get_num_processes(num_processes), len(points))), 1)
+        t0 = time.time()
+        results = parallel.fork_map(generate_rom, [tuple(point) for point in points], num_processes=num_processes)
+        cout.cout_wrap('\tBuilt the ROM database in %f s' % (time.time() - t0), 2)
+
+        if all(isinstance(result, tuple) for result in results):
+            roms = [result[0] for result in results]
+            right_bases = [_dense(result[1]) for result in results]
+            left_bases = [_dense(result[2]) for result in results]
+        else:
+            roms = results
+            right_bases, left_bases = None, None
+
+        return cls(parameters, points, roms, right_bases, left_bases)
+
+    def save(self, filename):
+        """
+        Saves the database to the HDF5 file ``filename``.
+        """
+        if '.h5' not in filename[-3:]:
+            filename += '.h5'
+        folder = os.path.dirname(filename)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        with h5.File(filename, 'w') as f:
+            f.create_dataset('parameters', data=np.array(self.parameters, dtype='S'))
+            f.create_dataset('points', data=self.points)
+            for ii, rom in enumerate(self.roms):
+                grp = f.create_group('rom_%04d' % ii)
+                for name in ['A', 'B', 'C', 'D']:
+                    grp.create_dataset(name, data=_dense(getattr(rom, name)))
+                if rom.dt is not None:
+                    grp.attrs['dt'] = rom.dt
+                if self.right_bases is not None:
+                    grp.create_dataset('V', data=self.right_bases[ii])
+                    grp.create_dataset('WT', data=self.left_bases[ii])
+
+        cout.cout_wrap('Saved ROM database to %s' % filename, 1)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Loads a database saved with :meth:`save`.
+
+        Returns:
+            ROMDatabase: ROM database
+        """
+        with h5.File(filename, 'r') as f:
+            parameters = [name.decode() for name in f['parameters'][()]]
+            points = f['points'][()]
+
+            roms, right_bases, left_bases = [], [], []
+            for ii in range(len(points)):
+                grp = f['rom_%04d' % ii]
+                roms.append(libss.ss(*[grp[name][()] for name in ['A', 'B', 'C', 'D']],
+                                     dt=grp.attrs['dt'] if 'dt' in grp.attrs else None))
+                if 'V' in grp:
+                    right_bases.append(grp['V'][()])
+                    left_bases.append(grp['WT'][()])
+
+        if len(right_bases) != len(roms):
+            right_bases, left_bases = None, None
+
+        return cls(parameters, points, roms, right_bases, left_bases)
+
+    def interpolator(self, method_proj=None, reference=0, extrapolate=False):
+        """
+        Online stage: projects the ROMs onto common generalised coordinates and returns the parametric ROM.
+
+        Args:
+            method_proj (str): Projection method of :class:`sharpy.rom.utils.librom_interp.InterpROM`. If ``None``,
+              the ROMs are assumed to be defined over the same generalised coordinates.
+            reference (int): Index of the point whose bases are used as reference for the projection
+            extrapolate (bool): Linear extrapolation outside the grid in 1D parameter spaces
+
+        Returns:
+            ParametricROM: Interpolated ROM
+        """
+        if method_proj is None:
+            interp = librom_interp.InterpROM(self.roms)
+        else:
+            if self.right_bases is None:
+                raise ValueError('The ROM database does not include the projection bases, unable to project '
+                                 'with method %s' % method_proj)
+            interp = librom_interp.InterpROM(self.roms, VV=self.right_bases, WWT=self.left_bases,
+                                             Vref=self.right_bases[reference],
+                                             WTref=self.left_bases[reference],
+                                             method_proj=method_proj)
+            interp.project()
+
+        return ParametricROM(interp, self.parameters, self.points, extrapolate=extrapolate)
+
+
+class ParametricROM(object):
+    """
+    ROM interpolated over a (scattered) grid of points of the parameter space.
+
+    Args:
+        interp (sharpy.rom.utils.librom_interp.InterpROM): Projected ROM interpolator
+        parameters (list(str)): Names of the parameters
+        points (np.ndarray): Parameter values at each point ``[n_points, n_parameters]``
+        extrapolate (bool): Linear extrapolation outside the grid in 1D parameter spaces
+    """
+
+    def __init__(self, interp, parameters, points, extrapolate=False):
+
+        self.interp = interp
+        self.parameters = list(parameters)
+        self.points = np.asarray(points, dtype=float)
+        self.extrapolate = extrapolate
+
+        self.weights = librom_interp.ScatteredWeights(self.points)
+
+    def get_weights(self, point):
+        """
+        Returns:
+            np.ndarray: Interpolatory weights of the tabulated ROMs at ``point[n_parameters]``
+        """
+        weights = self.weights
+        if self.extrapolate and weights.tri is None and len(weights.active) == 1:
+            zint = (np.atleast_1d(point)[weights.active[0]] - weights.offset[0]) / weights.scale[0]
+            return librom_interp.linear_weights(weights.points[:, 0], zint, extrapolate=True)
+        return weights(point)
+
+    def __call__(self, point):
+        """
+        Returns:
+            sharpy.linear.src.libss.ss: Interpolated ROM at ``point[n_parameters]``
+        """
+        return self.interp(self.get_weights(point))
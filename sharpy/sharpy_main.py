@@ -29,6 +29,7 @@ def main(args=None, sharpy_input_dict=None):
 
     import sharpy.utils.input_arg as input_arg
     import sharpy.utils.solver_interface as solver_interface
+    import sharpy.utils.instrumentation as instrumentation
     from sharpy.presharpy.presharpy import PreSharpy
     from sharpy.utils.cout_utils import start_writer, finish_writer
     import logging
@@ -109,8 +110,11 @@ def main(args=None, sharpy_input_dict=None):
         # Loop for the solvers specified in *.sharpy['SHARPy']['flow']
         for solver_name in settings['SHARPy']['flow']:
             solver = solver_interface.initialise_solver(solver_name)
-            solver.initialise(data)
-            data = solver.run()
+            with instrumentation.timeline.phase(solver_name + '.initialise'):
+                solver.initialise(data)
+            with instrumentation.timeline.phase(solver_name + '.run'):
+                data = solver.run()
+        instrumentation.timeline.finish()
 
         cpu_time = time.process_time() - t
         wall_time = time.perf_counter() - t0_wall
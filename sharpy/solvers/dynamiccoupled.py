@@ -18,6 +18,10 @@ import sharpy.utils.algebra as algebra
 import sharpy.utils.exceptions as exc
 import sharpy.io.network_interface as network_interface
 import sharpy.utils.generator_interface as gen_interface
+import sharpy.utils.instrumentation as instrumentation
+import sharpy.utils.realtime as realtime
+import sharpy.utils.coupling_acceleration as coupling_acceleration
+import sharpy.utils.adaptive_time_step as adaptive_time_step
 
 
 @solver
@@ -39,6 +43,20 @@ class DynamicCoupled(BaseSolver):
     ``runtime_generators`` are :class:`~sharpy.generators.externalforces.ExternalForces` and
     :class:`~sharpy.generators.modifystructure.ModifyStructure`.
 
+    With ``adaptive_time_step = on``, the time step is resized after every step from a predictor/corrector error
+    estimate of the structural state and the number of FSI iterations (see :mod:`sharpy.utils.adaptive_time_step`),
+    and the simulation runs until the nominal final time ``n_time_steps * dt``. The time and time step of each step
+    are recorded in the ``t`` and ``dt`` attributes of the structural time step info. Adaptive time stepping requires
+    an aerodynamic solver with ``cfl1 = off``. Prescribed ``dynamic_forces`` are sampled at the nominal time step
+    closest to the current time, whereas the prescribed FoR motion of ``NonLinearDynamicPrescribedStep`` is still read
+    by time step index.
+
+    With ``aero_subcycling = N > 1``, the aerodynamics are solved (and the FSI loop run) only every ``N`` time steps.
+    In the time steps in between, only the structure is solved, under the aerodynamic loads of the last aerodynamic
+    solutions, which are either frozen or extrapolated in time (``aero_subcycling_loads``), and the wake is not
+    convected. Since the aerodynamic time step then differs from the structural one, subcycling requires an
+    aerodynamic solver with ``cfl1 = off`` and is not available with ``include_unsteady_force_contribution = on``.
+
     """
     solver_id = 'DynamicCoupled'
     solver_classification = 'Coupled'
@@ -113,6 +131,32 @@ class DynamicCoupled(BaseSolver):
     settings_description['dynamic_relaxation'] = 'Controls if relaxation factor is modified during the FSI iteration ' \
                                                  'process'
 
+    settings_types['coupling_accelerator'] = 'str'
+    settings_default['coupling_accelerator'] = ''
+    settings_description['coupling_accelerator'] = 'Accelerator of the FSI iteration. If empty, the forces are ' \
+                                                   'relaxed with ``relaxation_factor``. ' \
+                                                   'See :py:mod:`sharpy.utils.coupling_acceleration`'
+    settings_options['coupling_accelerator'] = ['ConstantRelaxation', 'Aitken', 'IQNILS', 'Anderson']
+
+    settings_types['coupling_accelerator_settings'] = 'dict'
+    settings_default['coupling_accelerator_settings'] = dict()
+    settings_description['coupling_accelerator_settings'] = 'Settings for the ``coupling_accelerator``'
+
+    settings_types['fsi_predictor'] = 'str'
+    settings_default['fsi_predictor'] = ''
+    settings_description['fsi_predictor'] = 'Extrapolation of the structural state from the last converged time ' \
+                                            'steps to generate the first FSI iterate, on whose grid the first ' \
+                                            'aerodynamic solution is computed. If empty, the previous time step ' \
+                                            'is used'
+    settings_options['fsi_predictor'] = ['linear', 'quadratic']
+
+    settings_types['fsi_predictor_fallback_steps'] = 'int'
+    settings_default['fsi_predictor_fallback_steps'] = 10
+    settings_description['fsi_predictor_fallback_steps'] = 'If the extrapolated iterate is further from the first ' \
+                                                           'structural solution than the previous time step, the ' \
+                                                           'predictor is switched off during this number of ' \
+                                                           'time steps'
+
     settings_types['postprocessors'] = 'list(str)'
     settings_default['postprocessors'] = list()
     settings_description['postprocessors'] = 'List of the postprocessors to run at the end of every time step'
@@ -172,6 +216,41 @@ class DynamicCoupled(BaseSolver):
                                                ':class:`~sharpy.io.network_interface.NetworkLoader` for supported ' \
                                                'entries'
 
+    settings_types['real_time'] = 'bool'
+    settings_default['real_time'] = False
+    settings_description['real_time'] = 'Pace the time steps to the wall clock. When behind schedule, non-essential ' \
+                                        'postprocessors are skipped and ``fsi_substeps`` is reduced. ' \
+                                        'See :py:mod:`sharpy.utils.realtime`'
+
+    settings_types['real_time_settings'] = 'dict'
+    settings_default['real_time_settings'] = dict()
+    settings_description['real_time_settings'] = 'Settings for the real time pacing. ' \
+                                                 'See :class:`~sharpy.utils.realtime.RealTimePacer`'
+
+    settings_types['adaptive_time_step'] = 'bool'
+    settings_default['adaptive_time_step'] = False
+    settings_description['adaptive_time_step'] = 'Resize the time step from a predictor/corrector error estimate ' \
+                                                 'and the number of FSI iterations. ``dt`` is taken as the ' \
+                                                 'initial time step. See :py:mod:`sharpy.utils.adaptive_time_step`'
+
+    settings_types['adaptive_time_step_settings'] = 'dict'
+    settings_default['adaptive_time_step_settings'] = dict()
+    settings_description['adaptive_time_step_settings'] = 'Settings for the adaptive time stepping. ' \
+                                                          'See :class:`~sharpy.utils.adaptive_time_step.' \
+                                                          'AdaptiveTimeStep`'
+
+    settings_types['aero_subcycling'] = 'int'
+    settings_default['aero_subcycling'] = 1
+    settings_description['aero_subcycling'] = 'Number of time steps per aerodynamic solution. The structure alone ' \
+                                              'is solved in the time steps in between'
+
+    settings_types['aero_subcycling_loads'] = 'str'
+    settings_default['aero_subcycling_loads'] = 'extrapolated'
+    settings_description['aero_subcycling_loads'] = 'Aerodynamic loads applied in the time steps without ' \
+                                                    'aerodynamic solution: ``frozen`` at the last aerodynamic ' \
+                                                    'solution or linearly ``extrapolated`` in time from the last two'
+    settings_options['aero_subcycling_loads'] = ['extrapolated', 'frozen']
+
     settings_types['runtime_generators'] = 'dict'
     settings_default['runtime_generators'] = dict()
     settings_description['runtime_generators'] = 'The dictionary keys are the runtime generators to be used. ' \
@@ -197,8 +276,16 @@ class DynamicCoupled(BaseSolver):
         self.dt = 0.
         self.substep_dt = 0.
         self.initial_n_substeps = None
+        self.time = 0.
+
+        self.aero_ts = None
+        self.aero_time = None
+        self.aero_dt = None
+        self.aero_loads = []
 
         self.predictor = False
+        self.predictor_order = 0
+        self.predictor_off_steps = 0
         self.residual_table = None
         self.postprocessors = dict()
         self.with_postprocessors = False
@@ -219,6 +306,11 @@ class DynamicCoupled(BaseSolver):
         self.runtime_generators = dict()
         self.with_runtime_generators = False
 
+        self.accelerator = None
+
+        self.pacer = None
+        self.adaptive = None
+
     def get_g(self):
         """
         Getter for ``g``, the gravity value
@@ -267,6 +359,11 @@ class DynamicCoupled(BaseSolver):
         self.initial_n_substeps = self.settings['structural_substeps']
 
         self.print_info = self.settings['print_info']
+
+        self.predictor = self.settings['fsi_predictor'] != ''
+        self.predictor_order = {'': 0, 'linear': 1, 'quadratic': 2}[self.settings['fsi_predictor']]
+        self.predictor_off_steps = 0
+
         if self.settings['cleanup_previous_solution']:
             # if there's data in timestep_info[>0], copy the last one to
             # timestep_info[0] and remove the rest
@@ -337,6 +434,49 @@ class DynamicCoupled(BaseSolver):
                 self.runtime_generators[id] = gen()
                 self.runtime_generators[id].initialise(param, data=self.data)
 
+        # initialise the FSI coupling accelerator
+        self.accelerator = None
+        if self.settings['coupling_accelerator']:
+            self.accelerator = coupling_acceleration.initialise_accelerator(
+                self.settings['coupling_accelerator'],
+                self.settings['coupling_accelerator_settings'])
+            if (self.accelerator.settings['variable'] == 'state' and
+                    self.settings['structural_solver'] not in ['NonLinearDynamicPrescribedStep',
+                                                               'NonLinearDynamicCoupledStep']):
+                raise NotImplementedError('Acceleration of the structural state is only available with the '
+                                          'NonLinearDynamicPrescribedStep and NonLinearDynamicCoupledStep '
+                                          'structural solvers. Use variable = forces instead')
+
+        # initialise the real time pacing
+        self.pacer = None
+        if self.settings['real_time']:
+            self.pacer = realtime.RealTimePacer()
+            self.pacer.initialise(self.settings['real_time_settings'], self.dt, self.data.output_folder)
+
+        # initialise the adaptive time stepping
+        self.adaptive = None
+        if self.settings['adaptive_time_step']:
+            if self.aero_solver.settings.get('cfl1', False):
+                raise NotImplementedError('Adaptive time stepping requires cfl1 = off in the aerodynamic solver '
+                                          'settings')
+            self.adaptive = adaptive_time_step.AdaptiveTimeStep()
+            self.adaptive.initialise(self.settings['adaptive_time_step_settings'],
+                                     self.dt,
+                                     self.settings['n_time_steps']*self.settings['dt'])
+
+        # multi-rate aerodynamics
+        self.aero_ts = None
+        self.aero_time = None
+        self.aero_dt = None
+        self.aero_loads = []
+        if self.settings['aero_subcycling'] > 1:
+            if self.aero_solver.settings.get('cfl1', False):
+                raise NotImplementedError('Aerodynamic subcycling requires cfl1 = off in the aerodynamic solver '
+                                          'settings')
+            if self.settings['include_unsteady_force_contribution']:
+                raise NotImplementedError('Aerodynamic subcycling is not available with '
+                                          'include_unsteady_force_contribution = on')
+
     def cleanup_timestep_info(self):
         if max(len(self.data.aero.timestep_info), len(self.data.structure.timestep_info)) > 1:
             # copy last info to first
@@ -433,6 +573,12 @@ class DynamicCoupled(BaseSolver):
         if self.print_info:
             cout.cout_wrap('...Finished', 1)
 
+        if self.pacer is not None:
+            self.pacer.finish()
+
+        if self.adaptive is not None:
+            self.adaptive.finish()
+
         for postproc in self.postprocessors:
             try:
                 self.postprocessors[postproc].shutdown()
@@ -443,47 +589,26 @@ class DynamicCoupled(BaseSolver):
 
     def network_loop(self, in_queue, out_queue, finish_event):
         # runs in a separate thread from time_loop()
-        out_network, in_network = self.network_loader.get_networks()
-        out_network.set_queue(out_queue)
-
-        in_network.set_message_length(self.set_of_variables.input_msg_len)
-        in_network.set_queue(in_queue)
-
-        previous_queue_empty = True
-        while not finish_event.is_set():
-
-            # selector version
-            events = network_interface.sel.select(timeout=1)
-            if out_network.queue.empty() and not previous_queue_empty:
-                out_network.set_selector_events_mask('r')
-                previous_queue_empty = True
-            elif not out_network.queue.empty() and previous_queue_empty:
-                out_network.set_selector_events_mask('w')
-                previous_queue_empty = False
-
-            try:
-                for key, mask in events:
-                    key.data.process_events(mask)
-            except KeyboardInterrupt:
-                break
-
-        # close sockets
-        in_network.close()
-        out_network.close()
+        self.network_loader.network_loop(self.set_of_variables, in_queue, out_queue, finish_event)
 
     def time_loop(self, in_queue=None, out_queue=None, finish_event=None):
         self.logger.debug('Inside time loop')
         # dynamic simulations start at tstep == 1, 0 is reserved for the initial state
-        for self.data.ts in range(
-                len(self.data.structure.timestep_info),
-                self.settings['n_time_steps'] + 1):
+        for self.data.ts in self.time_steps():
             initial_time = time.perf_counter()
+            instrumentation.timeline.start_step(self.data.ts, self.time)
+            if self.pacer is not None:
+                self.pacer.start_step(self.data.ts)
 
             # network only
             # get input from the other thread
             if in_queue:
-                self.logger.info('Time Loop - Waiting for input')
+                self.logger.debug('Time Loop - Waiting for input')
+                ini_time_wait = time.perf_counter()
                 values = in_queue.get()  # should be list of tuples
+                instrumentation.timeline.add_time('DynamicCoupled.network_wait', time.perf_counter() - ini_time_wait)
+                if self.pacer is not None:
+                    self.pacer.add_queue_wait(time.perf_counter() - ini_time_wait)
                 self.logger.debug('Time loop - received {}'.format(values))
                 self.set_of_variables.update_timestep(self.data, values)
 
@@ -491,12 +616,15 @@ class DynamicCoupled(BaseSolver):
             aero_kstep = self.data.aero.timestep_info[-1].copy()
             self.logger.debug('Time step {}'.format(self.data.ts))
 
+            solve_aero = self.aero_ts is None or self.data.ts - self.aero_ts >= self.settings['aero_subcycling']
+
             # Add the controller here
             if self.with_controllers:
                 state = {'structural': structural_kstep,
                          'aero': aero_kstep}
                 for k, v in self.controllers.items():
-                    state = v.control(self.data, state)
+                    with instrumentation.timeline.phase('controller:' + k):
+                        state = v.control(self.data, state)
                     # this takes care of the changes in options for the solver
                     structural_kstep, aero_kstep = self.process_controller_output(
                         state)
@@ -522,127 +650,172 @@ class DynamicCoupled(BaseSolver):
                 params['force_coeff'] = force_coeff
                 params['fsi_substep'] = -1
                 for id, runtime_generator in self.runtime_generators.items():
-                    runtime_generator.generate(params)
+                    with instrumentation.timeline.phase('runtime_generator:' + id):
+                        runtime_generator.generate(params)
 
             self.time_aero = 0.0
             self.time_struc = 0.0
 
-            # Copy the controlled states so that the interpolation does not
-            # destroy the previous information
-            controlled_structural_kstep = structural_kstep.copy()
-            controlled_aero_kstep = aero_kstep.copy()
-
-            for k in range(self.settings['fsi_substeps'] + 1):
-                if (k == self.settings['fsi_substeps'] and
-                        self.settings['fsi_substeps']):
-                    print_res = 0 if self.res == 0. else np.log10(self.res)
-                    print_res_dqdt = 0 if self.res_dqdt == 0. else np.log10(self.res_dqdt)
-                    cout.cout_wrap(("The FSI solver did not converge!!! residuals: %f %f" % (print_res, print_res_dqdt)))
-                    self.aero_solver.update_custom_grid(
-                        structural_kstep,
-                        aero_kstep)
-                    break
-
-                # generate new grid (already rotated)
-                aero_kstep = controlled_aero_kstep.copy()
-                self.aero_solver.update_custom_grid(
-                    structural_kstep,
-                    aero_kstep)
-
-                # compute unsteady contribution
-                force_coeff = 0.0
-                unsteady_contribution = False
-                if self.settings['include_unsteady_force_contribution']:
-                    if self.data.ts > self.settings['steps_without_unsteady_force']:
-                        unsteady_contribution = True
-                        if k < self.settings['pseudosteps_ramp_unsteady_force']:
-                            force_coeff = k/self.settings['pseudosteps_ramp_unsteady_force']
+            fsi_substeps = self.settings['fsi_substeps']
+            if self.pacer is not None:
+                fsi_substeps = self.pacer.fsi_substeps(fsi_substeps)
+
+            if solve_aero:
+                # Copy the controlled states so that the interpolation does not
+                # destroy the previous information
+                controlled_structural_kstep = structural_kstep.copy()
+                controlled_aero_kstep = aero_kstep.copy()
+
+                # the extrapolated state only sets the first aerodynamic grid and iterate, the structure is
+                # always solved from the converged state in controlled_structural_kstep
+                predicted = False
+                if self.predictor:
+                    predicted = self.predict(structural_kstep)
+
+                if self.accelerator is not None:
+                    self.accelerator.start_step()
+
+                # otherwise the aerodynamic solver uses its own time step
+                aero_dt, aero_t = None, None
+                if self.adaptive is not None or self.settings['aero_subcycling'] > 1:
+                    aero_dt = self.dt if self.aero_time is None else self.time - self.aero_time
+                    aero_t = self.time
+                self.aero_dt = aero_dt
+
+                for k in range(fsi_substeps + 1):
+                    if (k == fsi_substeps and
+                            fsi_substeps):
+                        print_res = 0 if self.res == 0. else np.log10(self.res)
+                        print_res_dqdt = 0 if self.res_dqdt == 0. else np.log10(self.res_dqdt)
+                        if fsi_substeps < self.settings['fsi_substeps']:
+                            # the real time pacer reduced the FSI iterations on purpose
+                            self.logger.debug('FSI loop stopped after {} reduced substeps, residuals: {} {}'.format(
+                                fsi_substeps, print_res, print_res_dqdt))
                         else:
-                            force_coeff = 1.
-
-                previous_runtime_generated_forces = structural_kstep.runtime_generated_forces.astype(dtype=ct.c_double, order='F', copy=True)
-                # Add external forces
-                if self.with_runtime_generators:
-                    structural_kstep.runtime_generated_forces.fill(0.)
-                    params = dict()
-                    params['data'] = self.data
-                    params['struct_tstep'] = structural_kstep
-                    params['aero_tstep'] = aero_kstep
-                    params['force_coeff'] = force_coeff
-                    params['fsi_substep'] = k
-                    for id, runtime_generator in self.runtime_generators.items():
-                        runtime_generator.generate(params)
-
-                # run the solver
-                ini_time_aero = time.perf_counter()
-                self.data = self.aero_solver.run(aero_kstep,
-                                                 structural_kstep,
-                                                 convect_wake=True,
-                                                 unsteady_contribution=unsteady_contribution)
-                self.time_aero += time.perf_counter() - ini_time_aero
-
-                previous_kstep = structural_kstep.copy()
-                structural_kstep = controlled_structural_kstep.copy()
-                structural_kstep.runtime_generated_forces = previous_kstep.runtime_generated_forces.astype(dtype=ct.c_double, order='F', copy=True)
-                previous_kstep.runtime_generated_forces = previous_runtime_generated_forces.astype(dtype=ct.c_double, order='F', copy=True)
-
-                # move the aerodynamic surface according the the structural one
-                self.aero_solver.update_custom_grid(structural_kstep,
-                                                    aero_kstep)
-
-                self.map_forces(aero_kstep,
-                                structural_kstep,
-                                force_coeff)
-
-                # relaxation
-                relax_factor = self.relaxation_factor(k)
-                relax(self.data.structure,
-                      structural_kstep,
-                      previous_kstep,
-                      relax_factor)
-
-                # check if nan anywhere.
-                # if yes, raise exception
-                if np.isnan(structural_kstep.steady_applied_forces).any():
-                    raise exc.NotConvergedSolver('NaN found in steady_applied_forces!')
-                if np.isnan(structural_kstep.unsteady_applied_forces).any():
-                    raise exc.NotConvergedSolver('NaN found in unsteady_applied_forces!')
-
-                copy_structural_kstep = structural_kstep.copy()
-                ini_time_struc = time.perf_counter()
-                for i_substep in range(
-                        self.settings['structural_substeps'] + 1):
-                    # run structural solver
-                    coeff = ((i_substep + 1)/
-                             (self.settings['structural_substeps'] + 1))
-
-                    structural_kstep = self.interpolate_timesteps(
-                        step0=self.data.structure.timestep_info[-1],
-                        step1=copy_structural_kstep,
-                        out_step=structural_kstep,
-                        coeff=coeff)
-
-                    self.data = self.structural_solver.run(
-                        structural_step=structural_kstep,
-                        dt=self.substep_dt)
-
-                self.time_struc += time.perf_counter() - ini_time_struc
-
-                # check convergence
-                if self.convergence(k,
-                                    structural_kstep,
-                                    previous_kstep,
-                                    self.settings['structural_solver'].lower(),
-                                    self.settings['aero_solver'].lower(),
-                                    self.with_runtime_generators):
-                    # move the aerodynamic surface according to the structural one
-                    self.aero_solver.update_custom_grid(
+                            cout.cout_wrap(("The FSI solver did not converge!!! residuals: %f %f" % (print_res, print_res_dqdt)))
+                        self.update_custom_grid(
+                            structural_kstep,
+                            aero_kstep)
+                        break
+
+                    # FSI iterations solved in this time step
+                    fsi_iterations = k + 1
+
+                    # generate new grid (already rotated)
+                    aero_kstep = controlled_aero_kstep.copy()
+                    self.update_custom_grid(
                         structural_kstep,
                         aero_kstep)
-                    break
+
+                    # compute unsteady contribution
+                    force_coeff = 0.0
+                    unsteady_contribution = False
+                    if self.settings['include_unsteady_force_contribution']:
+                        if self.data.ts > self.settings['steps_without_unsteady_force']:
+                            unsteady_contribution = True
+                            if k < self.settings['pseudosteps_ramp_unsteady_force']:
+                                force_coeff = k/self.settings['pseudosteps_ramp_unsteady_force']
+                            else:
+                                force_coeff = 1.
+
+                    previous_runtime_generated_forces = structural_kstep.runtime_generated_forces.astype(dtype=ct.c_double, order='F', copy=True)
+                    # Add external forces
+                    if self.with_runtime_generators:
+                        structural_kstep.runtime_generated_forces.fill(0.)
+                        params = dict()
+                        params['data'] = self.data
+                        params['struct_tstep'] = structural_kstep
+                        params['aero_tstep'] = aero_kstep
+                        params['force_coeff'] = force_coeff
+                        params['fsi_substep'] = k
+                        for id, runtime_generator in self.runtime_generators.items():
+                            with instrumentation.timeline.phase('runtime_generator:' + id):
+                                runtime_generator.generate(params)
+
+                    # run the solver
+                    ini_time_aero = time.perf_counter()
+                    self.data = self.aero_solver.run(aero_kstep,
+                                                     structural_kstep,
+                                                     convect_wake=True,
+                                                     dt=aero_dt,
+                                                     t=aero_t,
+                                                     unsteady_contribution=unsteady_contribution)
+                    self.time_aero += time.perf_counter() - ini_time_aero
+                    instrumentation.timeline.add_time('DynamicCoupled.aero', time.perf_counter() - ini_time_aero)
+
+                    previous_kstep = structural_kstep.copy()
+                    structural_kstep = controlled_structural_kstep.copy()
+                    structural_kstep.runtime_generated_forces = previous_kstep.runtime_generated_forces.astype(dtype=ct.c_double, order='F', copy=True)
+                    previous_kstep.runtime_generated_forces = previous_runtime_generated_forces.astype(dtype=ct.c_double, order='F', copy=True)
+
+                    # move the aerodynamic surface according the the structural one
+                    self.update_custom_grid(structural_kstep,
+                                            aero_kstep)
+
+                    with instrumentation.timeline.phase('DynamicCoupled.map_forces'):
+                        self.map_forces(aero_kstep,
+                                        structural_kstep,
+                                        force_coeff)
+
+                    # relaxation
+                    if self.accelerator is None:
+                        relax_factor = self.relaxation_factor(k)
+                        relax(self.data.structure,
+                              structural_kstep,
+                              previous_kstep,
+                              relax_factor)
+                    elif self.accelerator.settings['variable'] == 'forces':
+                        self.accelerate_forces(structural_kstep, previous_kstep)
+
+                    # check if nan anywhere.
+                    # if yes, raise exception
+                    if np.isnan(structural_kstep.steady_applied_forces).any():
+                        raise exc.NotConvergedSolver('NaN found in steady_applied_forces!')
+                    if np.isnan(structural_kstep.unsteady_applied_forces).any():
+                        raise exc.NotConvergedSolver('NaN found in unsteady_applied_forces!')
+
+                    structural_kstep = self.solve_structure(structural_kstep)
+
+                    if predicted and k == 0:
+                        self.check_prediction(structural_kstep, previous_kstep)
+
+                    # check convergence
+                    if self.convergence(k,
+                                        structural_kstep,
+                                        previous_kstep,
+                                        self.settings['structural_solver'].lower(),
+                                        self.settings['aero_solver'].lower(),
+                                        self.with_runtime_generators):
+                        # move the aerodynamic surface according to the structural one
+                        self.update_custom_grid(
+                            structural_kstep,
+                            aero_kstep)
+                        break
+
+                    if self.accelerator is not None and self.accelerator.settings['variable'] == 'state':
+                        self.accelerate_state(structural_kstep, previous_kstep)
+
+                if self.accelerator is not None:
+                    self.accelerator.end_step()
+
+                self.aero_time = self.time
+                self.aero_ts = self.data.ts
+                self.store_aero_loads(structural_kstep)
+            else:
+                k = 0
+                fsi_iterations = 1
+                instrumentation.timeline.count('DynamicCoupled.subcycled_aero')
+                structural_kstep = self.subcycle_step(structural_kstep, aero_kstep)
 
             # move the aerodynamic surface according the the structural one
-            self.aero_solver.update_custom_grid(structural_kstep, aero_kstep)
+            self.update_custom_grid(structural_kstep, aero_kstep)
+
+            structural_kstep.t = self.time
+            structural_kstep.dt = self.dt
+            if self.adaptive is not None:
+                self.adapt_time_step(structural_kstep,
+                                     fsi_iterations=fsi_iterations,
+                                     converged=k < fsi_substeps or not fsi_substeps)
 
             self.aero_solver.add_step()
             self.data.aero.timestep_info[-1] = aero_kstep.copy()
@@ -654,7 +827,7 @@ class DynamicCoupled(BaseSolver):
             if self.print_info:
                 print_res = 0 if self.res_dqdt == 0. else np.log10(self.res_dqdt)
                 self.residual_table.print_line([self.data.ts,
-                                                self.data.ts*self.dt,
+                                                self.time,
                                                 k,
                                                 self.time_struc/(self.time_aero + self.time_struc),
                                                 final_time - initial_time,
@@ -667,7 +840,11 @@ class DynamicCoupled(BaseSolver):
             # run postprocessors
             if self.with_postprocessors:
                 for postproc in self.postprocessors:
-                    self.data = self.postprocessors[postproc].run(online=True)
+                    if self.pacer is not None and not self.pacer.run_postprocessor(postproc):
+                        instrumentation.timeline.count('DynamicCoupled.skipped_postprocessors')
+                        continue
+                    with instrumentation.timeline.phase('postprocessor:' + postproc):
+                        self.data = self.postprocessors[postproc].run(online=True)
 
             # network only
             # put result back in queue
@@ -680,10 +857,54 @@ class DynamicCoupled(BaseSolver):
                     self.logger.debug('Data output Queue is full - clearing output')
                 out_queue.put(self.set_of_variables)
 
+            instrumentation.timeline.end_step(fsi_iterations=fsi_iterations)
+
+            if self.pacer is not None:
+                self.pacer.end_step()
+
         if finish_event:
             finish_event.set()
             self.logger.info('Time loop - Complete')
 
+    def time_steps(self):
+        """
+        Generator of the indices of the time steps to be solved, which sets the current time ``self.time`` and, with
+        adaptive time stepping, the time step ``self.dt`` of each of them.
+        """
+        ts = len(self.data.structure.timestep_info)
+        if self.adaptive is None:
+            for ts in range(ts, self.settings['n_time_steps'] + 1):
+                self.time = ts*self.dt
+                yield ts
+            return
+
+        while True:
+            t = self.data.structure.timestep_info[-1].t
+            dt = self.adaptive.next_dt(t)
+            if dt is None:
+                return
+            self.dt = dt
+            self.substep_dt = dt/(self.settings['structural_substeps'] + 1)
+            self.time = t + dt
+            yield ts
+            ts += 1
+
+    def adapt_time_step(self, structural_kstep, fsi_iterations, converged):
+        """
+        Sizes the next time step from the converged ``structural_kstep``, comparing its state with the linear
+        extrapolation from the two previous converged time steps.
+        """
+        error = None
+        history = self.data.structure.timestep_info
+        if len(history) > 1 and history[-1].dt > 0.:
+            error = self.adaptive.error(np.concatenate((structural_kstep.q, structural_kstep.dqdt)),
+                                        np.concatenate((history[-1].q, history[-1].dqdt)),
+                                        np.concatenate((history[-2].q, history[-2].dqdt)),
+                                        self.dt,
+                                        history[-1].dt)
+        self.adaptive.update(self.data.ts, self.time, self.dt,
+                             error=error, fsi_iterations=fsi_iterations, converged=converged)
+
     def convergence(self, k, tstep, previous_tstep,
                     struct_solver, aero_solver, with_runtime_generators):
         r"""
@@ -779,6 +1000,13 @@ class DynamicCoupled(BaseSolver):
                                                        structural_kstep=structural_kstep,
                                                        struct_forces=struct_forces)
 
+        self.apply_aero_forces(aero_kstep, structural_kstep, struct_forces, dynamic_struct_forces)
+
+    def apply_aero_forces(self, aero_kstep, structural_kstep, struct_forces, dynamic_struct_forces):
+        """
+        Adds the prescribed and runtime generated forces to the aerodynamic forces on the structural nodes
+        ``struct_forces`` (steady) and ``dynamic_struct_forces`` (unsteady), and applies them to ``structural_kstep``.
+        """
         aero_kstep.aero_steady_forces_beam_dof = struct_forces
         structural_kstep.postproc_node['aero_steady_forces'] = struct_forces
         structural_kstep.postproc_node['aero_unsteady_forces'] = dynamic_struct_forces
@@ -787,15 +1015,85 @@ class DynamicCoupled(BaseSolver):
         structural_kstep.steady_applied_forces = (
             (struct_forces + self.data.structure.ini_info.steady_applied_forces).
             astype(dtype=ct.c_double, order='F', copy=True))
+        # prescribed inputs are given at the nominal time steps
+        i_input = max(int(round(self.time/self.settings['dt'])) - 1, 0)
         try:
             structural_kstep.unsteady_applied_forces = (
-                (dynamic_struct_forces + self.data.structure.dynamic_input[max(self.data.ts - 1, 0)]['dynamic_forces'] +
+                (dynamic_struct_forces + self.data.structure.dynamic_input[i_input]['dynamic_forces'] +
                  structural_kstep.runtime_generated_forces).
                 astype(dtype=ct.c_double, order='F', copy=True))
         except KeyError:
             structural_kstep.unsteady_applied_forces = (dynamic_struct_forces +
                                                         structural_kstep.runtime_generated_forces)
 
+    def solve_structure(self, structural_kstep):
+        """
+        Solves the structure over the time step in ``structural_substeps + 1`` substeps, with the applied forces
+        linearly interpolated from those of the last converged time step to those of ``structural_kstep``.
+        """
+        copy_structural_kstep = structural_kstep.copy()
+        ini_time_struc = time.perf_counter()
+        for i_substep in range(
+                self.settings['structural_substeps'] + 1):
+            # run structural solver
+            coeff = ((i_substep + 1)/
+                     (self.settings['structural_substeps'] + 1))
+
+            structural_kstep = self.interpolate_timesteps(
+                step0=self.data.structure.timestep_info[-1],
+                step1=copy_structural_kstep,
+                out_step=structural_kstep,
+                coeff=coeff)
+
+            self.data = self.structural_solver.run(
+                structural_step=structural_kstep,
+                dt=self.substep_dt)
+
+        self.time_struc += time.perf_counter() - ini_time_struc
+        instrumentation.timeline.add_time('DynamicCoupled.structure', time.perf_counter() - ini_time_struc)
+        return structural_kstep
+
+    def update_custom_grid(self, structural_kstep, aero_kstep):
+        """
+        Moves the aerodynamic grid with the structure. With adaptive time stepping or aerodynamic subcycling, the time
+        step of the last aerodynamic solution is passed to the aerodynamic solver rather than its ``dt`` setting.
+        """
+        if self.aero_dt is None:
+            self.aero_solver.update_custom_grid(structural_kstep, aero_kstep)
+        else:
+            self.aero_solver.update_custom_grid(structural_kstep, aero_kstep, dt=self.aero_dt)
+
+    def store_aero_loads(self, structural_kstep):
+        """
+        Keeps the aerodynamic loads on the structural nodes of the last two aerodynamic solutions, most recent first,
+        for the time steps without aerodynamic solution.
+        """
+        if self.settings['aero_subcycling'] < 2:
+            return
+        self.aero_loads.insert(0, (self.time,
+                                   structural_kstep.postproc_node['aero_steady_forces'].copy(),
+                                   structural_kstep.postproc_node['aero_unsteady_forces'].copy()))
+        del self.aero_loads[2:]
+
+    def subcycle_step(self, structural_kstep, aero_kstep):
+        """
+        Time step without aerodynamic solution. The structure is solved under the aerodynamic loads of the last
+        aerodynamic solution (``aero_subcycling_loads = frozen``) or their linear extrapolation in time from the last
+        two (``extrapolated``). The aerodynamic grid follows the structure, while the circulation and the wake are
+        held.
+        """
+        if self.settings['aero_subcycling_loads'] == 'extrapolated' and len(self.aero_loads) > 1:
+            coefficients = extrapolation_coefficients([loads[0] for loads in self.aero_loads], self.time)
+        else:
+            coefficients = [1.]
+        struct_forces = sum(c*loads[1] for c, loads in zip(coefficients, self.aero_loads))
+        dynamic_struct_forces = sum(c*loads[2] for c, loads in zip(coefficients, self.aero_loads))
+
+        self.apply_aero_forces(aero_kstep, structural_kstep, struct_forces, dynamic_struct_forces)
+        structural_kstep = self.solve_structure(structural_kstep)
+        self.update_custom_grid(structural_kstep, aero_kstep)
+        return structural_kstep
+
     def relaxation_factor(self, k):
         initial = self.settings['relaxation_factor']
         if not self.settings['dynamic_relaxation']:
@@ -808,6 +1106,86 @@ class DynamicCoupled(BaseSolver):
         value = initial + (final - initial)/self.settings['relaxation_steps']*k
         return value
 
+    def predict(self, structural_kstep):
+        """
+        Extrapolates the structural state from the last converged time steps into ``structural_kstep``, which is then
+        used as the first iterate of the FSI loop: the first aerodynamic solution is computed on the grid of the
+        extrapolated state.
+
+        The order of the extrapolation, set by ``fsi_predictor``, is reduced if not enough converged steps are
+        available.
+
+        Returns:
+            bool: ``True`` if an extrapolation has been performed
+        """
+        if self.predictor_off_steps > 0:
+            self.predictor_off_steps -= 1
+            return False
+
+        order = min(self.predictor_order, len(self.data.structure.timestep_info) - 1)
+        if order < 1:
+            return False
+
+        structural_steps = self.data.structure.timestep_info[-1 - order:][::-1]
+        times = None
+        if self.adaptive is not None:
+            times = [step.t for step in structural_steps] + [self.time]
+        extrapolate_timesteps(structural_steps, structural_kstep, times=times)
+        return True
+
+    def check_prediction(self, structural_kstep, predicted_kstep):
+        """
+        Compares the distance between the first structural solution of the time step and both the extrapolated
+        state and the last converged state. If the extrapolated state is the furthest, the predictor is switched off
+        for ``fsi_predictor_fallback_steps`` time steps.
+        """
+        previous_q = self.data.structure.timestep_info[-1].q
+        predicted_residual = np.linalg.norm(structural_kstep.q - predicted_kstep.q)
+        previous_residual = np.linalg.norm(structural_kstep.q - previous_q)
+        if predicted_residual > previous_residual:
+            self.predictor_off_steps = self.settings['fsi_predictor_fallback_steps']
+            instrumentation.timeline.count('DynamicCoupled.predictor_fallback')
+            self.logger.debug('Time step {} - extrapolation increased the first FSI residual, '
+                              'predictor switched off'.format(self.data.ts))
+
+    def accelerate_forces(self, structural_kstep, previous_kstep):
+        """
+        Computes the forces for the next structural solution with the coupling accelerator, taking the forces of the
+        previous FSI iteration as the current iterate and the newly mapped forces as the output of the fixed point
+        operator.
+        """
+        force_names = ['steady_applied_forces', 'unsteady_applied_forces', 'runtime_generated_forces']
+        x = np.concatenate([getattr(previous_kstep, name).ravel() for name in force_names])
+        x_tilde = np.concatenate([getattr(structural_kstep, name).ravel() for name in force_names])
+        x_new = self.accelerator.update(x, x_tilde)
+
+        i_start = 0
+        for name in force_names:
+            shape = getattr(structural_kstep, name).shape
+            size = int(np.prod(shape))
+            setattr(structural_kstep, name,
+                    x_new[i_start:i_start + size].reshape(shape).astype(dtype=ct.c_double, order='F', copy=True))
+            i_start += size
+
+    def accelerate_state(self, structural_kstep, previous_kstep):
+        """
+        Updates the structural state ``q`` and ``dqdt`` with the coupling accelerator, taking the state used for the
+        last aerodynamic solution as the current iterate and the new structural solution as the output of the fixed
+        point operator. The nodal displacements and, in free flight, the FoR velocities are updated accordingly.
+        """
+        import sharpy.structure.utils.xbeamlib as xbeamlib
+
+        n_q = len(structural_kstep.q)
+        x = np.concatenate((previous_kstep.q, previous_kstep.dqdt))
+        x_tilde = np.concatenate((structural_kstep.q, structural_kstep.dqdt))
+        x_new = self.accelerator.update(x, x_tilde)
+
+        structural_kstep.q[:] = x_new[:n_q]
+        structural_kstep.dqdt[:] = x_new[n_q:]
+        xbeamlib.xbeam_solv_state2disp(self.data.structure,
+                                       structural_kstep,
+                                       cbeam3=self.settings['structural_solver'] == 'NonLinearDynamicPrescribedStep')
+
     @staticmethod
     def interpolate_timesteps(step0, step1, out_step, coeff):
         """
@@ -855,6 +1233,62 @@ def relax(beam, timestep, previous_timestep, coeff):
             coeff*previous_timestep.runtime_generated_forces)
 
 
+def extrapolate_timesteps(structural_steps, structural_out, times=None):
+    """
+    Polynomial extrapolation of the structural state to the next time step from previous time steps.
+
+    Quantities extrapolated:
+    * `q`, `dqdt`, `pos`, `psi`, `pos_dot` and `psi_dot`
+    * `for_pos`, `for_vel` and `quat` (normalised)
+
+    Args:
+        structural_steps (list(StructTimeStepInfo)): Previous structural steps, most recent first. Two steps give a
+            linear and three a quadratic extrapolation
+        structural_out (StructTimeStepInfo): Structural step where the extrapolation is written
+        times (list(float)): Times of the previous steps, most recent first, followed by the time of the
+            extrapolated step. If ``None``, the steps are taken as equally spaced
+    """
+    if times is None:
+        coefficients = {2: [2., -1.],
+                        3: [3., -3., 1.]}[len(structural_steps)]
+    else:
+        coefficients = extrapolation_coefficients(times[:-1], times[-1])
+
+    def extrapolate(values, out):
+        if any(v.shape != out.shape for v in values):
+            return
+        out[:] = sum(c*v for c, v in zip(coefficients, values))
+
+    for name in ['q', 'dqdt', 'pos', 'psi', 'pos_dot', 'psi_dot', 'for_pos', 'for_vel', 'quat']:
+        extrapolate([getattr(step, name) for step in structural_steps], getattr(structural_out, name))
+    structural_out.quat[:] = algebra.unit_vector(structural_out.quat)
+
+
+def extrapolation_coefficients(times, t):
+    """
+    Lagrange polynomial extrapolation coefficients.
+
+    Args:
+        times (list(float)): Times of the known values
+        t (float): Time at which the polynomial through the known values is evaluated
+
+    Returns:
+        list(float): Coefficients of the known values
+
+    Examples:
+        >>> extrapolation_coefficients([2., 1., 0.], 3.)
+        [3.0, -3.0, 1.0]
+    """
+    coefficients = []
+    for i, t_i in enumerate(times):
+        c = 1.
+        for j, t_j in enumerate(times):
+            if j != i:
+                c *= (t - t_j)/(t_i - t_j)
+        coefficients.append(c)
+    return coefficients
+
+
 def normalise_quaternion(tstep):
     tstep.dqdt[-4:] = algebra.unit_vector(tstep.dqdt[-4:])
     tstep.quat = tstep.dqdt[-4:].astype(dtype=ct.c_double, order='F', copy=True)
@@ -1,6 +1,8 @@
 """
 Linear State Space Assembler
 """
+import os
+
 from sharpy.utils.datastructures import Linear
 from sharpy.utils.solver_interface import solver, BaseSolver
 
@@ -8,6 +10,7 @@ import sharpy.linear.utils.ss_interface as ss_interface
 import sharpy.utils.settings as settings
 import sharpy.utils.h5utils as h5
 import sharpy.utils.cout_utils as cout
+import sharpy.linear.utils.cache as linear_cache
 
 
 @solver
@@ -52,6 +55,15 @@ class LinearAssembler(BaseSolver):
     >>>        'Modal',
     >>>        'LinearAssembler']
 
+    Caching:
+
+    If ``cache`` is set, the assembled system is stored in a persistent on-disk cache (see
+    :mod:`sharpy.linear.utils.cache`) keyed by a hash of the linearisation time step, of the beam properties and
+    of the settings of this solver. Later runs linearising the same model about the same reference state with the
+    same settings, for instance in design loops, recover the system from the cache instead of assembling the UVLM,
+    computing the aeroelastic gains and running the reduced order models. Caching is currently supported by the
+    ``LinearAeroelastic`` system.
+
     """
     solver_id = 'LinearAssembler'
     solver_classification = 'Linear'
@@ -91,6 +103,21 @@ class LinearAssembler(BaseSolver):
     settings_default['retain_outputs'] = []
     settings_description['retain_outputs'] = 'List of output channels to retain in the chosen ``inout_coordinates``.'
 
+    settings_types['cache'] = 'bool'
+    settings_default['cache'] = False
+    settings_description['cache'] = 'Store the assembled system in a persistent cache and reuse it in later runs ' \
+                                    'with the same linearisation time step and settings'
+
+    settings_types['cache_folder'] = 'str'
+    settings_default['cache_folder'] = 'cache/linear/'
+    settings_description['cache_folder'] = 'Folder of the linear system cache, relative to the case route unless ' \
+                                           'given as an absolute path'
+
+    settings_types['cache_max_size'] = 'float'
+    settings_default['cache_max_size'] = 1024.
+    settings_description['cache_max_size'] = 'Maximum size of the linear system cache in MB. The least recently ' \
+                                             'used systems are deleted when exceeded'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
@@ -99,6 +126,9 @@ class LinearAssembler(BaseSolver):
         self.settings = dict()
         self.data = None
 
+        self.cache = None
+        self.cache_key = None
+
     def initialise(self, data, custom_settings=None):
 
         self.data = data
@@ -134,12 +164,30 @@ class LinearAssembler(BaseSolver):
         import sharpy.rom
 
         lsys = ss_interface.initialise_system(self.settings['linear_system'])
+
+        self.cache = None
+        if self.settings['cache'] and hasattr(lsys, 'cache_entry'):
+            self.cache = linear_cache.LinearCache(os.path.join(data.case_route, self.settings['cache_folder']),
+                                                  self.settings['cache_max_size'])
+            key_settings = {k: v for k, v in self.settings.items() if not k.startswith('cache')}
+            self.cache_key = linear_cache.linearisation_key(data.structure, tsstruct0, tsaero0, key_settings)
+            lsys.cached_entry = self.cache.load(self.cache_key)
+            if lsys.cached_entry is not None:
+                cout.cout_wrap('Recovering linear system from cache entry %s' % self.cache_key, 1)
+        elif self.settings['cache']:
+            cout.cout_wrap('Caching is not supported by %s systems' % self.settings['linear_system'], 3)
+
         lsys.initialise(data)
         self.data.linear.linear_system = lsys
 
     def run(self):
 
-        self.data.linear.ss = self.data.linear.linear_system.assemble()
+        lsys = self.data.linear.linear_system
+        self.data.linear.ss = lsys.assemble()
+
+        if self.cache is not None and lsys.cached_entry is None and not lsys.load_uvlm_from_file:
+            if self.cache.save(self.cache_key, lsys.cache_entry()):
+                cout.cout_wrap('Saved linear system to cache entry %s' % self.cache_key, 1)
 
         # modify inout coordinates
         if self.settings['inout_coordinates'] == 'nodes':
@@ -10,6 +10,7 @@ import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
 import sharpy.utils.cout_utils as cout
 import sharpy.structure.utils.modalutils as modalutils
+import sharpy.linear.src.libeig as libeig
 
 
 @solver
@@ -27,6 +28,7 @@ class Modal(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['print_info'] = 'bool'
     settings_default['print_info'] = True
@@ -94,8 +96,29 @@ class Modal(BaseSolver):
     settings_default['rigid_modes_cg'] = False
     settings_description['rigid_modes_cg'] = 'Modify the ridid body modes such that they are defined wrt to the CG'
 
+    settings_types['eigensolver'] = 'str'
+    settings_default['eigensolver'] = 'dense'
+    settings_description['eigensolver'] = 'Eigenvalue solver. ``dense`` computes all the eigenpairs and retains the ' \
+                                          'first ``NumLambda``. ``sparse`` computes only the retained eigenpairs ' \
+                                          'with shift-invert Lanczos (symmetric undamped systems) or Arnoldi ' \
+                                          'iterations. See :py:mod:`sharpy.linear.src.libeig`'
+    settings_options['eigensolver'] = ['dense', 'sparse']
+
+    settings_types['eigensolver_shift'] = 'float'
+    settings_default['eigensolver_shift'] = -1.
+    settings_description['eigensolver_shift'] = 'Shift of the ``sparse`` eigensolver, which returns the eigenvalues ' \
+                                                'closest to it. It is a squared frequency for undamped modes and a ' \
+                                                'continuous time eigenvalue for damped modes. Should be below the ' \
+                                                'lowest eigenvalue but not be one'
+
+    settings_types['sparse_extra_modes'] = 'int'
+    settings_default['sparse_extra_modes'] = 10
+    settings_description['sparse_extra_modes'] = 'Additional eigenpairs computed by the ``sparse`` eigensolver for ' \
+                                                 'damped modes, to ensure that the lowest damped frequencies are ' \
+                                                 'captured before sorting'
+
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.data = None
@@ -116,7 +139,8 @@ class Modal(BaseSolver):
             self.settings = custom_settings
         settings.to_custom_types(self.settings,
                                  self.settings_types,
-                                 self.settings_default)
+                                 self.settings_default,
+                                 options=self.settings_options)
 
         self.rigid_body_motion = self.settings['rigid_body_modes']
 
@@ -275,11 +299,15 @@ class Modal(BaseSolver):
 
         NumLambda = min(num_dof, self.settings['NumLambda'])
 
+        sparse_eigensolver = self.settings['eigensolver'] == 'sparse'
         if self.settings['use_undamped_modes']:
 
             # Solve for eigenvalues (with unit eigenvectors)
-            eigenvalues,eigenvectors=np.linalg.eig(
-                                       np.linalg.solve(FullMglobal,FullKglobal))
+            if sparse_eigensolver:
+                eigenvalues, eigenvectors = self.sparse_undamped_eig(FullMglobal, FullKglobal, NumLambda)
+            else:
+                eigenvalues,eigenvectors=np.linalg.eig(
+                                           np.linalg.solve(FullMglobal,FullKglobal))
             eigenvectors_left=None
             # Define vibration frequencies and damping
             freq_natural = np.sqrt(eigenvalues)
@@ -291,16 +319,20 @@ class Modal(BaseSolver):
             damping = np.zeros((NumLambda,))
 
         else:
-            # State-space model
-            Minv_neg = -np.linalg.inv(FullMglobal)
-            A = np.zeros((2*num_dof, 2*num_dof), dtype=ct.c_double, order='F')
-            A[:num_dof, num_dof:] = np.eye(num_dof)
-            A[num_dof:, :num_dof] = np.dot(Minv_neg, FullKglobal)
-            A[num_dof:, num_dof:] = np.dot(Minv_neg, FullCglobal)
-
-            # Solve the eigenvalues problem
-            eigenvalues, eigenvectors_left, eigenvectors = \
-                sc.linalg.eig(A,left=True,right=True)
+            if sparse_eigensolver:
+                eigenvalues, eigenvectors_left, eigenvectors, M_lu = \
+                    self.sparse_damped_eig(FullMglobal, FullCglobal, FullKglobal, NumLambda)
+            else:
+                # State-space model
+                Minv_neg = -np.linalg.inv(FullMglobal)
+                A = np.zeros((2*num_dof, 2*num_dof), dtype=ct.c_double, order='F')
+                A[:num_dof, num_dof:] = np.eye(num_dof)
+                A[num_dof:, :num_dof] = np.dot(Minv_neg, FullKglobal)
+                A[num_dof:, num_dof:] = np.dot(Minv_neg, FullCglobal)
+
+                # Solve the eigenvalues problem
+                eigenvalues, eigenvectors_left, eigenvectors = \
+                    sc.linalg.eig(A,left=True,right=True)
             freq_natural = np.abs(eigenvalues)
             damping = np.zeros_like(freq_natural)
             iiflex = freq_natural > 1e-16*np.mean(freq_natural)  # Pick only structural modes
@@ -365,7 +397,12 @@ class Modal(BaseSolver):
 
         # forces gain matrix (nodal -> modal)
         if not self.settings['use_undamped_modes']:
-            Kin_damp = np.dot(eigenvectors_left[num_dof:, :].T, -Minv_neg)
+            if sparse_eigensolver:
+                left_dof = eigenvectors_left[num_dof:, :]
+                Kin_damp = (M_lu.solve(np.ascontiguousarray(left_dof.real), trans='T') +
+                            1j * M_lu.solve(np.ascontiguousarray(left_dof.imag), trans='T')).T
+            else:
+                Kin_damp = np.dot(eigenvectors_left[num_dof:, :].T, -Minv_neg)
         else:
             Kin_damp = None
 
@@ -459,6 +496,55 @@ class Modal(BaseSolver):
 
         return self.data
 
+    def sparse_undamped_eig(self, FullMglobal, FullKglobal, NumLambda):
+        r"""
+        Computes the ``NumLambda`` undamped eigenpairs closest to ``eigensolver_shift`` of
+        :math:`\mathbf{K\,\Phi} = \omega_n^2\mathbf{M\,\Phi}` with the shift-invert Lanczos method if the
+        mass and stiffness matrices are symmetric, or the shift-invert Arnoldi method otherwise.
+
+        Returns:
+            tuple: Squared natural frequencies and mode shapes
+        """
+        sigma = self.settings['eigensolver_shift']
+        Msparse = sc.sparse.csc_matrix(FullMglobal)
+        Ksparse = sc.sparse.csc_matrix(FullKglobal)
+        if libeig.is_symmetric(Msparse) and libeig.is_symmetric(Ksparse):
+            return libeig.eigsh_shift_invert(Ksparse, NumLambda, sigma, B=Msparse)
+        return libeig.eigs_shift_invert(Ksparse, NumLambda, sigma, B=Msparse)
+
+    def sparse_damped_eig(self, FullMglobal, FullCglobal, FullKglobal, NumLambda):
+        r"""
+        Computes the damped eigenpairs closest to ``eigensolver_shift`` with the shift-invert Arnoldi method applied
+        to the pencil
+
+            .. math:: \begin{bmatrix} 0 & \mathbf{I} \\ -\mathbf{K} & -\mathbf{C} \end{bmatrix}\mathbf{\Phi} =
+                \lambda \begin{bmatrix} \mathbf{I} & 0 \\ 0 & \mathbf{M} \end{bmatrix}\mathbf{\Phi}
+
+        which has the same eigenvalues and right eigenvectors as the state-space matrix without forming
+        :math:`\mathbf{M}^{-1}`. The left eigenvectors are transformed to those of the state-space matrix.
+
+        ``2 * NumLambda + sparse_extra_modes`` eigenpairs are computed such that the lowest damped frequencies are
+        captured by the sorting that follows.
+
+        Returns:
+            tuple: Eigenvalues, left eigenvectors, right eigenvectors and LU factorisation of :math:`\mathbf{M}`
+        """
+        num_dof = FullMglobal.shape[0]
+        Msparse = sc.sparse.csc_matrix(FullMglobal)
+        eye = sc.sparse.identity(num_dof, format='csc')
+        A = sc.sparse.bmat([[None, eye],
+                            [-sc.sparse.csc_matrix(FullKglobal), -sc.sparse.csc_matrix(FullCglobal)]], format='csc')
+        B = sc.sparse.bmat([[eye, None],
+                            [None, Msparse]], format='csc')
+
+        num_eigs = 2 * NumLambda + self.settings['sparse_extra_modes']
+        eigenvalues, eigenvectors, eigenvectors_left = libeig.eigs_shift_invert(
+            A, num_eigs, self.settings['eigensolver_shift'], B=B, left=True)
+        eigenvectors_left = B.T.dot(eigenvectors_left)
+
+        # same convention as scipy.linalg.eig(left=True), conjugated later in run()
+        return eigenvalues, eigenvectors_left.conj(), eigenvectors, sc.sparse.linalg.splu(Msparse)
+
     def scale_modes_unit_mass_matrix(self, eigenvectors, FullMglobal, eigenvectors_left=None):
         if self.settings['use_undamped_modes']:
             # mass normalise (diagonalises M and K)
@@ -9,6 +9,8 @@ from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
 import sharpy.utils.generator_interface as gen_interface
+import sharpy.utils.instrumentation as instrumentation
+import sharpy.utils.coupling_acceleration as coupling_acceleration
 
 @solver
 class StaticCoupled(BaseSolver):
@@ -60,6 +62,23 @@ class StaticCoupled(BaseSolver):
     settings_default['relaxation_factor'] = 0.
     settings_description['relaxation_factor'] = 'Relaxation parameter in the FSI iteration. 0 is no relaxation and -> 1 is very relaxed'
 
+    settings_types['coupling_accelerator'] = 'str'
+    settings_default['coupling_accelerator'] = ''
+    settings_description['coupling_accelerator'] = 'Accelerator of the FSI iteration on the aerodynamic forces. If ' \
+                                                   'empty, the forces are relaxed with ``relaxation_factor``. ' \
+                                                   'See :py:mod:`sharpy.utils.coupling_acceleration`'
+    settings_options['coupling_accelerator'] = ['ConstantRelaxation', 'Aitken', 'IQNILS', 'Anderson']
+
+    settings_types['coupling_accelerator_settings'] = 'dict'
+    settings_default['coupling_accelerator_settings'] = dict()
+    settings_description['coupling_accelerator_settings'] = 'Settings for the ``coupling_accelerator``'
+
+    settings_types['warm_start'] = 'bool'
+    settings_default['warm_start'] = False
+    settings_description['warm_start'] = 'If ``True``, repeated calls to the solver, such as those made by the ' \
+                                         'trim solvers, start from the last converged structural deformation ' \
+                                         'instead of the undeformed configuration'
+
     settings_types['correct_forces_method'] = 'str'
     settings_default['correct_forces_method'] = ''
     settings_description['correct_forces_method'] = 'Function used to correct aerodynamic forces. ' \
@@ -96,6 +115,9 @@ class StaticCoupled(BaseSolver):
         self.runtime_generators = dict()
         self.with_runtime_generators = False
 
+        self.accelerator = None
+        self.converged_structural_step = None
+
     def initialise(self, data, input_dict=None):
         self.data = data
         if input_dict is None:
@@ -141,6 +163,17 @@ class StaticCoupled(BaseSolver):
                 self.runtime_generators[id] = gen()
                 self.runtime_generators[id].initialise(param, data=self.data)
 
+        # initialise the FSI coupling accelerator
+        self.accelerator = None
+        if self.settings['coupling_accelerator']:
+            self.accelerator = coupling_acceleration.initialise_accelerator(
+                self.settings['coupling_accelerator'],
+                self.settings['coupling_accelerator_settings'])
+            if self.accelerator.settings['variable'] != 'forces':
+                raise NotImplementedError('StaticCoupled only supports the acceleration of the forces')
+
+        self.converged_structural_step = None
+
     def increase_ts(self):
         self.data.ts += 1
         self.structural_solver.next_step()
@@ -159,7 +192,26 @@ class StaticCoupled(BaseSolver):
 
         self.data.ts = 0
 
+    def initial_structural_step(self):
+        """
+        Returns the structural time step from which a new static solution starts.
+
+        This is a copy of the undeformed configuration ``ini_info`` unless ``warm_start`` is on and a converged
+        solution from a previous call is available, in which case the deformed configuration of the latter is
+        returned. The applied forces are those of ``ini_info`` in both cases.
+
+        Returns:
+            sharpy.utils.datastructures.StructTimeStepInfo: Initial structural time step
+        """
+        if not self.settings['warm_start'] or self.converged_structural_step is None:
+            return self.data.structure.ini_info.copy()
+
+        tstep = self.converged_structural_step.copy()
+        tstep.steady_applied_forces[:] = self.data.structure.ini_info.steady_applied_forces
+        return tstep
+
     def run(self):
+        converged = False
         for i_step in range(self.settings['n_load_steps'] + 1):
             if (i_step == self.settings['n_load_steps'] and
                     self.settings['n_load_steps'] > 0):
@@ -174,27 +226,33 @@ class StaticCoupled(BaseSolver):
             if i_step > 0:
                 self.increase_ts()
 
+            converged = False
+            if self.accelerator is not None:
+                self.accelerator.start_step()
+
             for i_iter in range(self.settings['max_iter']):
                 # run aero
-                self.data = self.aero_solver.run()
+                with instrumentation.timeline.phase('StaticCoupled.aero'):
+                    self.data = self.aero_solver.run()
 
                 # map force
-                struct_forces = mapping.aero2struct_force_mapping(
-                    self.data.aero.timestep_info[self.data.ts].forces,
-                    self.data.aero.struct2aero_mapping,
-                    self.data.aero.timestep_info[self.data.ts].zeta,
-                    self.data.structure.timestep_info[self.data.ts].pos,
-                    self.data.structure.timestep_info[self.data.ts].psi,
-                    self.data.structure.node_master_elem,
-                    self.data.structure.connectivities,
-                    self.data.structure.timestep_info[self.data.ts].cag(),
-                    self.data.aero.aero_dict)
-
-                if self.correct_forces:
-                    struct_forces = \
-                        self.correct_forces_generator.generate(aero_kstep=self.data.aero.timestep_info[self.data.ts],
-                                                               structural_kstep=self.data.structure.timestep_info[self.data.ts],
-                                                               struct_forces=struct_forces)
+                with instrumentation.timeline.phase('StaticCoupled.map_forces'):
+                    struct_forces = mapping.aero2struct_force_mapping(
+                        self.data.aero.timestep_info[self.data.ts].forces,
+                        self.data.aero.struct2aero_mapping,
+                        self.data.aero.timestep_info[self.data.ts].zeta,
+                        self.data.structure.timestep_info[self.data.ts].pos,
+                        self.data.structure.timestep_info[self.data.ts].psi,
+                        self.data.structure.node_master_elem,
+                        self.data.structure.connectivities,
+                        self.data.structure.timestep_info[self.data.ts].cag(),
+                        self.data.aero.aero_dict)
+
+                    if self.correct_forces:
+                        struct_forces = \
+                            self.correct_forces_generator.generate(aero_kstep=self.data.aero.timestep_info[self.data.ts],
+                                                                   structural_kstep=self.data.structure.timestep_info[self.data.ts],
+                                                                   struct_forces=struct_forces)
                 self.data.aero.timestep_info[self.data.ts].aero_steady_forces_beam_dof = struct_forces
                 self.data.structure.timestep_info[self.data.ts].postproc_node['aero_steady_forces'] = struct_forces  # B
                 
@@ -208,11 +266,17 @@ class StaticCoupled(BaseSolver):
                     params['force_coeff'] = 0.
                     params['fsi_substep'] = -i_iter
                     for id, runtime_generator in self.runtime_generators.items():
-                        runtime_generator.generate(params)
+                        with instrumentation.timeline.phase('runtime_generator:' + id):
+                            runtime_generator.generate(params)
 
                     struct_forces += self.data.structure.timestep_info[self.data.ts].runtime_generated_forces
 
-                if not self.settings['relaxation_factor'] == 0.:
+                if self.accelerator is not None:
+                    if i_iter > 0:
+                        struct_forces = self.accelerator.update(self.previous_force,
+                                                                struct_forces).reshape(struct_forces.shape)
+                    self.previous_force = struct_forces.copy()
+                elif not self.settings['relaxation_factor'] == 0.:
                     if i_iter == 0:
                         self.previous_force = struct_forces.copy()
 
@@ -227,7 +291,8 @@ class StaticCoupled(BaseSolver):
                 temp1 = load_step_multiplier*(struct_forces + self.data.structure.ini_info.steady_applied_forces)
                 self.data.structure.timestep_info[self.data.ts].steady_applied_forces[:] = temp1
                 # run beam
-                self.data = self.structural_solver.run()
+                with instrumentation.timeline.phase('StaticCoupled.structure'):
+                    self.data = self.structural_solver.run()
                 self.structural_solver.settings['gravity'] = old_g
                 (self.data.structure.timestep_info[self.data.ts].total_forces[0:3],
                  self.data.structure.timestep_info[self.data.ts].total_forces[3:6]) = (
@@ -237,12 +302,20 @@ class StaticCoupled(BaseSolver):
                 self.aero_solver.update_step()
 
                 # convergence
+                instrumentation.timeline.count('StaticCoupled.fsi_iterations')
                 if self.convergence(i_iter, i_step):
                     # create q and dqdt vectors
                     self.structural_solver.update(self.data.structure.timestep_info[self.data.ts])
                     self.cleanup_timestep_info()
+                    converged = True
                     break
 
+            if self.accelerator is not None:
+                self.accelerator.end_step()
+
+        if converged and self.settings['warm_start']:
+            self.converged_structural_step = self.data.structure.timestep_info[self.data.ts].copy()
+
         return self.data
 
     def convergence(self, i_iter, i_step):
@@ -303,7 +376,7 @@ class StaticCoupled(BaseSolver):
     def change_trim(self, alpha, thrust, thrust_nodes, tail_deflection, tail_cs_index):
         # self.cleanup_timestep_info()
         self.data.structure.timestep_info = []
-        self.data.structure.timestep_info.append(self.data.structure.ini_info.copy())
+        self.data.structure.timestep_info.append(self.initial_structural_step())
         aero_copy = self.data.aero.timestep_info[-1]
         self.data.aero.timestep_info = []
         self.data.aero.timestep_info.append(aero_copy)
@@ -4,6 +4,7 @@ import sharpy.utils.cout_utils as cout
 import sharpy.utils.solver_interface as solver_interface
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
+import sharpy.utils.parallel as parallel
 import os
 
 
@@ -25,6 +26,7 @@ class StaticTrim(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['print_info'] = 'bool'
     settings_default['print_info'] = True
@@ -86,12 +88,29 @@ class StaticTrim(BaseSolver):
     settings_default['relaxation_factor'] = 0.2
     settings_description['relaxation_factor'] = 'Relaxation factor'
 
+    settings_types['jacobian_method'] = 'str'
+    settings_default['jacobian_method'] = 'secant'
+    settings_description['jacobian_method'] = 'Method to update the derivatives of the forces and moment with ' \
+                                              'respect to the trim variables. ``secant`` only uses the diagonal ' \
+                                              'terms, updated with the last two iterations. ``finite_differences`` ' \
+                                              'computes the full Jacobian every iteration. ``broyden`` computes ' \
+                                              'the full Jacobian in the first iteration and then applies ' \
+                                              'Broyden rank one updates'
+    settings_options['jacobian_method'] = ['secant', 'finite_differences', 'broyden']
+
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of processes used to compute the finite difference ' \
+                                            'perturbations concurrently. The perturbed static solutions run in ' \
+                                            'worker processes forked from the current state. If ``0``, the number ' \
+                                            'of CPUs is used'
+
     settings_types['save_info'] = 'bool'
     settings_default['save_info'] = False
     settings_description['save_info'] = 'Save trim results to text file'
 
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.data = None
@@ -117,7 +136,8 @@ class StaticTrim(BaseSolver):
     def initialise(self, data):
         self.data = data
         self.settings = data.settings[self.solver_id]
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default,
+                                 options=self.settings_options)
 
         self.solver = solver_interface.initialise_solver(self.settings['solver'])
         self.solver.initialise(self.data, self.settings['solver_settings'])
@@ -145,7 +165,10 @@ class StaticTrim(BaseSolver):
         except AttributeError:
             modal_exists = False
 
-        self.trim_algorithm()
+        if self.settings['jacobian_method'] == 'secant':
+            self.trim_algorithm()
+        else:
+            self.newton_trim_algorithm()
 
         if modal_exists:
             self.data.structure.timestep_info[-1].modal = modal
@@ -213,30 +236,10 @@ class StaticTrim(BaseSolver):
                     return
 
                 # compute gradients
-                # dfz/dalpha
-                (l, m, d) = self.evaluate(self.input_history[self.i_iter][0] + self.settings['initial_angle_eps'],
-                                          self.input_history[self.i_iter][1],
-                                          self.input_history[self.i_iter][2])
-
-                self.gradient_history[self.i_iter][0] = ((l - self.output_history[self.i_iter][0]) /
-                                                         self.settings['initial_angle_eps'])
-
-                # dm/dgamma
-                (l, m, d) = self.evaluate(self.input_history[self.i_iter][0],
-                                          self.input_history[self.i_iter][1] + self.settings['initial_angle_eps'],
-                                          self.input_history[self.i_iter][2])
-
-                self.gradient_history[self.i_iter][1] = ((m - self.output_history[self.i_iter][1]) /
-                                                         self.settings['initial_angle_eps'])
-
-                # dfx/dthrust
-                (l, m, d) = self.evaluate(self.input_history[self.i_iter][0],
-                                          self.input_history[self.i_iter][1],
-                                          self.input_history[self.i_iter][2] +
-                                          self.settings['initial_thrust_eps'])
-
-                self.gradient_history[self.i_iter][2] = ((d - self.output_history[self.i_iter][2]) /
-                                                         self.settings['initial_thrust_eps'])
+                jacobian = self.finite_difference_jacobian(self.input_history[self.i_iter],
+                                                           self.output_history[self.i_iter])
+                for i_dim in range(self.n_input):
+                    self.gradient_history[self.i_iter][i_dim] = jacobian[i_dim, i_dim]
 
                 continue
 
@@ -315,19 +318,101 @@ class StaticTrim(BaseSolver):
                 self.table.close_file()
                 return
 
-    def evaluate(self, alpha, deflection_gamma, thrust):
-        if not np.isfinite(alpha):
-            import pdb; pdb.set_trace()
-        if not np.isfinite(deflection_gamma):
-            import pdb; pdb.set_trace()
-        if not np.isfinite(thrust):
-            import pdb; pdb.set_trace()
+    def newton_trim_algorithm(self):
+        """
+        Newton trim algorithm method
+
+        The trim condition is found with Newton iterations using the full Jacobian of the vertical force, pitching
+        moment and horizontal force with respect to the angle of attack, the angle of attack plus control surface
+        deflection and the thrust. The Jacobian is computed with finite differences, run concurrently in
+        ``num_processes`` processes, either at every iteration (``finite_differences``) or at the first iteration
+        and then with Broyden updates (``broyden``). The Jacobian is recomputed if a Broyden step does not reduce
+        the residual.
+        """
+        tolerances = np.array([self.settings['fz_tolerance'],
+                               self.settings['m_tolerance'],
+                               self.settings['fx_tolerance']])
+
+        x = np.array([self.settings['initial_alpha'],
+                      self.settings['initial_deflection'] + self.settings['initial_alpha'],
+                      self.settings['initial_thrust']])
+        f = np.array(self.evaluate(*x))
+        jacobian = None
+        for self.i_iter in range(self.settings['max_iter'] + 1):
+            if self.i_iter == self.settings['max_iter']:
+                raise Exception('The Trim routine reached max iterations without convergence!')
+
+            self.input_history.append(list(x))
+            self.output_history.append(list(f))
+
+            if all(self.convergence(*f)):
+                self.gradient_history.append([0.]*self.n_input if jacobian is None else list(np.diag(jacobian)))
+                self.trimmed_values = self.input_history[self.i_iter]
+                self.table.close_file()
+                return
+
+            if jacobian is None:
+                jacobian = self.finite_difference_jacobian(x, f)
+            self.gradient_history.append(list(np.diag(jacobian)))
+
+            delta_x = -np.linalg.solve(jacobian, f)
+            x_new = x + delta_x
+            f_new = np.array(self.evaluate(*x_new))
+
+            if self.settings['jacobian_method'] == 'broyden':
+                if np.linalg.norm(f_new/tolerances) < np.linalg.norm(f/tolerances):
+                    jacobian += np.outer(f_new - f - jacobian.dot(delta_x), delta_x)/delta_x.dot(delta_x)
+                else:
+                    jacobian = None
+            else:
+                jacobian = None
+
+            x = x_new
+            f = f_new
 
-        # cout.cout_wrap('--', 2)
-        # cout.cout_wrap('Trying trim: ', 2)
-        # cout.cout_wrap('Alpha: ' + str(alpha*180/np.pi), 2)
-        # cout.cout_wrap('CS deflection: ' + str((deflection_gamma - alpha)*180/np.pi), 2)
-        # cout.cout_wrap('Thrust: ' + str(thrust), 2)
+    def finite_difference_jacobian(self, x, f):
+        """
+        Computes the Jacobian of the outputs ``[fz, m, fx]`` with respect to the inputs
+        ``[alpha, alpha + deflection, thrust]`` with forward finite differences, perturbing the inputs by
+        ``initial_angle_eps`` and ``initial_thrust_eps``.
+
+        The perturbed static solutions are independent and are run in ``num_processes`` forked processes.
+
+        Args:
+            x (list or np.ndarray): Current inputs
+            f (list or np.ndarray): Outputs for the current inputs
+
+        Returns:
+            np.ndarray: ``3x3`` Jacobian, where ``jacobian[i, j]`` is the derivative of output ``i`` with respect
+            to input ``j``
+        """
+        eps = np.array([self.settings['initial_angle_eps'],
+                        self.settings['initial_angle_eps'],
+                        self.settings['initial_thrust_eps']])
+        perturbed_inputs = []
+        for i_dim in range(self.n_input):
+            perturbed_x = np.array(x, dtype=float)
+            perturbed_x[i_dim] += eps[i_dim]
+            perturbed_inputs.append(tuple(perturbed_x))
+
+        perturbed_outputs = parallel.fork_map(self.solve, perturbed_inputs,
+                                              num_processes=self.settings['num_processes'])
+
+        jacobian = np.zeros((self.n_input, self.n_input))
+        for i_dim, (perturbed_x, (forces, moments)) in enumerate(zip(perturbed_inputs, perturbed_outputs)):
+            self.print_evaluation(*perturbed_x, forces, moments)
+            perturbed_f = np.array([forces[2], moments[1], forces[0]])
+            jacobian[:, i_dim] = (perturbed_f - np.array(f))/eps[i_dim]
+
+        return jacobian
+
+    def solve(self, alpha, deflection_gamma, thrust):
+        """
+        Runs the static solver for the given trim variables.
+
+        Returns:
+            tuple: Total forces and moments
+        """
         # modify the trim in the static_coupled solver
         self.solver.change_trim(alpha,
                                 thrust,
@@ -338,15 +423,9 @@ class StaticTrim(BaseSolver):
         self.solver.run()
         # extract resultants
         forces, moments = self.solver.extract_resultants()
+        return forces, moments
 
-        forcez = forces[2]
-        forcex = forces[0]
-        moment = moments[1]
-        # cout.cout_wrap('Forces and moments:', 2)
-        # cout.cout_wrap('fx = ' + str(forces[0]) + ' mx = ' + str(moments[0]), 2)
-        # cout.cout_wrap('fy = ' + str(forces[1]) + ' my = ' + str(moments[1]), 2)
-        # cout.cout_wrap('fz = ' + str(forces[2]) + ' mz = ' + str(moments[2]), 2)
-
+    def print_evaluation(self, alpha, deflection_gamma, thrust, forces, moments):
         self.table.print_line([self.i_iter,
                                alpha*180/np.pi,
                                (deflection_gamma - alpha)*180/np.pi,
@@ -358,4 +437,20 @@ class StaticTrim(BaseSolver):
                                moments[1],
                                moments[2]])
 
+    def evaluate(self, alpha, deflection_gamma, thrust):
+        if not np.isfinite(alpha):
+            import pdb; pdb.set_trace()
+        if not np.isfinite(deflection_gamma):
+            import pdb; pdb.set_trace()
+        if not np.isfinite(thrust):
+            import pdb; pdb.set_trace()
+
+        forces, moments = self.solve(alpha, deflection_gamma, thrust)
+
+        forcez = forces[2]
+        forcex = forces[0]
+        moment = moments[1]
+
+        self.print_evaluation(alpha, deflection_gamma, thrust, forces, moments)
+
         return forcez, moment, forcex
@@ -402,7 +402,8 @@ class StepLinearUVLM(BaseSolver):
     def update_grid(self, beam):
         self.data.aero.generate_zeta(beam, self.data.aero.aero_settings, -1, beam_ts=-1)
 
-    def update_custom_grid(self, structure_tstep, aero_tstep):
+    def update_custom_grid(self, structure_tstep, aero_tstep, dt=None):
+        # the time step of the linear system is fixed
         self.data.aero.generate_zeta_timestep_info(structure_tstep, aero_tstep, self.data.structure, self.data.aero.aero_settings)
 
     def unpack_ss_vectors(self, y_n, x_n, u_n, aero_tstep):
@@ -10,6 +10,7 @@ from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.generator_interface as gen_interface
 import sharpy.utils.cout_utils as cout
 from sharpy.utils.constants import vortex_radius_def
+import sharpy.utils.instrumentation as instrumentation
 
 
 @solver
@@ -207,32 +208,34 @@ class StepUvlm(BaseSolver):
             return self.data
 
         # generate uext
-        self.velocity_generator.generate({'zeta': aero_tstep.zeta,
-                                          'override': True,
-                                          't': t,
-                                          'ts': self.data.ts,
-                                          'dt': dt,
-                                          'for_pos': structure_tstep.for_pos,
-                                          'is_wake': False},
-                                         aero_tstep.u_ext)
-        if ((self.settings['convection_scheme'] > 1 and convect_wake) or
-           (not self.settings['cfl1'])):
-            # generate uext_star
-            self.velocity_generator.generate({'zeta': aero_tstep.zeta_star,
+        with instrumentation.timeline.phase('velocity_generator:' + self.settings['velocity_field_generator']):
+            self.velocity_generator.generate({'zeta': aero_tstep.zeta,
                                               'override': True,
+                                              't': t,
                                               'ts': self.data.ts,
                                               'dt': dt,
-                                              't': t,
                                               'for_pos': structure_tstep.for_pos,
-                                              'is_wake': True},
-                                             aero_tstep.u_ext_star)
-
-        uvlmlib.uvlm_solver(self.data.ts,
-                            aero_tstep,
-                            structure_tstep,
-                            self.settings,
-                            convect_wake=convect_wake,
-                            dt=dt)
+                                              'is_wake': False},
+                                             aero_tstep.u_ext)
+            if ((self.settings['convection_scheme'] > 1 and convect_wake) or
+               (not self.settings['cfl1'])):
+                # generate uext_star
+                self.velocity_generator.generate({'zeta': aero_tstep.zeta_star,
+                                                  'override': True,
+                                                  'ts': self.data.ts,
+                                                  'dt': dt,
+                                                  't': t,
+                                                  'for_pos': structure_tstep.for_pos,
+                                                  'is_wake': True},
+                                                 aero_tstep.u_ext_star)
+
+        with instrumentation.timeline.phase('StepUvlm.uvlm_solver'):
+            uvlmlib.uvlm_solver(self.data.ts,
+                                aero_tstep,
+                                structure_tstep,
+                                self.settings,
+                                convect_wake=convect_wake,
+                                dt=dt)
 
         if unsteady_contribution and not self.settings['quasi_steady']:
             # calculate unsteady (added mass) forces:
@@ -248,11 +251,12 @@ class StepUvlm(BaseSolver):
                     aero_tstep,
                     self.data.aero.timestep_info,
                     self.settings['gamma_dot_filtering'])
-            uvlmlib.uvlm_calculate_unsteady_forces(aero_tstep,
-                                                   structure_tstep,
-                                                   self.settings,
-                                                   convect_wake=convect_wake,
-                                                   dt=dt)
+            with instrumentation.timeline.phase('StepUvlm.unsteady_forces'):
+                uvlmlib.uvlm_calculate_unsteady_forces(aero_tstep,
+                                                       structure_tstep,
+                                                       self.settings,
+                                                       convect_wake=convect_wake,
+                                                       dt=dt)
         else:
             for i_surf in range(len(aero_tstep.gamma)):
                 aero_tstep.gamma_dot[i_surf][:] = 0.0
@@ -268,12 +272,14 @@ class StepUvlm(BaseSolver):
                                      -1,
                                      beam_ts=-1)
 
-    def update_custom_grid(self, structure_tstep, aero_tstep):
+    def update_custom_grid(self, structure_tstep, aero_tstep, dt=None):
+        if dt is None:
+            dt = self.settings['dt']
         self.data.aero.generate_zeta_timestep_info(structure_tstep,
                                                    aero_tstep,
                                                    self.data.structure,
                                                    self.data.aero.aero_settings,
-                                                   dt=self.settings['dt'])
+                                                   dt=dt)
 
     @staticmethod
     def filter_gamma_dot(tstep, history, filter_param):
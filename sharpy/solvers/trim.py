@@ -8,6 +8,7 @@ import sharpy.utils.cout_utils as cout
 import sharpy.utils.solver_interface as solver_interface
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
+import sharpy.utils.parallel as parallel
 import sharpy.utils.algebra as algebra
 
 
@@ -86,6 +87,13 @@ class Trim(BaseSolver):
     settings_default['refine_solution'] = False
     settings_description['refine_solution'] = 'If ``True`` and the optimiser routine allows for it, the optimiser will try to improve the solution with hybrid methods'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of processes used to compute the finite difference gradients ' \
+                                            'of the gradient-based refinement. The perturbed static solutions run ' \
+                                            'in worker processes forked from the current state. If ``0``, the ' \
+                                            'number of CPUs is used. If ``1``, scipy computes the gradients serially'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -253,10 +261,16 @@ class Trim(BaseSolver):
                                                     'fatol': 1e-4})
         if refine:
             cout.cout_wrap('Refining results with a gradient-based method', 1)
+            jac = None
+            if self.settings['num_processes'] != 1:
+                # serially, scipy's own finite differences reuse the function value at x
+                jac = lambda x, *jac_args: finite_difference_gradient(func, x, jac_args, 0.05,
+                                                                      self.settings['num_processes'])
             solution = scipy.optimize.minimize(func,
                                                solution.x,
                                                args=args,
                                                method='BFGS',
+                                               jac=jac,
                                                options={'disp': print_info,
                                                         'eps': 0.05,
                                                         'maxfev': 5000,
@@ -279,6 +293,23 @@ class Trim(BaseSolver):
 #                 cout.cout_wrap(k + ': ', v)
 
 
+def finite_difference_gradient(func, x, args, eps, num_processes=1):
+    """
+    Forward finite difference gradient of ``func(x, *args)``, with all the evaluations run concurrently in
+    ``num_processes`` forked processes.
+    """
+    x = np.array(x, dtype=float)
+    evaluation_points = [x]
+    for i_dim in range(len(x)):
+        perturbed_x = x.copy()
+        perturbed_x[i_dim] += eps
+        evaluation_points.append(perturbed_x)
+
+    values = parallel.fork_map(func, [(point,) + tuple(args) for point in evaluation_points],
+                               num_processes=num_processes)
+    return (np.array(values[1:]) - values[0])/eps
+
+
 def solver_wrapper(x, x_info, solver_data, i_dim=-1):
     if solver_data.settings['print_info']:
         cout.cout_wrap('x = ' + str(x), 1)
@@ -287,7 +318,11 @@ def solver_wrapper(x, x_info, solver_data, i_dim=-1):
     beta = x[x_info['i_beta']]
     roll = x[x_info['i_roll']]
     # change input data
-    solver_data.data.structure.timestep_info[solver_data.data.ts] = solver_data.data.structure.ini_info.copy()
+    if hasattr(solver_data.solver, 'initial_structural_step'):
+        initial_step = solver_data.solver.initial_structural_step()
+    else:
+        initial_step = solver_data.data.structure.ini_info.copy()
+    solver_data.data.structure.timestep_info[solver_data.data.ts] = initial_step
     tstep = solver_data.data.structure.timestep_info[solver_data.data.ts]
     aero_tstep = solver_data.data.aero.timestep_info[solver_data.data.ts]
     orientation_quat = algebra.euler2quat(np.array([roll, alpha, beta]))
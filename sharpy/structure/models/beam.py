@@ -66,6 +66,8 @@ class Beam(BaseStructure):
 
         self.global_nodes_num = None
         self.global_elems_num = None
+        self.body_nodes_mask = None
+        self.body_elems_mask = None
 
 
     def generate(self, in_data, settings):
@@ -114,6 +116,7 @@ class Beam(BaseStructure):
 
         self.global_nodes_num = list(set(self.connectivities.reshape(-1)))
         self.global_elems_num = np.arange(0, self.num_elem, 1)
+        self.generate_body_masks()
 
         # stiffness data
         self.elem_stiffness = in_data['elem_stiffness'].copy()
@@ -286,6 +289,18 @@ class Beam(BaseStructure):
 
         self.num_dof = ct.c_int((vcounter + 1)*6)
 
+    def generate_body_masks(self):
+        """
+        Generates the masks of the nodes ``body_nodes_mask[num_bodies, num_node]`` and elements
+        ``body_elems_mask[num_bodies, num_elem]`` that belong to each body, used to operate on each body of the
+        whole structure without extracting it.
+        """
+        self.body_elems_mask = np.zeros((self.num_bodies, self.num_elem), dtype=bool)
+        self.body_nodes_mask = np.zeros((self.num_bodies, self.num_node), dtype=bool)
+        for ibody in range(self.num_bodies):
+            self.body_elems_mask[ibody, :] = self.body_number == ibody
+            self.body_nodes_mask[ibody, self.connectivities[self.body_elems_mask[ibody], :].reshape(-1)] = True
+
     def generate_mass_matrix(self, mass, position, inertia):
 
         inertia_tensor = np.zeros((6, 6))
@@ -502,36 +517,37 @@ class Beam(BaseStructure):
         Returns:
             np.array: the ``nodal`` argument projected onto the reference ``A`` frame.
         """
-        nodal_a = nodal.copy(order='F')
-        for i_node in range(self.num_node):
-            # get master elem and i_local_node
-            i_master_elem, i_local_node = self.node_master_elem[i_node, :]
-            crv = tstep.psi[i_master_elem, i_local_node, :]
-            cab = algebra.crv2rotation(crv)
-            temp = np.zeros((6,))
-            temp[0:3] = np.dot(cab, nodal[i_node, 0:3])
-            temp[3:6] = np.dot(cab, nodal[i_node, 3:6])
-            for i in range(6):
-                if filter[i]:
-                    nodal_a[i_node, i] = temp[i]
-
-        return nodal_a
+        cab = algebra.crv2rotation_batch(self.nodal_master_psi(tstep))
+        return self.nodal_premultiply(cab, nodal, filter)
 
     def nodal_premultiply_inv_T_transpose(self, nodal, tstep, filter=np.array([True]*6)):
-        # nodal_t = np.zeros_like(nodal, dtype=ct.c_double, order='F')
-        nodal_t = nodal.copy(order='F')
-        for i_node in range(self.num_node):
-            # get master elem and i_local_node
-            i_master_elem, i_local_node = self.node_master_elem[i_node, :]
-            crv = tstep.psi[i_master_elem, i_local_node, :]
-            inv_tanT = algebra.crv2invtant(crv)
-            temp = np.zeros((6,))
-            temp[0:3] = np.dot(inv_tanT, nodal[i_node, 0:3])
-            temp[3:6] = np.dot(inv_tanT, nodal[i_node, 3:6])
-            for i in range(6):
-                if filter[i]:
-                    nodal_t[i_node, i] = temp[i]
+        inv_tanT = np.linalg.inv(np.swapaxes(algebra.crv2tan_batch(self.nodal_master_psi(tstep)), -1, -2))
+        return self.nodal_premultiply(inv_tanT, nodal, filter)
+
+    def nodal_master_psi(self, tstep):
+        """
+        Returns:
+            np.array: CRV of each node in its master element ``(num_node, 3)``
+        """
+        return tstep.psi[self.node_master_elem[:, 0], self.node_master_elem[:, 1], :]
 
+    @staticmethod
+    def nodal_premultiply(matrices, nodal, filter=np.array([True]*6)):
+        """
+        Premultiplies the force and moment (or translational and rotational) components of a nodal variable by a
+        matrix at each node.
+
+        Args:
+            matrices (np.array): Matrix at each node ``(num_node, 3, 3)``
+            nodal (np.array): Nodal variable of size ``(num_node, 6)``
+            filter (np.array): Degrees of freedom that are premultiplied. The rest are returned unchanged.
+
+        Returns:
+            np.array: the premultiplied ``nodal`` variable
+        """
+        nodal_t = nodal.copy(order='F')
+        temp = np.einsum('nij,nkj->nki', matrices, nodal.reshape(-1, 2, 3)).reshape(-1, 6)
+        nodal_t[:, filter] = temp[:, filter]
         return nodal_t
 
     def get_body(self, ibody):
@@ -0,0 +1,189 @@
+r"""Adaptive Time Stepping
+
+Time step control used by :class:`~sharpy.solvers.dynamiccoupled.DynamicCoupled` when ``adaptive_time_step = on``.
+
+After each converged time step, the structural state :math:`\mathbf{x} = [\mathbf{q}; \dot{\mathbf{q}}]` is compared
+with its linear extrapolation from the two previous converged steps, which for a variable time step reads
+
+.. math:: \mathbf{x}^{pred}_{n+1} = \mathbf{x}_n + \frac{\Delta t_{n+1}}{\Delta t_n}(\mathbf{x}_n - \mathbf{x}_{n-1})
+
+The difference between predictor and corrector, scaled with a mixed absolute and relative tolerance, gives the error
+estimate
+
+.. math:: \epsilon = \sqrt{\frac{1}{N}\sum_i\left(\frac{x_{n+1, i} - x^{pred}_{n+1, i}}
+    {\mathrm{atol} + \mathrm{rtol}|x_{n+1, i}|}\right)^2}
+
+Since the error of the linear predictor is of second order, the next time step is
+
+.. math:: \Delta t_{n+2} = \Delta t_{n+1}\,s\,\epsilon^{-1/2}
+
+with :math:`s` a safety factor. The step is further reduced in proportion to the number of FSI iterations beyond
+``fsi_iterations_target`` and by ``max_decrease`` if the FSI loop did not converge. The change of time step between
+consecutive steps is limited to ``[max_decrease, max_increase]`` and the time step to ``[dt_min_ratio,
+dt_max_ratio]`` times the nominal one. Time steps are not rejected: the error estimate only sizes the following step.
+
+The last time steps are shortened to finish at the nominal final time ``n_time_steps * dt``.
+"""
+import numpy as np
+
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.settings as settings
+
+
+class AdaptiveTimeStep(object):
+    """
+    Sizes the time steps of a time marching simulation from a predictor/corrector error estimate and the number of
+    FSI iterations.
+    """
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+
+    settings_types['relative_tolerance'] = 'float'
+    settings_default['relative_tolerance'] = 1e-3
+    settings_description['relative_tolerance'] = 'Relative tolerance of the predictor/corrector error estimate'
+
+    settings_types['absolute_tolerance'] = 'float'
+    settings_default['absolute_tolerance'] = 1e-6
+    settings_description['absolute_tolerance'] = 'Absolute tolerance of the predictor/corrector error estimate'
+
+    settings_types['safety_factor'] = 'float'
+    settings_default['safety_factor'] = 0.9
+    settings_description['safety_factor'] = 'Factor applied to the time step given by the error estimate'
+
+    settings_types['max_increase'] = 'float'
+    settings_default['max_increase'] = 2.
+    settings_description['max_increase'] = 'Maximum ratio between consecutive time steps'
+
+    settings_types['max_decrease'] = 'float'
+    settings_default['max_decrease'] = 0.5
+    settings_description['max_decrease'] = 'Minimum ratio between consecutive time steps'
+
+    settings_types['dt_min_ratio'] = 'float'
+    settings_default['dt_min_ratio'] = 0.1
+    settings_description['dt_min_ratio'] = 'Minimum time step, as a fraction of the nominal time step'
+
+    settings_types['dt_max_ratio'] = 'float'
+    settings_default['dt_max_ratio'] = 10.
+    settings_description['dt_max_ratio'] = 'Maximum time step, as a multiple of the nominal time step'
+
+    settings_types['fsi_iterations_target'] = 'int'
+    settings_default['fsi_iterations_target'] = 8
+    settings_description['fsi_iterations_target'] = 'Number of FSI iterations above which the time step is ' \
+                                                    'reduced. If ``0``, the number of iterations is not ' \
+                                                    'considered'
+
+    settings_table = settings.SettingsTable()
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description,
+                                       header_line='The adaptive time stepping takes the following settings:')
+
+    def __init__(self):
+        self.settings = None
+
+        self.nominal_dt = 0.
+        self.final_time = 0.
+        self.dt = 0.
+        self.dt_min = 0.
+        self.dt_max = 0.
+
+        self.steps = []
+
+    def initialise(self, in_settings, dt, final_time):
+        """
+        Args:
+            in_settings (dict): Adaptive time stepping settings
+            dt (float): Nominal time step, used for the first step
+            final_time (float): Time at which the simulation finishes
+        """
+        self.settings = in_settings
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, no_ctype=True)
+
+        self.nominal_dt = dt
+        self.final_time = final_time
+        self.dt = dt
+        self.dt_min = self.settings['dt_min_ratio']*dt
+        self.dt_max = self.settings['dt_max_ratio']*dt
+        self.steps = []
+
+    def next_dt(self, t):
+        """
+        Time step to be taken from time ``t``, shortened to finish at the final time.
+
+        Returns:
+            float: Time step, or ``None`` if the final time has been reached
+        """
+        remaining = self.final_time - t
+        if remaining < 1e-6*self.dt_min:
+            return None
+        if remaining <= self.dt:
+            return remaining
+        if remaining < 1.5*self.dt:
+            # two similar steps rather than a much shorter last one
+            return 0.5*remaining
+        return self.dt
+
+    def error(self, x, x_previous, x_before, dt, dt_previous):
+        """
+        Predictor/corrector error estimate of a time step.
+
+        Args:
+            x (np.ndarray): Converged state of the time step
+            x_previous (np.ndarray): Converged state of the previous time step
+            x_before (np.ndarray): Converged state of the time step before the previous one
+            dt (float): Time step between ``x_previous`` and ``x``
+            dt_previous (float): Time step between ``x_before`` and ``x_previous``
+
+        Returns:
+            float: Scaled RMS norm of the difference between ``x`` and its linear extrapolation
+        """
+        x_predicted = x_previous + dt/dt_previous*(x_previous - x_before)
+        scale = self.settings['absolute_tolerance'] + self.settings['relative_tolerance']*np.abs(x)
+        return np.sqrt(np.mean(((x - x_predicted)/scale)**2))
+
+    def update(self, ts, t, dt, error=None, fsi_iterations=0, converged=True):
+        """
+        Records a converged time step and sizes the next one.
+
+        Args:
+            ts (int): Time step index
+            t (float): Time at the end of the time step
+            dt (float): Time step taken
+            error (float): Error estimate (see :meth:`error`). If ``None``, the time step is only reduced
+              according to the FSI iterations
+            fsi_iterations (int): Number of FSI iterations of the time step
+            converged (bool): ``False`` if the FSI loop did not converge
+
+        Returns:
+            float: Next time step
+        """
+        factor = 1.
+        if error is not None:
+            factor = self.settings['max_increase'] if error == 0. else self.settings['safety_factor']*error**-0.5
+
+        target = self.settings['fsi_iterations_target']
+        if not converged:
+            factor = self.settings['max_decrease']
+        elif target > 0 and fsi_iterations > target:
+            factor = min(factor, target/fsi_iterations)
+
+        factor = min(max(factor, self.settings['max_decrease']), self.settings['max_increase'])
+        self.dt = min(max(dt*factor, self.dt_min), self.dt_max)
+
+        self.steps.append({'ts': int(ts),
+                           't': t,
+                           'dt': dt,
+                           'error': error,
+                           'fsi_iterations': fsi_iterations,
+                           'converged': converged})
+        return self.dt
+
+    def finish(self):
+        """
+        Prints the time step statistics.
+        """
+        if not self.steps:
+            return
+        dts = np.array([step['dt'] for step in self.steps])
+        n_nominal = int(np.ceil(self.final_time/self.nominal_dt - 1e-6))
+        cout.cout_wrap('Adaptive time stepping: %u time steps (%u with the nominal time step), '
+                       'dt min %.3e, mean %.3e, max %.3e' % (len(dts), n_nominal, dts.min(), dts.mean(), dts.max()), 1)
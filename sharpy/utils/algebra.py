@@ -654,22 +654,12 @@ def crv2invtant(psi):
 
 
 def triad2crv_vec(v1, v2, v3):
-    n_nodes, _ = v1.shape
-    crv_vec = np.zeros((n_nodes, 3))
-    for inode in range(n_nodes):
-        crv_vec[inode, :] = triad2crv(v1[inode, :], v2[inode, :], v3[inode, :])
-
-    return crv_vec
+    return rotation2crv_batch(np.stack((v1, v2, v3), axis=-1))
 
 
 def crv2triad_vec(crv_vec):
-    n_nodes, _ = crv_vec.shape
-    v1 = np.zeros((n_nodes, 3))
-    v2 = np.zeros((n_nodes, 3))
-    v3 = np.zeros((n_nodes, 3))
-    for inode in range(n_nodes):
-        v1[inode, :], v2[inode, :], v3[inode, :] = crv2triad(crv_vec[inode, :])
-    return v1, v2, v3
+    rot_matrix = crv2rotation_batch(crv_vec)
+    return rot_matrix[..., 0], rot_matrix[..., 1], rot_matrix[..., 2]
 
 
 def quat2rotation(q1):
@@ -1996,3 +1986,381 @@ def der_skewp_skewp_v(p, v):
     der[2, 2] = v[0]*p[0] + v[1]*p[1]
 
     return der
+
+
+#######
+# Batched operations
+# The functions below evaluate the operations above for arrays of vectors ``[N, 3]`` (or any array with the vector
+# components in the last dimension), returning stacked matrices ``[N, 3, 3]``.
+def skew_batch(vectors):
+    """
+    Batched version of :func:`skew`.
+
+    Args:
+        vectors (np.ndarray): Vectors ``[..., 3]``
+
+    Returns:
+        np.ndarray: Skew-symmetric matrices ``[..., 3, 3]``
+    """
+    vectors = np.asarray(vectors)
+    matrices = np.zeros(vectors.shape + (3,))
+    matrices[..., 1, 2] = -vectors[..., 0]
+    matrices[..., 2, 0] = -vectors[..., 1]
+    matrices[..., 0, 1] = -vectors[..., 2]
+    matrices[..., 2, 1] = vectors[..., 0]
+    matrices[..., 0, 2] = vectors[..., 1]
+    matrices[..., 1, 0] = vectors[..., 2]
+    return matrices
+
+
+def crv2rotation_batch(psi):
+    """
+    Batched version of :func:`crv2rotation`.
+
+    Args:
+        psi (np.ndarray): Cartesian rotation vectors ``[..., 3]``
+
+    Returns:
+        np.ndarray: Rotation matrices ``[..., 3, 3]``
+    """
+    psi = np.asarray(psi)
+    norm_psi = np.linalg.norm(psi, axis=-1)
+    small = norm_psi < 1e-15
+    norm_safe = np.where(small, 1., norm_psi)
+    k1 = np.where(small, 1., np.sin(norm_psi) / norm_safe)
+    k2 = np.where(small, 0.5, (1.0 - np.cos(norm_psi)) / norm_safe ** 2)
+
+    psi_skew = skew_batch(psi)
+    rot_matrix = k1[..., None, None] * psi_skew + k2[..., None, None] * (psi_skew @ psi_skew)
+    rot_matrix[..., [0, 1, 2], [0, 1, 2]] += 1.
+    return rot_matrix
+
+
+def crv2tan_batch(psi):
+    """
+    Batched version of :func:`crv2tan`.
+
+    Args:
+        psi (np.ndarray): Cartesian rotation vectors ``[..., 3]``
+
+    Returns:
+        np.ndarray: Tangential operators ``[..., 3, 3]``
+    """
+    psi = np.asarray(psi)
+    norm_psi = np.linalg.norm(psi, axis=-1)
+    small = norm_psi < 1e-8
+    norm_safe = np.where(small, 1., norm_psi)
+    k1 = np.where(small, -0.5, (np.cos(norm_psi) - 1.0) / norm_safe ** 2)
+    k2 = np.where(small, 1.0 / 6.0, (1.0 - np.sin(norm_psi) / norm_safe) / norm_safe ** 2)
+
+    psi_skew = skew_batch(psi)
+    tan = k1[..., None, None] * psi_skew + k2[..., None, None] * (psi_skew @ psi_skew)
+    tan[..., [0, 1, 2], [0, 1, 2]] += 1.
+    return tan
+
+
+def der_Ccrv_by_v_batch(fv0, v):
+    """
+    Batched version of :func:`der_Ccrv_by_v`. The leading dimensions of ``fv0[..., 3]`` and ``v[..., 3]`` are
+    broadcast against each other.
+
+    Returns:
+        np.ndarray: Derivatives of ``dot(C, v)`` w.r.t. the CRV ``[..., 3, 3]``
+    """
+    return -crv2rotation_batch(fv0) @ skew_batch(v) @ crv2tan_batch(fv0)
+
+
+def der_TanT_by_xv_batch(fv0, xv):
+    """
+    Batched version of :func:`der_TanT_by_xv`. The leading dimensions of ``fv0[..., 3]`` and ``xv[..., 3]`` are
+    broadcast against each other.
+
+    Being :math:`T^\\top x = x - f_1 \\tilde{\\psi} x + f_2 \\tilde{\\psi}\\tilde{\\psi} x`, the derivative is
+    assembled from the gradients of the scalar functions :math:`f_1, f_2` and of the skew products.
+
+    Returns:
+        np.ndarray: Derivatives of ``dot(Tan.T, xv)`` w.r.t. the CRV ``[..., 3, 3]``
+    """
+    fv0, xv = np.broadcast_arrays(np.asarray(fv0, dtype=float), np.asarray(xv, dtype=float))
+
+    eps = 1e-15
+    f0 = np.linalg.norm(fv0, axis=-1)
+    small = f0 < eps
+    f0 = np.where(small, 1., f0)
+    f1 = np.where(small, -1.0 / 2.0, (np.cos(f0) - 1.0) / f0 ** 2)
+    f2 = np.where(small, 1.0 / 6.0, (1.0 - np.sin(f0) / f0) / f0 ** 2)
+    g1 = np.where(small, -1.0 / 12.0, (f0 * np.sin(f0) + 2.0 * (np.cos(f0) - 1.0)) / f0 ** 4)
+    g2 = np.where(small, 0., 2.0 / f0 ** 4 + np.cos(f0) / f0 ** 4 - 3.0 * np.sin(f0) / f0 ** 5)
+
+    # f1 and f2 gradients are -g1*fv0 and -g2*fv0
+    pxv = np.cross(fv0, xv)
+    ppxv = np.cross(fv0, pxv)
+    pdotx = np.sum(fv0 * xv, axis=-1)
+
+    der = (g1[..., None] * pxv - g2[..., None] * ppxv)[..., :, None] * fv0[..., None, :]
+    der += f1[..., None, None] * skew_batch(xv)
+    der += f2[..., None, None] * (fv0[..., :, None] * xv[..., None, :] - 2. * xv[..., :, None] * fv0[..., None, :])
+    der[..., [0, 1, 2], [0, 1, 2]] += (f2 * pdotx)[..., None]
+
+    return der
+
+
+def unit_vector_batch(vector):
+    """
+    Batched version of :func:`unit_vector`. Vectors ``[..., 3]`` with norm below ``1e-6`` are set to zero.
+    """
+    vector = np.asarray(vector, dtype=float)
+    norm = np.linalg.norm(vector, axis=-1)[..., None]
+    return np.where(norm < 1e-6, 0., vector / np.where(norm < 1e-6, 1., norm))
+
+
+def cross3_batch(v, w):
+    """
+    Batched version of :func:`cross3`. The leading dimensions of ``v[..., 3]`` and ``w[..., 3]`` are broadcast
+    against each other.
+    """
+    v, w = np.broadcast_arrays(np.asarray(v, dtype=float), np.asarray(w, dtype=float))
+    res = np.empty(v.shape)
+    res[..., 0] = v[..., 1]*w[..., 2] - v[..., 2]*w[..., 1]
+    res[..., 1] = -v[..., 0]*w[..., 2] + v[..., 2]*w[..., 0]
+    res[..., 2] = v[..., 0]*w[..., 1] - v[..., 1]*w[..., 0]
+    return res
+
+
+def quat2rotation_batch(quat):
+    """
+    Batched version of :func:`quat2rotation`.
+
+    Args:
+        quat (np.ndarray): Quaternions ``[..., 4]``. They need not be normalised.
+
+    Returns:
+        np.ndarray: Rotation matrices ``[..., 3, 3]``
+    """
+    q = np.asarray(quat, dtype=float)
+    q = q / np.linalg.norm(q, axis=-1)[..., None]
+    q0, q1, q2, q3 = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    rot_mat = np.empty(q.shape[:-1] + (3, 3))
+
+    rot_mat[..., 0, 0] = q0**2 + q1**2 - q2**2 - q3**2
+    rot_mat[..., 1, 1] = q0**2 - q1**2 + q2**2 - q3**2
+    rot_mat[..., 2, 2] = q0**2 - q1**2 - q2**2 + q3**2
+
+    rot_mat[..., 1, 0] = 2.*(q1*q2 + q0*q3)
+    rot_mat[..., 0, 1] = 2.*(q1*q2 - q0*q3)
+
+    rot_mat[..., 2, 0] = 2.*(q1*q3 - q0*q2)
+    rot_mat[..., 0, 2] = 2.*(q1*q3 + q0*q2)
+
+    rot_mat[..., 2, 1] = 2.*(q2*q3 + q0*q1)
+    rot_mat[..., 1, 2] = 2.*(q2*q3 - q0*q1)
+
+    return rot_mat
+
+
+def quat_bound_batch(quat):
+    """
+    Batched version of :func:`quat_bound`. Unlike the scalar version, the input is not modified.
+
+    Args:
+        quat (np.ndarray): Quaternions ``[..., 4]``
+
+    Returns:
+        np.ndarray: Bounded quaternions ``[..., 4]``
+    """
+    quat = np.asarray(quat, dtype=float)
+    return np.where(quat[..., :1] < 0, -quat, quat)
+
+
+def rotation2quat_batch(Cab):
+    """
+    Batched version of :func:`rotation2quat`.
+
+    Args:
+        Cab (np.ndarray): Rotation matrices ``[..., 3, 3]``
+
+    Returns:
+        np.ndarray: Equivalent bounded quaternions ``[..., 4]``
+    """
+    Cab = np.asarray(Cab, dtype=float)
+    s = np.empty(Cab.shape[:-2] + (4, 4))
+
+    s[..., 0, 0] = 1.0 + np.trace(Cab, axis1=-2, axis2=-1)
+    s[..., 0, 1] = Cab[..., 2, 1] - Cab[..., 1, 2]
+    s[..., 0, 2] = Cab[..., 0, 2] - Cab[..., 2, 0]
+    s[..., 0, 3] = Cab[..., 1, 0] - Cab[..., 0, 1]
+
+    s[..., 1, 0] = Cab[..., 2, 1] - Cab[..., 1, 2]
+    s[..., 1, 1] = 1.0 + Cab[..., 0, 0] - Cab[..., 1, 1] - Cab[..., 2, 2]
+    s[..., 1, 2] = Cab[..., 0, 1] + Cab[..., 1, 0]
+    s[..., 1, 3] = Cab[..., 0, 2] + Cab[..., 2, 0]
+
+    s[..., 2, 0] = Cab[..., 0, 2] - Cab[..., 2, 0]
+    s[..., 2, 1] = Cab[..., 1, 0] + Cab[..., 0, 1]
+    s[..., 2, 2] = 1.0 - Cab[..., 0, 0] + Cab[..., 1, 1] - Cab[..., 2, 2]
+    s[..., 2, 3] = Cab[..., 1, 2] + Cab[..., 2, 1]
+
+    s[..., 3, 0] = Cab[..., 1, 0] - Cab[..., 0, 1]
+    s[..., 3, 1] = Cab[..., 0, 2] + Cab[..., 2, 0]
+    s[..., 3, 2] = Cab[..., 1, 2] + Cab[..., 2, 1]
+    s[..., 3, 3] = 1.0 - Cab[..., 0, 0] - Cab[..., 1, 1] + Cab[..., 2, 2]
+
+    # compute quaternion angles from the row of the largest diagonal term
+    ismax = np.argmax(np.diagonal(s, axis1=-2, axis2=-1), axis=-1)
+    s_row = np.take_along_axis(s, ismax[..., None, None], axis=-2)[..., 0, :]
+    smax = np.take_along_axis(s_row, ismax[..., None], axis=-1)
+    qmax = 0.5*np.sqrt(smax)
+    quat = 0.25*s_row/qmax
+    np.put_along_axis(quat, ismax[..., None], qmax, axis=-1)
+
+    return quat_bound_batch(quat)
+
+
+def crv_bounds_batch(crv_ini):
+    """
+    Batched version of :func:`crv_bounds`.
+
+    Args:
+        crv_ini (np.ndarray): Cartesian rotation vectors ``[..., 3]``
+
+    Returns:
+        np.ndarray: Bounded Cartesian rotation vectors ``[..., 3]``
+    """
+    crv_ini = np.asarray(crv_ini, dtype=float)
+    norm_ini = np.linalg.norm(crv_ini, axis=-1)
+
+    # force the norm to be in [-pi, pi]
+    norm = np.fmod(norm_ini, 2.0*np.pi)
+    norm = np.where(norm > np.pi, norm - 2.0*np.pi, norm)
+
+    return crv_ini * np.where(norm == 0.0, 0.0, norm / np.where(norm_ini == 0.0, 1.0, norm_ini))[..., None]
+
+
+def quat2crv_batch(quat):
+    """
+    Batched version of :func:`quat2crv`.
+
+    Args:
+        quat (np.ndarray): Quaternions ``[..., 4]``
+
+    Returns:
+        np.ndarray: Cartesian rotation vectors ``[..., 3]``
+    """
+    quat = np.asarray(quat, dtype=float)
+    crv_norm = 2.0*np.arccos(np.clip(quat[..., 0], -1.0, 1.0))
+
+    small = np.abs(crv_norm) < 1e-15
+    factor = np.where(small, 0.0, crv_norm / np.where(small, 1.0, np.sin(crv_norm*0.5)))
+    return factor[..., None]*quat[..., 1:4]
+
+
+def crv2quat_batch(psi):
+    """
+    Batched version of :func:`crv2quat`.
+
+    Args:
+        psi (np.ndarray): Cartesian rotation vectors ``[..., 3]``
+
+    Returns:
+        np.ndarray: Equivalent "minimal rotation" quaternions ``[..., 4]``
+    """
+    # minimise crv rotation
+    psi_new = crv_bounds_batch(psi)
+
+    fi = np.linalg.norm(psi_new, axis=-1)
+    nv = psi_new / np.where(fi > 1e-15, fi, 1.0)[..., None]
+
+    quat = np.empty(psi_new.shape[:-1] + (4,))
+    quat[..., 0] = np.cos(.5 * fi)
+    quat[..., 1:] = np.sin(.5 * fi)[..., None] * nv
+    return quat
+
+
+def rotation2crv_batch(Cab):
+    """
+    Batched version of :func:`rotation2crv`.
+
+    Args:
+        Cab (np.ndarray): Rotation matrices ``[..., 3, 3]``
+
+    Returns:
+        np.ndarray: Equivalent minimal size Cartesian rotation vectors ``[..., 3]``
+    """
+    Cab = np.asarray(Cab, dtype=float)
+    if np.any(np.linalg.norm(Cab, axis=(-2, -1)) < 1e-6):
+        raise AttributeError('Element Vector V is not orthogonal to reference line (51105)')
+
+    return crv_bounds_batch(quat2crv_batch(rotation2quat_batch(Cab)))
+
+
+def crv_dot2omega_batch(crv, crv_dot):
+    """
+    Batched version of :func:`crv_dot2omega`.
+    """
+    return np.einsum('...ji,...j->...i', crv2tan_batch(crv), crv_dot)
+
+
+def crv_dot2Omega_batch(crv, crv_dot):
+    """
+    Batched version of :func:`crv_dot2Omega`.
+    """
+    return np.einsum('...ij,...j->...i', crv2tan_batch(crv), crv_dot)
+
+
+def der_CcrvT_by_v_batch(fv0, v):
+    """
+    Batched version of :func:`der_CcrvT_by_v`. The leading dimensions of ``fv0[..., 3]`` and ``v[..., 3]`` are
+    broadcast against each other.
+
+    Returns:
+        np.ndarray: Derivatives of ``dot(C.T, v)`` w.r.t. the CRV ``[..., 3, 3]``
+    """
+    Cba0 = np.swapaxes(crv2rotation_batch(fv0), -1, -2)
+    return skew_batch(np.einsum('...ij,...j->...i', Cba0, v)) @ crv2tan_batch(fv0)
+
+
+def der_Cquat_by_v_batch(q, v):
+    """
+    Batched version of :func:`der_Cquat_by_v`. The leading dimensions of ``q[..., 4]`` and ``v[..., 3]`` are
+    broadcast against each other.
+
+    Returns:
+        np.ndarray: Derivatives of ``dot(C, v)`` w.r.t. the quaternion ``[..., 3, 4]``
+    """
+    q = np.asarray(q, dtype=float)
+    v = np.asarray(v, dtype=float)
+    vx, vy, vz = v[..., 0], v[..., 1], v[..., 2]
+    q0, q1, q2, q3 = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    der = np.stack([
+        np.stack([q0*vx + q2*vz - q3*vy, q1*vx + q2*vy + q3*vz,
+                  q0*vz + q1*vy - q2*vx, -q0*vy + q1*vz - q3*vx], axis=-1),
+        np.stack([q0*vy - q1*vz + q3*vx, -q0*vz - q1*vy + q2*vx,
+                  q1*vx + q2*vy + q3*vz, q0*vx + q2*vz - q3*vy], axis=-1),
+        np.stack([q0*vz + q1*vy - q2*vx, q0*vy - q1*vz + q3*vx,
+                  -q0*vx - q2*vz + q3*vy, q1*vx + q2*vy + q3*vz], axis=-1)], axis=-2)
+    return 2.*der
+
+
+def der_CquatT_by_v_batch(q, v):
+    """
+    Batched version of :func:`der_CquatT_by_v`. The leading dimensions of ``q[..., 4]`` and ``v[..., 3]`` are
+    broadcast against each other.
+
+    Returns:
+        np.ndarray: Derivatives of ``dot(C.T, v)`` w.r.t. the quaternion ``[..., 3, 4]``
+    """
+    q = np.asarray(q, dtype=float)
+    v = np.asarray(v, dtype=float)
+    vx, vy, vz = v[..., 0], v[..., 1], v[..., 2]
+    q0, q1, q2, q3 = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    der = np.stack([
+        np.stack([q0*vx - q2*vz + q3*vy, q1*vx + q2*vy + q3*vz,
+                  -q0*vz + q1*vy - q2*vx, q0*vy + q1*vz - q3*vx], axis=-1),
+        np.stack([q0*vy + q1*vz - q3*vx, q0*vz - q1*vy + q2*vx,
+                  q1*vx + q2*vy + q3*vz, -q0*vx + q2*vz - q3*vy], axis=-1),
+        np.stack([q0*vz - q1*vy + q2*vx, -q0*vy - q1*vz + q3*vx,
+                  q0*vx - q2*vz + q3*vy, q1*vx + q2*vy + q3*vz], axis=-1)], axis=-2)
+    return 2.*der
@@ -0,0 +1,334 @@
+"""Coupling Accelerators
+
+Accelerators for the fixed point iteration of partitioned fluid-structure interaction solvers. Given the current
+iterate :math:`\\mathbf{x}^k` and the output of the fixed point operator :math:`\\tilde{\\mathbf{x}}^k =
+\\mathcal{H}(\\mathbf{x}^k)`, the accelerator returns the input to the next iteration :math:`\\mathbf{x}^{k+1}`.
+The residual is defined as :math:`\\mathbf{r}^k = \\tilde{\\mathbf{x}}^k - \\mathbf{x}^k`.
+
+The accelerators are used by the coupled solvers through the ``coupling_accelerator`` and
+``coupling_accelerator_settings`` settings.
+
+Examples:
+
+    >>> accelerator = initialise_accelerator('Aitken', {'initial_relaxation': 0.5})
+    >>> accelerator.start_step()
+    >>> for k in range(max_iterations):
+    >>>     x_tilde = fixed_point_operator(x)
+    >>>     x = accelerator.update(x, x_tilde)
+    >>> accelerator.end_step()
+
+References:
+
+    Küttler, U. and Wall, W. A.. Fixed-point fluid–structure interaction solvers with dynamic relaxation.
+    Computational Mechanics, 43(1), 61–72. 2008.
+
+    Degroote, J., Bathe, K.-J. and Vierendeels, J.. Performance of a new partitioned procedure versus a monolithic
+    procedure in fluid–structure interaction. Computers & Structures, 87(11-12), 793–801. 2009.
+
+    Haelterman, R., Bogaers, A. E. J., Scheufele, K., Uekermann, B. and Mehl, M.. Improving the performance of the
+    partitioned QN-ILS procedure for fluid–structure interaction problems: Filtering. Computers & Structures, 171,
+    9–17. 2016.
+"""
+from abc import ABCMeta, abstractmethod
+
+import numpy as np
+
+import sharpy.utils.settings as settings
+
+dict_of_accelerators = {}
+
+
+def accelerator(arg):
+    global dict_of_accelerators
+    try:
+        arg.accelerator_id
+    except AttributeError:
+        raise AttributeError('Class defined as accelerator has no accelerator_id attribute')
+    dict_of_accelerators[arg.accelerator_id] = arg
+    return arg
+
+
+def initialise_accelerator(accelerator_id, in_settings=None):
+    """
+    Returns an initialised instance of the accelerator ``accelerator_id``.
+
+    Args:
+        accelerator_id (str): Accelerator name, a key of ``dict_of_accelerators``
+        in_settings (dict): Accelerator settings
+
+    Returns:
+        BaseAccelerator: Initialised accelerator
+    """
+    try:
+        acc = dict_of_accelerators[accelerator_id]()
+    except KeyError:
+        raise KeyError('Coupling accelerator %s not found. Available accelerators: %s' %
+                       (accelerator_id, ', '.join(dict_of_accelerators.keys())))
+    acc.initialise(in_settings if in_settings is not None else dict())
+    return acc
+
+
+class BaseAccelerator(metaclass=ABCMeta):
+
+    accelerator_id = None
+
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+    settings_options = dict()
+
+    settings_types['variable'] = 'str'
+    settings_default['variable'] = 'forces'
+    settings_description['variable'] = 'Interface variable that is accelerated. ``forces`` for the mapped ' \
+                                       'structural forces or ``state`` for the structural state ``q`` and ``dqdt``'
+    settings_options['variable'] = ['forces', 'state']
+
+    settings_types['initial_relaxation'] = 'float'
+    settings_default['initial_relaxation'] = 0.5
+    settings_description['initial_relaxation'] = 'Relaxation factor :math:`\\omega_0` used in the first iteration, ' \
+                                                 'where :math:`\\mathbf{x}^{1} = \\mathbf{x}^0 + \\omega_0 ' \
+                                                 '\\mathbf{r}^0`. Note that, unlike the ``relaxation_factor`` of ' \
+                                                 'the coupled solvers, ``1`` is no relaxation'
+
+    def __init__(self):
+        self.settings = None
+        self.x = None
+        self.x_tilde = None
+        self.residual = None
+        self.iteration = 0
+
+    def initialise(self, in_settings):
+        self.settings = in_settings
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default,
+                                 options=self.settings_options, no_ctype=True)
+
+    def start_step(self):
+        """
+        Resets the iteration counter at the start of a new time step or load step.
+        """
+        self.iteration = 0
+        self.x = None
+        self.x_tilde = None
+        self.residual = None
+
+    def end_step(self):
+        """
+        Called once the fixed point iteration has converged.
+        """
+        pass
+
+    def update(self, x, x_tilde):
+        """
+        Computes the next iterate.
+
+        Args:
+            x (np.ndarray): Current iterate :math:`\\mathbf{x}^k`
+            x_tilde (np.ndarray): Output of the fixed point operator :math:`\\mathcal{H}(\\mathbf{x}^k)`
+
+        Returns:
+            np.ndarray: Next iterate :math:`\\mathbf{x}^{k+1}`
+        """
+        x = np.asarray(x, dtype=float).ravel()
+        x_tilde = np.asarray(x_tilde, dtype=float).ravel()
+        residual = x_tilde - x
+
+        x_new = self.compute_update(x, x_tilde, residual)
+
+        self.x = x
+        self.x_tilde = x_tilde
+        self.residual = residual
+        self.iteration += 1
+        return x_new
+
+    @abstractmethod
+    def compute_update(self, x, x_tilde, residual):
+        pass
+
+
+@accelerator
+class ConstantRelaxation(BaseAccelerator):
+    """
+    Constant under-relaxation :math:`\\mathbf{x}^{k+1} = \\mathbf{x}^k + \\omega_0 \\mathbf{r}^k`.
+    """
+    accelerator_id = 'ConstantRelaxation'
+
+    settings_types = BaseAccelerator.settings_types.copy()
+    settings_default = BaseAccelerator.settings_default.copy()
+    settings_description = BaseAccelerator.settings_description.copy()
+    settings_options = BaseAccelerator.settings_options.copy()
+
+    def compute_update(self, x, x_tilde, residual):
+        return x + self.settings['initial_relaxation']*residual
+
+
+@accelerator
+class Aitken(BaseAccelerator):
+    """
+    Aitken dynamic relaxation.
+
+    The relaxation factor is updated at each iteration as
+
+    .. math:: \\omega^{k} = -\\omega^{k-1}\\frac{(\\mathbf{r}^{k-1})^\\top(\\mathbf{r}^k - \\mathbf{r}^{k-1})}
+        {||\\mathbf{r}^k - \\mathbf{r}^{k-1}||^2}
+
+    and bounded by ``min_relaxation`` and ``max_relaxation``. The first iteration of each step uses the last
+    relaxation factor of the previous step, bounded by ``initial_relaxation``.
+    """
+    accelerator_id = 'Aitken'
+
+    settings_types = BaseAccelerator.settings_types.copy()
+    settings_default = BaseAccelerator.settings_default.copy()
+    settings_description = BaseAccelerator.settings_description.copy()
+    settings_options = BaseAccelerator.settings_options.copy()
+
+    settings_types['min_relaxation'] = 'float'
+    settings_default['min_relaxation'] = 1e-3
+    settings_description['min_relaxation'] = 'Lower bound of the relaxation factor'
+
+    settings_types['max_relaxation'] = 'float'
+    settings_default['max_relaxation'] = 1.
+    settings_description['max_relaxation'] = 'Upper bound of the relaxation factor'
+
+    def __init__(self):
+        super().__init__()
+        self.omega = None
+
+    def start_step(self):
+        super().start_step()
+        if self.omega is None:
+            self.omega = self.settings['initial_relaxation']
+        else:
+            self.omega = min(self.omega, self.settings['initial_relaxation'])
+
+    def compute_update(self, x, x_tilde, residual):
+        if self.omega is None:
+            self.omega = self.settings['initial_relaxation']
+
+        if self.residual is not None:
+            delta_residual = residual - self.residual
+            denominator = np.dot(delta_residual, delta_residual)
+            if denominator > 0.:
+                self.omega = -self.omega*np.dot(self.residual, delta_residual)/denominator
+                self.omega = min(max(self.omega, self.settings['min_relaxation']), self.settings['max_relaxation'])
+
+        return x + self.omega*residual
+
+
+@accelerator
+class IQNILS(BaseAccelerator):
+    """
+    Interface quasi-Newton with an approximation for the inverse of the Jacobian from a least-squares model
+    (IQN-ILS).
+
+    Secant information from the current and, optionally, the ``reuse_steps`` previous steps is stored in the
+    matrices of residual differences :math:`\\mathbf{V}` and output differences :math:`\\mathbf{W}`. The next
+    iterate is
+
+    .. math:: \\mathbf{x}^{k+1} = \\tilde{\\mathbf{x}}^k + \\mathbf{W}\\mathbf{c}, \\quad
+        \\mathbf{c} = \\arg\\min ||\\mathbf{V}\\mathbf{c} + \\mathbf{r}^k||
+
+    Linearly dependent columns are removed with a QR filter. When no secant information is available, constant
+    relaxation with ``initial_relaxation`` is used.
+
+    Setting ``reuse_steps = 0`` makes this equivalent to Anderson acceleration restarted at each step.
+    """
+    accelerator_id = 'IQNILS'
+
+    settings_types = BaseAccelerator.settings_types.copy()
+    settings_default = BaseAccelerator.settings_default.copy()
+    settings_description = BaseAccelerator.settings_description.copy()
+    settings_options = BaseAccelerator.settings_options.copy()
+
+    settings_types['reuse_steps'] = 'int'
+    settings_default['reuse_steps'] = 8
+    settings_description['reuse_steps'] = 'Number of previous steps whose secant information is reused'
+
+    settings_types['max_columns'] = 'int'
+    settings_default['max_columns'] = 100
+    settings_description['max_columns'] = 'Maximum number of secant pairs kept, the oldest are dropped first'
+
+    settings_types['filter_tolerance'] = 'float'
+    settings_default['filter_tolerance'] = 1e-8
+    settings_description['filter_tolerance'] = 'Columns whose QR diagonal is below ``filter_tolerance`` times the ' \
+                                               'norm of the residual differences are discarded'
+
+    def __init__(self):
+        super().__init__()
+        self.delta_residuals = []
+        self.delta_outputs = []
+        self.previous_steps = []
+
+    def start_step(self):
+        super().start_step()
+        self.delta_residuals = []
+        self.delta_outputs = []
+
+    def end_step(self):
+        if self.settings['reuse_steps'] > 0 and self.delta_residuals:
+            self.previous_steps.insert(0, (self.delta_residuals, self.delta_outputs))
+        del self.previous_steps[self.settings['reuse_steps']:]
+
+    def secant_columns(self):
+        """
+        Returns the residual and output difference columns, newest first.
+        """
+        delta_residuals = self.delta_residuals[::-1]
+        delta_outputs = self.delta_outputs[::-1]
+        for previous_residuals, previous_outputs in self.previous_steps:
+            delta_residuals = delta_residuals + previous_residuals[::-1]
+            delta_outputs = delta_outputs + previous_outputs[::-1]
+        n_columns = self.settings['max_columns']
+        return delta_residuals[:n_columns], delta_outputs[:n_columns]
+
+    def filter_columns(self, delta_residuals, delta_outputs):
+        """
+        QR filter: removes columns that are close to being linearly dependent on the (newer) preceding ones.
+        """
+        tolerance = self.settings['filter_tolerance']
+        while delta_residuals:
+            V = np.column_stack(delta_residuals)
+            R = np.linalg.qr(V, mode='r')
+            diagonal = np.abs(np.diag(R))
+            dependent = np.where(diagonal < tolerance*np.linalg.norm(V))[0]
+            if len(dependent) == 0:
+                break
+            i_remove = dependent[0]
+            del delta_residuals[i_remove]
+            del delta_outputs[i_remove]
+        return delta_residuals, delta_outputs
+
+    def compute_update(self, x, x_tilde, residual):
+        if self.residual is not None:
+            if self.residual.shape != residual.shape:
+                self.delta_residuals = []
+                self.delta_outputs = []
+                self.previous_steps = []
+            else:
+                self.delta_residuals.append(residual - self.residual)
+                self.delta_outputs.append(x_tilde - self.x_tilde)
+        elif self.previous_steps and self.previous_steps[0][0][0].shape != residual.shape:
+            self.previous_steps = []
+
+        delta_residuals, delta_outputs = self.filter_columns(*self.secant_columns())
+        if not delta_residuals:
+            return x + self.settings['initial_relaxation']*residual
+
+        V = np.column_stack(delta_residuals)
+        W = np.column_stack(delta_outputs)
+        c = np.linalg.lstsq(V, -residual, rcond=None)[0]
+        return x_tilde + W.dot(c)
+
+
+@accelerator
+class Anderson(IQNILS):
+    """
+    Anderson acceleration, equivalent to :class:`IQNILS` without reuse of the secant information of previous steps.
+    """
+    accelerator_id = 'Anderson'
+
+    settings_types = IQNILS.settings_types.copy()
+    settings_default = IQNILS.settings_default.copy()
+    settings_description = IQNILS.settings_description.copy()
+    settings_options = IQNILS.settings_options.copy()
+
+    settings_default['reuse_steps'] = 0
@@ -482,6 +482,9 @@ class StructTimeStepInfo(object):
         num_elem (int): Number of elements
         num_node_elem (int): Number of nodes per element
 
+        t (float): Time at the end of the time step
+        dt (float): Time step that led to this step. ``0`` for the initial state
+
         pos (np.ndarray): Displacements. ``[num_node x 3]`` containing the vector of ``x``, ``y`` and ``z``
           coordinates (in ``A`` frame) of the beam nodes.
         pos_dot (np.ndarray): Velocities. Time derivative of ``pos``.
@@ -532,6 +535,8 @@ class StructTimeStepInfo(object):
         self.num_node = num_node
         self.num_elem = num_elem
         self.num_node_elem = num_node_elem
+        self.t = 0.
+        self.dt = 0.
         # generate placeholder for node coordinates
         self.pos = np.zeros((self.num_node, 3), dtype=ct.c_double, order='F')
         self.pos_dot = np.zeros((self.num_node, 3), dtype=ct.c_double, order='F')
@@ -586,6 +591,8 @@ class StructTimeStepInfo(object):
         copied.num_node = self.num_node
         copied.num_elem = self.num_elem
         copied.num_node_elem = self.num_node_elem
+        copied.t = self.t
+        copied.dt = self.dt
 
         # generate placeholder for node coordinates
         copied.pos = self.pos.astype(dtype=ct.c_double, order='F', copy=True)
@@ -738,38 +745,8 @@ class StructTimeStepInfo(object):
             for0_vel (np.ndarray): Velocity of the global A FoR
             quat0 (np.ndarray): Quaternion of the global A FoR
         """
-
-        # Define the rotation matrices between the different FoR
-        CAslaveG = algebra.quat2rotation(self.quat).T
-        CGAmaster = algebra.quat2rotation(quat0)
-        Csm = np.dot(CAslaveG, CGAmaster)
-
-        delta_vel_ms = np.zeros((6,))
-        delta_pos_ms = self.for_pos[0:3] - for0_pos[0:3]
-        delta_vel_ms[0:3] = np.dot(CAslaveG.T, self.for_vel[0:3]) - np.dot(CGAmaster, for0_vel[0:3])
-        delta_vel_ms[3:6] = np.dot(CAslaveG.T, self.for_vel[3:6]) - np.dot(CGAmaster, for0_vel[3:6])
-
-        # Modify position
-        for inode in range(self.pos.shape[0]):
-            pos_previous = self.pos[inode,:] + np.zeros((3,),)
-            self.pos[inode,:] = np.dot(Csm,self.pos[inode,:]) - np.dot(CAslaveG,delta_pos_ms[0:3])
-            # self.pos_dot[inode,:] = np.dot(Csm,self.pos_dot[inode,:]) - np.dot(CAslaveG,delta_vel_ms[0:3])
-            self.pos_dot[inode,:] = (np.dot(Csm, self.pos_dot[inode,:]) -
-                                    np.dot(CAslaveG, delta_vel_ms[0:3]) -
-                                    np.dot(algebra.skew(np.dot( CAslaveG, self.for_vel[3:6])), self.pos[inode,:]) +
-                                    np.dot(Csm, np.dot(algebra.skew(np.dot(CGAmaster.T, for0_vel[3:6])), pos_previous)))
-
-            self.gravity_forces[inode,0:3] = np.dot(Csm, self.gravity_forces[inode,0:3])
-            self.gravity_forces[inode,3:6] = np.dot(Csm, self.gravity_forces[inode,3:6])
-
-        # Modify local rotations
-        for ielem in range(self.psi.shape[0]):
-            for inode in range(3):
-                psi_previous = self.psi[ielem,inode,:] + np.zeros((3,),)
-                self.psi[ielem,inode,:] = algebra.rotation2crv(np.dot(Csm,algebra.crv2rotation(self.psi[ielem,inode,:])))
-                self.psi_dot[ielem, inode, :] = np.dot(np.dot(algebra.crv2tan(self.psi[ielem,inode,:]),Csm),
-                                                    (np.dot(algebra.crv2tan(psi_previous).T,self.psi_dot[ielem,inode,:]) - np.dot(CGAmaster.T,delta_vel_ms[3:6])))
-
+        self._to_local_AFoR(slice(None), slice(None), self.quat, self.for_pos, self.for_vel,
+                            for0_pos, for0_vel, quat0)
 
     def change_to_global_AFoR(self, for0_pos, for0_vel, quat0):
         """
@@ -780,42 +757,88 @@ class StructTimeStepInfo(object):
             for0_vel (np.ndarray): Velocity of the global A FoR
             quat0 (np.ndarray): Quaternion of the global A FoR
         """
+        self._to_global_AFoR(slice(None), slice(None), self.quat, self.for_pos, self.for_vel,
+                             for0_pos, for0_vel, quat0)
 
+    def _to_local_AFoR(self, nodes, elems, quat, for_pos, for_vel, for0_pos, for0_vel, quat0):
+        """
+        Changes the variables of the nodes and elements selected by ``nodes`` and ``elems`` (indices, masks or slices)
+        from the global A FoR to the local A FoR defined by ``quat``, ``for_pos`` and ``for_vel``.
+        """
         # Define the rotation matrices between the different FoR
-        CAslaveG = algebra.quat2rotation(self.quat).T
+        CAslaveG = algebra.quat2rotation(quat).T
         CGAmaster = algebra.quat2rotation(quat0)
         Csm = np.dot(CAslaveG, CGAmaster)
 
         delta_vel_ms = np.zeros((6,))
-        delta_pos_ms = self.for_pos[0:3] - for0_pos[0:3]
-        delta_vel_ms[0:3] = np.dot(CAslaveG.T, self.for_vel[0:3]) - np.dot(CGAmaster, for0_vel[0:3])
-        delta_vel_ms[3:6] = np.dot(CAslaveG.T, self.for_vel[3:6]) - np.dot(CGAmaster, for0_vel[3:6])
-
-        for inode in range(self.pos.shape[0]):
-            pos_previous = self.pos[inode,:] + np.zeros((3,),)
-            self.pos[inode,:] = (np.dot(np.transpose(Csm),self.pos[inode,:]) +
-                                np.dot(np.transpose(CGAmaster),delta_pos_ms[0:3]))
-            self.pos_dot[inode,:] = (np.dot(np.transpose(Csm),self.pos_dot[inode,:]) +
-                                    np.dot(np.transpose(CGAmaster),delta_vel_ms[0:3]) +
-                                    np.dot(Csm.T, np.dot(algebra.skew(np.dot(CAslaveG, self.for_vel[3:6])), pos_previous)) -
-                                    np.dot(algebra.skew(np.dot(CGAmaster.T, for0_vel[3:6])), self.pos[inode,:]))
-            self.gravity_forces[inode,0:3] = np.dot(Csm.T, self.gravity_forces[inode,0:3])
-            self.gravity_forces[inode,3:6] = np.dot(Csm.T, self.gravity_forces[inode,3:6])
-                                    # np.cross(np.dot(CGAmaster.T, delta_vel_ms[3:6]), pos_previous))
-
-        for ielem in range(self.psi.shape[0]):
-            for inode in range(3):
-                psi_previous = self.psi[ielem,inode,:] + np.zeros((3,),)
-                self.psi[ielem,inode,:] = algebra.rotation2crv(np.dot(Csm.T, algebra.crv2rotation(self.psi[ielem,inode,:])))
-                self.psi_dot[ielem, inode, :] = np.dot(algebra.crv2tan(self.psi[ielem,inode,:]),
-                                                (np.dot(Csm.T, np.dot(algebra.crv2tan(psi_previous).T, self.psi_dot[ielem, inode, :])) +
-                                                np.dot(algebra.quat2rotation(quat0).T, delta_vel_ms[3:6])))
+        delta_pos_ms = for_pos[0:3] - for0_pos[0:3]
+        delta_vel_ms[0:3] = np.dot(CAslaveG.T, for_vel[0:3]) - np.dot(CGAmaster, for0_vel[0:3])
+        delta_vel_ms[3:6] = np.dot(CAslaveG.T, for_vel[3:6]) - np.dot(CGAmaster, for0_vel[3:6])
 
+        # Modify position
+        pos_previous = self.pos[nodes, :]
+        pos = np.dot(pos_previous, Csm.T) - np.dot(CAslaveG, delta_pos_ms[0:3])
+        pos_dot = (np.dot(self.pos_dot[nodes, :], Csm.T) -
+                   np.dot(CAslaveG, delta_vel_ms[0:3]) -
+                   algebra.cross3_batch(np.dot(CAslaveG, for_vel[3:6]), pos) +
+                   np.dot(algebra.cross3_batch(np.dot(CGAmaster.T, for0_vel[3:6]), pos_previous), Csm.T))
+        gravity_forces = np.dot(self.gravity_forces[nodes, :].reshape(-1, 2, 3), Csm.T).reshape(-1, 6)
+
+        # Modify local rotations
+        psi_previous = self.psi[elems, :, :]
+        psi = algebra.rotation2crv_batch(np.matmul(Csm, algebra.crv2rotation_batch(psi_previous)))
+        omega = (algebra.crv_dot2omega_batch(psi_previous, self.psi_dot[elems, :, :]) -
+                 np.dot(CGAmaster.T, delta_vel_ms[3:6]))
+        psi_dot = np.einsum('...ij,...j->...i', np.matmul(algebra.crv2tan_batch(psi), Csm), omega)
+
+        self.pos[nodes, :] = pos
+        self.pos_dot[nodes, :] = pos_dot
+        self.gravity_forces[nodes, :] = gravity_forces
+        self.psi[elems, :, :] = psi
+        self.psi_dot[elems, :, :] = psi_dot
+
+    def _to_global_AFoR(self, nodes, elems, quat, for_pos, for_vel, for0_pos, for0_vel, quat0):
+        """
+        Changes the variables of the nodes and elements selected by ``nodes`` and ``elems`` (indices, masks or slices)
+        from the local A FoR defined by ``quat``, ``for_pos`` and ``for_vel`` to the global A FoR.
+        """
+        # Define the rotation matrices between the different FoR
+        CAslaveG = algebra.quat2rotation(quat).T
+        CGAmaster = algebra.quat2rotation(quat0)
+        Csm = np.dot(CAslaveG, CGAmaster)
+
+        delta_vel_ms = np.zeros((6,))
+        delta_pos_ms = for_pos[0:3] - for0_pos[0:3]
+        delta_vel_ms[0:3] = np.dot(CAslaveG.T, for_vel[0:3]) - np.dot(CGAmaster, for0_vel[0:3])
+        delta_vel_ms[3:6] = np.dot(CAslaveG.T, for_vel[3:6]) - np.dot(CGAmaster, for0_vel[3:6])
+
+        pos_previous = self.pos[nodes, :]
+        pos = np.dot(pos_previous, Csm) + np.dot(CGAmaster.T, delta_pos_ms[0:3])
+        pos_dot = (np.dot(self.pos_dot[nodes, :], Csm) +
+                   np.dot(CGAmaster.T, delta_vel_ms[0:3]) +
+                   np.dot(algebra.cross3_batch(np.dot(CAslaveG, for_vel[3:6]), pos_previous), Csm) -
+                   algebra.cross3_batch(np.dot(CGAmaster.T, for0_vel[3:6]), pos))
+        gravity_forces = np.dot(self.gravity_forces[nodes, :].reshape(-1, 2, 3), Csm).reshape(-1, 6)
+
+        psi_previous = self.psi[elems, :, :]
+        psi = algebra.rotation2crv_batch(np.matmul(Csm.T, algebra.crv2rotation_batch(psi_previous)))
+        omega = (np.dot(algebra.crv_dot2omega_batch(psi_previous, self.psi_dot[elems, :, :]), Csm) +
+                 np.dot(CGAmaster.T, delta_vel_ms[3:6]))
+        psi_dot = algebra.crv_dot2Omega_batch(psi, omega)
+
+        self.pos[nodes, :] = pos
+        self.pos_dot[nodes, :] = pos_dot
+        self.gravity_forces[nodes, :] = gravity_forces
+        self.psi[elems, :, :] = psi
+        self.psi_dot[elems, :, :] = psi_dot
 
     def whole_structure_to_local_AFoR(self, beam):
         """
         Same as change_to_local_AFoR but for a multibody structure
 
+        The nodes and elements of each body are selected through the masks of
+        :meth:`~sharpy.structure.models.beam.Beam.generate_body_masks`.
+
         Args:
             beam(sharpy.structure.models.beam.Beam): Beam structure of ``PreSharpy``
         """
@@ -827,27 +850,13 @@ class StructTimeStepInfo(object):
         for0_pos = self.for_pos.astype(dtype=ct.c_double, order='F', copy=True)
         for0_vel = self.for_vel.astype(dtype=ct.c_double, order='F', copy=True)
 
-        MB_beam = [None]*beam.num_bodies
-        MB_tstep = [None]*beam.num_bodies
+        if beam.body_nodes_mask is None:
+            beam.generate_body_masks()
 
         for ibody in range(beam.num_bodies):
-            MB_beam[ibody] = beam.get_body(ibody = ibody)
-            MB_tstep[ibody] = self.get_body(beam, MB_beam[ibody].num_dof, ibody = ibody)
-            MB_tstep[ibody].change_to_local_AFoR(for0_pos, for0_vel, quat0)
-
-        first_dof = 0
-        for ibody in range(beam.num_bodies):
-            # Renaming for clarity
-            ibody_elems = MB_beam[ibody].global_elems_num
-            ibody_nodes = MB_beam[ibody].global_nodes_num
-
-            # Merge tstep
-            self.pos[ibody_nodes,:] = MB_tstep[ibody].pos.astype(dtype=ct.c_double, order='F', copy=True)
-            self.psi[ibody_elems,:,:] = MB_tstep[ibody].psi.astype(dtype=ct.c_double, order='F', copy=True)
-            self.gravity_forces[ibody_nodes,:] = MB_tstep[ibody].gravity_forces.astype(dtype=ct.c_double, order='F', copy=True)
-
-            self.pos_dot[ibody_nodes,:] = MB_tstep[ibody].pos_dot.astype(dtype=ct.c_double, order='F', copy=True)
-            self.psi_dot[ibody_elems,:,:] = MB_tstep[ibody].psi_dot.astype(dtype=ct.c_double, order='F', copy=True)
+            self._to_local_AFoR(beam.body_nodes_mask[ibody], beam.body_elems_mask[ibody],
+                                self.mb_quat[ibody, :], self.mb_FoR_pos[ibody, :], self.mb_FoR_vel[ibody, :],
+                                for0_pos, for0_vel, quat0)
 
             # TODO: Do I need a change in FoR for the following variables? Maybe for the FoR ones.
             # tstep.forces_constraints_nodes[ibody_nodes,:] = MB_tstep[ibody].forces_constraints_nodes.astype(dtype=ct.c_double, order='F', copy=True)
@@ -857,6 +866,9 @@ class StructTimeStepInfo(object):
         """
         Same as change_to_global_AFoR but for a multibody structure
 
+        The nodes and elements of each body are selected through the masks of
+        :meth:`~sharpy.structure.models.beam.Beam.generate_body_masks`.
+
         Args:
             beam(sharpy.structure.models.beam.Beam): Beam structure of ``PreSharpy``
         """
@@ -864,34 +876,17 @@ class StructTimeStepInfo(object):
             raise NotImplementedError("Wrong managing of FoR")
 
         self.in_global_AFoR = True
-
-        MB_beam = [None]*beam.num_bodies
-        MB_tstep = [None]*beam.num_bodies
         quat0 = self.quat.astype(dtype=ct.c_double, order='F', copy=True)
         for0_pos = self.for_pos.astype(dtype=ct.c_double, order='F', copy=True)
         for0_vel = self.for_vel.astype(dtype=ct.c_double, order='F', copy=True)
 
-        for ibody in range(beam.num_bodies):
-            MB_beam[ibody] = beam.get_body(ibody = ibody)
-            MB_tstep[ibody] = self.get_body(beam, MB_beam[ibody].num_dof, ibody = ibody)
-            MB_tstep[ibody].change_to_global_AFoR(for0_pos, for0_vel, quat0)
-
+        if beam.body_nodes_mask is None:
+            beam.generate_body_masks()
 
-        first_dof = 0
         for ibody in range(beam.num_bodies):
-            # Renaming for clarity
-            ibody_elems = MB_beam[ibody].global_elems_num
-            ibody_nodes = MB_beam[ibody].global_nodes_num
-
-            # Merge tstep
-            self.pos[ibody_nodes,:] = MB_tstep[ibody].pos.astype(dtype=ct.c_double, order='F', copy=True)
-            # tstep.pos_dot[ibody_nodes,:] = MB_tstep[ibody].pos_dot.astype(dtype=ct.c_double, order='F', copy=True)
-            self.psi[ibody_elems,:,:] = MB_tstep[ibody].psi.astype(dtype=ct.c_double, order='F', copy=True)
-            self.gravity_forces[ibody_nodes,:] = MB_tstep[ibody].gravity_forces.astype(dtype=ct.c_double, order='F',
-                                                                                       copy=True)
-            
-            self.pos_dot[ibody_nodes,:] = MB_tstep[ibody].pos_dot.astype(dtype=ct.c_double, order='F', copy=True)
-            self.psi_dot[ibody_elems,:,:] = MB_tstep[ibody].psi_dot.astype(dtype=ct.c_double, order='F', copy=True)
+            self._to_global_AFoR(beam.body_nodes_mask[ibody], beam.body_elems_mask[ibody],
+                                 self.mb_quat[ibody, :], self.mb_FoR_pos[ibody, :], self.mb_FoR_vel[ibody, :],
+                                 for0_pos, for0_vel, quat0)
 
 
 class LinearTimeStepInfo(object):
@@ -413,3 +413,25 @@ def save_list_as_array(list_obj, grp_target, compress_float=False):
 
                 return True
     return False
+
+
+def append_arrays(handle, arrays):
+    """
+    Appends arrays along their first dimension to the datasets of the same name in ``handle``.
+
+    Datasets that do not exist yet are created resizable along the first dimension, such that results can be written
+    in blocks (e.g. one time step at a time) as they are produced.
+
+    Args:
+        handle (h5py.Group): Open file or group
+        arrays (dict): Arrays to append, with the dataset names as keys
+    """
+    for name, value in arrays.items():
+        value = np.asarray(value)
+        if name not in handle:
+            handle.create_dataset(name, data=value, maxshape=(None,) + value.shape[1:], chunks=True)
+        else:
+            dataset = handle[name]
+            n_entries = dataset.shape[0]
+            dataset.resize(n_entries + value.shape[0], axis=0)
+            dataset[n_entries:] = value
@@ -0,0 +1,384 @@
+"""Run Instrumentation
+
+Lightweight recording of wall time, call counts, FSI iterations and bytes written throughout a SHARPy run.
+
+The module holds a single :class:`Timeline` instance, ``timeline``, shared by all solvers in the same way as
+:data:`sharpy.utils.cout_utils.cout_wrap`. Solvers wrap the relevant phases of their execution in
+``timeline.phase(name)`` blocks. When the instrumentation is not enabled these blocks are no-ops.
+
+The instrumentation is enabled through the ``instrumentation`` setting in the ``SHARPy`` header of the case file
+(see :class:`~sharpy.presharpy.presharpy.PreSharpy`) and its settings are given in ``instrumentation_settings``.
+"""
+import contextlib
+import cProfile
+import collections
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.settings as settings
+
+
+class Timeline(object):
+    """
+    Records the time spent and the number of calls to each instrumented phase, together with any counters, both
+    for the whole run and for every time step.
+
+    At the end of the run, the results are written to ``<output_folder>/<folder>/timeline.json`` and a per time step
+    summary to ``timeline.csv``.
+
+    Profiling of a range of time steps (both ends included) can be requested with ``profile_steps``. The
+    ``cProfile`` method writes a ``.prof`` file that can be inspected with ``pstats`` or ``snakeviz``, whereas the
+    ``sampling`` method records the stack of the profiled thread every ``sampling_interval`` seconds and writes the
+    most common stacks to a text file. The latter has a lower overhead for long profiled ranges.
+    """
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+    settings_options = dict()
+
+    settings_types['folder'] = 'str'
+    settings_default['folder'] = 'instrumentation'
+    settings_description['folder'] = 'Name of the folder, inside the case output folder, where results are written'
+
+    settings_types['write_json'] = 'bool'
+    settings_default['write_json'] = True
+    settings_description['write_json'] = 'Write ``timeline.json`` with run totals and per time step records'
+
+    settings_types['write_csv'] = 'bool'
+    settings_default['write_csv'] = True
+    settings_description['write_csv'] = 'Write ``timeline.csv`` with one row per time step'
+
+    settings_types['profile_steps'] = 'list(int)'
+    settings_default['profile_steps'] = []
+    settings_description['profile_steps'] = 'First and last time steps to profile. Empty for no profiling'
+
+    settings_types['profile_method'] = 'str'
+    settings_default['profile_method'] = 'cProfile'
+    settings_description['profile_method'] = 'Profiler to use in ``profile_steps``'
+    settings_options['profile_method'] = ['cProfile', 'sampling']
+
+    settings_types['sampling_interval'] = 'float'
+    settings_default['sampling_interval'] = 1e-3
+    settings_description['sampling_interval'] = 'Time between stack samples for the ``sampling`` profiler'
+
+    settings_table = settings.SettingsTable()
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options,
+                                       header_line='The instrumentation takes the following settings:')
+
+    def __init__(self):
+        self.enabled = False
+        self.settings = None
+        self.folder = None
+
+        self._lock = threading.RLock()
+        self._null_phase = contextlib.nullcontext()
+
+        self.t0 = 0.
+        self.totals = None
+        self.counters = None
+        self.bytes_written = None
+
+        self.steps = []
+        self.current_step = None
+
+        self.profiler = None
+
+    def initialise(self, in_settings=None, output_folder='./'):
+        """
+        Enables the instrumentation and resets any previous record.
+
+        Args:
+            in_settings (dict): Instrumentation settings
+            output_folder (str): Case output folder
+        """
+        if in_settings is None:
+            in_settings = dict()
+        self.settings = in_settings
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default,
+                                 options=self.settings_options)
+
+        self.folder = output_folder + '/' + self.settings['folder'] + '/'
+        self.reset()
+        self.enabled = True
+
+    def reset(self):
+        self.t0 = time.perf_counter()
+        self.totals = collections.OrderedDict()
+        self.counters = collections.OrderedDict()
+        self.bytes_written = collections.OrderedDict()
+        self.steps = []
+        self.current_step = None
+        self.profiler = None
+
+    def phase(self, name):
+        """
+        Context manager that times the enclosed block under the phase ``name``.
+
+        Nested phases are timed independently, hence phase times are inclusive of the phases they contain.
+
+        Args:
+            name (str): Phase name. Use ``Solver.method`` or ``category:id`` for clarity in the output.
+        """
+        if not self.enabled:
+            return self._null_phase
+        return self._timed_phase(name)
+
+    @contextlib.contextmanager
+    def _timed_phase(self, name):
+        t_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t_start)
+
+    def add_time(self, name, elapsed, calls=1):
+        """
+        Adds ``elapsed`` seconds and ``calls`` calls to the phase ``name``.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            _accumulate_phase(self.totals, name, elapsed, calls)
+            if self.current_step is not None:
+                _accumulate_phase(self.current_step['phases'], name, elapsed, calls)
+
+    def count(self, name, increment=1):
+        """
+        Increments the counter ``name`` by ``increment`` for the run and the current time step.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + increment
+            if self.current_step is not None:
+                self.current_step['counters'][name] = self.current_step['counters'].get(name, 0) + increment
+
+    def add_bytes(self, name, n_bytes):
+        """
+        Records ``n_bytes`` written by ``name``.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.bytes_written[name] = self.bytes_written.get(name, 0) + n_bytes
+            if self.current_step is not None:
+                self.current_step['bytes_written'] += n_bytes
+
+    def written(self, name, filename):
+        """
+        Records the size of the file ``filename`` as bytes written by ``name``.
+        """
+        if not self.enabled:
+            return
+        try:
+            self.add_bytes(name, os.path.getsize(filename))
+        except OSError:
+            pass
+
+    def start_step(self, ts, t=None):
+        """
+        Opens the record of time step ``ts``. Starts the profiler if ``ts`` is the first step of ``profile_steps``.
+
+        Args:
+            ts (int): Time step number
+            t (float (optional)): Simulation time
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.current_step = {'ts': int(ts),
+                                 't': None if t is None else float(t),
+                                 'start': time.perf_counter() - self.t0,
+                                 'wall_time': 0.,
+                                 'fsi_iterations': None,
+                                 'bytes_written': 0,
+                                 'phases': collections.OrderedDict(),
+                                 'counters': collections.OrderedDict()}
+
+        if len(self.settings['profile_steps']) > 0 and ts == self.settings['profile_steps'][0]:
+            self.start_profiler()
+
+    def end_step(self, fsi_iterations=None):
+        """
+        Closes the record of the current time step.
+
+        Args:
+            fsi_iterations (int (optional)): Number of FSI iterations taken in the time step
+        """
+        if not self.enabled or self.current_step is None:
+            return
+        with self._lock:
+            step = self.current_step
+            step['wall_time'] = time.perf_counter() - self.t0 - step['start']
+            if fsi_iterations is not None:
+                fsi_iterations = int(fsi_iterations)
+                self.counters['fsi_iterations'] = self.counters.get('fsi_iterations', 0) + fsi_iterations
+            step['fsi_iterations'] = fsi_iterations
+            self.steps.append(step)
+            self.current_step = None
+
+        if self.profiler is not None and step['ts'] >= self.settings['profile_steps'][-1]:
+            self.stop_profiler()
+
+    def start_profiler(self):
+        if self.settings['profile_method'] == 'cProfile':
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.profiler = SamplingProfiler(self.settings['sampling_interval'])
+            self.profiler.start()
+
+    def stop_profiler(self):
+        if self.profiler is None:
+            return
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+        steps = '%g-%g' % (self.settings['profile_steps'][0], self.settings['profile_steps'][-1])
+        if self.settings['profile_method'] == 'cProfile':
+            self.profiler.disable()
+            filename = self.folder + 'profile_ts%s.prof' % steps
+            self.profiler.dump_stats(filename)
+        else:
+            self.profiler.stop()
+            filename = self.folder + 'profile_ts%s.txt' % steps
+            self.profiler.write(filename)
+        cout.cout_wrap('Profile of time steps %s written to %s' % (steps, filename), 1)
+        self.profiler = None
+
+    def summary(self):
+        """
+        Returns:
+            dict: Run totals and per time step records
+        """
+        with self._lock:
+            return {'wall_time': time.perf_counter() - self.t0,
+                    'phases': self.totals,
+                    'counters': self.counters,
+                    'bytes_written': self.bytes_written,
+                    'steps': self.steps}
+
+    def finish(self):
+        """
+        Stops any running profiler and writes the results. The instrumentation is disabled afterwards.
+        """
+        if not self.enabled:
+            return
+        self.stop_profiler()
+
+        if self.settings['write_json'] or self.settings['write_csv']:
+            if not os.path.isdir(self.folder):
+                os.makedirs(self.folder)
+
+        summary = self.summary()
+        if self.settings['write_json']:
+            with open(self.folder + 'timeline.json', 'w') as outfile:
+                json.dump(summary, outfile, indent=1)
+
+        if self.settings['write_csv']:
+            self.write_csv(self.folder + 'timeline.csv')
+
+        if self.settings['write_json'] or self.settings['write_csv']:
+            cout.cout_wrap('Instrumentation output written to %s' % self.folder, 1)
+        self.enabled = False
+
+    def write_csv(self, filename):
+        phase_names = []
+        counter_names = []
+        for step in self.steps:
+            phase_names += [name for name in step['phases'] if name not in phase_names]
+            counter_names += [name for name in step['counters'] if name not in counter_names]
+
+        header = ['ts', 't', 'wall_time', 'fsi_iterations', 'bytes_written']
+        header += ['time:' + name for name in phase_names]
+        header += ['calls:' + name for name in phase_names]
+        header += counter_names
+        with open(filename, 'w', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(header)
+            for step in self.steps:
+                row = [step['ts'], step['t'], step['wall_time'], step['fsi_iterations'], step['bytes_written']]
+                row += [step['phases'].get(name, {'time': 0.})['time'] for name in phase_names]
+                row += [step['phases'].get(name, {'calls': 0})['calls'] for name in phase_names]
+                row += [step['counters'].get(name, 0) for name in counter_names]
+                writer.writerow(row)
+
+
+class SamplingProfiler(object):
+    """
+    Statistical profiler that samples the call stack of the thread that created it at a fixed interval.
+
+    Args:
+        interval (float): Time between samples in seconds
+        max_depth (int): Maximum number of frames recorded per sample
+    """
+    def __init__(self, interval=1e-3, max_depth=30):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.thread_id = threading.get_ident()
+        self.samples = collections.Counter()
+        self.n_samples = 0
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append('%s:%d(%s)' % (code.co_filename, frame.f_lineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(stack)] += 1
+                self.n_samples += 1
+
+    def leaf_counts(self):
+        """
+        Returns:
+            collections.Counter: Number of samples in which each function was at the top of the stack
+        """
+        leaves = collections.Counter()
+        for stack, count in self.samples.items():
+            leaves[stack[0]] += count
+        return leaves
+
+    def write(self, filename, n_entries=50):
+        with open(filename, 'w') as outfile:
+            outfile.write('Samples: %g, interval: %g s\n\n' % (self.n_samples, self.interval))
+            outfile.write('Top functions (self samples)\n')
+            for leaf, count in self.leaf_counts().most_common(n_entries):
+                outfile.write('%8d %6.2f%% %s\n' % (count, 100*count/max(self.n_samples, 1), leaf))
+            outfile.write('\nTop stacks\n')
+            for stack, count in self.samples.most_common(n_entries):
+                outfile.write('%8d %6.2f%%\n' % (count, 100*count/max(self.n_samples, 1)))
+                for frame in stack:
+                    outfile.write('\t' + frame + '\n')
+
+
+def _accumulate_phase(record, name, elapsed, calls):
+    try:
+        entry = record[name]
+    except KeyError:
+        entry = record[name] = {'time': 0., 'calls': 0}
+    entry['time'] += elapsed
+    entry['calls'] += calls
+
+
+timeline = Timeline()
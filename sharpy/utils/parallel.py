@@ -0,0 +1,132 @@
+"""Process Parallelisation Utilities
+
+Evaluation of independent tasks in worker processes forked from the current process, such that the workers start
+with a copy-on-write copy of the whole state of SHARPy (including the compiled libraries data) and only the task
+arguments and results need to be transferred.
+
+Note:
+    Forking a process that has already run multithreaded OpenMP regions may deadlock the workers with some OpenMP
+    runtimes. In such cases, run SHARPy with ``OMP_NUM_THREADS=1`` when using process parallelisation.
+"""
+import multiprocessing
+import os
+
+import numpy as np
+
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.instrumentation as instrumentation
+
+_forked_function = None
+_forked_arguments = None
+
+
+def fork_available():
+    """
+    Returns ``True`` if worker processes can be created with ``fork`` in this platform.
+    """
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def get_num_processes(num_processes=None):
+    """
+    Returns the number of processes to use: ``num_processes`` if it is a positive integer, else the number of CPUs.
+    """
+    if num_processes is None or num_processes < 1:
+        return os.cpu_count() or 1
+    return num_processes
+
+
+def _quiet_worker():
+    cout.cout_wrap.cout_quiet()
+    cout.cout_wrap.print_file = False
+
+
+def _call_forked(i_task):
+    return _forked_function(*_forked_arguments[i_task])
+
+
+def fork_map(function, arguments, num_processes=None, quiet=True):
+    """
+    Evaluates ``function(*args)`` for each ``args`` in ``arguments`` in forked worker processes.
+
+    The function does not need to be picklable, since it is inherited by the workers at the fork, but its return
+    values do. Tasks are run serially in the current process if only one process is requested, if there is a single
+    task or if ``fork`` is not available.
+
+    Args:
+        function (callable): Function to evaluate
+        arguments (list(tuple)): Positional arguments for each evaluation
+        num_processes (int): Number of worker processes. If ``None`` or ``< 1`` the number of CPUs is used
+        quiet (bool): Suppress the screen output of the workers
+
+    Returns:
+        list: Return values of each evaluation, in the order of ``arguments``
+    """
+    global _forked_function, _forked_arguments
+
+    arguments = [args if isinstance(args, tuple) else (args,) for args in arguments]
+    num_processes = min(get_num_processes(num_processes), len(arguments))
+    if num_processes <= 1 or not fork_available():
+        return [function(*args) for args in arguments]
+
+    _forked_function = function
+    _forked_arguments = arguments
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(num_processes, initializer=_quiet_worker if quiet else None) as pool:
+            results = pool.map(_call_forked, range(len(arguments)), chunksize=1)
+    finally:
+        _forked_function = None
+        _forked_arguments = None
+
+    return results
+
+
+def _call_timesteps(function, steps, parent_pid):
+    timeline = instrumentation.timeline
+    bytes_written = dict(timeline.bytes_written) if timeline.enabled else dict()
+
+    results = [function(it) for it in steps]
+
+    if not timeline.enabled or os.getpid() == parent_pid:
+        return results, dict()
+    return results, {name: n_bytes - bytes_written.get(name, 0)
+                     for name, n_bytes in timeline.bytes_written.items()
+                     if n_bytes != bytes_written.get(name, 0)}
+
+
+def timestep_map(function, steps, num_processes=None, tasks_per_process=4):
+    """
+    Evaluates ``function(it)`` for each time step ``it`` in ``steps`` in forked worker processes.
+
+    Intended for post-processors run after the simulation, where time steps are independent. The time step info of
+    the whole simulation is shared copy-on-write by the workers, so only the step numbers and the results of
+    ``function`` are transferred. Steps are split into contiguous chunks, ``tasks_per_process`` per worker, to
+    balance the load while keeping the number of transfers low.
+
+    Any change made by ``function`` to the SHARPy data in a worker is lost, hence ``function`` must return whatever
+    the main process needs to keep. The bytes written recorded by the instrumentation in the workers (see
+    :mod:`sharpy.utils.instrumentation`) are added to the timeline of the main process.
+
+    Args:
+        function (callable): Function of the time step number
+        steps (list(int)): Time steps to evaluate
+        num_processes (int): Number of worker processes. If ``None`` or ``< 1`` the number of CPUs is used
+        tasks_per_process (int): Number of chunks of time steps per worker process
+
+    Returns:
+        list: Return values of ``function`` at each step, in the order of ``steps``
+    """
+    steps = list(steps)
+    if len(steps) == 0:
+        return []
+    num_processes = min(get_num_processes(num_processes), len(steps))
+    chunks = np.array_split(np.arange(len(steps)), min(num_processes * tasks_per_process, len(steps)))
+    arguments = [(function, [steps[i] for i in chunk], os.getpid()) for chunk in chunks]
+
+    results = []
+    for chunk_results, bytes_written in fork_map(_call_timesteps, arguments, num_processes=num_processes):
+        results.extend(chunk_results)
+        for name, n_bytes in bytes_written.items():
+            instrumentation.timeline.add_bytes(name, n_bytes)
+    return results
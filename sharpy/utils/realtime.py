@@ -0,0 +1,263 @@
+"""Real Time Pacing
+
+Pacing of a time marching simulation to the wall clock, used by
+:class:`~sharpy.solvers.dynamiccoupled.DynamicCoupled` when ``real_time = on``, for instance when SHARPy is coupled
+to a flight simulator or a controller through the network interface.
+
+Time step ``n`` (counted from the first paced step) has a deadline ``n * dt / speed_factor`` seconds of wall time
+after the start of the first paced step. Steps that finish ahead of their deadline wait until it is reached. Steps
+that finish after it are counted as deadline misses and, if ``degrade = on``, the cost of the following steps is
+lowered by increasing a degradation level:
+
+    * Level 1: the postprocessors not listed in ``essential_postprocessors`` are skipped.
+
+    * Level ``l > 1``: in addition, the maximum number of FSI iterations is divided by ``2 ** (l - 1)``, down to
+      ``min_fsi_substeps``.
+
+The level is lowered by one after ``recovery_steps`` consecutive steps finishing with at least ``recovery_slack``
+of the wall time step to spare.
+
+The wall time of each step, the time spent waiting for the network input queue and the deadline misses are recorded
+and, at the end of the run, written to ``<output_folder>/<folder>/realtime.json`` together with a latency histogram
+(latencies normalised by the wall time step).
+"""
+import collections
+import json
+import os
+import time
+
+import numpy as np
+
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.settings as settings
+import sharpy.utils.instrumentation as instrumentation
+
+
+class RealTimePacer(object):
+    """
+    Paces time steps to the wall clock and records deadline statistics.
+    """
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+
+    settings_types['speed_factor'] = 'float'
+    settings_default['speed_factor'] = 1.
+    settings_description['speed_factor'] = 'Simulated time per unit of wall time. ``2`` runs twice as fast as real ' \
+                                           'time'
+
+    settings_types['degrade'] = 'bool'
+    settings_default['degrade'] = True
+    settings_description['degrade'] = 'Lower the cost of the time steps when behind schedule'
+
+    settings_types['lag_tolerance'] = 'float'
+    settings_default['lag_tolerance'] = 0.
+    settings_description['lag_tolerance'] = 'Lag behind schedule, as a fraction of the wall time step, tolerated ' \
+                                            'before increasing the degradation level'
+
+    settings_types['essential_postprocessors'] = 'list(str)'
+    settings_default['essential_postprocessors'] = list()
+    settings_description['essential_postprocessors'] = 'Postprocessors that are run even when behind schedule'
+
+    settings_types['min_fsi_substeps'] = 'int'
+    settings_default['min_fsi_substeps'] = 1
+    settings_description['min_fsi_substeps'] = 'Lower bound of the maximum number of FSI iterations when behind ' \
+                                               'schedule'
+
+    settings_types['recovery_steps'] = 'int'
+    settings_default['recovery_steps'] = 10
+    settings_description['recovery_steps'] = 'Consecutive time steps with enough slack needed to lower the ' \
+                                             'degradation level'
+
+    settings_types['recovery_slack'] = 'float'
+    settings_default['recovery_slack'] = 0.25
+    settings_description['recovery_slack'] = 'Fraction of the wall time step to spare for a time step to count ' \
+                                             'towards recovery'
+
+    settings_types['histogram_bins'] = 'list(float)'
+    settings_default['histogram_bins'] = [0., 0.25, 0.5, 0.75, 1., 1.25, 1.5, 2., 4.]
+    settings_description['histogram_bins'] = 'Edges of the latency histogram bins, as a fraction of the wall time ' \
+                                             'step. An open ended bin is added after the last edge'
+
+    settings_types['folder'] = 'str'
+    settings_default['folder'] = 'realtime'
+    settings_description['folder'] = 'Name of the folder, inside the case output folder, where results are written. ' \
+                                     'If empty, the results are not written'
+
+    settings_table = settings.SettingsTable()
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description,
+                                       header_line='The real time pacing takes the following settings:')
+
+    def __init__(self):
+        self.settings = None
+        self.folder = None
+
+        self.wall_dt = 0.
+        self.t_start = None
+        self.n_paced_steps = 0
+        self.step_start = None
+        self.current_ts = None
+        self.queue_wait = 0.
+
+        self.level = 0
+        self.recovery_count = 0
+        self.saturated = False
+
+        self.steps = []
+
+    def initialise(self, in_settings, dt, output_folder='./'):
+        """
+        Args:
+            in_settings (dict): Real time settings
+            dt (float): Simulation time step
+            output_folder (str): Case output folder
+        """
+        self.settings = in_settings
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, no_ctype=True)
+
+        self.wall_dt = dt/self.settings['speed_factor']
+        self.folder = None
+        if self.settings['folder']:
+            self.folder = output_folder + '/' + self.settings['folder'] + '/'
+
+        self.t_start = None
+        self.n_paced_steps = 0
+        self.level = 0
+        self.recovery_count = 0
+        self.saturated = False
+        self.steps = []
+
+    @property
+    def skip_postprocessors(self):
+        return self.level > 0
+
+    def run_postprocessor(self, postproc):
+        """
+        Returns ``True`` if the postprocessor ``postproc`` is to be run in the current time step.
+        """
+        return not self.skip_postprocessors or postproc in self.settings['essential_postprocessors']
+
+    def fsi_substeps(self, nominal):
+        """
+        Maximum number of FSI iterations for the current time step.
+
+        Args:
+            nominal (int): Number of FSI iterations in the settings
+        """
+        lower_bound = min(self.settings['min_fsi_substeps'], nominal)
+        reduced = nominal if self.level < 2 else max(lower_bound, nominal//2**(self.level - 1))
+        # further levels would not lower the cost
+        self.saturated = reduced == lower_bound
+        return reduced
+
+    def start_step(self, ts):
+        """
+        Starts the wall clock of time step ``ts``.
+        """
+        self.step_start = time.perf_counter()
+        if self.t_start is None:
+            self.t_start = self.step_start
+        self.queue_wait = 0.
+        self.current_ts = ts
+
+    def add_queue_wait(self, elapsed):
+        """
+        Adds ``elapsed`` seconds to the time spent waiting for the input queue in the current step.
+        """
+        self.queue_wait += elapsed
+
+    def end_step(self):
+        """
+        Records the current time step, updates the degradation level and waits until the step deadline.
+
+        Returns:
+            bool: ``True`` if the deadline was missed
+        """
+        t_end = time.perf_counter()
+        self.n_paced_steps += 1
+        deadline = self.t_start + self.n_paced_steps*self.wall_dt
+        lag = t_end - deadline
+        missed = lag > 0.
+
+        self.steps.append({'ts': int(self.current_ts),
+                           'latency': t_end - self.step_start,
+                           'queue_wait': self.queue_wait,
+                           'lag': lag,
+                           'missed': missed,
+                           'level': self.level})
+
+        if missed:
+            instrumentation.timeline.count('DynamicCoupled.deadline_miss')
+        if self.settings['degrade']:
+            self.update_level(lag)
+
+        if lag < 0.:
+            time.sleep(-lag)
+        return missed
+
+    def update_level(self, lag):
+        if lag > self.settings['lag_tolerance']*self.wall_dt:
+            if not (self.saturated and self.level > 0):
+                self.level += 1
+            self.recovery_count = 0
+        elif lag < -self.settings['recovery_slack']*self.wall_dt:
+            self.recovery_count += 1
+            if self.recovery_count >= self.settings['recovery_steps'] and self.level > 0:
+                self.level -= 1
+                self.recovery_count = 0
+        else:
+            self.recovery_count = 0
+
+    def summary(self):
+        """
+        Returns:
+            dict: Deadline statistics, latency histogram and per time step records
+        """
+        latencies = np.array([step['latency'] for step in self.steps])
+        queue_waits = np.array([step['queue_wait'] for step in self.steps])
+        n_steps = len(self.steps)
+
+        edges = list(self.settings['histogram_bins']) + [np.inf]
+        counts = np.histogram(latencies/self.wall_dt, bins=edges)[0] if n_steps else np.zeros(len(edges) - 1)
+        histogram = collections.OrderedDict()
+        for i_bin in range(len(edges) - 1):
+            histogram['%g-%g' % (edges[i_bin], edges[i_bin + 1])] = int(counts[i_bin])
+
+        def percentile(values, q):
+            return float(np.percentile(values, q)) if n_steps else None
+
+        return {'wall_dt': self.wall_dt,
+                'speed_factor': self.settings['speed_factor'],
+                'n_steps': n_steps,
+                'deadline_misses': int(sum(step['missed'] for step in self.steps)),
+                'max_lag': max((step['lag'] for step in self.steps), default=None),
+                'max_level': max((step['level'] for step in self.steps), default=0),
+                'latency': {'mean': float(np.mean(latencies)) if n_steps else None,
+                            'p50': percentile(latencies, 50),
+                            'p95': percentile(latencies, 95),
+                            'p99': percentile(latencies, 99),
+                            'max': float(np.max(latencies)) if n_steps else None},
+                'queue_wait': {'total': float(np.sum(queue_waits)),
+                               'mean': float(np.mean(queue_waits)) if n_steps else None,
+                               'max': float(np.max(queue_waits)) if n_steps else None},
+                'latency_histogram': histogram,
+                'steps': self.steps}
+
+    def finish(self):
+        """
+        Prints the deadline statistics and writes them to the output folder.
+
+        Returns:
+            dict: Summary, see :meth:`summary`
+        """
+        summary = self.summary()
+        cout.cout_wrap('Real time pacing: %u/%u deadlines missed, p95 latency %s of %.3e s wall time step' %
+                       (summary['deadline_misses'], summary['n_steps'],
+                        '-' if summary['latency']['p95'] is None else '%.3e s' % summary['latency']['p95'],
+                        self.wall_dt), 1)
+        if self.folder is not None:
+            if not os.path.isdir(self.folder):
+                os.makedirs(self.folder)
+            with open(self.folder + 'realtime.json', 'w') as outfile:
+                json.dump(summary, outfile, indent=1)
+        return summary
@@ -0,0 +1,82 @@
+"""
+Goland wing clamped at the root and encountering a 1-cos gust, shared by the dynamic coupled tests
+"""
+import numpy as np
+
+import cases.templates.flying_wings as wings
+
+
+def generate_goland_gust(case_name, route, dynamic_coupled_settings=None, physical_time=0.1):
+    """
+    Writes the case files of the Goland wing gust response.
+
+    Args:
+        case_name (str): Case name
+        route (str): Folder where the case files are written
+        dynamic_coupled_settings (dict): Settings that replace the default ``DynamicCoupled`` ones
+        physical_time (float): Simulation time
+
+    Returns:
+        cases.templates.flying_wings.Goland: Case generator
+    """
+    ws = wings.Goland(M=4,
+                      N=8,
+                      Mstar_fact=10,
+                      u_inf=50,
+                      alpha=1.,
+                      rho=1.225,
+                      sweep=0,
+                      physical_time=physical_time,
+                      n_surfaces=2,
+                      route=route,
+                      case_name=case_name)
+
+    ws.gust_intensity = 0.05
+    ws.gust_length = 5.
+
+    ws.clean_test_files()
+    ws.update_derived_params()
+    ws.update_aero_prop()
+    ws.update_fem_prop()
+    ws.set_default_config_dict()
+
+    ws.generate_aero_file()
+    ws.generate_fem_file()
+
+    ws.config['SHARPy']['flow'] = ['BeamLoader', 'AerogridLoader',
+                                   'StaticCoupled',
+                                   'DynamicCoupled']
+    ws.config['SHARPy']['write_screen'] = 'off'
+    ws.config['SHARPy']['log_folder'] = route + '/output/'
+
+    ws.config['AerogridLoader']['wake_shape_generator'] = 'StraightWake'
+    ws.config['AerogridLoader']['wake_shape_generator_input'] = {'u_inf': ws.u_inf,
+                                                                 'u_inf_direction': np.array([1., 0., 0.]),
+                                                                 'dt': ws.dt}
+
+    ws.config['DynamicCoupled']['aero_solver_settings'] = {
+        'print_info': 'off',
+        'horseshoe': False,
+        'num_cores': 4,
+        'n_rollup': 0,
+        'convection_scheme': 2,
+        'cfl1': False,
+        'velocity_field_generator': 'GustVelocityField',
+        'velocity_field_input': {'u_inf': ws.u_inf,
+                                 'u_inf_direction': [1., 0., 0.],
+                                 'gust_shape': '1-cos',
+                                 'offset': 1.,
+                                 'gust_parameters': {'gust_length': ws.gust_length,
+                                                     'gust_intensity': ws.gust_intensity*ws.u_inf}},
+        'rho': ws.rho,
+        'n_time_steps': ws.n_tstep,
+        'dt': ws.dt}
+    ws.config['DynamicCoupled']['fsi_tolerance'] = 1e-8
+    ws.config['DynamicCoupled']['postprocessors'] = []
+    ws.config['DynamicCoupled']['postprocessors_settings'] = dict()
+    if dynamic_coupled_settings is not None:
+        ws.config['DynamicCoupled'].update(dynamic_coupled_settings)
+
+    ws.config.write()
+
+    return ws
@@ -0,0 +1,93 @@
+import os
+import shutil
+import types
+import unittest
+
+import numpy as np
+
+import sharpy.sharpy_main
+import sharpy.solvers.dynamiccoupled as dynamiccoupled
+from tests.coupled.dynamic.goland_gust import generate_goland_gust
+
+
+class TestAeroSubcycling(unittest.TestCase):
+    """
+    Tests the time steps without aerodynamic solution of ``DynamicCoupled`` with ``aero_subcycling > 1``
+    """
+
+    route = os.path.dirname(os.path.realpath(__file__)) + '/cases_subcycling/'
+
+    @staticmethod
+    def steady_loads(t):
+        return np.ones((3, 6))*(1. + 2.*t)
+
+    @staticmethod
+    def unsteady_loads(t):
+        return np.ones((3, 6))*(0.5 - t)
+
+    def subcycled_loads(self, aero_times, t, loads):
+        solver = dynamiccoupled.DynamicCoupled()
+        solver.settings = {'aero_subcycling': 2, 'aero_subcycling_loads': loads}
+        for solver.time in aero_times:
+            structural_kstep = types.SimpleNamespace(
+                postproc_node={'aero_steady_forces': self.steady_loads(solver.time),
+                               'aero_unsteady_forces': self.unsteady_loads(solver.time)})
+            solver.store_aero_loads(structural_kstep)
+
+        applied = []
+        solver.apply_aero_forces = lambda aero_kstep, structural_kstep, struct_forces, dynamic_struct_forces: \
+            applied.append((struct_forces, dynamic_struct_forces))
+        solver.solve_structure = lambda structural_kstep: structural_kstep
+        solver.update_custom_grid = lambda structural_kstep, aero_kstep: None
+
+        solver.time = t
+        solver.subcycle_step(types.SimpleNamespace(), types.SimpleNamespace())
+        self.assertEqual(len(applied), 1)
+        self.assertLessEqual(len(solver.aero_loads), 2)
+        return applied[0]
+
+    def test_load_extrapolation(self):
+        # the loads are linear in time, thus exactly extrapolated from the last two aerodynamic solutions
+        steady, unsteady = self.subcycled_loads([0.1, 0.2, 0.3], 0.4, 'extrapolated')
+        np.testing.assert_allclose(steady, self.steady_loads(0.4))
+        np.testing.assert_allclose(unsteady, self.unsteady_loads(0.4))
+
+        # the last aerodynamic loads are held
+        steady, unsteady = self.subcycled_loads([0.1, 0.2, 0.3], 0.4, 'frozen')
+        np.testing.assert_allclose(steady, self.steady_loads(0.3))
+        np.testing.assert_allclose(unsteady, self.unsteady_loads(0.3))
+
+        # a single aerodynamic solution cannot be extrapolated
+        steady, unsteady = self.subcycled_loads([0.3], 0.4, 'extrapolated')
+        np.testing.assert_allclose(steady, self.steady_loads(0.3))
+        np.testing.assert_allclose(unsteady, self.unsteady_loads(0.3))
+
+    def run_case(self, aero_subcycling, loads):
+        case_name = 'goland_subcycling_%u_%s' % (aero_subcycling, loads)
+        ws = generate_goland_gust(case_name, self.route,
+                                  dynamic_coupled_settings={'aero_subcycling': aero_subcycling,
+                                                            'aero_subcycling_loads': loads},
+                                  physical_time=0.15)
+        data = sharpy.sharpy_main.main(['', ws.route + '/' + ws.case_name + '.sharpy'])
+        return np.array([tstep.pos[:, 2] for tstep in data.structure.timestep_info[1:]])
+
+    def test_gust_response(self):
+        reference = self.run_case(1, 'extrapolated')
+        deflection = reference - reference[0, :]
+        peak = np.max(np.abs(deflection))
+        self.assertGreater(peak, 1e-4, msg='The gust does not excite the wing')
+
+        for loads in ['frozen', 'extrapolated']:
+            with self.subTest(aero_subcycling_loads=loads):
+                pos_z = self.run_case(2, loads)
+                self.assertEqual(pos_z.shape, reference.shape)
+                self.assertLess(np.max(np.abs(pos_z - reference)), 0.1*peak)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.isdir(cls.route):
+            shutil.rmtree(cls.route)
+
+
+if __name__ == '__main__':
+    unittest.main()
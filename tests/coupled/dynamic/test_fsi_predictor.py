@@ -0,0 +1,50 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+import sharpy.sharpy_main
+from tests.coupled.dynamic.goland_gust import generate_goland_gust
+
+
+class TestFsiPredictor(unittest.TestCase):
+    """
+    The extrapolated first FSI iterate only changes the number of FSI iterations: the converged time history must
+    match that of a simulation without predictor
+    """
+
+    route = os.path.dirname(os.path.realpath(__file__)) + '/cases_predictor/'
+
+    def run_case(self, fsi_predictor):
+        case_name = 'goland_predictor_' + (fsi_predictor or 'none')
+        ws = generate_goland_gust(case_name, self.route,
+                                  dynamic_coupled_settings={'fsi_predictor': fsi_predictor})
+        data = sharpy.sharpy_main.main(['', ws.route + '/' + ws.case_name + '.sharpy'])
+
+        steps = data.structure.timestep_info[1:]
+        pos = np.array([tstep.pos for tstep in steps])
+        psi = np.array([tstep.psi for tstep in steps])
+        q = np.array([tstep.q for tstep in steps])
+        return pos, psi, q
+
+    def test_predictor(self):
+        pos_ref, psi_ref, q_ref = self.run_case('')
+        tip_deflection = np.max(np.abs(pos_ref[:, :, 2] - pos_ref[0, :, 2]))
+        self.assertGreater(tip_deflection, 1e-4, msg='The gust does not excite the wing')
+
+        for fsi_predictor in ['linear', 'quadratic']:
+            with self.subTest(fsi_predictor=fsi_predictor):
+                pos, psi, q = self.run_case(fsi_predictor)
+                np.testing.assert_allclose(pos, pos_ref, rtol=0., atol=1e-4*tip_deflection)
+                np.testing.assert_allclose(psi, psi_ref, rtol=0., atol=1e-6)
+                np.testing.assert_allclose(q, q_ref, rtol=0., atol=1e-4*np.max(np.abs(q_ref)))
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.isdir(cls.route):
+            shutil.rmtree(cls.route)
+
+
+if __name__ == '__main__':
+    unittest.main()
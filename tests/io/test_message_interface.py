@@ -0,0 +1,177 @@
+import unittest
+import os
+import struct
+import socket
+import threading
+import queue
+import uuid
+
+import sharpy.io.message_interface as message_interface
+import sharpy.io.network_interface as network_interface
+import sharpy.io.inout_variables as inout_variables
+
+
+class TestMessageInterface(unittest.TestCase):
+    """
+    Tests the binary encoding of the network messages and the data transports
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+
+    def setUp(self):
+        # variables are indexed by a global counter
+        inout_variables.Variable.num_vars = 0
+
+    def test_codec(self):
+        indices = [0, 3, 7]
+        values = [1.5, -2.25, 1e3]
+        for byte_ordering in ['<', '>']:
+            with self.subTest(byte_ordering=byte_ordering):
+                reference = message_interface.header
+                for idx, value in zip(indices, values):
+                    reference += struct.pack(byte_ordering + 'if', idx, value)
+
+                codec = message_interface.MessageCodec(indices, byte_ordering=byte_ordering)
+                msg = codec.encode(values)
+                self.assertEqual(bytes(msg), reference)
+                self.assertEqual(codec.message_length, len(reference))
+
+                decoded_indices, decoded_values = codec.decode(msg)
+                self.assertEqual(decoded_indices.tolist(), indices)
+                self.assertEqual(decoded_values.tolist(), values)
+
+                self.assertEqual(message_interface.decoder(reference, byte_ordering=byte_ordering),
+                                 list(zip(indices, values)))
+
+    def test_set_of_variables_encode(self):
+        set_of_variables = inout_variables.SetOfVariables()
+        set_of_variables.load_variables_from_yaml(self.route_test_dir + '/variables.yaml')
+        for i_var, var_idx in enumerate(set_of_variables.out_variables):
+            set_of_variables[var_idx].value = 0.5 * i_var
+
+        reference = message_interface.header
+        for i_var, var_idx in enumerate(set_of_variables.out_variables):
+            reference += struct.pack('<if', set_of_variables[var_idx].variable_index, 0.5 * i_var)
+
+        self.assertEqual(bytes(set_of_variables.encode()), reference)
+
+    def test_in_network_receive(self):
+        in_network = network_interface.InNetwork()
+        in_network.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        in_network.sock.bind(('127.0.0.1', 0))
+        in_queue = queue.Queue()
+        in_network.set_queue(in_queue)
+
+        codec = message_interface.MessageCodec([2, 5])
+        in_network.set_message_length(codec.message_length)
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            msg = codec.encode([0.25, -1.])
+            client.sendto(msg, in_network.sock.getsockname())
+            in_network.receive_message()
+            self.assertEqual(in_queue.get(timeout=1), [(2, 0.25), (5, -1.)])
+
+            # message split in two packets
+            client.sendto(msg[:7], in_network.sock.getsockname())
+            in_network.receive_message()
+            self.assertTrue(in_queue.empty())
+            client.sendto(msg[7:], in_network.sock.getsockname())
+            in_network.receive_message()
+            self.assertEqual(in_queue.get(timeout=1), [(2, 0.25), (5, -1.)])
+        finally:
+            client.close()
+            in_network.sock.close()
+
+    def test_asyncio_loop(self):
+        set_of_variables = inout_variables.SetOfVariables()
+        set_of_variables.load_variables_from_yaml(self.route_test_dir + '/variables.yaml')
+        for i_var, var_idx in enumerate(set_of_variables.out_variables):
+            set_of_variables[var_idx].value = float(i_var)
+        reference = bytes(set_of_variables.encode())
+
+        for send_on_demand in [True, False]:
+            with self.subTest(send_on_demand=send_on_demand):
+                client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                client.bind(('127.0.0.1', 0))
+                client.settimeout(1)
+
+                out_network = network_interface.OutNetwork()
+                out_network.initialise('r', {'address': '127.0.0.1',
+                                             'port': 0,
+                                             'send_on_demand': send_on_demand,
+                                             'destination_address': [] if send_on_demand else ['127.0.0.1'],
+                                             'destination_ports': [] if send_on_demand else
+                                             [client.getsockname()[1]]})
+                in_network = network_interface.InNetwork()
+                in_network.initialise('r', {'address': '127.0.0.1', 'port': 0})
+                in_network.set_message_length(set_of_variables.input_msg_len)
+                in_queue = queue.Queue()
+                in_network.set_queue(in_queue)
+                out_queue = queue.Queue(maxsize=1)
+                out_network.set_queue(out_queue)
+
+                finish_event = threading.Event()
+                n_threads = threading.active_count()
+                thread = threading.Thread(target=network_interface.asyncio_loop,
+                                          args=(in_network, out_network, finish_event))
+                thread.start()
+                try:
+                    out_queue.put(set_of_variables)
+                    if send_on_demand:
+                        # nothing is sent until requested
+                        client.settimeout(0.2)
+                        self.assertRaises(socket.timeout, client.recvfrom, 1024)
+                        client.settimeout(1)
+                        client.sendto(b'request', out_network.sock.getsockname())
+                    self.assertEqual(client.recvfrom(1024)[0], reference)
+                finally:
+                    finish_event.set()
+                    thread.join(timeout=5)
+                    self.assertFalse(thread.is_alive())
+                    # the helper threads of the event loop have finished too
+                    self.assertEqual(threading.active_count(), n_threads)
+                    client.close()
+                    in_network.close()
+                    out_network.close()
+
+    def test_shared_memory(self):
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            self.skipTest('Shared memory requires Python 3.8 or above')
+
+        set_of_variables = inout_variables.SetOfVariables()
+        set_of_variables.load_variables_from_yaml(self.route_test_dir + '/variables.yaml')
+        for i_var, var_idx in enumerate(set_of_variables.out_variables):
+            set_of_variables[var_idx].value = float(i_var)
+
+        name = 'sharpy_test_' + uuid.uuid4().hex[:8]
+        shm_network = network_interface.SharedMemoryNetwork()
+        shm_network.initialise({'name': name}, set_of_variables)
+        in_queue = queue.Queue()
+        out_queue = queue.Queue()
+        finish_event = threading.Event()
+        thread = threading.Thread(target=network_interface.shared_memory_loop,
+                                  args=(shm_network, in_queue, out_queue, finish_event))
+        thread.start()
+        client = network_interface.SharedMemoryClient(name)
+        try:
+            client.send_inputs([0.1])
+            in_index = set_of_variables[set_of_variables.in_variables[0]].variable_index
+            self.assertEqual(in_queue.get(timeout=1), [(in_index, 0.1)])
+
+            out_queue.put(set_of_variables)
+            outputs = client.receive_outputs(timeout=1)
+            self.assertIsNotNone(outputs)
+            self.assertEqual(outputs.tolist(), [float(i) for i in range(len(set_of_variables.out_variables))])
+            self.assertIsNone(client.receive_outputs(timeout=1e-3))
+        finally:
+            finish_event.set()
+            thread.join()
+            client.close()
+            shm_network.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,7 @@ import scipy.linalg as scalg
 
 import sharpy.utils.h5utils as h5utils
 import sharpy.linear.src.assembly as assembly
+import sharpy.linear.src.linuvlm as linuvlm
 import sharpy.linear.src.multisurfaces as multisurfaces
 import sharpy.linear.src.surface as surface
 import sharpy.utils.algebra as algebra
@@ -1064,6 +1065,74 @@ class Test_assembly(unittest.TestCase):
             assert np.max(np.abs(gvec - gvec_ref)) < 1e-15, \
                 'Prop. from trailing edge not correct'
 
+    def test_wake_prop_formats(self):
+
+        self.start_writer()
+        MS = self.MS
+
+        for cfl1 in [True, False]:
+            settings = {'cfl1': cfl1, 'dt': 0.1}
+            C_ref, Cstar_ref = assembly.wake_prop(MS, settings=settings)
+            for sparse_format in ['csc', 'csr', 'coo', 'lil']:
+                C_list, Cstar_list = assembly.wake_prop(MS, use_sparse=True, sparse_format=sparse_format,
+                                                        settings=settings)
+                for ss in range(len(MS.Surfs)):
+                    assert np.max(np.abs(C_list[ss].toarray() - C_ref[ss])) < 1e-15, \
+                        'Prop. from trailing edge in %s format not correct' % sparse_format
+                    assert np.max(np.abs(Cstar_list[ss].toarray() - Cstar_ref[ss])) < 1e-15, \
+                        'Wake prop. in %s format not correct' % sparse_format
+
+    def test_get_Cw_cpx(self):
+
+        self.start_writer()
+        MS = self.MS
+        K, K_star = sum(MS.KK), sum(MS.KK_star)
+        zv = np.exp(1.j * np.linspace(0.01, 1., 5))
+
+        # exact solution of the wake propagation with CFL=1
+        C_list, Cstar_list = assembly.wake_prop(MS)
+        C = scalg.block_diag(*C_list)
+        Cstar = scalg.block_diag(*Cstar_list)
+        Cw_list = linuvlm.get_Cw_cpx(MS, K, K_star, zv)
+        for kk in range(len(zv)):
+            Cw_ref = np.linalg.solve(zv[kk] * np.eye(K_star) - Cstar, C)
+            assert np.max(np.abs(Cw_list[kk].toarray() - Cw_ref)) < 1e-12, \
+                'Wake propagation in frequency domain not correct'
+
+        # all frequencies at once
+        settings = {'cfl1': False, 'dt': 0.1}
+        Cw_list = linuvlm.get_Cw_cpx(MS, K, K_star, zv, settings=settings)
+        for kk in range(len(zv)):
+            Cw = linuvlm.get_Cw_cpx(MS, K, K_star, zv[kk], settings=settings)
+            assert np.max(np.abs(Cw_list[kk].toarray() - Cw.toarray())) < 1e-14, \
+                'Wake propagation at a vector of frequencies not correct'
+
+
+    def test_parallel_assembly(self):
+
+        self.start_writer()
+        MS = self.MS
+
+        # duplicate the surface such that there are several pairs of surfaces
+        Surfs = [MS.Surfs[0], copy.deepcopy(MS.Surfs[0])]
+        Surfs_star = [MS.Surfs_star[0], copy.deepcopy(MS.Surfs_star[0])]
+        for Surf in (Surfs[1], Surfs_star[1]):
+            Surf.zeta[1] += 1.5 * np.max(np.abs(MS.Surfs[0].zeta[1]))
+        for Surf in Surfs:
+            Surf.generate_collocations()
+
+        for function in (assembly.nc_dqcdzeta, assembly.dfqsdvind_gamma, assembly.dfqsdvind_zeta):
+            out_serial = function(Surfs, Surfs_star, num_processes=1)
+            out_parallel = function(Surfs, Surfs_star, num_processes=2)
+            for list_serial, list_parallel in zip(out_serial, out_parallel):
+                for ss_out in range(len(Surfs)):
+                    ref = list_serial[ss_out]
+                    par = list_parallel[ss_out]
+                    if not isinstance(ref, list):
+                        ref, par = [ref], [par]
+                    for block_serial, block_parallel in zip(ref, par):
+                        assert np.max(np.abs(block_parallel - block_serial)) < 1e-14, \
+                            'Parallel assembly in %s not matching serial assembly' % function.__name__
 
     def start_writer(self):
         # Over write writer with print_file False to avoid I/O errors
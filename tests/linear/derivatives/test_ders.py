@@ -199,6 +199,41 @@ class Test_ders(unittest.TestCase):
             assert ErVer_max[ss + 1] < ErVer_max[ss], \
                 'Error of derivative w.r.t. ZetaPanel not decreasing monothonically'
 
+    def test_dbiot_panel_batch(self):
+        if self.print_info:
+            print('\n---------------------------------- Testing dbiot.eval_panel_*_batch')
+
+        np.random.seed(10)
+        n_points, n_panels = 5, 6
+        ZetaPanel = np.array([self.zeta0, self.zeta1, self.zeta2, self.zeta3])
+        ZetaP = self.zetaP + np.random.rand(n_points, 3)
+        ZetaPanels = ZetaPanel + 0.5 * np.random.rand(n_panels, 4, 3)
+        Gamma = 1. + np.random.rand(n_panels)
+
+        # all point/panel pairs at once
+        DerP, DerVer = dbiot.eval_panel_fast_batch(ZetaP[:, None, :], ZetaPanels[None, :, :, :],
+                                                   vortex_radius, Gamma[None, :])
+        DerP_coll = dbiot.eval_panel_fast_coll_batch(ZetaP[:, None, :], ZetaPanels[None, :, :, :],
+                                                     vortex_radius, Gamma[None, :])
+        assert DerP.shape == (n_points, n_panels, 3, 3)
+        assert DerVer.shape == (n_points, n_panels, 4, 3, 3)
+
+        for pp in range(n_points):
+            for ii in range(n_panels):
+                DerP_ref, DerVer_ref = dbiot.eval_panel_fast(ZetaP[pp], ZetaPanels[ii], vortex_radius, Gamma[ii])
+                er_max = max(np.max(np.abs(DerP[pp, ii] - DerP_ref)),
+                             np.max(np.abs(DerVer[pp, ii] - DerVer_ref)))
+                assert er_max < 1e-13, 'eval_panel_fast_batch not matching with eval_panel_fast'
+                er_max = np.max(np.abs(DerP_coll[pp, ii] - DerP_ref))
+                assert er_max < 1e-13, 'eval_panel_fast_coll_batch not matching with eval_panel_fast'
+
+        # segments within the vortex radius do not contribute
+        DerP, DerVer = dbiot.eval_panel_fast_batch(self.zeta0, ZetaPanel, vortex_radius, 2.4)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            DerP_ref, DerVer_ref = dbiot.eval_panel_fast(self.zeta0, ZetaPanel, vortex_radius, 2.4)
+        assert np.max(np.abs(DerP - DerP_ref)) < 1e-13, 'eval_panel_fast_batch not matching on panel vertex'
+        assert np.max(np.abs(DerVer - DerVer_ref)) < 1e-13, 'eval_panel_fast_batch not matching on panel vertex'
+
     def test_dbiot_panel_mid_segment(self):
 
         if self.print_info:
@@ -0,0 +1,143 @@
+import unittest
+import numpy as np
+import scipy.linalg as sclalg
+import scipy.sparse as scsp
+
+import sharpy.linear.src.libeig as libeig
+
+
+class TestShiftInvertEigenvalues(unittest.TestCase):
+    """
+    Tests the shift-invert eigenvalue solvers against the dense decomposition for a damped spring-mass chain
+    """
+
+    def setUp(self):
+        n = 150
+        np.random.seed(1)
+        self.n = n
+        self.K = scsp.diags([-np.ones(n - 1), 2 * np.ones(n), -np.ones(n - 1)], [-1, 0, 1], format='csc') * 1e4
+        self.M = scsp.diags(1 + np.random.rand(n), format='csc')
+        self.C = 1e-3 * self.K + 0.1 * self.M
+
+    def test_undamped_modes(self):
+        eigenvalues, eigenvectors = libeig.eigsh_shift_invert(self.K, 10, -1., B=self.M)
+        eigenvalues_dense = sclalg.eigh(self.K.toarray(), self.M.toarray(), eigvals_only=True)[:10]
+        np.testing.assert_allclose(eigenvalues, eigenvalues_dense, rtol=1e-10)
+
+        # mass normalised modes
+        np.testing.assert_allclose(eigenvectors.T.dot(self.M.dot(eigenvectors)), np.eye(10), atol=1e-10)
+
+        # the general Arnoldi solver returns the same eigenvalues
+        eigenvalues_arnoldi, _ = libeig.eigs_shift_invert(self.K, 10, -1., B=self.M)
+        np.testing.assert_allclose(eigenvalues_arnoldi.real, eigenvalues_dense, rtol=1e-8)
+
+    def test_damped_modes(self):
+        n = self.n
+        eye = scsp.identity(n, format='csc')
+        A = scsp.bmat([[None, eye], [-self.K, -self.C]], format='csc')
+        B = scsp.bmat([[eye, None], [None, self.M]], format='csc')
+        A_ss = np.linalg.solve(B.toarray(), A.toarray())
+
+        sigma = -1.
+        eigenvalues, right, left = libeig.eigs_shift_invert(A, 12, sigma, B=B, left=True)
+
+        eigenvalues_dense = sclalg.eigvals(A_ss)
+        eigenvalues_dense = eigenvalues_dense[np.argsort(np.abs(eigenvalues_dense - sigma))][:12]
+        np.testing.assert_allclose(np.sort_complex(eigenvalues), np.sort_complex(eigenvalues_dense), rtol=1e-8)
+
+        np.testing.assert_allclose(A_ss.dot(right), right * eigenvalues, atol=1e-7 * np.max(np.abs(eigenvalues)))
+        left_ss = B.T.dot(left)
+        np.testing.assert_allclose(left_ss.T.dot(A_ss), eigenvalues[:, None] * left_ss.T,
+                                   atol=1e-7 * np.max(np.abs(eigenvalues)) * np.max(np.abs(left_ss)))
+
+        # complex shift targets the eigenvalues around it
+        target = eigenvalues_dense[np.argmax(eigenvalues_dense.imag)]
+        eigenvalues_target, _ = libeig.eigs_shift_invert(A, 2, target + 0.01j, B=B)
+        self.assertAlmostEqual(eigenvalues_target[0], target, places=6)
+
+    def test_continuation(self):
+        n = self.n
+        eye = scsp.identity(n, format='csc')
+        B = scsp.bmat([[eye, None], [None, self.M]], format='csc')
+
+        def pencil(p):
+            # stiffness and damping change with the parameter
+            return scsp.bmat([[None, eye], [-(1 + p) * self.K, -(1 - 0.5 * p) * self.C]], format='csc')
+
+        A0 = np.linalg.solve(B.toarray(), pencil(0.).toarray())
+        eigenvalues, eigenvectors = sclalg.eig(A0)
+        tracked = np.where(eigenvalues.imag > 0)[0]
+        tracked = tracked[np.argsort(eigenvalues[tracked].real)[::-1]][:4]
+        eigenvalues = eigenvalues[tracked]
+        eigenvectors = eigenvectors[:, tracked]
+
+        for p in np.linspace(0.05, 0.5, 10):
+            eigenvalues, eigenvectors, mac_values = libeig.track_eigenpairs(pencil(p), eigenvalues, eigenvectors,
+                                                                            k=3, B=B)
+            self.assertTrue(np.all(mac_values > 0.9))
+
+            eigenvalues_dense = sclalg.eigvals(np.linalg.solve(B.toarray(), pencil(p).toarray()))
+            for eigenvalue in eigenvalues:
+                self.assertLess(np.min(np.abs(eigenvalues_dense - eigenvalue)), 1e-6 * np.abs(eigenvalue))
+
+        # the modes remain distinct
+        self.assertEqual(len(np.unique(np.round(eigenvalues, 6))), 4)
+
+    def test_clustered_continuation(self):
+        n = self.n
+        eye = scsp.identity(n, format='csc')
+        B = scsp.bmat([[eye, None], [None, self.M]], format='csc')
+        A = scsp.bmat([[None, eye], [-1.05 * self.K, -self.C]], format='csc')
+
+        A0 = np.linalg.solve(B.toarray(), scsp.bmat([[None, eye], [-self.K, -self.C]]).toarray())
+        eigenvalues, eigenvectors = sclalg.eig(A0)
+        tracked = np.where(eigenvalues.imag > 0)[0]
+        tracked = tracked[np.argsort(eigenvalues[tracked].real)[::-1]][:10]
+        eigenvalues = eigenvalues[tracked]
+        eigenvectors = eigenvectors[:, tracked]
+
+        clusters = libeig.cluster_shifts(eigenvalues, 0.5)
+        self.assertLess(len(clusters), len(eigenvalues))
+        self.assertEqual(sorted(sum(clusters, [])), list(range(len(eigenvalues))))
+
+        reference = libeig.track_eigenpairs(A, eigenvalues, eigenvectors, k=3, B=B, cluster_radius=0.)
+        clustered = libeig.track_eigenpairs(A, eigenvalues, eigenvectors, k=3, B=B, cluster_radius=0.5)
+        self.assertTrue(np.all(clustered[2] > 0.9))
+        np.testing.assert_allclose(clustered[0], reference[0], rtol=1e-8)
+        np.testing.assert_allclose(clustered[2], reference[2], atol=1e-8)
+
+        # above the MAC threshold, every mode of a cluster is tracked again on its own
+        n_solutions = [0]
+        eigs_shift_invert = libeig.eigs_shift_invert
+
+        def counted_eigs_shift_invert(*args, **kwargs):
+            n_solutions[0] += 1
+            return eigs_shift_invert(*args, **kwargs)
+
+        libeig.eigs_shift_invert = counted_eigs_shift_invert
+        try:
+            retracked = libeig.track_eigenpairs(A, eigenvalues, eigenvectors, k=3, B=B, cluster_radius=0.5,
+                                                mac_threshold=1.1)
+        finally:
+            libeig.eigs_shift_invert = eigs_shift_invert
+        n_grouped = sum(len(cluster) for cluster in clusters if len(cluster) > 1)
+        self.assertEqual(n_solutions[0], len(clusters) + n_grouped)
+        np.testing.assert_allclose(retracked[0], reference[0], rtol=1e-8)
+
+    def test_mac(self):
+        phi = np.random.rand(10, 3) + 1j * np.random.rand(10, 3)
+        mac_matrix = libeig.mac(phi, phi * (2 - 1j))
+        np.testing.assert_allclose(np.diag(mac_matrix), np.ones(3))
+        self.assertTrue(np.all(mac_matrix <= 1 + 1e-12))
+
+    def test_dense_fallback(self):
+        A = np.random.rand(5, 5)
+        eigenvalues, right, left = libeig.eigs_shift_invert(A, 5, 0., left=True)
+        np.testing.assert_allclose(A.dot(right), right * eigenvalues, atol=1e-10)
+        np.testing.assert_allclose(left.T.dot(A), eigenvalues[:, None] * left.T, atol=1e-10)
+        self.assertTrue(libeig.is_symmetric(A + A.T))
+        self.assertFalse(libeig.is_symmetric(scsp.csc_matrix(A)))
+
+
+if __name__ == '__main__':
+    unittest.main()
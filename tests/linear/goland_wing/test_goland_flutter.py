@@ -81,6 +81,7 @@ class TestGolandFlutter(unittest.TestCase):
                  'LinearAssembler',
                  'FrequencyResponse',
                  'AsymptoticStability',
+                 'StabilityMap',
                  'SaveData',
                  ],
             'case': ws.case_name, 'route': ws.route,
@@ -222,6 +223,11 @@ class TestGolandFlutter(unittest.TestCase):
                                           'target_system': ['aeroelastic'],
                                           }
 
+        ws.config['StabilityMap'] = {'velocities': [float(u) for u in np.linspace(160, 180, 20)],
+                                     'analysis': 'eigenvalues',
+                                     'num_evals': 10,
+                                     'num_processes': 2}
+
         ws.config['SaveData'] = {'save_aero': 'off',
                                  'save_struct': 'off',
                                  'save_rom': 'on'}
@@ -266,10 +272,28 @@ class TestGolandFlutter(unittest.TestCase):
                                                                            'Frequency: %.2f rad/s' % (flutter_speed,
                                                                                                       flutter_frequency)
 
+    def run_stability_map(self):
+        # the stability map sweep is evaluated in worker processes and must match the serial velocity analysis
+        ulb = 160
+        uub = 180
+        num_u = 20
+        res = np.loadtxt(self.route_test_dir + '/output/%s/stability/' % self.data.settings['SHARPy']['case'] +
+                         '/velocity_analysis_min%04d_max%04d_nvel%04d.dat' % (ulb * 10, uub * 10, num_u), )
+        stability_map = np.loadtxt(self.route_test_dir + '/output/%s/stability/' %
+                                   self.data.settings['SHARPy']['case'] + '/stability_map.dat')
+
+        u_inf = np.unique(res[:, 0])
+        max_real = np.array([np.max(res[res[:, 0] == u, 1]) for u in u_inf])
+        max_real_map = np.array([np.max(stability_map[stability_map[:, 0] == u, 3]) for u in u_inf])
+
+        np.testing.assert_allclose(max_real_map, max_real, atol=1e-6,
+                                   err_msg='Stability map differs from the velocity analysis')
+
     def test_flutter(self):
         self.setup()
         self.run_rom_stable()
         self.run_flutter()
+        self.run_stability_map()
 
     def tearDown(self):
         import shutil
@@ -0,0 +1,117 @@
+"""Test the parametric ROM database and the interpolatory weights
+
+"""
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+import sharpy.linear.src.libss as libss
+import sharpy.rom.utils.librom_interp as librom_interp
+import sharpy.rom.utils.romdatabase as romdatabase
+import sharpy.utils.cout_utils as coututils
+
+
+def affine_rom(*point):
+    """
+    Discrete time system whose matrices depend linearly on the parameters, such that linear interpolation is exact.
+    """
+    states, inputs, outputs = 4, 2, 3
+    rng = np.random.RandomState(0)
+    mats = [rng.rand(*shape) for shape in [(states, states), (states, inputs), (outputs, states), (outputs, inputs)]]
+    slopes = [[rng.rand(*mat.shape) for mat in mats] for _ in point]
+    for slope, value in zip(slopes, point):
+        mats = [mat + value * d_mat for mat, d_mat in zip(mats, slope)]
+    return libss.ss(*mats, dt=0.1)
+
+
+class TestROMDatabase(unittest.TestCase):
+
+    test_dir = os.path.abspath(os.path.dirname(__file__))
+    output_folder = test_dir + '/output/rom_database/'
+
+    def setUp(self):
+        coututils.start_writer()
+
+    def test_weights(self):
+        zv = np.array([2., 0., 1., 4.])
+        wv = librom_interp.linear_weights(zv, 1.5)
+        np.testing.assert_array_almost_equal(wv, [0.5, 0., 0.5, 0.])
+        np.testing.assert_array_almost_equal(librom_interp.linear_weights(zv, 5.), [0., 0., 0., 1.])
+        np.testing.assert_array_almost_equal(librom_interp.linear_weights(zv, 5., extrapolate=True),
+                                             [-0.5, 0., 0., 1.5])
+
+        # scattered points, with the last parameter constant
+        rng = np.random.RandomState(1)
+        points = np.column_stack((rng.rand(20) * 100., rng.rand(20) * 1e4, np.ones(20)))
+        weights = librom_interp.ScatteredWeights(points)
+        for point in points:
+            wv = weights(point)
+            np.testing.assert_array_almost_equal(wv @ points, point)
+        point = np.mean(points, axis=0)
+        wv = weights(point)
+        self.assertAlmostEqual(np.sum(wv), 1.)
+        self.assertLessEqual(np.count_nonzero(wv), 3)
+        np.testing.assert_array_almost_equal(wv @ points, point)
+
+    def test_repeated_points(self):
+        with self.assertRaises(ValueError):
+            librom_interp.linear_weights([0., 1., 1., 2.], 1.)
+        with self.assertRaises(ValueError):
+            librom_interp.ScatteredWeights([[0., 0.], [1., 0.], [0., 1.], [1., 0.]])
+
+    def test_build_interpolate(self):
+        parameters = ['u_inf', 'altitude']
+        points = romdatabase.grid_points([10., 20., 30.], [0., 1.])
+
+        database = romdatabase.ROMDatabase.build(affine_rom, parameters, points, num_processes=2)
+        database_serial = romdatabase.ROMDatabase.build(affine_rom, parameters, points, num_processes=1)
+        for rom, rom_serial in zip(database.roms, database_serial.roms):
+            np.testing.assert_array_equal(rom.A, rom_serial.A)
+
+        database.save(self.output_folder + 'database')
+        database = romdatabase.ROMDatabase.load(self.output_folder + 'database.h5')
+        self.assertEqual(database.parameters, parameters)
+        self.assertEqual(database.n_points, 6)
+        self.assertIsNone(database.right_bases)
+
+        rom_interp = database.interpolator()
+        for point in [(15., 0.25), (27.5, 0.9), (10., 0.)]:
+            rom = rom_interp(point)
+            rom_ref = affine_rom(*point)
+            for name in ['A', 'B', 'C', 'D']:
+                np.testing.assert_array_almost_equal(getattr(rom, name), getattr(rom_ref, name))
+            self.assertEqual(rom.dt, rom_ref.dt)
+
+    def test_projection(self):
+        # the same system in different generalised coordinates
+        rom_ref = affine_rom(0.)
+        states = rom_ref.states
+        rng = np.random.RandomState(2)
+        V, _ = np.linalg.qr(rng.rand(10, states))
+        WT = V.T
+
+        def generate_rom(u_inf):
+            T = np.eye(states) + 0.1 * u_inf * rng.rand(states, states)
+            Tinv = np.linalg.inv(T)
+            rom = libss.ss(Tinv @ rom_ref.A @ T, Tinv @ rom_ref.B, rom_ref.C @ T, rom_ref.D, dt=rom_ref.dt)
+            return rom, V @ T, Tinv @ WT
+
+        database = romdatabase.ROMDatabase.build(generate_rom, ['u_inf'], [0., 1., 2.], num_processes=1)
+        with self.assertRaises(ValueError):
+            romdatabase.ROMDatabase(database.parameters, database.points, database.roms).interpolator('strongMAC_BT')
+
+        rom_interp = database.interpolator('strongMAC_BT', reference=0)
+        rom = rom_interp(1.3)
+        for name in ['A', 'B', 'C', 'D']:
+            np.testing.assert_array_almost_equal(getattr(rom, name), getattr(rom_ref, name))
+
+    def tearDown(self):
+        coututils.finish_writer()
+        if os.path.isdir(self.test_dir + '/output/'):
+            shutil.rmtree(self.test_dir + '/output/')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import os
+import shutil
+import types
+import numpy as np
+import scipy.sparse as scsp
+
+import sharpy.linear.utils.cache as linear_cache
+import sharpy.linear.src.libss as libss
+
+
+class TestLinearCache(unittest.TestCase):
+    """
+    Tests the content addressed cache of linear systems
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    cache_folder = route_test_dir + '/output/cache/'
+
+    @staticmethod
+    def timesteps(pos_z=0., stiffness=1.):
+        beam = types.SimpleNamespace(num_node=2,
+                                     connectivities=np.array([[0, 1]]),
+                                     stiffness_db=stiffness * np.eye(6)[None, :, :])
+        tsstruct0 = types.SimpleNamespace(pos=np.array([[0., 0., pos_z], [0., 1., pos_z]]),
+                                          modal={'freq_natural': np.array([1., 2.])})
+        tsaero0 = types.SimpleNamespace(zeta=[np.ones((3, 2, 2))], rho=1.225, ct_pointer=object())
+        return beam, tsstruct0, tsaero0
+
+    def test_key(self):
+        settings = {'linear_system': 'LinearAeroelastic',
+                    'linear_system_settings': {'aero_settings': {'dt': 0.1, 'rom_method': ['Krylov']},
+                                               'beam_settings': {'modal_projection': True}}}
+        key = linear_cache.linearisation_key(*self.timesteps(), settings)
+
+        reordered = {'linear_system_settings': {'beam_settings': {'modal_projection': True},
+                                                'aero_settings': {'rom_method': ['Krylov'], 'dt': 0.1}},
+                     'linear_system': 'LinearAeroelastic'}
+        self.assertEqual(linear_cache.linearisation_key(*self.timesteps(), reordered), key)
+
+        self.assertNotEqual(linear_cache.linearisation_key(*self.timesteps(pos_z=1e-12), settings), key)
+        # same reference state of a beam with different properties
+        self.assertNotEqual(linear_cache.linearisation_key(*self.timesteps(stiffness=2.), settings), key)
+        beam, tsstruct0, tsaero0 = self.timesteps()
+        beam.connectivities = np.array([[1, 0]])
+        self.assertNotEqual(linear_cache.linearisation_key(beam, tsstruct0, tsaero0, settings), key)
+        settings['linear_system_settings']['aero_settings']['dt'] = 0.2
+        self.assertNotEqual(linear_cache.linearisation_key(*self.timesteps(), settings), key)
+
+        # sparse and dense arrays with the same entries are different
+        self.assertNotEqual(linear_cache.linearisation_key(*self.timesteps(), {'a': np.eye(2)}),
+                            linear_cache.linearisation_key(*self.timesteps(), {'a': scsp.eye(2)}))
+
+    def test_save_load(self):
+        cache = linear_cache.LinearCache(self.cache_folder)
+        self.assertIsNone(cache.load('missing'))
+
+        ss = libss.ss(np.eye(2) * 0.5, np.ones((2, 1)), np.ones((1, 2)), np.zeros((1, 1)), dt=0.1)
+        entry = {'uvlm_ss': ss, 'rom': {'Krylov': {'V': np.eye(2)}}}
+        self.assertTrue(cache.save('key', entry))
+
+        loaded = cache.load('key')
+        np.testing.assert_array_equal(loaded['uvlm_ss'].A, ss.A)
+        self.assertEqual(loaded['uvlm_ss'].dt, ss.dt)
+        np.testing.assert_array_equal(loaded['rom']['Krylov']['V'], np.eye(2))
+
+    def test_stale_entry(self):
+        cache = linear_cache.LinearCache(self.cache_folder)
+        # pickles of classes that have been renamed or whose module has been moved
+        for key, stale in [('renamed', b'cos\nMissingClass\n.'),
+                           ('moved', b'csharpy.missing_module\nMissingClass\n.')]:
+            with self.subTest(key=key):
+                cache.save(key, None)
+                with open(cache.path(key), 'wb') as f:
+                    f.write(stale)
+                self.assertIsNone(cache.load(key))
+                self.assertFalse(os.path.exists(cache.path(key)))
+
+    def test_eviction(self):
+        entry = {'A': np.zeros(128 * 1024 // 8)}  # 128 kB
+        cache = linear_cache.LinearCache(self.cache_folder, max_size=0.3)
+        for i_entry, key in enumerate(['first', 'second']):
+            cache.save(key, entry)
+            os.utime(cache.path(key), (i_entry, i_entry))
+
+        # loading marks the first entry as the most recently used
+        cache.load('first')
+        cache.save('third', entry)
+        self.assertEqual(sorted(key for key, _, _ in cache.entries()), ['first', 'third'])
+        self.assertLessEqual(cache.size(), cache.max_size)
+
+        # entries larger than the cache are not stored
+        self.assertFalse(cache.save('large', {'A': np.zeros(1024 ** 2 // 8)}))
+        self.assertIsNone(cache.load('large'))
+
+    def tearDown(self):
+        if os.path.isdir(self.route_test_dir + '/output/'):
+            shutil.rmtree(self.route_test_dir + '/output/')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import numpy as np
+
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+
+
+def to_sparse(system):
+    return libss.ss(*[libsp.csc_matrix(M) for M in system.get_mats()], dt=system.dt)
+
+
+class TestInterconnection(unittest.TestCase):
+    """
+    Tests the block assembly of interconnected state-space systems against the dense formulas
+    """
+
+    def setUp(self):
+        np.random.seed(10)
+        self.dt = 0.2
+        self.ss1 = libss.random_ss(6, 4, 3, dt=self.dt)
+        self.ss2 = libss.random_ss(5, 3, 4, dt=self.dt)
+        self.K12 = np.random.rand(4, 4)
+        self.K21 = np.random.rand(3, 3)
+
+    @staticmethod
+    def couple_reference(ss1, ss2, K12, K21):
+        A1, B1, C1, D1 = [libsp.dense(M) for M in ss1.get_mats()]
+        A2, B2, C2, D2 = [libsp.dense(M) for M in ss2.get_mats()]
+        K12, K21 = libsp.dense(K12), libsp.dense(K21)
+
+        cpl_12 = np.linalg.solve(np.eye(K12.shape[0]) - K12.dot(D2).dot(K21).dot(D1), K12)
+        cpl_21 = np.linalg.solve(np.eye(K21.shape[0]) - K21.dot(D1).dot(K12).dot(D2), K21)
+        cpl_11 = cpl_12.dot(D2).dot(K21)
+        cpl_22 = cpl_21.dot(D1).dot(K12)
+
+        Lx = np.block([[B1, np.zeros((B1.shape[0], B2.shape[1]))], [np.zeros((B2.shape[0], B1.shape[1])), B2]])
+        Ly = np.block([[D1, np.zeros((D1.shape[0], D2.shape[1]))], [np.zeros((D2.shape[0], D1.shape[1])), D2]])
+        G = np.block([[cpl_11, cpl_12], [cpl_21, cpl_22]])
+        Rx = np.block([[C1, np.zeros((C1.shape[0], C2.shape[1]))], [np.zeros((C2.shape[0], C1.shape[1])), C2]])
+        Ru = Ly
+
+        A = np.block([[A1, np.zeros((A1.shape[0], A2.shape[1]))], [np.zeros((A2.shape[0], A1.shape[1])), A2]])
+        return libss.ss(A + Lx.dot(G).dot(Rx), Lx + Lx.dot(G).dot(Ru), Rx + Ly.dot(G).dot(Rx), Ly + Ly.dot(G).dot(Ru),
+                        dt=ss1.dt)
+
+    def test_couple(self):
+        reference = self.couple_reference(self.ss1, self.ss2, self.K12, self.K21)
+        for ss1 in [self.ss1, to_sparse(self.ss1)]:
+            for ss2 in [self.ss2, to_sparse(self.ss2)]:
+                for K12 in [self.K12, libsp.csc_matrix(self.K12)]:
+                    for out_sparse in [False, True]:
+                        with self.subTest(sparse1=type(ss1.A), sparse2=type(ss2.A), K12=type(K12),
+                                          out_sparse=out_sparse):
+                            coupled = libss.couple(ss1, ss2, K12, self.K21, out_sparse=out_sparse)
+                            libss.compare_ss(reference, coupled)
+                            expected_type = libsp.csc_matrix if out_sparse else np.ndarray
+                            self.assertTrue(all(type(M) is expected_type for M in coupled.get_mats()))
+
+    def test_couple_no_feedthrough(self):
+        ss2 = libss.ss(self.ss2.A, self.ss2.B, self.ss2.C, np.zeros_like(self.ss2.D), dt=self.dt)
+        reference = self.couple_reference(self.ss1, ss2, self.K12, self.K21)
+
+        # small row blocks
+        chunk_elements = libss.chunk_elements
+        libss.chunk_elements = 8
+        try:
+            libss.compare_ss(reference, libss.couple(self.ss1, ss2, self.K12, self.K21))
+            libss.compare_ss(reference, libss.couple(to_sparse(self.ss1), ss2, self.K12, self.K21))
+        finally:
+            libss.chunk_elements = chunk_elements
+
+        # sparse blocks remain sparse
+        A1 = np.diag(np.random.rand(6))
+        ss1 = libss.ss(libsp.csc_matrix(A1), libsp.csc_matrix(self.ss1.B), self.ss1.C, self.ss1.D, dt=self.dt)
+        coupled = libss.couple(ss1, to_sparse(ss2), self.K12, self.K21, out_sparse=True)
+        self.assertEqual(coupled.A[:6, :6].nnz, 6)
+
+    def test_series(self):
+        A1, B1, C1, D1 = self.ss2.get_mats()
+        A2, B2, C2, D2 = self.ss1.get_mats()
+        reference = libss.ss(np.block([[A1, np.zeros((5, 6))], [B2.dot(C1), A2]]),
+                             np.block([[B1], [B2.dot(D1)]]),
+                             np.block([D2.dot(C1), C2]),
+                             D2.dot(D1), dt=self.dt)
+        for out_sparse in [False, True]:
+            libss.compare_ss(reference, libss.series(self.ss2, self.ss1, out_sparse=out_sparse))
+            libss.compare_ss(reference, libss.series(to_sparse(self.ss2), to_sparse(self.ss1),
+                                                     out_sparse=out_sparse))
+
+    def test_no_feedthrough(self):
+        ss1 = libss.ss(self.ss1.A, self.ss1.B, self.ss1.C, np.zeros_like(self.ss1.D), dt=self.dt)
+        ss2 = libss.ss(self.ss2.A, self.ss2.B, self.ss2.C, np.zeros_like(self.ss2.D), dt=self.dt)
+
+        reference = libss.ss(np.block([[ss2.A, np.zeros((5, 6))], [ss1.B.dot(ss2.C), ss1.A]]),
+                             np.block([[ss2.B], [np.zeros((6, ss2.inputs))]]),
+                             np.block([np.zeros((ss1.outputs, 5)), ss1.C]),
+                             np.zeros((ss1.outputs, ss2.inputs)), dt=self.dt)
+        for out_sparse in [False, True]:
+            with self.subTest(out_sparse=out_sparse):
+                series = libss.series(ss2, ss1, out_sparse=out_sparse)
+                libss.compare_ss(reference, series)
+                self.assertEqual(libsp.dense(series.D).dtype, float)
+
+                libss.compare_ss(self.couple_reference(ss1, ss2, self.K12, self.K21),
+                                 libss.couple(ss1, ss2, self.K12, self.K21, out_sparse=out_sparse))
+
+    def test_parallel_join2(self):
+        ss3 = libss.random_ss(2, 2, 3, dt=self.dt)
+        parallel = libss.parallel(self.ss1, to_sparse(ss3))
+        np.testing.assert_allclose(parallel.C, np.block([self.ss1.C, ss3.C]))
+        np.testing.assert_allclose(parallel.D, np.block([self.ss1.D, ss3.D]))
+        np.testing.assert_allclose(parallel.A[6:, 6:], ss3.A)
+
+        K = np.random.rand(2, 2)
+        for out_sparse in [False, True]:
+            joined = libss.join2(K, to_sparse(self.ss1), out_sparse=out_sparse)
+            self.assertEqual((joined.states, joined.inputs, joined.outputs), (6, 6, 5))
+            np.testing.assert_allclose(libsp.dense(joined.D)[:2, :2], K)
+            np.testing.assert_allclose(libsp.dense(joined.D)[2:, 2:], self.ss1.D)
+            np.testing.assert_allclose(libsp.dense(joined.B)[:, 2:], self.ss1.B)
+
+    def test_addGain(self):
+        K = np.random.rand(3, 2)
+        for system in [self.ss1, to_sparse(self.ss1)]:
+            gained = libss.addGain(system, K, 'parallel-down')
+            np.testing.assert_allclose(libsp.dense(gained.D), np.block([self.ss1.D, K]))
+            np.testing.assert_allclose(libsp.dense(gained.B), np.block([self.ss1.B, np.zeros((6, 2))]))
+            self.assertIs(type(gained.B), type(system.B))
+
+            gained = libss.addGain(system, libsp.csc_matrix(np.random.rand(4, 2)), 'in')
+            self.assertEqual(gained.inputs, 2)
+
+    def test_nbytes(self):
+        self.assertEqual(self.ss1.nbytes, 8 * (36 + 24 + 18 + 12))
+        self.assertIn('Memory', self.ss1.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+import sharpy.utils.adaptive_time_step as adaptive_time_step
+import sharpy.utils.cout_utils as cout
+
+
+class TestAdaptiveTimeStep(unittest.TestCase):
+    """
+    Tests the adaptive time step control
+    """
+
+    def setUp(self):
+        cout.start_writer()
+
+    def test_decaying_response(self):
+        # the time step grows as the response decays
+        def state(t):
+            return np.array([np.exp(-t), -np.exp(-t)])
+
+        dt = 0.01
+        final_time = 5.
+        stepper = adaptive_time_step.AdaptiveTimeStep()
+        stepper.initialise({'relative_tolerance': 0., 'absolute_tolerance': 1e-3}, dt=dt, final_time=final_time)
+
+        history = [(0., state(0.))]
+        while True:
+            t = history[-1][0]
+            dt = stepper.next_dt(t)
+            if dt is None:
+                break
+            t += dt
+            x = state(t)
+            error = None
+            if len(history) > 1:
+                error = stepper.error(x, history[-1][1], history[-2][1], dt, history[-1][0] - history[-2][0])
+                # the linear extrapolation error is of second order
+                self.assertAlmostEqual(error, 0.5*dt*(dt + history[-1][0] - history[-2][0])*np.exp(-t)/1e-3, delta=0.25*error)
+            stepper.update(len(history), t, dt, error=error)
+            history.append((t, x))
+
+        self.assertAlmostEqual(history[-1][0], final_time, places=12)
+        dts = np.array([step['dt'] for step in stepper.steps])
+        self.assertLess(len(dts), final_time/stepper.nominal_dt/3)
+        self.assertLessEqual(dts.max(), stepper.dt_max*(1 + 1e-12))
+        self.assertTrue(np.all(dts[1:] <= stepper.settings['max_increase']*dts[:-1]*(1 + 1e-12)))
+
+        stepper.finish()
+
+    def test_linear_response(self):
+        stepper = adaptive_time_step.AdaptiveTimeStep()
+        stepper.initialise({}, dt=0.1, final_time=1.)
+
+        times = [0.1, 0.25, 0.3]
+        x = [np.array([2.*t, 1. - t]) for t in times]
+        self.assertAlmostEqual(stepper.error(x[2], x[1], x[0], times[2] - times[1], times[1] - times[0]), 0.)
+
+    def test_fsi_iterations(self):
+        stepper = adaptive_time_step.AdaptiveTimeStep()
+        stepper.initialise({'fsi_iterations_target': 8}, dt=0.1, final_time=1.)
+
+        self.assertAlmostEqual(stepper.update(1, 0.1, 0.1, fsi_iterations=16), 0.05)
+        self.assertAlmostEqual(stepper.update(2, 0.15, 0.05, fsi_iterations=20, converged=False), 0.025)
+        self.assertAlmostEqual(stepper.update(3, 0.175, 0.025, fsi_iterations=4), 0.025)
+        self.assertAlmostEqual(stepper.update(4, 0.225, 0.0101, fsi_iterations=100), 0.01)
+
+        # the last steps finish at the final time
+        stepper.dt = 0.1
+        self.assertAlmostEqual(stepper.next_dt(0.8), 0.1)
+        self.assertAlmostEqual(stepper.next_dt(0.88), 0.06)
+        self.assertAlmostEqual(stepper.next_dt(0.94), 0.06)
+        self.assertIsNone(stepper.next_dt(1.))
+
+    def tearDown(self):
+        cout.finish_writer()
+
+
+if __name__ == '__main__':
+    unittest.main()
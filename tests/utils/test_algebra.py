@@ -370,6 +370,67 @@ class TestAlgebra(unittest.TestCase):
 
         assert er < A[-2], 'der_TanT_by_xv error too large'
 
+    def test_crv_batch(self):
+        """ Checks the batched Cartesian rotation vector operations against the scalar versions"""
+
+        n_vec = 20
+        psi = 2.0 * np.pi * (np.random.rand(n_vec, 3) - 0.5)
+        psi[-2] *= 1e-10  # series expansions
+        psi[-1] = 0.
+        vec = np.random.rand(n_vec, 3)
+
+        batch_scalar = [(algebra.skew_batch(vec), lambda ii: algebra.skew(vec[ii])),
+                        (algebra.crv2rotation_batch(psi), lambda ii: algebra.crv2rotation(psi[ii])),
+                        (algebra.crv2tan_batch(psi), lambda ii: algebra.crv2tan(psi[ii])),
+                        (algebra.der_Ccrv_by_v_batch(psi, vec), lambda ii: algebra.der_Ccrv_by_v(psi[ii], vec[ii])),
+                        (algebra.der_TanT_by_xv_batch(psi[:-2], vec[:-2]),
+                         lambda ii: algebra.der_TanT_by_xv(psi[ii], vec[ii]))]
+
+        for batch, scalar in batch_scalar:
+            for ii in range(batch.shape[0]):
+                np.testing.assert_allclose(batch[ii], scalar(ii), rtol=1e-12, atol=1e-12)
+
+        # broadcasting of a single vector
+        np.testing.assert_allclose(algebra.der_TanT_by_xv_batch(psi[-1], vec[0]), algebra.der_TanT_by_xv(psi[-1], vec[0]))
+
+    def test_quat_batch(self):
+        """ Checks the batched quaternion operations and rotation conversions against the scalar versions"""
+
+        n_vec = 20
+        psi = 4.0 * np.pi * (np.random.rand(n_vec, 3) - 0.5)
+        psi[-2] *= 1e-10
+        psi[-1] = 0.
+        quat = np.random.rand(n_vec, 4) - 0.5
+        quat /= np.linalg.norm(quat, axis=1)[:, None]
+        vec = np.random.rand(n_vec, 3)
+        vec2 = np.random.rand(n_vec, 3)
+        rot = algebra.crv2rotation_batch(psi)
+
+        batch_scalar = [(algebra.cross3_batch(vec, vec2), lambda ii: algebra.cross3(vec[ii], vec2[ii])),
+                        (algebra.quat2rotation_batch(quat), lambda ii: algebra.quat2rotation(quat[ii])),
+                        (algebra.quat_bound_batch(quat), lambda ii: algebra.quat_bound(quat[ii].copy())),
+                        (algebra.rotation2quat_batch(rot), lambda ii: algebra.rotation2quat(rot[ii])),
+                        (algebra.rotation2crv_batch(rot), lambda ii: algebra.rotation2crv(rot[ii])),
+                        (algebra.crv_bounds_batch(psi), lambda ii: algebra.crv_bounds(psi[ii])),
+                        (algebra.crv2quat_batch(psi), lambda ii: algebra.crv2quat(psi[ii])),
+                        (algebra.quat2crv_batch(quat), lambda ii: algebra.quat2crv(quat[ii])),
+                        (algebra.crv_dot2omega_batch(psi, vec), lambda ii: algebra.crv_dot2omega(psi[ii], vec[ii])),
+                        (algebra.crv_dot2Omega_batch(psi, vec), lambda ii: algebra.crv_dot2Omega(psi[ii], vec[ii])),
+                        (algebra.der_CcrvT_by_v_batch(psi, vec), lambda ii: algebra.der_CcrvT_by_v(psi[ii], vec[ii])),
+                        (algebra.der_Cquat_by_v_batch(quat, vec), lambda ii: algebra.der_Cquat_by_v(quat[ii], vec[ii])),
+                        (algebra.der_CquatT_by_v_batch(quat, vec),
+                         lambda ii: algebra.der_CquatT_by_v(quat[ii], vec[ii]))]
+
+        for batch, scalar in batch_scalar:
+            for ii in range(batch.shape[0]):
+                np.testing.assert_allclose(batch[ii], scalar(ii), rtol=1e-12, atol=1e-12)
+
+        # triads
+        v1, v2, v3 = algebra.crv2triad_vec(psi)
+        np.testing.assert_allclose(algebra.triad2crv_vec(v1, v2, v3), algebra.rotation2crv_batch(rot), atol=1e-12)
+        for ii in range(n_vec):
+            np.testing.assert_allclose(v2[ii], algebra.crv2triad(psi[ii])[1], atol=1e-12)
+
     def test_quat_wrt_rot(self):
         """
         We define:
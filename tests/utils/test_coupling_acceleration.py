@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+
+import sharpy.utils.coupling_acceleration as coupling_acceleration
+
+
+class TestCouplingAcceleration(unittest.TestCase):
+    """
+    Tests the FSI coupling accelerators on a linear fixed point problem :math:`x = G x + b`, where the fixed point
+    iteration without relaxation diverges.
+    """
+
+    n_dof = 20
+
+    def setUp(self):
+        np.random.seed(10)
+        Q, _ = np.linalg.qr(np.random.rand(self.n_dof, self.n_dof))
+        eigenvalues = np.linspace(-1.5, 0.5, self.n_dof)
+        self.G = Q.dot(np.diag(eigenvalues)).dot(Q.T)
+        self.b = np.random.rand(self.n_dof)
+        self.x_exact = np.linalg.solve(np.eye(self.n_dof) - self.G, self.b)
+
+    def solve(self, acc, b=None, tolerance=1e-10, max_iter=500):
+        if b is None:
+            b = self.b
+        acc.start_step()
+        x = np.zeros(self.n_dof)
+        for k in range(max_iter):
+            x_tilde = self.G.dot(x) + b
+            if np.linalg.norm(x_tilde - x) < tolerance*np.linalg.norm(b):
+                break
+            x = acc.update(x, x_tilde)
+        acc.end_step()
+        return x, k
+
+    def test_accelerators_converge(self):
+        iterations = dict()
+        for accelerator_id in ['ConstantRelaxation', 'Aitken', 'IQNILS', 'Anderson']:
+            acc = coupling_acceleration.initialise_accelerator(accelerator_id, {'initial_relaxation': 0.3})
+            x, iterations[accelerator_id] = self.solve(acc)
+            np.testing.assert_allclose(x, self.x_exact, rtol=1e-7,
+                                       err_msg='%s did not converge to the fixed point' % accelerator_id)
+
+        self.assertLess(iterations['Aitken'], iterations['ConstantRelaxation'])
+        # IQN-ILS converges in at most n + 1 iterations for linear problems (up to round off)
+        self.assertLessEqual(iterations['IQNILS'], self.n_dof + 3)
+        self.assertLessEqual(iterations['Anderson'], self.n_dof + 3)
+
+    def test_iqnils_reuse(self):
+        acc = coupling_acceleration.initialise_accelerator('IQNILS', {'initial_relaxation': 0.3,
+                                                                      'reuse_steps': 4})
+        _, first_iterations = self.solve(acc)
+        x, second_iterations = self.solve(acc, b=1.01*self.b)
+        np.testing.assert_allclose(x, 1.01*self.x_exact, rtol=1e-7)
+        self.assertLess(second_iterations, first_iterations)
+
+    def test_unknown_accelerator(self):
+        with self.assertRaises(KeyError):
+            coupling_acceleration.initialise_accelerator('NotAnAccelerator')
+
+
+if __name__ == '__main__':
+    unittest.main()
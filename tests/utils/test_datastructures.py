@@ -0,0 +1,97 @@
+import ctypes as ct
+import unittest
+import numpy as np
+
+import sharpy.utils.algebra as algebra
+from sharpy.utils.datastructures import StructTimeStepInfo
+from sharpy.structure.models.beam import Beam
+
+
+class TestStructTimeStepInfo(unittest.TestCase):
+    """
+    Tests the changes of frame of reference of a multibody structure with three bodies of two 3-noded elements each
+    """
+
+    num_elem = 6
+    num_node = 15
+    num_bodies = 3
+
+    def setUp(self):
+        np.random.seed(4)
+        beam = Beam()
+        beam.num_elem = self.num_elem
+        beam.num_node = self.num_node
+        beam.num_bodies = self.num_bodies
+        beam.body_number = np.repeat(np.arange(self.num_bodies), 2)
+        beam.connectivities = np.array([[0, 2, 1], [2, 4, 3],
+                                        [5, 7, 6], [7, 9, 8],
+                                        [10, 12, 11], [12, 14, 13]])
+        beam.generate_body_masks()
+        # first element in which each node appears
+        beam.node_master_elem = np.array([[0, 0], [0, 2], [0, 1], [1, 2], [1, 1],
+                                          [2, 0], [2, 2], [2, 1], [3, 2], [3, 1],
+                                          [4, 0], [4, 2], [4, 1], [5, 2], [5, 1]])
+        self.beam = beam
+
+        tstep = StructTimeStepInfo(self.num_node, self.num_elem, 3,
+                                   num_dof=ct.c_int((self.num_node - self.num_bodies) * 6),
+                                   num_bodies=self.num_bodies)
+        for name in ['pos', 'pos_dot', 'gravity_forces', 'psi', 'psi_dot']:
+            getattr(tstep, name)[...] = np.random.rand(*getattr(tstep, name).shape) - 0.5
+        tstep.quat[:] = algebra.euler2quat(np.random.rand(3) - 0.5)
+        tstep.for_pos[:] = np.random.rand(6)
+        tstep.for_vel[:] = np.random.rand(6)
+        for ibody in range(self.num_bodies):
+            tstep.mb_quat[ibody, :] = algebra.euler2quat(np.random.rand(3) - 0.5)
+            tstep.mb_FoR_pos[ibody, :] = np.random.rand(6)
+            tstep.mb_FoR_vel[ibody, :] = np.random.rand(6)
+        self.tstep = tstep
+
+    def test_body_masks(self):
+        np.testing.assert_array_equal(np.sum(self.beam.body_nodes_mask, axis=1), [5, 5, 5])
+        np.testing.assert_array_equal(np.nonzero(self.beam.body_nodes_mask[1])[0], np.arange(5, 10))
+        np.testing.assert_array_equal(np.nonzero(self.beam.body_elems_mask[2])[0], [4, 5])
+
+    def test_local_global_AFoR(self):
+        reference = self.tstep.copy()
+        self.tstep.whole_structure_to_local_AFoR(self.beam)
+        self.assertFalse(self.tstep.in_global_AFoR)
+
+        # each body matches the change of frame of that body alone
+        for ibody in range(self.num_bodies):
+            body = reference.copy()
+            body.quat = reference.mb_quat[ibody, :]
+            body.for_pos = reference.mb_FoR_pos[ibody, :]
+            body.for_vel = reference.mb_FoR_vel[ibody, :]
+            body.change_to_local_AFoR(reference.for_pos, reference.for_vel, reference.quat)
+            nodes = self.beam.body_nodes_mask[ibody]
+            elems = self.beam.body_elems_mask[ibody]
+            for name in ['pos', 'pos_dot', 'gravity_forces']:
+                np.testing.assert_allclose(getattr(self.tstep, name)[nodes], getattr(body, name)[nodes], atol=1e-12)
+            for name in ['psi', 'psi_dot']:
+                np.testing.assert_allclose(getattr(self.tstep, name)[elems], getattr(body, name)[elems], atol=1e-12)
+
+        self.tstep.whole_structure_to_global_AFoR(self.beam)
+        self.assertTrue(self.tstep.in_global_AFoR)
+        for name in ['pos', 'pos_dot', 'gravity_forces', 'psi']:
+            np.testing.assert_allclose(getattr(self.tstep, name), getattr(reference, name), atol=1e-12)
+
+    def test_nodal_b_for_2_a_for(self):
+        nodal = np.random.rand(self.num_node, 6)
+        dof_filter = np.array([True, True, False, True, True, True])
+        nodal_a = self.beam.nodal_b_for_2_a_for(nodal, self.tstep, filter=dof_filter)
+        nodal_t = self.beam.nodal_premultiply_inv_T_transpose(nodal, self.tstep)
+        for i_node in range(self.num_node):
+            i_master_elem, i_local_node = self.beam.node_master_elem[i_node, :]
+            crv = self.tstep.psi[i_master_elem, i_local_node, :]
+            cab = algebra.crv2rotation(crv)
+            np.testing.assert_allclose(nodal_a[i_node, 0:2], cab.dot(nodal[i_node, 0:3])[0:2])
+            self.assertEqual(nodal_a[i_node, 2], nodal[i_node, 2])
+            np.testing.assert_allclose(nodal_a[i_node, 3:6], cab.dot(nodal[i_node, 3:6]))
+            inv_tanT = algebra.crv2invtant(crv)
+            np.testing.assert_allclose(nodal_t[i_node, 0:3], inv_tanT.dot(nodal[i_node, 0:3]))
+            np.testing.assert_allclose(nodal_t[i_node, 3:6], inv_tanT.dot(nodal[i_node, 3:6]))
+
+
+if __name__ == '__main__':
+    unittest.main()
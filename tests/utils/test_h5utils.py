@@ -0,0 +1,41 @@
+import unittest
+import os
+import shutil
+
+import h5py as h5
+import numpy as np
+
+import sharpy.utils.h5utils as h5utils
+
+
+class TestH5Utils(unittest.TestCase):
+    """
+    Tests the h5 file utilities
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/h5utils_test/'
+
+    def setUp(self):
+        os.makedirs(self.output_folder, exist_ok=True)
+
+    def test_append_arrays(self):
+        filename = self.output_folder + 'history.h5'
+        loads = np.arange(2 * 3 * 6, dtype=float).reshape(2, 3, 6)
+
+        with h5.File(filename, 'w') as f:
+            h5utils.append_arrays(f, {'ts': np.array([0]), 'loads': loads[:1]})
+        with h5.File(filename, 'a') as f:
+            h5utils.append_arrays(f, {'ts': np.array([1]), 'loads': loads[1:]})
+
+        with h5.File(filename, 'r') as f:
+            np.testing.assert_array_equal(f['ts'][()], [0, 1])
+            np.testing.assert_array_equal(f['loads'][()], loads)
+
+    def tearDown(self):
+        if os.path.isdir(self.output_folder):
+            shutil.rmtree(self.output_folder)
+
+
+if __name__ == '__main__':
+    unittest.main()
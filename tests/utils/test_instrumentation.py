@@ -0,0 +1,87 @@
+import unittest
+import os
+import json
+import csv
+import shutil
+import time
+
+import sharpy.utils.instrumentation as instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Tests the run instrumentation timeline
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/instrumentation_test/'
+
+    def test_disabled_timeline_is_noop(self):
+        timeline = instrumentation.Timeline()
+        with timeline.phase('aero'):
+            pass
+        timeline.count('iterations')
+        timeline.start_step(1)
+        timeline.end_step(fsi_iterations=3)
+        self.assertIsNone(timeline.totals)
+        self.assertEqual(timeline.steps, [])
+
+    def test_timeline_records(self):
+        timeline = instrumentation.Timeline()
+        timeline.initialise({'profile_steps': [1, 1]}, self.output_folder)
+
+        with timeline.phase('initialise'):
+            pass
+
+        for ts in range(1, 3):
+            timeline.start_step(ts, t=0.1*ts)
+            for k in range(ts + 1):
+                with timeline.phase('aero'):
+                    time.sleep(1e-3)
+                timeline.count('uvlm_solves')
+            timeline.add_bytes('writer', 10)
+            timeline.end_step(fsi_iterations=ts + 1)
+
+        summary = timeline.summary()
+        self.assertEqual(summary['phases']['aero']['calls'], 5)
+        self.assertEqual(summary['phases']['initialise']['calls'], 1)
+        self.assertGreaterEqual(summary['phases']['aero']['time'], 5e-3)
+        self.assertEqual(summary['counters']['uvlm_solves'], 5)
+        self.assertEqual(summary['counters']['fsi_iterations'], 5)
+        self.assertEqual(summary['bytes_written']['writer'], 20)
+        self.assertEqual(len(summary['steps']), 2)
+        self.assertEqual(summary['steps'][1]['phases']['aero']['calls'], 3)
+        self.assertNotIn('initialise', summary['steps'][0]['phases'])
+
+        timeline.finish()
+        self.assertFalse(timeline.enabled)
+
+        with open(self.output_folder + 'instrumentation/timeline.json', 'r') as infile:
+            written = json.load(infile)
+        self.assertEqual(written['counters']['fsi_iterations'], 5)
+
+        with open(self.output_folder + 'instrumentation/timeline.csv', 'r') as infile:
+            rows = list(csv.DictReader(infile))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(int(rows[0]['calls:aero']), 2)
+        self.assertEqual(int(rows[1]['fsi_iterations']), 3)
+
+        self.assertTrue(os.path.isfile(self.output_folder + 'instrumentation/profile_ts1-1.prof'))
+
+    def test_sampling_profiler(self):
+        profiler = instrumentation.SamplingProfiler(interval=1e-3)
+        profiler.start()
+        t_end = time.perf_counter() + 0.05
+        while time.perf_counter() < t_end:
+            sum(range(100))
+        profiler.stop()
+        self.assertGreater(profiler.n_samples, 0)
+        self.assertIn('test_sampling_profiler', ''.join(profiler.leaf_counts().keys()))
+
+    def tearDown(self):
+        if os.path.isdir(self.route_test_dir + '/output/'):
+            shutil.rmtree(self.route_test_dir + '/output/')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import numpy as np
+
+import sharpy.utils.instrumentation as instrumentation
+import sharpy.utils.parallel as parallel
+
+
+class TestParallel(unittest.TestCase):
+    """
+    Tests the forked process evaluation utilities
+    """
+
+    def test_fork_map(self):
+        state = {'offset': np.arange(3.)}
+
+        def evaluate(i, scale=1.):
+            # the closure and the state are inherited by the forked workers
+            return scale*(state['offset'] + i), os.getpid()
+
+        arguments = [(i, 2.) for i in range(5)]
+        for num_processes in [1, 3]:
+            results = parallel.fork_map(evaluate, arguments, num_processes=num_processes)
+            self.assertEqual(len(results), 5)
+            for i, (value, pid) in enumerate(results):
+                np.testing.assert_array_equal(value, 2.*(state['offset'] + i))
+
+            pids = set(pid for _, pid in results)
+            if num_processes == 1 or not parallel.fork_available():
+                self.assertEqual(pids, {os.getpid()})
+            else:
+                self.assertNotIn(os.getpid(), pids)
+
+    def test_single_arguments(self):
+        results = parallel.fork_map(lambda x: x**2, [1, 2, 3], num_processes=2)
+        self.assertEqual(results, [1, 4, 9])
+
+    def test_timestep_map(self):
+        timeline = instrumentation.timeline
+        timeline.initialise(output_folder=os.path.abspath(os.path.dirname(__file__)))
+
+        def step(it):
+            timeline.add_bytes('writer', it)
+            return it**2, os.getpid()
+
+        steps = list(range(0, 30, 2))
+        try:
+            for num_processes in [1, 3]:
+                timeline.reset()
+                results = parallel.timestep_map(step, steps, num_processes=num_processes)
+                self.assertEqual([value for value, _ in results], [it**2 for it in steps])
+                # bytes recorded in the workers are merged once into the main process
+                self.assertEqual(timeline.bytes_written['writer'], sum(steps))
+                if num_processes > 1 and parallel.fork_available():
+                    self.assertNotIn(os.getpid(), set(pid for _, pid in results))
+        finally:
+            timeline.enabled = False
+
+        self.assertEqual(parallel.timestep_map(step, [], num_processes=2), [])
+
+    def test_num_processes(self):
+        self.assertEqual(parallel.get_num_processes(4), 4)
+        self.assertGreaterEqual(parallel.get_num_processes(0), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
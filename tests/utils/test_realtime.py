@@ -0,0 +1,92 @@
+import unittest
+import os
+import json
+import shutil
+import time
+
+import sharpy.utils.realtime as realtime
+
+
+class TestRealTimePacer(unittest.TestCase):
+    """
+    Tests the real time pacing of time steps
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/realtime_test/'
+
+    def test_pacing(self):
+        pacer = realtime.RealTimePacer()
+        pacer.initialise({'speed_factor': 2.}, dt=0.02, output_folder=self.output_folder)
+        self.assertAlmostEqual(pacer.wall_dt, 0.01)
+
+        t_start = time.perf_counter()
+        for ts in range(1, 6):
+            pacer.start_step(ts)
+            missed = pacer.end_step()
+            self.assertFalse(missed)
+        elapsed = time.perf_counter() - t_start
+
+        # fast steps wait for their deadline
+        self.assertGreaterEqual(elapsed, 5*pacer.wall_dt)
+        self.assertEqual(pacer.level, 0)
+        self.assertEqual(pacer.fsi_substeps(20), 20)
+        self.assertTrue(pacer.run_postprocessor('BeamPlot'))
+
+    def test_degradation(self):
+        pacer = realtime.RealTimePacer()
+        pacer.initialise({'essential_postprocessors': ['SaveData'],
+                          'min_fsi_substeps': 2,
+                          'recovery_steps': 2,
+                          'folder': ''},
+                         dt=1e-3)
+
+        levels = []
+        fsi_substeps = []
+        for ts in range(1, 5):
+            pacer.start_step(ts)
+            fsi_substeps.append(pacer.fsi_substeps(8))
+            time.sleep(2e-3)
+            self.assertTrue(pacer.end_step())
+            levels.append(pacer.level)
+
+        self.assertEqual(fsi_substeps, [8, 8, 4, 2])
+        # level does not increase once the number of FSI iterations is at its lower bound
+        self.assertEqual(levels, [1, 2, 3, 3])
+        self.assertFalse(pacer.run_postprocessor('BeamPlot'))
+        self.assertTrue(pacer.run_postprocessor('SaveData'))
+
+        # recovery once ahead of schedule
+        pacer.wall_dt = 1.
+        pacer.update_level(-0.5)
+        self.assertEqual(pacer.level, 3)
+        pacer.update_level(-0.5)
+        self.assertEqual(pacer.level, 2)
+
+        summary = pacer.summary()
+        self.assertEqual(summary['deadline_misses'], 4)
+        self.assertEqual(summary['n_steps'], 4)
+        self.assertEqual(sum(summary['latency_histogram'].values()), 4)
+
+    def test_output(self):
+        pacer = realtime.RealTimePacer()
+        pacer.initialise({}, dt=1e-3, output_folder=self.output_folder)
+        for ts in range(1, 4):
+            pacer.start_step(ts)
+            pacer.add_queue_wait(1e-4)
+            pacer.end_step()
+        pacer.finish()
+
+        with open(self.output_folder + 'realtime/realtime.json', 'r') as infile:
+            written = json.load(infile)
+        self.assertEqual(written['n_steps'], 3)
+        self.assertAlmostEqual(written['queue_wait']['total'], 3e-4)
+        self.assertEqual([step['ts'] for step in written['steps']], [1, 2, 3])
+
+    def tearDown(self):
+        if os.path.isdir(self.route_test_dir + '/output/'):
+            shutil.rmtree(self.route_test_dir + '/output/')
+
+
+if __name__ == '__main__':
+    unittest.main()
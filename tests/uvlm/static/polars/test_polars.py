@@ -6,6 +6,7 @@ import configobj
 import numpy as np
 
 from sharpy.aero.utils.utils import local_stability_axes
+from sharpy.aero.utils.airfoilpolars import Polar
 import sharpy.utils.algebra as algebra
 
 
@@ -103,6 +104,50 @@ def process_case(path_to_case):
     return alpha, inertial_forces[2], inertial_forces[0], inertial_moments[1]
 
 
+class TestPolar(unittest.TestCase):
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+
+    def setUp(self):
+        polar_data = np.loadtxt(self.route_test_dir + '/xf-naca0018-il-50000.txt', skiprows=12)
+        self.polar = Polar()
+        self.polar.initialise(np.column_stack((polar_data[:, 0] * np.pi / 180, polar_data[:, 1],
+                                               polar_data[:, 2], polar_data[:, 4])))
+
+    def cdcm_from_cl_walk(self, cl):
+        """
+        Walks along the polar from the point closest to the angle of zero lift until the lift coefficient is reached
+        """
+        table = self.polar.table
+        i = np.argmin(np.abs(table[:, 0] - self.polar.aoa_cl0_deg))
+        if cl > 0.:
+            while table[i, 1] < cl:
+                i += 1
+            return [np.interp(cl, table[i-1:i+1, 1], table[i-1:i+1, icol]) for icol in [2, 3]]
+        else:
+            while table[i, 1] > cl:
+                i -= 1
+            return [np.interp(cl, table[i:i+2, 1], table[i:i+2, icol]) for icol in [2, 3]]
+
+    def test_cdcm_from_cl(self):
+        """
+        The inverse CL tables of the (non monotone) NACA 0018 polar match the first point of each branch of the polar
+        """
+        cl = np.linspace(-0.89, 0.89, 179)
+        cl = cl[cl != 0.]
+        cd, cm = self.polar.get_cdcm_from_cl(cl)
+        for icl in range(len(cl)):
+            np.testing.assert_allclose([cd[icl], cm[icl]], self.cdcm_from_cl_walk(cl[icl]), atol=1e-12)
+
+        cd, cm = self.polar.get_cdcm_from_cl(0.5)
+        np.testing.assert_allclose([cd, cm], self.cdcm_from_cl_walk(0.5), atol=1e-12)
+
+        # out of range
+        cd, cm = self.polar.get_cdcm_from_cl(np.array([-5., 5.]))
+        np.testing.assert_array_equal(cd, [0., 0.])
+        np.testing.assert_array_equal(cm, [0., 0.])
+
+
 class TestStab(unittest.TestCase):
 
     def test_stability(self):
@@ -0,0 +1,74 @@
+import unittest
+import os
+import shutil
+import types
+
+import h5py as h5
+import numpy as np
+
+from sharpy.postproc.beamloads import BeamLoads
+
+
+class StepBeamLoads(BeamLoads):
+    # loads known in closed form, in place of the beam solver call
+    def calculate_step_loads(self, it):
+        strain = np.full((self.data.structure.num_elem, 6), float(it))
+        return strain, 10. * strain
+
+
+class TestBeamLoads(unittest.TestCase):
+    """
+    Tests the stacking of the BeamLoads results over the time history
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/beamloads_test/'
+
+    num_elem = 4
+    n_tsteps = 5
+
+    def build_data(self):
+        connectivities = np.array([[2 * i_elem, 2 * i_elem + 2, 2 * i_elem + 1] for i_elem in range(self.num_elem)])
+        structure = types.SimpleNamespace(num_elem=self.num_elem,
+                                          connectivities=connectivities,
+                                          beam_number=np.zeros(self.num_elem, dtype=int),
+                                          timestep_info=[])
+        return types.SimpleNamespace(structure=structure, output_folder=self.output_folder)
+
+    def add_step(self, data, it):
+        data.structure.timestep_info.append(types.SimpleNamespace(pos=np.full((2 * self.num_elem + 1, 3), float(it)),
+                                                                  num_elem=self.num_elem,
+                                                                  postproc_cell=dict()))
+
+    def test_online(self):
+        settings = {'h5_output': True, 'output_file_name': 'online'}
+
+        data = self.build_data()
+        online_loads = StepBeamLoads()
+        online_loads.initialise(data, dict(settings))
+        for it in range(self.n_tsteps):
+            self.add_step(data, it)
+            online_loads.run(online=True)
+
+            # the time steps of previous calls are kept
+            np.testing.assert_array_equal(online_loads.ts, np.arange(it + 1))
+            self.assertEqual(online_loads.loads.shape, (it + 1, self.num_elem, 6))
+            self.assertIs(data.structure.timestep_info[it].postproc_cell['loads'].base, online_loads.loads)
+
+        offline_loads = StepBeamLoads()
+        offline_loads.initialise(data, {'output_file_name': 'offline'})
+        offline_loads.run()
+        for attr in ['ts', 'strain', 'loads', 'coords_a']:
+            np.testing.assert_array_equal(getattr(online_loads, attr), getattr(offline_loads, attr))
+
+        with h5.File(self.output_folder + 'beam/online.h5', 'r') as f:
+            np.testing.assert_array_equal(f['ts'][()], offline_loads.ts)
+            np.testing.assert_array_equal(f['loads'][()], offline_loads.loads)
+
+    def tearDown(self):
+        if os.path.isdir(self.output_folder):
+            shutil.rmtree(self.output_folder)
+
+
+if __name__ == '__main__':
+    unittest.main()